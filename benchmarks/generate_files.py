@@ -0,0 +1,157 @@
+"""
+Deterministic generator of synthetic fixed-width files for benchmarks.
+
+The same size, seed and corruption settings always produce the same
+bytes, so results from different runs are comparable. Files with more
+than MAX_TRANSACTIONS_AMOUNT (20 000) transactions are outside the
+format and fail structure validation; their 6-digit counters wrap
+around after 999 999. They are still useful to measure reading,
+parsing and the per-line validators at scale.
+
+Usage:
+    python benchmarks/generate_files.py OUTPUT --transactions 20000
+        [--seed 0] [--corrupt-every 0]
+"""
+
+import argparse
+import random
+import sys
+from typing import Iterator, List
+
+SIZES = {
+    "1k": 1_000,
+    "20k": 20_000,
+    "1m": 1_000_000,
+    "10m": 10_000_000,
+}
+
+CURRENCIES = ["USD", "EUR", "GBP"]
+COUNTER_MODULO = 10**6
+CONTROL_SUM_MODULO = 10**12
+TRANSACTION_RESERVED = " " * 97
+FOOTER_RESERVED = " " * 100
+CHUNK_SIZE = 10_000
+
+# Corruptions applied in turn to every n-th transaction of a corrupted
+# file, each one caught by a different validator check.
+CORRUPTIONS = ["currency", "amount", "length", "counter"]
+
+
+def header_line() -> str:
+    """Returns a valid header record."""
+    return ",".join(
+        [
+            "01",
+            "benchmark".ljust(28),
+            "generator".ljust(30),
+            "synthetic".ljust(30),
+            "fixed width street 1".ljust(30),
+        ]
+    )
+
+
+def transaction_line(counter: int, amount: int, currency: str) -> str:
+    """Returns a valid transaction record."""
+    return (
+        f"02,{counter % COUNTER_MODULO:06d},{amount:012d},"
+        f"{currency},{TRANSACTION_RESERVED}"
+    )
+
+
+def corrupt_line(line: str, corruption: str) -> str:
+    """Applies one of CORRUPTIONS to a valid transaction record."""
+    if corruption == "currency":
+        return line[:21] + "ZZZ" + line[24:]
+    if corruption == "amount":
+        return line[:9] + "00000000000X" + line[21:]
+    if corruption == "length":
+        return line[:-1]
+    return line[:3] + "00000A" + line[9:]
+
+
+def footer_line(transactions: int, control_sum: int) -> str:
+    """Returns a footer record for the given totals."""
+    return (
+        f"03,{transactions % COUNTER_MODULO:06d},"
+        f"{control_sum % CONTROL_SUM_MODULO:012d},{FOOTER_RESERVED}"
+    )
+
+
+def generate_lines(
+    transactions: int, seed: int = 0, corrupt_every: int = 0
+) -> Iterator[List[str]]:
+    """
+    Generates the records of a file in chunks.
+    Args:
+        transactions: Number of transaction records.
+        seed: Seed of the amount and currency sequence.
+        corrupt_every: Corrupts every n-th transaction, 0 for none.
+    Yields:
+        Lists of at most CHUNK_SIZE records, without line endings.
+    """
+    # Reproducible test data, not a security use of randomness.
+    rng = random.Random(seed)  # nosec B311
+    control_sum = 0
+    chunk = [header_line()]
+    for counter in range(1, transactions + 1):
+        amount = rng.randrange(1, 1_000_000)
+        control_sum += amount
+        line = transaction_line(counter, amount, rng.choice(CURRENCIES))
+        if corrupt_every and counter % corrupt_every == 0:
+            corruption = CORRUPTIONS[
+                (counter // corrupt_every - 1) % len(CORRUPTIONS)
+            ]
+            line = corrupt_line(line, corruption)
+        chunk.append(line)
+        if len(chunk) >= CHUNK_SIZE:
+            yield chunk
+            chunk = []
+    chunk.append(footer_line(transactions, control_sum))
+    yield chunk
+
+
+def generate_file(
+    path: str, transactions: int, seed: int = 0, corrupt_every: int = 0
+) -> int:
+    """
+    Writes a synthetic file.
+    Args:
+        path: Output file path.
+        transactions: Number of transaction records.
+        seed: Seed of the amount and currency sequence.
+        corrupt_every: Corrupts every n-th transaction, 0 for none.
+    Returns:
+        The size of the written file in bytes.
+    """
+    size = 0
+    with open(path, "w") as output:
+        for chunk in generate_lines(transactions, seed, corrupt_every):
+            data = "\n".join(chunk) + "\n"
+            output.write(data)
+            size += len(data)
+    return size
+
+
+def main(argv: List[str]) -> int:
+    """Generates one file from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("output")
+    parser.add_argument(
+        "--transactions",
+        default="20k",
+        help=f"Number of transactions or one of {', '.join(SIZES)}.",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--corrupt-every", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    transactions = SIZES.get(args.transactions) or int(args.transactions)
+    size = generate_file(
+        args.output, transactions, args.seed, args.corrupt_every
+    )
+    print(f"Wrote {transactions} transactions ({size} bytes) to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,135 @@
+"""
+Start-up import time regression benchmark for fintech_file_cli.
+
+Runs the CLI entry point module under ``python -X importtime`` several
+times, alone and followed by the packages that the validate, retrieve
+and edit operations import on first use. Reports the median cumulative
+import time of the heaviest modules and fails if a scenario imports a
+module that its operation must not need, or if the start-up exceeds the
+given budget.
+
+Usage:
+    python benchmarks/import_time.py [--runs 5] [--budget-ms 100]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess  # nosec B404
+import sys
+from typing import Dict, List, Tuple
+
+ENTRY_MODULE = "fintech_file_cli.cli.main"
+
+# Modules that no validate, retrieve or edit operation needs.
+FORBIDDEN_IN_OPERATIONS = [
+    "asyncio",
+    "multiprocessing",
+    "concurrent.futures",
+    "fintech_file_cli.server.daemon",
+    "fintech_file_cli.executors.batch_executor",
+    "fintech_file_cli.executors.script_executor",
+]
+
+# Modules that must not be imported just by starting the CLI.
+FORBIDDEN_AT_STARTUP = FORBIDDEN_IN_OPERATIONS + [
+    "fixed_width_struct_io.access_control.immutable_field_setter",
+    "fixed_width_struct_io.writers",
+]
+
+# Modules of the merge, split, diff, repair, export and build operations,
+# which the validate, retrieve and edit operations do not need.
+FILE_OPERATION_MODULES = [
+    "fixed_width_struct_io.readers.file_differ",
+    "fixed_width_struct_io.writers.file_merger",
+    "fixed_width_struct_io.writers.file_splitter",
+    "fixed_width_struct_io.writers.file_repairer",
+    "fixed_width_struct_io.writers.record_exporter",
+    "fixed_width_struct_io.writers.file_builder",
+]
+
+# Name -> (packages imported after the entry module, forbidden modules).
+SCENARIOS: Dict[str, Tuple[List[str], List[str]]] = {
+    "startup": ([], FORBIDDEN_AT_STARTUP),
+    "validate": (
+        ["fixed_width_struct_io.validators"],
+        FORBIDDEN_AT_STARTUP + FILE_OPERATION_MODULES,
+    ),
+    "retrieve": (
+        ["fixed_width_struct_io.readers"],
+        FORBIDDEN_AT_STARTUP + FILE_OPERATION_MODULES,
+    ),
+    "edit": (
+        ["fixed_width_struct_io.writers"],
+        FORBIDDEN_IN_OPERATIONS + FILE_OPERATION_MODULES,
+    ),
+}
+
+
+def measure_imports(packages: List[str]) -> Dict[str, int]:
+    """
+    Imports the entry module and then the given packages in a fresh
+    interpreter.
+    Args:
+        packages: Packages imported after the entry module.
+    Returns:
+        The cumulative import time in microseconds of every module.
+    """
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    statement = "; ".join(
+        f"import {module}" for module in [ENTRY_MODULE, *packages]
+    )
+    # Runs the current interpreter with a fixed statement, no shell.
+    completed = subprocess.run(  # nosec B603
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=repo_root,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative: Dict[str, int] = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, module = line.split("|")
+        cumulative[module.strip()] = int(cumulative_us)
+    return cumulative
+
+
+def main(argv: List[str]) -> int:
+    """Runs the benchmark and returns the process exit code."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=100.0)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    failed = False
+    for name, (packages, forbidden) in SCENARIOS.items():
+        runs = [measure_imports(packages) for _ in range(args.runs)]
+        modules = runs[0]
+        medians = {
+            module: statistics.median(run.get(module, 0) for run in runs)
+            for module in modules
+        }
+        total_ms = (
+            sum(medians[module] for module in [ENTRY_MODULE, *packages]) / 1000
+        )
+
+        print(f"{name}: {total_ms:.1f} ms (median of {args.runs} runs)")
+        heaviest = sorted(medians.items(), key=lambda item: -item[1])
+        for module, cumulative_us in heaviest[: args.top]:
+            print(f"  {cumulative_us / 1000:8.1f} ms  {module}")
+
+        imported = [module for module in forbidden if module in modules]
+        if imported:
+            print(f"FAIL: {name} imported: {', '.join(imported)}")
+            failed = True
+        if name == "startup" and total_ms > args.budget_ms:
+            print(f"FAIL: {total_ms:.1f} ms exceeds {args.budget_ms:.1f} ms")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
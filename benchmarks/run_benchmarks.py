@@ -0,0 +1,331 @@
+"""
+Benchmark suite for the fixed_width_struct_io library.
+
+Generates synthetic files (see generate_files.py), times the library
+operations on them and records throughput and peak RSS to a JSON
+results file. Every measurement runs in a fresh interpreter so that
+its peak RSS is not inflated by earlier measurements. Each operation
+is timed end to end including its own read of the file, the same way
+a CLI run performs it.
+
+A results file can be compared with an earlier one to catch
+regressions: the run fails if any operation got slower than the given
+threshold.
+
+Usage:
+    PYTHONPATH=. python benchmarks/run_benchmarks.py
+        [--sizes 1k,20k] [--repeat 3] [--output results.json]
+        [--compare previous.json] [--threshold 0.2]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import shutil
+import statistics
+import subprocess  # nosec B404
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple, Type, Union
+
+from generate_files import SIZES, generate_file
+
+OPERATIONS = [
+    "load",
+    "validate_structure",
+    "validate_length",
+    "validate_values",
+    "collect_errors",
+    "retrieve",
+    "edit",
+    "append",
+]
+WRITE_OPERATIONS = {"edit", "append"}
+CORRUPT_EVERY = 100
+
+
+def _load(path: str) -> None:
+    from fixed_width_struct_io.core import FileIOBase
+
+    FileIOBase(file_path=path)
+
+
+def _validate_structure(path: str) -> None:
+    from fixed_width_struct_io.validators import FileStructureValidator
+
+    FileStructureValidator(file_path=path).validate()
+
+
+def _validate_length(path: str) -> None:
+    from fixed_width_struct_io.validators import StringLengthValidator
+
+    StringLengthValidator(file_path=path).validate()
+
+
+def _validate_values(path: str) -> None:
+    from fixed_width_struct_io.validators import ValuesValidator
+
+    ValuesValidator(file_path=path).validate()
+
+
+def _collect_errors(path: str) -> None:
+    from fixed_width_struct_io.validators import (
+        ErrorCollector,
+        FileStructureValidator,
+        StringLengthValidator,
+        ValuesValidator,
+    )
+
+    collector = ErrorCollector(max_errors=sys.maxsize)
+    validator_classes: Tuple[
+        Type[
+            Union[
+                FileStructureValidator,
+                StringLengthValidator,
+                ValuesValidator,
+            ]
+        ],
+        ...,
+    ] = (FileStructureValidator, StringLengthValidator, ValuesValidator)
+    for validator_class in validator_classes:
+        validator_class(file_path=path).collect_errors(collector)
+
+
+def _retrieve(path: str) -> None:
+    from fixed_width_struct_io.readers import FieldRetriever
+
+    FieldRetriever(file_path=path).retrieve(
+        record_type="footer", field_name="control sum", transaction_index=None
+    )
+
+
+def _edit(path: str) -> None:
+    from fixed_width_struct_io.writers import FieldEditor
+
+    FieldEditor(file_path=path).edit_field_value(
+        record_type="transaction",
+        field_name="amount",
+        transaction_index="000001",
+        new_value="000000000100",
+    )
+
+
+def _append(path: str) -> None:
+    from fixed_width_struct_io.writers import TransactionAppender
+
+    TransactionAppender(file_path=path).append_transaction(
+        "000000001000", "USD"
+    )
+
+
+OPERATION_FUNCTIONS: Dict[str, Callable[[str], None]] = {
+    "load": _load,
+    "validate_structure": _validate_structure,
+    "validate_length": _validate_length,
+    "validate_values": _validate_values,
+    "collect_errors": _collect_errors,
+    "retrieve": _retrieve,
+    "edit": _edit,
+    "append": _append,
+}
+
+
+def _peak_rss_kb() -> int:
+    """Returns the peak resident set size of this process in KiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def run_worker(operation: str, path: str, repeat: int) -> dict:
+    """
+    Times one operation in the current process.
+    Write operations run on a fresh copy of the file for every repeat,
+    the copy is not included in the timing.
+    """
+    function = OPERATION_FUNCTIONS[operation]
+    timings = []
+    result: dict = {"status": "ok"}
+    with tempfile.TemporaryDirectory() as work_dir:
+        target = os.path.join(work_dir, os.path.basename(path))
+        for _ in range(repeat):
+            if operation in WRITE_OPERATIONS:
+                shutil.copyfile(path, target)
+            started_at = time.perf_counter()
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    function(target if operation in WRITE_OPERATIONS else path)
+            except Exception as e:
+                result.update(status="error", error=str(e))
+            timings.append(time.perf_counter() - started_at)
+    result["seconds"] = timings
+    result["peak_rss_kb"] = _peak_rss_kb()
+    return result
+
+
+def measure(operation: str, path: str, repeat: int) -> dict:
+    """Runs one measurement in a fresh interpreter."""
+    # Runs this script with the current interpreter and fixed arguments.
+    completed = subprocess.run(  # nosec B603
+        [sys.executable, __file__, "--worker", operation, path],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=dict(os.environ, BENCHMARK_REPEAT=str(repeat)),
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def run_suite(
+    sizes: List[str], repeat: int, data_dir: str, operations: List[str]
+) -> List[dict]:
+    """Generates the files for every size and measures every operation."""
+    results = []
+    for size_name in sizes:
+        transactions = SIZES[size_name]
+        valid_path = os.path.join(data_dir, f"valid_{size_name}.csv")
+        corrupt_path = os.path.join(data_dir, f"corrupt_{size_name}.csv")
+        if not os.path.exists(valid_path):
+            generate_file(valid_path, transactions)
+        if not os.path.exists(corrupt_path):
+            generate_file(
+                corrupt_path, transactions, corrupt_every=CORRUPT_EVERY
+            )
+
+        for operation in operations:
+            path = (
+                corrupt_path if operation == "collect_errors" else valid_path
+            )
+            measured = measure(operation, path, repeat)
+            median = statistics.median(measured["seconds"])
+            file_size = os.path.getsize(path)
+            result = {
+                "size": size_name,
+                "transactions": transactions,
+                "operation": operation,
+                "status": measured["status"],
+                "median_seconds": round(median, 6),
+                "min_seconds": round(min(measured["seconds"]), 6),
+                "records_per_second": round(transactions / median, 1),
+                "mb_per_second": round(file_size / median / 2**20, 2),
+                "peak_rss_kb": measured["peak_rss_kb"],
+            }
+            if "error" in measured:
+                result["error"] = measured["error"]
+            results.append(result)
+            print(
+                f"{size_name:>4} {operation:<20} {median * 1000:10.2f} ms "
+                f"{result['records_per_second']:>14,.0f} rec/s "
+                f"{result['peak_rss_kb'] / 1024:8.1f} MiB "
+                f"{result['status']}"
+            )
+    return results
+
+
+def compare(
+    results: List[dict], previous_path: str, threshold: float
+) -> List[str]:
+    """Returns the operations that got slower than the threshold."""
+    with open(previous_path, "r") as previous_file:
+        previous = {
+            (result["size"], result["operation"]): result
+            for result in json.load(previous_file)["results"]
+        }
+    regressions = []
+    for result in results:
+        before = previous.get((result["size"], result["operation"]))
+        if before is None or not before["median_seconds"]:
+            continue
+        change = result["median_seconds"] / before["median_seconds"] - 1
+        if change > threshold:
+            regressions.append(
+                f"{result['size']} {result['operation']}: "
+                f"{before['median_seconds']:.6f}s -> "
+                f"{result['median_seconds']:.6f}s (+{change:.0%})"
+            )
+    return regressions
+
+
+def _git_revision() -> Optional[str]:
+    """Returns the current commit, if the suite runs in a git checkout."""
+    try:
+        # Only reads the revision; git is looked up on PATH on purpose.
+        return subprocess.run(  # nosec B603, B607
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv: List[str]) -> int:
+    """Runs the suite and returns the process exit code."""
+    if argv[:1] == ["--worker"]:
+        repeat = int(os.environ.get("BENCHMARK_REPEAT", "1"))
+        print(json.dumps(run_worker(argv[1], argv[2], repeat)))
+        return 0
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes",
+        default="1k,20k",
+        help=f"Comma-separated sizes out of {', '.join(SIZES)}.",
+    )
+    parser.add_argument(
+        "--operations",
+        default=",".join(OPERATIONS),
+        help="Comma-separated operations to measure.",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--data-dir",
+        default=os.path.join(tempfile.gettempdir(), "fixed_width_benchmarks"),
+        help="Directory for the generated files, reused between runs.",
+    )
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", help="Earlier results file.")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    sizes = args.sizes.split(",")
+    operations = args.operations.split(",")
+    unknown = [size for size in sizes if size not in SIZES] + [
+        operation for operation in operations if operation not in OPERATIONS
+    ]
+    if unknown:
+        parser.error(f"Unknown sizes or operations: {', '.join(unknown)}")
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    results = run_suite(sizes, args.repeat, args.data_dir, operations)
+    with open(args.output, "w") as output:
+        json.dump(
+            {
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "revision": _git_revision(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "repeat": args.repeat,
+                "results": results,
+            },
+            output,
+            indent=2,
+        )
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
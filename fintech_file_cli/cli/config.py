@@ -5,29 +5,307 @@ def parse_arguments() -> argparse.Namespace:
     """
     Parses command line arguments for the fixed-width file validator CLI.
 
+    Returns:
+        Namespace: An argparse.Namespace object containing
+         the parsed arguments and their values.
+    """
+    return build_parser().parse_args()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Builds the argument parser for the fixed-width file validator CLI.
+
     This function defines the command line arguments available for use with
     the CLI. It uses argparse to handle command line argument parsing.
+    The same parser is used for the lines of a --commands file.
 
     Returns:
-        Namespace: An argparse.Namespace object containing
-         the parsed arguments and their values.
+        ArgumentParser: The configured argument parser.
     """
     parser = argparse.ArgumentParser(
         description="CLI tool for managing fixed-width files. It supports "
         "validating file structure, editing/retrieving field "
         "values, managing transactions, and configuring field access."
     )
+    parser.add_argument(
+        "mode",
+        nargs="?",
+        choices=["serve"],
+        help="Use 'serve' to start a long-running daemon that keeps "
+        "parsed files in memory and answers requests on --socket.",
+    )
+    parser.add_argument(
+        "--socket",
+        help="Path of the daemon's Unix domain socket. With 'serve' the "
+        "daemon listens on it; with any other operation the CLI sends "
+        "the operation to a running daemon instead of executing it.",
+    )
     parser.add_argument(
         "--file-path",
         type=str,
         help="Path to the fixed-width file for processing or validation.",
     )
+    parser.add_argument(
+        "--batch",
+        help="Processes many files in one run instead of --file-path. "
+        "Accepts a directory, a glob pattern (quote it) or a manifest "
+        "file with one path per line. Supports --validate (and "
+        "--max-errors) and field retrieval; results are printed as JSON "
+        "Lines as each file completes.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Number of worker processes used by --batch, --segmented "
+        "validation or --split. Defaults to the number of CPUs for --batch.",
+    )
+    parser.add_argument(
+        "--commands",
+        help="Path to a file with one operation per line, written with the "
+        "same flags as a single CLI run (e.g. '--record-type header --field "
+        "name'), or '-' to read them from stdin. The file given by "
+        "--file-path is read once, all operations are applied in memory "
+        "and the result is written once at the end.",
+    )
+    parser.add_argument(
+        "--merge",
+        nargs="+",
+        metavar="INPUT",
+        help="Merges the given files into the file given by --file-path,"
+        " renumbering the transaction counters. If the merged transactions"
+        " exceed the limit of a file, numbered files such as"
+        " 'merged.001.csv' are written instead.",
+    )
+    parser.add_argument(
+        "--split",
+        metavar="OUTPUT",
+        help="Splits the file given by --file-path into shards of at most"
+        " --shard-size transactions, each a valid file with its own header"
+        " copy and footer. Several shards are numbered like the outputs of"
+        " --merge, e.g. 'shard.001.csv'.",
+    )
+    parser.add_argument(
+        "--shard-size",
+        type=int,
+        help="Maximum number of transactions per shard written by --split."
+        " Defaults to the transaction limit of a file.",
+    )
+    parser.add_argument(
+        "--diff",
+        metavar="NEW_FILE",
+        help="Compares the file given by --file-path with a newer version"
+        " of it and prints the changed header fields, added, removed and"
+        " changed transactions by counter and footer changes as JSON Lines,"
+        " followed by a summary line.",
+    )
+    parser.add_argument(
+        "--repair",
+        action="store_true",
+        help="Renumbers drifted transaction counters and recomputes the"
+        " footer total counter and control sum of the file given by"
+        " --file-path in one pass, replacing the file atomically. Every"
+        " change is printed as a JSON line, followed by a summary line.",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Used with --repair. Prints the planned changes without"
+        " writing the file.",
+    )
+    parser.add_argument(
+        "--sync-sqlite",
+        metavar="DATABASE",
+        help="Mirrors the header, transactions and footer of the file given"
+        " by --file-path into a local SQLite database, indexed by counter,"
+        " currency and amount. Re-running it only parses what was appended"
+        " since the last sync, or nothing if the file is unchanged.",
+    )
+    parser.add_argument(
+        "--mirror",
+        metavar="DATABASE",
+        help="Used with --record-type and --field. Syncs the file into this"
+        " SQLite mirror and answers the retrieval from it.",
+    )
+    parser.add_argument(
+        "--export-snapshot",
+        metavar="SNAPSHOT",
+        help="Writes a compact binary columnar snapshot of the file given by"
+        " --file-path, which can be memory-mapped and read without parsing.",
+    )
+    parser.add_argument(
+        "--import-snapshot",
+        metavar="SNAPSHOT",
+        help="Restores the exact fixed-width file from a snapshot written by"
+        " --export-snapshot into the file given by --file-path.",
+    )
+    parser.add_argument(
+        "--export",
+        metavar="OUTPUT",
+        help="Exports the records of the file given by --file-path to CSV or"
+        " JSON Lines in one streaming pass. Use '-' to write to stdout.",
+    )
+    parser.add_argument(
+        "--export-format",
+        choices=["csv", "jsonl"],
+        help="Format of --export. Defaults to 'csv'.",
+    )
+    parser.add_argument(
+        "--export-fields",
+        help="Comma-separated fields exported by --export, e.g."
+        " 'counter,amount,currency'. Defaults to every field except the"
+        " field id and the reserved space.",
+    )
+    parser.add_argument(
+        "--amount-format",
+        choices=["text", "cents", "decimal"],
+        help="How --export writes amounts and control sums: as in the file"
+        " ('text', the default), as integer cents ('cents') or as decimal"
+        " strings such as '20.00' ('decimal'). With --build, the unit of every"
+        " 'amount' of the rows, 'cents' by default.",
+    )
+    parser.add_argument(
+        "--build",
+        metavar="ROWS",
+        help="Builds a new valid file at --file-path from a CSV or JSON Lines"
+        " file of rows with 'amount' and 'currency' values, in one streaming"
+        " pass. Counters and the footer are computed. All amounts have the"
+        " unit set by --amount-format: integer cents such as '2050' by"
+        " default, 12-digit cents as in the file with 'text', or units such"
+        " as '20.50' or '20' with 'decimal'.",
+    )
+    parser.add_argument(
+        "--build-format",
+        choices=["csv", "jsonl"],
+        help="Format of the --build rows. Defaults to 'jsonl' for .jsonl and"
+        " .ndjson files and 'csv' otherwise.",
+    )
+    parser.add_argument(
+        "--header-field",
+        action="append",
+        metavar="FIELD=VALUE",
+        help="Header value of a file written by --build, e.g. 'name=John'."
+        " Repeat it for every header field; missing fields are left blank.",
+    )
+    parser.add_argument(
+        "--currency-index",
+        action="store_true",
+        help="Builds the currency index of the file given by --file-path, a"
+        " '<file>.currency-index' sidecar kept up to date by later edits and"
+        " appends, and prints the number of transactions per currency.",
+    )
+    parser.add_argument(
+        "--filter-currency",
+        metavar="CURRENCY",
+        help="Prints the transactions of one currency of the file given by"
+        " --file-path as JSON lines, followed by a summary line with their"
+        " total in cents. The currency index is used, and built if needed,"
+        " so only the matching records are read.",
+    )
+    parser.add_argument(
+        "--amount-index",
+        action="store_true",
+        help="Builds the amount index of the file given by --file-path, a"
+        " '<file>.amount-index' sidecar of the amounts sorted with their"
+        " counters, kept up to date by later edits and appends.",
+    )
+    parser.add_argument(
+        "--amounts-between",
+        nargs=2,
+        type=int,
+        metavar=("MIN", "MAX"),
+        help="Prints the transactions of the file given by --file-path with"
+        " amounts between MIN and MAX cents as JSON lines, in ascending"
+        " order, followed by a summary line. The amount index is used, and"
+        " built if needed.",
+    )
+    parser.add_argument(
+        "--top-amounts",
+        type=int,
+        metavar="COUNT",
+        help="Prints the COUNT transactions with the largest amounts as JSON"
+        " lines, largest first, followed by a summary line, using the"
+        " amount index.",
+    )
+    parser.add_argument(
+        "--amount-quantile",
+        type=float,
+        metavar="FRACTION",
+        help="Prints the transaction at a quantile of the amounts, e.g. 0.5"
+        " for the median, using the amount index.",
+    )
     parser.add_argument(
         "--validate",
         action="store_true",
         help="Performs validation on the structure and"
         " content of the specified fixed-width file.",
     )
+    parser.add_argument(
+        "--max-errors",
+        type=int,
+        help="Used with --validate. Instead of stopping at the first error,"
+        " collects up to N errors in one pass and prints them as JSON "
+        "Lines followed by a summary line.",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="all",
+        choices=["cpu", "memory", "all"],
+        help="Profiles the executed operation with cProfile ('cpu'), "
+        "tracemalloc ('memory') or both ('all', the default when no value "
+        "is given). A summary with the time spent in each phase (read, "
+        "parse, each validator, write) and the top functions and "
+        "allocation sites is written to stderr.",
+    )
+    parser.add_argument(
+        "--profile-output",
+        help="Path of the pstats file written by --profile. "
+        "Defaults to 'fintech_file_cli.pstats'.",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        help="Writes the library metrics (records and bytes read, "
+        "validation times, edits, appends, cache hits, lock waits) to this "
+        "file when the CLI exits, e.g. into the directory of a Prometheus "
+        "node exporter textfile collector.",
+    )
+    parser.add_argument(
+        "--metrics-format",
+        choices=["prometheus", "json"],
+        help="Format of --metrics-file. Defaults to 'prometheus'.",
+    )
+    parser.add_argument(
+        "--lock-timeout",
+        type=float,
+        help="Seconds to wait for the lock on the file while another"
+        " process reads or writes it. Defaults to 30.",
+    )
+    parser.add_argument(
+        "--show-version",
+        action="store_true",
+        help="Prints the version of the file (size, modification time and"
+        " content hash) as read, or as written by an edit or append.",
+    )
+    parser.add_argument(
+        "--expected-version",
+        type=str,
+        help="Version printed by --show-version that the file must still"
+        " have; an edit or append is refused if the file changed since.",
+    )
+    parser.add_argument(
+        "--segmented",
+        action="store_true",
+        help="Treats the file as a segmented file: several header/"
+        "transactions/footer groups in one file. Supports validation,"
+        " retrieval with --segment and appending.",
+    )
+    parser.add_argument(
+        "--segment",
+        type=int,
+        help="1-based number of the segment to retrieve a field from"
+        " with --segmented.",
+    )
     parser.add_argument(
         "--record-type",
         choices=["header", "transaction", "footer"],
@@ -87,4 +365,4 @@ def parse_arguments() -> argparse.Namespace:
         "result of retrieve operations.",
     )
 
-    return parser.parse_args()
+    return parser
@@ -1,16 +1,9 @@
 import logging
 import sys
+from typing import Optional
 
 from fintech_file_cli.executors import CommandExecutor
 from fintech_file_cli.validators import ArgumentValidator
-from fixed_width_struct_io.access_control import immutable_field_setter
-from fixed_width_struct_io.readers import FieldRetriever
-from fixed_width_struct_io.validators import (
-    FileStructureValidator,
-    StringLengthValidator,
-    ValuesValidator,
-)
-from fixed_width_struct_io.writers import FieldEditor, TransactionAppender
 
 from fintech_file_cli.setup_logger import configure_logging
 from fintech_file_cli.cli.config import parse_arguments
@@ -26,6 +19,7 @@ def main() -> None:
      validates arguments, and executes the requested command on a
     fixed-width file according to the provided arguments.
     """
+    args = None
     try:
         args = parse_arguments()
         configure_logging(args.log)
@@ -33,25 +27,9 @@ def main() -> None:
         validator = ArgumentValidator(args)
         validator.validate()
 
-        file_path = args.file_path or ""
-
-        file_structure_validator = FileStructureValidator(file_path=file_path)
-        length_validator = StringLengthValidator(file_path=file_path)
-        values_validator = ValuesValidator(file_path=file_path)
-        field_retriever = FieldRetriever(file_path=file_path)
-        field_editor = FieldEditor(file_path=file_path)
-        transaction_appender = TransactionAppender(file_path=file_path)
-
-        executor = CommandExecutor(
-            args=args,
-            file_structure_validator=file_structure_validator,
-            length_validator=length_validator,
-            values_validator=values_validator,
-            field_retriever=field_retriever,
-            field_editor=field_editor,
-            transaction_appender=transaction_appender,
-            immutable_field_setter=immutable_field_setter,
-        )
+        # Validators and utilities are created by the executor on first
+        # use, so only the modules needed by the operation are imported.
+        executor = CommandExecutor(args=args)
         executor.execute()
     except ValueError as e:
         logger.error(f"Error: {e}")
@@ -59,6 +37,22 @@ def main() -> None:
     except Exception as e:
         logger.error(f"An unexpected error occurred: {e}")
         sys.exit(1)
+    finally:
+        if args is not None and args.metrics_file:
+            export_metrics(args.metrics_file, args.metrics_format)
+
+
+def export_metrics(metrics_file: str, metrics_format: Optional[str]) -> None:
+    """
+    Writes the library metrics collected during the run.
+    A failed export is logged and does not change the exit status.
+    """
+    from fixed_width_struct_io.metrics import write_metrics
+
+    try:
+        write_metrics(metrics_file, metrics_format or "prometheus")
+    except OSError as e:
+        logger.error(f"Failed to write metrics to {metrics_file}: {e}")
 
 
 if __name__ == "__main__":
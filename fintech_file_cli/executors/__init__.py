@@ -1,3 +1,20 @@
-from fintech_file_cli.executors.command_executor import (  # noqa: F401, E501
-    CommandExecutor,
-)
+import importlib
+from typing import Any
+
+# The executors are imported on first access, so that starting the CLI
+# does not import the process pool, asyncio or the library modules that
+# the requested operation does not need.
+_EXPORTS = {
+    "BatchExecutor": "fintech_file_cli.executors.batch_executor",
+    "CommandExecutor": "fintech_file_cli.executors.command_executor",
+    "ScriptExecutor": "fintech_file_cli.executors.script_executor",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    """Imports an exported executor on first access."""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_EXPORTS[name]), name)
@@ -0,0 +1,230 @@
+import argparse
+import glob
+import json
+import logging
+import os
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type, Union
+
+logger = logging.getLogger(__name__)
+
+BatchTask = namedtuple(
+    "BatchTask",
+    [
+        "file_path",
+        "validate",
+        "max_errors",
+        "record_type",
+        "field",
+        "transaction_counter",
+    ],
+)
+
+
+def resolve_batch_paths(source: str) -> List[str]:
+    """
+    Resolves the file paths of a batch source.
+    Args:
+        source: A directory (all regular, non-hidden files in it),
+                a glob pattern, or a manifest file listing one path
+                per line. Empty lines and lines starting with '#' in a
+                manifest are ignored, relative paths are resolved
+                against the manifest's directory.
+    Returns:
+        A sorted list of file paths for directories and glob patterns,
+        or the manifest paths in their original order.
+    Raises:
+        ValueError: If the source does not exist or matches no files.
+    """
+    if os.path.isdir(source):
+        paths = sorted(
+            entry.path
+            for entry in os.scandir(source)
+            if entry.is_file() and not entry.name.startswith(".")
+        )
+    elif glob.has_magic(source):
+        paths = sorted(
+            path
+            for path in glob.glob(source, recursive=True)
+            if os.path.isfile(path)
+        )
+    elif os.path.isfile(source):
+        manifest_dir = os.path.dirname(os.path.abspath(source))
+        with open(source, "r") as manifest:
+            paths = [
+                os.path.join(manifest_dir, line.strip())
+                for line in manifest
+                if line.strip() and not line.startswith("#")
+            ]
+    else:
+        raise ValueError(f"Batch source not found: {source}")
+
+    if not paths:
+        raise ValueError(f"No files found for batch source: {source}")
+    logger.info(f"Resolved {len(paths)} file(s) for batch source {source}.")
+    return paths
+
+
+def process_batch_task(task: BatchTask) -> dict:
+    """
+    Runs the requested operation on a single file of a batch.
+    This is the unit of work executed in the worker processes,
+    so it never raises: failures are reported in the result.
+    Args:
+        task: The file and the operation to run on it.
+    Returns:
+        A result dictionary with the file path, status
+        ('ok', 'invalid' or 'error'), elapsed seconds and the
+        operation output.
+    """
+    started_at = time.perf_counter()
+    result: dict = {"file": task.file_path}
+    try:
+        if task.validate:
+            result.update(_validate_task(task))
+        if task.record_type and task.field:
+            from fixed_width_struct_io.readers import FieldRetriever
+
+            result["value"] = FieldRetriever(
+                file_path=task.file_path
+            ).get_value(
+                record_type=task.record_type,
+                field_name=task.field,
+                transaction_index=task.transaction_counter,
+            )
+        result.setdefault("status", "ok")
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = str(e)
+    result["elapsed"] = round(time.perf_counter() - started_at, 6)
+    return result
+
+
+def _validate_task(task: BatchTask) -> dict:
+    """Validates a single file, fail-fast or in collect-all-errors mode."""
+    from fixed_width_struct_io.validators import (
+        ErrorCollector,
+        FileStructureValidator,
+        StringLengthValidator,
+        ValuesValidator,
+    )
+
+    validator_classes: Tuple[
+        Type[
+            Union[
+                FileStructureValidator,
+                StringLengthValidator,
+                ValuesValidator,
+            ]
+        ],
+        ...,
+    ] = (
+        FileStructureValidator,
+        StringLengthValidator,
+        ValuesValidator,
+    )
+    if task.max_errors is None:
+        try:
+            for validator_class in validator_classes:
+                validator_class(file_path=task.file_path).validate()
+        except ValueError as e:
+            return {"status": "invalid", "error": str(e)}
+        return {"status": "ok"}
+
+    collector = ErrorCollector(max_errors=task.max_errors)
+    for validator_class in validator_classes:
+        validator_class(file_path=task.file_path).collect_errors(collector)
+        if collector.truncated:
+            break
+    return {
+        "status": "invalid" if len(collector) else "ok",
+        "errors": [issue._asdict() for issue in collector],
+        "summary": collector.summary(),
+    }
+
+
+class BatchExecutor:
+    """
+    Runs validation or field retrieval over many files in one
+    CLI invocation, using a pool of worker processes.
+
+    Results are streamed to stdout as JSON Lines as soon as each file
+    is processed, followed by a summary line with the totals.
+
+    Attributes:
+        args: Parsed command-line arguments.
+        workers: Number of worker processes.
+    """
+
+    def __init__(self, args: argparse.Namespace) -> None:
+        """Initializes the BatchExecutor with command-line arguments."""
+        self.args = args
+        self.workers = args.workers or os.cpu_count() or 1
+
+    def execute(self) -> None:
+        """
+        Processes every file of the batch source.
+        Raises:
+            ValueError: If at least one file is invalid or failed.
+        """
+        started_at = time.perf_counter()
+        paths = resolve_batch_paths(self.args.batch)
+        summary: Dict[str, Any] = {
+            "files": len(paths),
+            "ok": 0,
+            "invalid": 0,
+            "error": 0,
+        }
+        total: Optional[int] = 0
+
+        for result in self._run(paths):
+            summary[result["status"]] += 1
+            value = result.get("value")
+            if total is not None and value is not None:
+                total = total + int(value) if value.isdigit() else None
+            self._write_json_line(result)
+
+        if self.args.record_type and self.args.field and total is not None:
+            summary["total"] = total
+        summary["elapsed"] = round(time.perf_counter() - started_at, 6)
+        self._write_json_line({"summary": summary})
+
+        failed = summary["invalid"] + summary["error"]
+        if failed:
+            raise ValueError(
+                f"{failed} of {len(paths)} file(s) failed in batch mode."
+            )
+        logger.info(f"All {len(paths)} file(s) processed successfully.")
+
+    def _run(self, paths: List[str]) -> Iterator[dict]:
+        """Yields per-file results in the order they complete."""
+        tasks = [
+            BatchTask(
+                file_path=path,
+                validate=self.args.validate,
+                max_errors=self.args.max_errors,
+                record_type=self.args.record_type,
+                field=self.args.field,
+                transaction_counter=self.args.transaction_counter,
+            )
+            for path in paths
+        ]
+        if self.workers == 1:
+            for task in tasks:
+                yield process_batch_task(task)
+            return
+
+        logger.info(f"Starting batch with {self.workers} worker processes.")
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            futures = [pool.submit(process_batch_task, task) for task in tasks]
+            for future in as_completed(futures):
+                yield future.result()
+
+    @staticmethod
+    def _write_json_line(record: dict) -> None:
+        """Writes a single JSON Lines record to stdout."""
+        sys.stdout.write(json.dumps(record) + "\n")
+        sys.stdout.flush()
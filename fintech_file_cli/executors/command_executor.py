@@ -1,16 +1,24 @@
 import argparse
+import json
 import logging
+import sys
+from typing import TYPE_CHECKING, Any, List, Optional
 
-from fixed_width_struct_io.access_control.immutable_field_setter import (
-    ImmutableFieldSetter,
-)
-from fixed_width_struct_io.readers import FieldRetriever
-from fixed_width_struct_io.validators import (
-    FileStructureValidator,
-    StringLengthValidator,
-)
-from fixed_width_struct_io.validators.values_validator import ValuesValidator
-from fixed_width_struct_io.writers import FieldEditor, TransactionAppender
+if TYPE_CHECKING:
+    from fixed_width_struct_io.access_control.immutable_field_setter import (
+        ImmutableFieldSetter,
+    )
+    from fixed_width_struct_io.core import FileVersion
+    from fixed_width_struct_io.readers import FieldRetriever
+    from fixed_width_struct_io.validators import (
+        FileStructureValidator,
+        StringLengthValidator,
+        ValuesValidator,
+    )
+    from fixed_width_struct_io.writers import (
+        FieldEditor,
+        TransactionAppender,
+    )
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +27,11 @@ class CommandExecutor:
     """
     Executes commands based on the parsed arguments for the CLI.
 
+    Validators and utilities that are not passed in are created on first
+    use, so a run only imports the modules and reads the file needed by
+    the requested operation. The read-only components share one read of
+    the file.
+
     Attributes:
         args: Parsed command-line arguments.
         file_path: Path to the file.
@@ -34,28 +47,229 @@ class CommandExecutor:
     def __init__(
         self,
         args: argparse.Namespace,
-        file_structure_validator: FileStructureValidator,
-        length_validator: StringLengthValidator,
-        values_validator: ValuesValidator,
-        field_retriever: FieldRetriever,
-        field_editor: FieldEditor,
-        transaction_appender: TransactionAppender,
-        immutable_field_setter: ImmutableFieldSetter,
+        file_structure_validator: Optional["FileStructureValidator"] = None,
+        length_validator: Optional["StringLengthValidator"] = None,
+        values_validator: Optional["ValuesValidator"] = None,
+        field_retriever: Optional["FieldRetriever"] = None,
+        field_editor: Optional["FieldEditor"] = None,
+        transaction_appender: Optional["TransactionAppender"] = None,
+        immutable_field_setter: Optional["ImmutableFieldSetter"] = None,
     ) -> None:
         """Initializes the CommandExecutor with the necessary
         validators and utilities."""
         self.args = args
-        self.file_structure_validator = file_structure_validator
-        self.length_validator = length_validator
-        self.values_validator = values_validator
-        self.field_retriever = field_retriever
-        self.field_editor = field_editor
-        self.transaction_appender = transaction_appender
-        self.immutable_field_setter = immutable_field_setter
+        self.file_path = args.file_path
+        self._file_structure_validator = file_structure_validator
+        self._length_validator = length_validator
+        self._values_validator = values_validator
+        self._field_retriever = field_retriever
+        self._field_editor = field_editor
+        self._transaction_appender = transaction_appender
+        self._immutable_field_setter = immutable_field_setter
+        self._lines: Optional[List[str]] = None
+        self._read_version: Optional["FileVersion"] = None
+
+    @property
+    def lock_timeout(self) -> float:
+        """Seconds to wait for the file lock."""
+        from fixed_width_struct_io.constants import DEFAULT_LOCK_TIMEOUT
+
+        lock_timeout = getattr(self.args, "lock_timeout", None)
+        return DEFAULT_LOCK_TIMEOUT if lock_timeout is None else lock_timeout
+
+    def _get_lines(self) -> List[str]:
+        """Reads the file once for all read-only components."""
+        if self._lines is None:
+            from fixed_width_struct_io.core import FileIOBase
+
+            reader = FileIOBase(
+                file_path=self.file_path,
+                lock_timeout=self.lock_timeout,
+                track_version=bool(self.args.show_version),
+            )
+            self._lines, self._read_version = reader.lines, reader.version
+        return self._lines
+
+    @property
+    def expected_version(self) -> Optional["FileVersion"]:
+        """Version the file must have for a write, from the arguments."""
+        if not self.args.expected_version:
+            return None
+        from fixed_width_struct_io.core import FileVersion
+
+        return FileVersion.parse(self.args.expected_version)
+
+    def _writer_kwargs(self) -> dict:
+        """Keyword arguments shared by the writers."""
+        return {
+            "file_path": self.file_path,
+            "lock_timeout": self.lock_timeout,
+            "expected_version": self.expected_version,
+            "track_version": bool(self.args.show_version),
+        }
+
+    @property
+    def file_structure_validator(self) -> "FileStructureValidator":
+        """Validator for the file structure, created on first use."""
+        if self._file_structure_validator is None:
+            from fixed_width_struct_io.validators import (
+                FileStructureValidator,
+            )
+
+            self._file_structure_validator = FileStructureValidator(
+                lines=self._get_lines()
+            )
+        return self._file_structure_validator
+
+    @property
+    def length_validator(self) -> "StringLengthValidator":
+        """Validator for the length of file content, created on first use."""
+        if self._length_validator is None:
+            from fixed_width_struct_io.validators import StringLengthValidator
+
+            self._length_validator = StringLengthValidator(
+                lines=self._get_lines()
+            )
+        return self._length_validator
+
+    @property
+    def values_validator(self) -> "ValuesValidator":
+        """Validator for the values within the file, created on first use."""
+        if self._values_validator is None:
+            from fixed_width_struct_io.validators import ValuesValidator
+
+            self._values_validator = ValuesValidator(lines=self._get_lines())
+        return self._values_validator
+
+    @property
+    def field_retriever(self) -> "FieldRetriever":
+        """Utility to retrieve field values, created on first use."""
+        if self._field_retriever is None:
+            from fixed_width_struct_io.readers import FieldRetriever
+
+            self._field_retriever = FieldRetriever(lines=self._get_lines())
+        return self._field_retriever
+
+    @property
+    def field_editor(self) -> "FieldEditor":
+        """Utility to edit field values, created on first use."""
+        if self._field_editor is None:
+            from fixed_width_struct_io.writers import FieldEditor
+
+            self._field_editor = FieldEditor(**self._writer_kwargs())
+        return self._field_editor
+
+    @property
+    def transaction_appender(self) -> "TransactionAppender":
+        """Utility to append transactions, created on first use."""
+        if self._transaction_appender is None:
+            from fixed_width_struct_io.writers import TransactionAppender
+
+            self._transaction_appender = TransactionAppender(
+                **self._writer_kwargs()
+            )
+        return self._transaction_appender
+
+    @property
+    def immutable_field_setter(self) -> "ImmutableFieldSetter":
+        """Utility to change field immutability, imported on first use."""
+        if self._immutable_field_setter is None:
+            from fixed_width_struct_io.access_control import (
+                immutable_field_setter,
+            )
+
+            self._immutable_field_setter = immutable_field_setter
+        return self._immutable_field_setter
 
     def execute(self) -> None:
+        """
+        Executes the appropriate actions based on the provided arguments,
+        under the profiler if --profile is given.
+        """
+        if self.args.profile:
+            from fintech_file_cli.profiling import OperationProfiler
+
+            with OperationProfiler(
+                self.args.profile, self.args.profile_output
+            ):
+                self._execute()
+        else:
+            self._execute()
+
+    def _execute(self) -> None:
         """Executes the appropriate actions based on the provided arguments."""
         try:
+            if self.args.mode == "serve":
+                from fintech_file_cli.server.daemon import FileDaemon
+
+                FileDaemon(self.args.socket).run()
+                return
+
+            if self.args.socket:
+                self._forward_to_daemon()
+                return
+
+            if self.args.batch:
+                from fintech_file_cli.executors.batch_executor import (
+                    BatchExecutor,
+                )
+
+                BatchExecutor(self.args).execute()
+                return
+
+            if self.args.commands:
+                from fintech_file_cli.executors.script_executor import (
+                    ScriptExecutor,
+                )
+
+                ScriptExecutor(self.args).execute()
+                return
+
+            if self.args.merge:
+                self._merge_files()
+                return
+
+            if self.args.split:
+                self._split_file()
+                return
+
+            if self.args.diff:
+                self._diff_files()
+                return
+
+            if self.args.repair:
+                self._repair_file()
+                return
+
+            if self.args.sync_sqlite:
+                self._sync_sqlite()
+                return
+
+            if self.args.export_snapshot or self.args.import_snapshot:
+                self._convert_snapshot()
+                return
+
+            if self.args.export:
+                self._export_records()
+                return
+
+            if self.args.build:
+                self._build_file()
+                return
+
+            if self.args.currency_index or self.args.filter_currency:
+                self._query_currency_index()
+                return
+
+            if (
+                self.args.amount_index
+                or self.args.amounts_between is not None
+                or self.args.top_amounts is not None
+                or self.args.amount_quantile is not None
+            ):
+                self._query_amount_index()
+                return
+
             if self.args.file_path:
                 self._handle_file_path_actions()
 
@@ -80,9 +294,280 @@ class CommandExecutor:
             logger.error(f"An error occurred during command execution: {e}")
             raise
 
+    def _merge_files(self) -> None:
+        """Merges the --merge inputs and prints the written files."""
+        from fixed_width_struct_io.writers.file_merger import FileMerger
+
+        logger.info(f"Merging {len(self.args.merge)} file(s).")
+        outputs = FileMerger(
+            self.args.merge, lock_timeout=self.lock_timeout
+        ).merge(self.file_path)
+        self._write_json_line({"outputs": outputs})
+
+    def _split_file(self) -> None:
+        """Splits --file-path into --split shards and prints them."""
+        from fixed_width_struct_io.constants import MAX_TRANSACTIONS_AMOUNT
+        from fixed_width_struct_io.writers.file_splitter import FileSplitter
+
+        max_transactions = (
+            self.args.shard_size
+            if self.args.shard_size is not None
+            else MAX_TRANSACTIONS_AMOUNT
+        )
+        logger.info(f"Splitting {self.file_path}.")
+        outputs = FileSplitter(
+            self.file_path,
+            max_transactions=max_transactions,
+            lock_timeout=self.lock_timeout,
+        ).split(self.args.split, workers=self.args.workers)
+        self._write_json_line({"outputs": outputs})
+
+    def _diff_files(self) -> None:
+        """
+        Compares --file-path with --diff and prints every difference as a
+        JSON line, followed by a summary line.
+        """
+        from fixed_width_struct_io.readers.file_differ import FileDiffer
+
+        logger.info(f"Comparing {self.file_path} with {self.args.diff}.")
+        diff = FileDiffer(
+            self.file_path, self.args.diff, lock_timeout=self.lock_timeout
+        ).diff()
+        for difference in diff:
+            self._write_json_line(difference._asdict())
+        self._write_json_line({"summary": diff.summary()})
+
+    def _repair_file(self) -> None:
+        """
+        Repairs the counters and the footer of --file-path and prints every
+        change as a JSON line, followed by a summary line.
+        """
+        from fixed_width_struct_io.writers.file_repairer import FileRepairer
+
+        changes = FileRepairer(
+            self.file_path, lock_timeout=self.lock_timeout
+        ).repair(dry_run=self.args.dry_run)
+        for change in changes:
+            self._write_json_line(change._asdict())
+        summary = {"changes": len(changes), "dry_run": self.args.dry_run}
+        self._write_json_line({"summary": summary})
+
+    def _sync_sqlite(self) -> None:
+        """Syncs --file-path into the SQLite mirror and prints the result."""
+        from fixed_width_struct_io.mirror import SqliteMirror
+
+        with SqliteMirror(
+            self.args.sync_sqlite, lock_timeout=self.lock_timeout
+        ) as mirror:
+            result = mirror.sync(self.file_path)
+        self._write_json_line(result._asdict())
+
+    def _convert_snapshot(self) -> None:
+        """
+        Exports --file-path to a snapshot or restores it from one, and
+        prints the snapshot and its number of transactions.
+        """
+        from fixed_width_struct_io.snapshot import ColumnarSnapshot
+
+        if self.args.export_snapshot:
+            snapshot = ColumnarSnapshot.export(
+                self.file_path,
+                self.args.export_snapshot,
+                lock_timeout=self.lock_timeout,
+            )
+        else:
+            snapshot = ColumnarSnapshot(self.args.import_snapshot)
+        with snapshot:
+            if self.args.import_snapshot:
+                snapshot.restore(
+                    self.file_path, lock_timeout=self.lock_timeout
+                )
+            self._write_json_line(
+                {
+                    "snapshot": snapshot.snapshot_path,
+                    "transactions": len(snapshot),
+                }
+            )
+
+    def _export_records(self) -> None:
+        """
+        Exports the records of --file-path to --export, or to stdout for
+        '-', and prints the output and number of records for a file.
+        """
+        from fixed_width_struct_io.writers.record_exporter import (
+            RecordExporter,
+        )
+
+        fields = (
+            self.args.export_fields.split(",")
+            if self.args.export_fields
+            else None
+        )
+        exporter = RecordExporter(
+            self.file_path,
+            fields=fields,
+            amount_format=self.args.amount_format or "text",
+            lock_timeout=self.lock_timeout,
+        )
+        output_format = self.args.export_format or "csv"
+        if self.args.export == "-":
+            exporter.export_to(sys.stdout, output_format)
+            sys.stdout.flush()
+            return
+        records = exporter.export(self.args.export, output_format)
+        self._write_json_line({"output": self.args.export, "records": records})
+
+    def _build_file(self) -> None:
+        """
+        Builds --file-path from the --build rows and prints the file and
+        its number of transactions.
+        """
+        from fixed_width_struct_io.writers.file_builder import FileBuilder
+
+        header = dict(
+            header_field.split("=", 1)
+            for header_field in self.args.header_field or []
+        )
+        builder = FileBuilder(
+            {field.strip().lower(): value for field, value in header.items()},
+            amount_format=self.args.amount_format or "cents",
+            lock_timeout=self.lock_timeout,
+        )
+        transactions = builder.build_from(
+            self.args.build, self.file_path, self.args.build_format
+        )
+        self._write_json_line(
+            {"output": self.file_path, "transactions": transactions}
+        )
+
+    def _query_currency_index(self) -> None:
+        """
+        Builds the currency index of --file-path and prints its counts, or
+        prints the --filter-currency transactions as JSON lines, followed
+        by a summary line with their total in cents.
+        """
+        from fixed_width_struct_io.constants import FIELD_ORDER, TRANSACTION_ID
+        from fixed_width_struct_io.indexes import CurrencyIndex
+
+        if self.args.currency_index:
+            index = CurrencyIndex.build(
+                self.file_path, lock_timeout=self.lock_timeout
+            )
+            self._write_json_line(
+                {
+                    "index": index.sidecar_path,
+                    "transactions": index.transaction_count,
+                    "currencies": index.counts(),
+                }
+            )
+            return
+        index = CurrencyIndex.load(
+            self.file_path, lock_timeout=self.lock_timeout
+        )
+        fields = FIELD_ORDER[TRANSACTION_ID]
+        transactions = total = 0
+        for transactions, line in enumerate(
+            index.lines(self.args.filter_currency), start=1
+        ):
+            record = dict(zip(fields, line.split(",")))
+            total += int(record["amount"])
+            self._write_json_line(
+                {
+                    field: record[field]
+                    for field in ("counter", "amount", "currency")
+                }
+            )
+        summary = {
+            "currency": self.args.filter_currency.upper(),
+            "transactions": transactions,
+            "total": total,
+        }
+        self._write_json_line({"summary": summary})
+
+    def _query_amount_index(self) -> None:
+        """
+        Builds the amount index of --file-path and prints its size, or
+        answers an amount query from it: the matching transactions are
+        printed as JSON lines, followed by a summary line for ranges and
+        top-k queries.
+        """
+        from fixed_width_struct_io.indexes import AmountIndex
+        from fixed_width_struct_io.writers.record_format import (
+            format_amount,
+            format_counter,
+        )
+
+        if self.args.amount_index:
+            index = AmountIndex.build(
+                self.file_path, lock_timeout=self.lock_timeout
+            )
+            self._write_json_line(
+                {
+                    "index": index.sidecar_path,
+                    "transactions": index.transaction_count,
+                }
+            )
+            return
+        index = AmountIndex.load(
+            self.file_path, lock_timeout=self.lock_timeout
+        )
+        if self.args.amount_quantile is not None:
+            entry = index.quantile(self.args.amount_quantile)
+            self._write_json_line(
+                {
+                    "quantile": self.args.amount_quantile,
+                    "counter": format_counter(entry.counter),
+                    "amount": format_amount(entry.amount),
+                }
+            )
+            return
+        if self.args.amounts_between is not None:
+            entries = index.between(*self.args.amounts_between)
+        else:
+            entries = index.top(self.args.top_amounts)
+        for entry in entries:
+            self._write_json_line(
+                {
+                    "counter": format_counter(entry.counter),
+                    "amount": format_amount(entry.amount),
+                }
+            )
+        self._write_json_line({"summary": {"transactions": len(entries)}})
+
+    def _forward_to_daemon(self) -> None:
+        """
+        Sends the requested operation to a running daemon and prints
+        its result the same way a local run would.
+        Raises:
+            ValueError: If the daemon reports a failure.
+        """
+        from fintech_file_cli.server.client import build_request, send_request
+
+        request = build_request(self.args)
+        logger.info(f"Sending '{request['op']}' request to the daemon.")
+        response = send_request(self.args.socket, request)
+        if not response["ok"]:
+            raise ValueError(response["error"])
+        result = response["result"]
+        if request["op"] == "retrieve":
+            print(f"'{result}'")
+        elif request["op"] == "validate" and "summary" in result:
+            for issue in result["errors"]:
+                self._write_json_line(issue)
+            self._write_json_line({"summary": result["summary"]})
+            if result["errors"]:
+                raise ValueError(
+                    f"Validation found {len(result['errors'])} error(s)."
+                )
+        logger.info(f"Daemon completed the '{request['op']}' request.")
+
     def _handle_file_path_actions(self) -> None:
         """Handles actions that require the file path argument."""
         try:
+            if self.args.segmented:
+                self._handle_segmented_actions()
+                return
+
             if self.args.validate:
                 self._validate_file()
 
@@ -100,12 +585,57 @@ class CommandExecutor:
                 and self.args.field
             ):
                 self._retrieve_field()
+
+            if self.args.show_version:
+                self._show_version()
         except Exception as e:
             logger.error(f"Error handling file path actions: {e}")
             raise
 
+    def _handle_segmented_actions(self) -> None:
+        """Validates, appends to or retrieves from a segmented file."""
+        from fixed_width_struct_io.segments import SegmentedFile
+
+        segmented_file = SegmentedFile(
+            self.file_path, lock_timeout=self.lock_timeout
+        )
+        if self.args.validate:
+            logger.info("Validating every segment of the file.")
+            segmented_file.validate(workers=self.args.workers)
+            logger.info("File is valid.")
+        if self.args.add_transaction:
+            segment = segmented_file.append_transaction(
+                self.args.amount, self.args.currency
+            )
+            logger.info(f"Transaction appended to segment {segment}.")
+        elif self.args.record_type and self.args.field:
+            value = segmented_file.get_value(
+                segment=self.args.segment,
+                record_type=self.args.record_type,
+                field_name=self.args.field,
+                transaction_index=self.args.transaction_counter,
+            )
+            print(f"'{value}'")
+
+    def _show_version(self) -> None:
+        """
+        Prints the version of the file: after the write if the file was
+        changed, otherwise as it was read.
+        """
+        if self.args.new_value is not None:
+            version = self.field_editor.version
+        elif self.args.add_transaction:
+            version = self.transaction_appender.version
+        else:
+            self._get_lines()
+            version = self._read_version
+        print(f"Version: {version}")
+
     def _validate_file(self) -> None:
         """Validates the structure, length, and values of the file."""
+        if self.args.max_errors is not None:
+            self._collect_validation_errors()
+            return
         try:
             logger.info("Validating file structure, length, and values.")
             self.file_structure_validator.validate()
@@ -116,6 +646,45 @@ class CommandExecutor:
             logger.error(f"Validation failed: {e}")
             raise
 
+    def _collect_validation_errors(self) -> None:
+        """
+        Validates the file in collect-all-errors mode. Every error is
+        streamed to stdout as a JSON line as soon as it is found,
+        followed by a summary line.
+        Raises:
+            ValueError: If the file has at least one validation error.
+        """
+        from fixed_width_struct_io.validators import ErrorCollector
+
+        logger.info(
+            f"Collecting up to {self.args.max_errors} validation errors."
+        )
+        collector = ErrorCollector(
+            max_errors=self.args.max_errors,
+            on_error=lambda issue: self._write_json_line(issue._asdict()),
+        )
+        for validator in (
+            self.file_structure_validator,
+            self.length_validator,
+            self.values_validator,
+        ):
+            validator.collect_errors(collector)
+            if collector.truncated:
+                break
+        self._write_json_line({"summary": collector.summary()})
+        if len(collector):
+            raise ValueError(
+                f"Validation found {len(collector)} error(s)"
+                f"{' (truncated)' if collector.truncated else ''}."
+            )
+        logger.info("File is valid.")
+
+    @staticmethod
+    def _write_json_line(record: dict) -> None:
+        """Writes a single JSON Lines record to stdout."""
+        sys.stdout.write(json.dumps(record) + "\n")
+        sys.stdout.flush()
+
     def _add_transaction(self) -> None:
         """Appends a new transaction to the file."""
         try:
@@ -153,12 +722,35 @@ class CommandExecutor:
         """Retrieves a field value from the file."""
         try:
             logger.info(f"Retrieving field '{self.args.field}'.")
-            value = self.field_retriever.retrieve(
-                record_type=self.args.record_type,
-                field_name=self.args.field,
-                transaction_index=self.args.transaction_counter,
-            )
+            if self.args.mirror:
+                value = self._retrieve_from_mirror()
+            else:
+                value = self.field_retriever.retrieve(
+                    record_type=self.args.record_type,
+                    field_name=self.args.field,
+                    transaction_index=self.args.transaction_counter,
+                )
             logger.info(f"Retrieved value for '{self.args.field}': {value}")
         except Exception as e:
             logger.error(f"Failed to retrieve field value: {e}")
             raise
+
+    def _retrieve_from_mirror(self) -> Any:
+        """
+        Syncs the file into the --mirror database and retrieves the field
+        from it, printing it like FieldRetriever.retrieve does.
+        """
+        from fixed_width_struct_io.mirror import SqliteMirror
+
+        with SqliteMirror(
+            self.args.mirror, lock_timeout=self.lock_timeout
+        ) as mirror:
+            mirror.sync(self.file_path)
+            value = mirror.get_value(
+                self.file_path,
+                record_type=self.args.record_type,
+                field_name=self.args.field,
+                transaction_index=self.args.transaction_counter,
+            )
+        print(f"'{value}'")
+        return value
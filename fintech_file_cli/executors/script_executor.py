@@ -0,0 +1,222 @@
+import argparse
+import json
+import logging
+import shlex
+import sys
+from typing import Any, Iterator, List, Optional, Tuple
+
+from fintech_file_cli.cli.config import build_parser
+from fintech_file_cli.server.client import build_request
+from fintech_file_cli.validators import ArgumentValidator
+from fixed_width_struct_io.access_control import immutable_field_setter
+from fixed_width_struct_io.constants import DEFAULT_LOCK_TIMEOUT
+from fixed_width_struct_io.core import FileIOBase, FileLock
+from fixed_width_struct_io.readers import FieldRetriever
+from fixed_width_struct_io.validators import validate_lines
+from fixed_width_struct_io.writers import FieldEditor, TransactionAppender
+
+logger = logging.getLogger(__name__)
+
+FORBIDDEN_COMMAND_ARGS = [
+    "file_path",
+    "mode",
+    "socket",
+    "batch",
+    "workers",
+    "commands",
+    "lock_timeout",
+    "show_version",
+    "expected_version",
+    "segmented",
+    "segment",
+    "merge",
+    "split",
+    "shard_size",
+    "diff",
+    "repair",
+    "dry_run",
+    "sync_sqlite",
+    "mirror",
+    "export_snapshot",
+    "import_snapshot",
+    "export",
+    "export_format",
+    "export_fields",
+    "amount_format",
+    "build",
+    "build_format",
+    "header_field",
+    "currency_index",
+    "filter_currency",
+    "amount_index",
+    "amounts_between",
+    "top_amounts",
+    "amount_quantile",
+]
+
+
+class ScriptExecutor:
+    """
+    Executes many operations against one file in a single process.
+
+    The operations are read from a commands file (or stdin), one per
+    line, using the same flags as a single CLI run. The file is read
+    once, every operation is applied in order to the in-memory lines,
+    and the lines are written back once at the end if anything changed.
+    One JSON line is printed per command, followed by a summary line.
+    The file stays exclusively locked for the whole run, so no other
+    process changes it between the read and the write.
+
+    Attributes:
+        args: Parsed command-line arguments of the script run.
+        lines: The current in-memory lines of the file.
+    """
+
+    def __init__(self, args: argparse.Namespace) -> None:
+        """Initializes the ScriptExecutor with command-line arguments."""
+        self.args = args
+        self.lines: List[str] = []
+        self._retriever: Optional[FieldRetriever] = None
+        self._modified = False
+
+    def execute(self) -> None:
+        """
+        Runs every command of the script and writes the file once.
+        Raises:
+            ValueError: If at least one command failed.
+        """
+        lock_timeout = getattr(self.args, "lock_timeout", None)
+        with FileLock(
+            self.args.file_path,
+            exclusive=True,
+            timeout=(
+                DEFAULT_LOCK_TIMEOUT if lock_timeout is None else lock_timeout
+            ),
+        ):
+            summary = self._run_script()
+
+        if summary["error"]:
+            raise ValueError(
+                f"{summary['error']} of {summary['commands']} "
+                f"command(s) failed."
+            )
+
+    def _run_script(self) -> dict:
+        """Runs the commands and writes the file, returning the summary."""
+        self.lines = FileIOBase(file_path=self.args.file_path).lines
+        summary = {"commands": 0, "ok": 0, "error": 0}
+
+        for command_number, command_line in self._read_commands():
+            summary["commands"] += 1
+            result: dict = {"command": command_number}
+            try:
+                request = build_request(self._parse_command(command_line))
+                result["op"] = request["op"]
+                result["result"] = self._run(request)
+                result["status"] = "ok"
+            except Exception as e:
+                result["status"] = "error"
+                result["error"] = str(e)
+            summary[result["status"]] += 1
+            self._write_json_line(result)
+
+        if self._modified:
+            FileIOBase(lines=self.lines).write_lines(self.args.file_path)
+            logger.info(f"Changes written to {self.args.file_path}.")
+        summary["written"] = self._modified
+        self._write_json_line({"summary": summary})
+        return summary
+
+    def _read_commands(self) -> Iterator[Tuple[int, str]]:
+        """Yields non-empty, non-comment lines with their line numbers."""
+        if self.args.commands == "-":
+            lines = sys.stdin.read().splitlines()
+        else:
+            with open(self.args.commands, "r") as commands_file:
+                lines = commands_file.read().splitlines()
+        for command_number, command_line in enumerate(lines, start=1):
+            stripped = command_line.strip()
+            if stripped and not stripped.startswith("#"):
+                yield command_number, stripped
+
+    def _parse_command(self, command_line: str) -> argparse.Namespace:
+        """
+        Parses and validates the flags of one command line.
+        Raises:
+            ValueError: If the command uses flags that are not allowed
+                        in a script or fails argument validation.
+        """
+        try:
+            command_args = build_parser().parse_args(shlex.split(command_line))
+        except SystemExit:
+            raise ValueError(f"Invalid command: {command_line}")
+        not_allowed = [
+            f"--{arg.replace('_', '-')}"
+            for arg in FORBIDDEN_COMMAND_ARGS
+            if getattr(command_args, arg) not in [None, False]
+        ]
+        if not_allowed:
+            raise ValueError(
+                f"Flags not allowed in a commands file: "
+                f"{', '.join(not_allowed)}."
+            )
+        if not (
+            command_args.block_field_from_changes
+            or command_args.unblock_field_from_changes
+        ):
+            command_args.file_path = self.args.file_path
+        ArgumentValidator(command_args).validate()
+        return command_args
+
+    def _run(self, request: dict) -> Any:
+        """Applies a single operation to the in-memory lines."""
+        op = request["op"]
+        if op == "validate":
+            return validate_lines(self.lines, request.get("max_errors"))
+        if op == "retrieve":
+            return self._get_retriever().get_value(
+                record_type=request["record_type"],
+                field_name=request["field"],
+                transaction_index=request["transaction_counter"],
+            )
+        if op == "edit":
+            editor = FieldEditor(lines=self.lines)
+            result = editor.edit_field_value(
+                record_type=request["record_type"],
+                field_name=request["field"],
+                transaction_index=request["transaction_counter"],
+                new_value=request["new_value"],
+            )
+            self._update_lines(editor.lines)
+            return result
+        if op == "append":
+            appender = TransactionAppender(lines=self.lines)
+            result = appender.append_transaction(
+                request["amount"], request["currency"]
+            )
+            self._update_lines(appender.lines)
+            return result
+        if op == "block":
+            return immutable_field_setter.make_field_immutable(
+                request["field"]
+            )
+        return immutable_field_setter.make_field_mutable(request["field"])
+
+    def _get_retriever(self) -> FieldRetriever:
+        """Returns a retriever sharing the records parsed since the
+        last change."""
+        if self._retriever is None:
+            self._retriever = FieldRetriever(lines=self.lines)
+        return self._retriever
+
+    def _update_lines(self, lines: List[str]) -> None:
+        """Replaces the in-memory lines after a successful change."""
+        self.lines = lines
+        self._retriever = None
+        self._modified = True
+
+    @staticmethod
+    def _write_json_line(record: dict) -> None:
+        """Writes a single JSON Lines record to stdout."""
+        sys.stdout.write(json.dumps(record) + "\n")
+        sys.stdout.flush()
@@ -0,0 +1,3 @@
+from fintech_file_cli.profiling.operation_profiler import (  # noqa: F401, E501
+    OperationProfiler,
+)
@@ -0,0 +1,128 @@
+import cProfile
+import logging
+import pstats
+import sys
+import time
+import tracemalloc
+from types import TracebackType
+from typing import Optional, TextIO, Type
+
+from fixed_width_struct_io.helpers import phase_timer
+
+logger = logging.getLogger(__name__)
+
+PROFILE_CPU = "cpu"
+PROFILE_MEMORY = "memory"
+PROFILE_ALL = "all"
+PROFILE_MODES = [PROFILE_CPU, PROFILE_MEMORY, PROFILE_ALL]
+DEFAULT_TOP_N = 15
+DEFAULT_OUTPUT_PATH = "fintech_file_cli.pstats"
+
+
+class OperationProfiler:
+    """
+    Context manager profiling a single CLI operation.
+
+    Depending on the mode, the operation runs under cProfile, tracemalloc
+    or both, and the library phase timer records the time spent reading,
+    parsing, validating and writing. On exit, a short report is written
+    to stderr and the cProfile statistics are dumped to a pstats file,
+    also when the operation failed.
+
+    Attributes:
+        mode (str): One of 'cpu', 'memory' or 'all'.
+        output_path (str): Path of the pstats file, defaults to
+                           DEFAULT_OUTPUT_PATH.
+        top (int): Number of functions and allocation sites reported.
+    """
+
+    def __init__(
+        self,
+        mode: str,
+        output_path: Optional[str] = None,
+        top: int = DEFAULT_TOP_N,
+        stream: Optional[TextIO] = None,
+    ) -> None:
+        """Initializes the profiler for the given mode."""
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Invalid profile mode: {mode}")
+        self.mode = mode
+        self.output_path = output_path or DEFAULT_OUTPUT_PATH
+        self.top = top
+        self._stream = stream
+        self._profile: Optional[cProfile.Profile] = None
+        self._started_at = 0.0
+
+    @property
+    def profiles_cpu(self) -> bool:
+        """Whether the operation runs under cProfile."""
+        return self.mode in (PROFILE_CPU, PROFILE_ALL)
+
+    @property
+    def profiles_memory(self) -> bool:
+        """Whether the operation runs under tracemalloc."""
+        return self.mode in (PROFILE_MEMORY, PROFILE_ALL)
+
+    def __enter__(self) -> "OperationProfiler":
+        """Starts the phase timer and the selected profilers."""
+        phase_timer.start()
+        if self.profiles_memory:
+            tracemalloc.start()
+        if self.profiles_cpu:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        self._started_at = time.perf_counter()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Stops profiling and writes the report."""
+        elapsed = time.perf_counter() - self._started_at
+        if self._profile is not None:
+            self._profile.disable()
+        phase_timer.stop()
+        snapshot, peak = None, 0
+        if self.profiles_memory:
+            snapshot = tracemalloc.take_snapshot().filter_traces(
+                [tracemalloc.Filter(False, tracemalloc.__file__)]
+            )
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        try:
+            self._report(elapsed, snapshot, peak)
+        except OSError as e:
+            logger.error(f"Failed to write the profile: {e}")
+
+    def _report(
+        self,
+        elapsed: float,
+        snapshot: Optional[tracemalloc.Snapshot],
+        peak: int,
+    ) -> None:
+        """Writes the phase, CPU and memory summaries."""
+        stream = self._stream or sys.stderr
+        stream.write(f"Profile ({self.mode}): total {elapsed:.4f}s\n")
+        stream.write("Phases (may nest):\n")
+        for name, total, calls in phase_timer.summary():
+            stream.write(f"  {name:<20} {total:10.4f}s  {calls} call(s)\n")
+
+        if self._profile is not None:
+            self._profile.dump_stats(self.output_path)
+            stream.write(
+                f"Top {self.top} functions by cumulative time "
+                f"(full statistics in {self.output_path}):\n"
+            )
+            pstats.Stats(self._profile, stream=stream).sort_stats(
+                pstats.SortKey.CUMULATIVE
+            ).print_stats(self.top)
+            logger.info(f"Profile statistics written to {self.output_path}.")
+
+        if snapshot is not None:
+            stream.write(f"Peak traced memory: {peak / 2**20:.2f} MiB\n")
+            stream.write(f"Top {self.top} allocation sites:\n")
+            for statistic in snapshot.statistics("lineno")[: self.top]:
+                stream.write(f"  {statistic}\n")
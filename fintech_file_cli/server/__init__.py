@@ -0,0 +1,19 @@
+import importlib
+from typing import Any
+
+# The daemon pulls in asyncio, which the thin client does not need,
+# so the exports are imported on first access.
+_EXPORTS = {
+    "build_request": "fintech_file_cli.server.client",
+    "send_request": "fintech_file_cli.server.client",
+    "FileDaemon": "fintech_file_cli.server.daemon",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    """Imports an exported name on first access."""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_EXPORTS[name]), name)
@@ -0,0 +1,72 @@
+import argparse
+import json
+import logging
+import os
+import socket
+
+logger = logging.getLogger(__name__)
+
+CLIENT_TIMEOUT_SECONDS = 300.0
+
+
+def build_request(args: argparse.Namespace) -> dict:
+    """
+    Converts parsed command-line arguments into a daemon request. The file
+    path is made absolute, since the daemon may run in another directory.
+    Args:
+        args: Parsed command-line arguments of a single operation.
+    Returns:
+        The request dictionary with the operation and its arguments.
+    Raises:
+        ValueError: If the arguments do not describe a supported operation.
+    """
+    if args.block_field_from_changes:
+        return {"op": "block", "field": args.block_field_from_changes}
+    if args.unblock_field_from_changes:
+        return {"op": "unblock", "field": args.unblock_field_from_changes}
+    request = {"file_path": os.path.abspath(args.file_path)}
+    if args.add_transaction:
+        request.update(op="append", amount=args.amount, currency=args.currency)
+    elif args.new_value is not None:
+        request.update(
+            op="edit",
+            record_type=args.record_type,
+            field=args.field,
+            transaction_counter=args.transaction_counter,
+            new_value=args.new_value,
+        )
+    elif args.record_type and args.field:
+        request.update(
+            op="retrieve",
+            record_type=args.record_type,
+            field=args.field,
+            transaction_counter=args.transaction_counter,
+        )
+    elif args.validate:
+        request.update(op="validate", max_errors=args.max_errors)
+    else:
+        raise ValueError("No operation to send to the daemon.")
+    return request
+
+
+def send_request(socket_path: str, request: dict) -> dict:
+    """
+    Sends a request to the daemon and waits for its response.
+    Args:
+        socket_path: Path of the daemon's Unix domain socket.
+        request: The request dictionary.
+    Returns:
+        The decoded response dictionary.
+    Raises:
+        ConnectionError: If the daemon closes the connection early.
+    """
+    logger.debug("Sending request to %s: %s", socket_path, request)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.settimeout(CLIENT_TIMEOUT_SECONDS)
+        connection.connect(socket_path)
+        connection.sendall(json.dumps(request).encode() + b"\n")
+        with connection.makefile("rb") as response_file:
+            response_line = response_file.readline()
+    if not response_line:
+        raise ConnectionError("The daemon closed the connection.")
+    return json.loads(response_line)
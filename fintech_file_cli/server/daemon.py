@@ -0,0 +1,266 @@
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import signal
+import time
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from fixed_width_struct_io.access_control import immutable_field_setter
+from fixed_width_struct_io.cache import CachedFile, FileCache
+from fixed_width_struct_io.constants import DEFAULT_CACHE_MAX_BYTES
+from fixed_width_struct_io.metrics import LOCK_WAIT_SECONDS, metrics
+from fixed_width_struct_io.validators import validate_lines
+from fixed_width_struct_io.writers import FieldEditor, TransactionAppender
+
+logger = logging.getLogger(__name__)
+
+
+class FileDaemon:
+    """
+    Long-running server answering file operations over a Unix socket.
+
+    Parsed files are kept in a FileCache between requests and reloaded
+    when their mtime, size or inode changes; least recently used files
+    are evicted once the cached files exceed `cache_max_bytes`. Writes to
+    the same file are serialized, and every write invalidates the cached
+    copy. Write locks are keyed by the real path of a file and dropped
+    once no request holds or waits for them. Blocking file I/O and
+    parsing run off the event loop.
+
+    Requests and responses are JSON objects, one per line. A request has
+    an "op" (ping, validate, retrieve, edit, append, block, unblock,
+    metrics) and
+    the operation arguments; a response is {"ok": true, "result": ...}
+    or {"ok": false, "error": "..."}.
+
+    Attributes:
+        socket_path (str): Path of the Unix domain socket.
+    """
+
+    def __init__(
+        self,
+        socket_path: str,
+        cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+    ) -> None:
+        """Initializes the daemon with an empty file cache."""
+        self.socket_path = socket_path
+        self._cache = FileCache(max_bytes=cache_max_bytes, name="daemon")
+        self._write_locks: Dict[str, asyncio.Lock] = {}
+        self._write_lock_users: Dict[str, int] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._handlers: Dict[str, Callable] = {
+            "ping": self._ping,
+            "validate": self._validate,
+            "retrieve": self._retrieve,
+            "edit": self._edit,
+            "append": self._append,
+            "block": self._block,
+            "unblock": self._unblock,
+            "metrics": self._metrics,
+        }
+
+    def run(self) -> None:
+        """Runs the daemon until it receives SIGINT or SIGTERM."""
+        asyncio.run(self._serve_until_signalled())
+
+    async def _serve_until_signalled(self) -> None:
+        """Serves with signal handlers that stop the daemon cleanly."""
+        loop = asyncio.get_running_loop()
+        for signal_number in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signal_number, self.stop)
+        await self.serve_forever()
+
+    async def serve_forever(self) -> None:
+        """Starts listening on the socket and serves until stopped."""
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        self._server = await asyncio.start_unix_server(
+            self._handle_client, path=self.socket_path
+        )
+        logger.info(f"Daemon listening on {self.socket_path}.")
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+            logger.info("Daemon stopped.")
+
+    def stop(self) -> None:
+        """Stops accepting connections and ends `serve_forever`."""
+        if self._server is not None:
+            self._server.close()
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answers every request line sent on a client connection."""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                response = await self._respond(line)
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError as e:
+            logger.warning(f"Client connection lost: {e}")
+        finally:
+            writer.close()
+
+    async def _respond(self, line: bytes) -> dict:
+        """Decodes a request line and turns its outcome into a response."""
+        try:
+            request = json.loads(line)
+            result = await self.handle_request(request)
+            return {"ok": True, "result": result}
+        except Exception as e:
+            logger.error(f"Request failed: {e}")
+            return {"ok": False, "error": str(e)}
+
+    async def handle_request(self, request: dict) -> Any:
+        """
+        Executes a single request.
+        Args:
+            request: The decoded request with its "op" and arguments.
+        Returns:
+            The JSON-serializable result of the operation.
+        Raises:
+            ValueError: If the operation is unknown or fails.
+        """
+        handler = self._handlers.get(request.get("op", ""))
+        if handler is None:
+            raise ValueError(f"Unknown operation: {request.get('op')}")
+        return await handler(request)
+
+    async def _load(self, file_path: str) -> CachedFile:
+        """
+        Returns the cached copy of a file, reading it again if the file
+        changed on disk since it was cached.
+        """
+        return await self._run_blocking(self._cache.get, file_path)
+
+    @contextlib.asynccontextmanager
+    async def _locked_for_write(self, file_path: str) -> AsyncIterator[None]:
+        """
+        Holds the write lock of a file, recording the time waited. The
+        lock is removed when its last user releases it.
+        """
+        key = os.path.realpath(file_path)
+        lock = self._write_locks.setdefault(key, asyncio.Lock())
+        self._write_lock_users[key] = self._write_lock_users.get(key, 0) + 1
+        try:
+            started_at = time.perf_counter()
+            async with lock:
+                LOCK_WAIT_SECONDS.observe(
+                    time.perf_counter() - started_at, lock="daemon_write"
+                )
+                yield
+        finally:
+            self._write_lock_users[key] -= 1
+            if not self._write_lock_users[key]:
+                del self._write_lock_users[key]
+                del self._write_locks[key]
+
+    @staticmethod
+    async def _run_blocking(function: Callable, *args: Any) -> Any:
+        """Runs blocking file I/O or parsing off the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, function, *args)
+
+    async def _ping(self, request: dict) -> str:
+        """Answers a liveness check."""
+        return "pong"
+
+    async def _validate(self, request: dict) -> dict:
+        """Validates a file, fail-fast or in collect-all-errors mode."""
+        cached = await self._load(request["file_path"])
+        return await self._run_blocking(
+            validate_lines, cached.lines, request.get("max_errors")
+        )
+
+    async def _retrieve(self, request: dict) -> Any:
+        """Retrieves a field value from the cached records of a file."""
+        cached = await self._load(request["file_path"])
+        return await self._run_blocking(
+            partial(
+                cached.retriever.get_value,
+                record_type=request["record_type"],
+                field_name=request["field"],
+                transaction_index=request.get("transaction_counter"),
+            )
+        )
+
+    async def _edit(self, request: dict) -> bool:
+        """Edits a field value, serialized with other writes."""
+        file_path = request["file_path"]
+        async with self._locked_for_write(file_path):
+            try:
+                return await self._run_blocking(
+                    _edit_file,
+                    file_path,
+                    request["record_type"],
+                    request["field"],
+                    request.get("transaction_counter"),
+                    request["new_value"],
+                )
+            finally:
+                self._cache.invalidate(file_path)
+
+    async def _append(self, request: dict) -> bool:
+        """Appends a transaction, serialized with other writes."""
+        file_path = request["file_path"]
+        async with self._locked_for_write(file_path):
+            try:
+                return await self._run_blocking(
+                    _append_transaction,
+                    file_path,
+                    request["amount"],
+                    request["currency"],
+                )
+            finally:
+                self._cache.invalidate(file_path)
+
+    async def _block(self, request: dict) -> bool:
+        """Marks a field as immutable in the in-memory configuration."""
+        return await self._run_blocking(
+            immutable_field_setter.make_field_immutable, request["field"]
+        )
+
+    async def _unblock(self, request: dict) -> bool:
+        """Removes the immutable flag of a field."""
+        return await self._run_blocking(
+            immutable_field_setter.make_field_mutable, request["field"]
+        )
+
+    async def _metrics(self, request: dict) -> dict:
+        """Returns the metrics collected since the daemon started."""
+        return metrics.as_dict()
+
+
+def _edit_file(
+    file_path: str,
+    record_type: str,
+    field: str,
+    transaction_counter: Optional[str],
+    new_value: str,
+) -> bool:
+    """Edits a field value of a file on disk."""
+    return FieldEditor(file_path=file_path).edit_field_value(
+        record_type=record_type,
+        field_name=field,
+        transaction_index=transaction_counter or "",
+        new_value=new_value,
+    )
+
+
+def _append_transaction(file_path: str, amount: str, currency: str) -> bool:
+    """Appends a transaction to a file on disk."""
+    return TransactionAppender(file_path=file_path).append_transaction(
+        amount, currency
+    )
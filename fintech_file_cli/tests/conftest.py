@@ -22,11 +22,58 @@ def sample_file():
     os.remove(file_path)
 
 
+@pytest.fixture
+def valid_content():
+    return """01,nnnnnn                      ,ooooooo                       ,dnit                          ,street4567                    
+02,000001,000000009000,gbp,                                                                                                 
+02,000002,000000034000,eur,                                                                                                 
+03,000002,000000043000,                                                                                                    
+"""
+
+
 @pytest.fixture
 def args(sample_file):
     return argparse.Namespace(
+        mode=None,
+        socket=None,
         file_path=sample_file,
+        batch=None,
+        commands=None,
+        workers=None,
         validate=True,
+        max_errors=None,
+        profile=None,
+        profile_output=None,
+        metrics_file=None,
+        metrics_format=None,
+        lock_timeout=None,
+        show_version=False,
+        expected_version=None,
+        segmented=False,
+        segment=None,
+        merge=None,
+        split=None,
+        shard_size=None,
+        diff=None,
+        repair=False,
+        dry_run=False,
+        sync_sqlite=None,
+        mirror=None,
+        export_snapshot=None,
+        import_snapshot=None,
+        export=None,
+        export_format=None,
+        export_fields=None,
+        amount_format=None,
+        build=None,
+        build_format=None,
+        header_field=None,
+        currency_index=False,
+        filter_currency=None,
+        amount_index=False,
+        amounts_between=None,
+        top_amounts=None,
+        amount_quantile=None,
         add_transaction=False,
         new_value=None,
         block_field_from_changes=None,
@@ -65,7 +112,46 @@ def command_executor(args):
 @pytest.fixture
 def args_none(sample_file):
     return argparse.Namespace(
+        mode=None,
+        socket=None,
         file_path=sample_file,
+        batch=None,
+        commands=None,
+        workers=None,
+        validate=False,
+        max_errors=None,
+        profile=None,
+        profile_output=None,
+        metrics_file=None,
+        metrics_format=None,
+        lock_timeout=None,
+        show_version=False,
+        expected_version=None,
+        segmented=False,
+        segment=None,
+        merge=None,
+        split=None,
+        shard_size=None,
+        diff=None,
+        repair=False,
+        dry_run=False,
+        sync_sqlite=None,
+        mirror=None,
+        export_snapshot=None,
+        import_snapshot=None,
+        export=None,
+        export_format=None,
+        export_fields=None,
+        amount_format=None,
+        build=None,
+        build_format=None,
+        header_field=None,
+        currency_index=False,
+        filter_currency=None,
+        amount_index=False,
+        amounts_between=None,
+        top_amounts=None,
+        amount_quantile=None,
         block_field_from_changes=None,
         unblock_field_from_changes=None,
         record_type=None,
@@ -0,0 +1,20 @@
+import subprocess
+import sys
+
+STARTUP_CHECK = """
+import sys
+import fintech_file_cli.cli.main
+print(",".join(sorted(sys.modules)))
+"""
+
+
+def test_cli_startup_does_not_import_unused_modules():
+    completed = subprocess.run(
+        [sys.executable, "-c", STARTUP_CHECK], capture_output=True, text=True, check=True
+    )
+    modules = set(completed.stdout.strip().split(","))
+    assert "asyncio" not in modules
+    assert "concurrent.futures" not in modules
+    assert "fintech_file_cli.server.daemon" not in modules
+    assert "fixed_width_struct_io.access_control.immutable_field_setter" not in modules
+    assert "fixed_width_struct_io.writers" not in modules
@@ -0,0 +1,99 @@
+import argparse
+import json
+
+import pytest
+
+from fintech_file_cli.executors import BatchExecutor
+from fintech_file_cli.executors.batch_executor import (
+    BatchTask,
+    process_batch_task,
+    resolve_batch_paths,
+)
+
+VALID_CONTENT = """01,nnnnnn                      ,ooooooo                       ,dnit                          ,street4567                    
+02,000001,000000009000,gbp,                                                                                                 
+02,000002,000000034000,eur,                                                                                                 
+03,000002,000000043000,                                                                                                    
+"""
+INVALID_CONTENT = VALID_CONTENT.replace("eur", "zzz")
+
+
+@pytest.fixture
+def batch_dir(tmp_path):
+    (tmp_path / "a.csv").write_text(VALID_CONTENT)
+    (tmp_path / "b.csv").write_text(VALID_CONTENT)
+    (tmp_path / "c.txt").write_text(INVALID_CONTENT)
+    (tmp_path / ".hidden").write_text(VALID_CONTENT)
+    return tmp_path
+
+
+def batch_args(source, **overrides):
+    values = dict(
+        batch=str(source),
+        workers=1,
+        validate=True,
+        max_errors=None,
+        record_type=None,
+        field=None,
+        transaction_counter=None,
+    )
+    values.update(overrides)
+    return argparse.Namespace(**values)
+
+
+def test_resolve_directory(batch_dir):
+    paths = resolve_batch_paths(str(batch_dir))
+    assert [path.rsplit("/", 1)[-1] for path in paths] == ["a.csv", "b.csv", "c.txt"]
+
+
+def test_resolve_glob(batch_dir):
+    paths = resolve_batch_paths(str(batch_dir / "*.csv"))
+    assert [path.rsplit("/", 1)[-1] for path in paths] == ["a.csv", "b.csv"]
+
+
+def test_resolve_manifest(batch_dir):
+    manifest = batch_dir / "manifest.lst"
+    manifest.write_text("# comment\nb.csv\n\na.csv\n")
+    paths = resolve_batch_paths(str(manifest))
+    assert paths == [str(batch_dir / "b.csv"), str(batch_dir / "a.csv")]
+
+
+def test_resolve_missing_source(tmp_path):
+    with pytest.raises(ValueError):
+        resolve_batch_paths(str(tmp_path / "missing"))
+    with pytest.raises(ValueError):
+        resolve_batch_paths(str(tmp_path / "*.csv"))
+
+
+def test_process_task_statuses(batch_dir):
+    valid = process_batch_task(BatchTask(str(batch_dir / "a.csv"), True, None, None, None, None))
+    invalid = process_batch_task(BatchTask(str(batch_dir / "c.txt"), True, None, None, None, None))
+    missing = process_batch_task(BatchTask(str(batch_dir / "missing.csv"), True, None, None, None, None))
+    assert valid["status"] == "ok" and valid["elapsed"] >= 0
+    assert invalid["status"] == "invalid"
+    assert missing["status"] == "error"
+
+
+def test_process_task_collects_errors(batch_dir):
+    result = process_batch_task(BatchTask(str(batch_dir / "c.txt"), True, 5, None, None, None))
+    assert result["status"] == "invalid"
+    assert result["errors"][0]["field"] == "currency"
+
+
+def test_execute_streams_results_and_summary(batch_dir, capsys):
+    with pytest.raises(ValueError):
+        BatchExecutor(batch_args(batch_dir)).execute()
+    output = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert len(output) == 4
+    summary = output[-1]["summary"]
+    assert (summary["files"], summary["ok"], summary["invalid"]) == (3, 2, 1)
+
+
+def test_execute_retrieval_aggregates_values(batch_dir, capsys):
+    args = batch_args(
+        batch_dir / "*.csv", workers=2, validate=False, record_type="footer", field="control sum"
+    )
+    BatchExecutor(args).execute()
+    output = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert sorted(result["value"] for result in output[:-1]) == ["000000043000", "000000043000"]
+    assert output[-1]["summary"]["total"] == 86000
@@ -1,5 +1,9 @@
+import json
+import os
 from unittest.mock import patch
 
+import pytest
+
 
 def test_execute_validate_file(command_executor):
     executor, _ = command_executor
@@ -58,3 +62,94 @@ def test_execute_unblock_field_from_changes(command_executor, args):
     with patch.object(executor.immutable_field_setter, 'make_field_mutable') as mock_unblock:
         executor.execute()
         mock_unblock.assert_called_once_with(args.unblock_field_from_changes)
+
+
+def test_execute_validate_collects_errors(command_executor, args, capsys):
+    args.max_errors = 5
+    args.record_type = None
+    args.field = None
+    executor, _ = command_executor
+
+    def collect_errors(collector):
+        collector.add(2, "02", "currency", "invalid currency")
+
+    executor.length_validator.collect_errors.side_effect = collect_errors
+    with pytest.raises(ValueError):
+        executor.execute()
+    output = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert output[0] == {"line": 2, "record_type": "transaction", "field": "currency", "reason": "invalid currency"}
+    assert output[-1]["summary"]["errors"] == 1
+    executor.values_validator.collect_errors.assert_called_once()
+
+
+def test_execute_forwards_to_daemon(command_executor, args, capsys):
+    args.socket = "daemon.sock"
+    args.validate = False
+    executor, _ = command_executor
+    with patch("fintech_file_cli.server.client.send_request") as mock_send:
+        mock_send.return_value = {"ok": True, "result": "nnnnnn"}
+        executor.execute()
+    mock_send.assert_called_once_with(
+        "daemon.sock",
+        {"op": "retrieve", "file_path": os.path.abspath(args.file_path), "record_type": "header", "field": "name", "transaction_counter": None},
+    )
+    assert capsys.readouterr().out == "'nnnnnn'\n"
+    executor.field_retriever.retrieve.assert_not_called()
+
+
+def test_execute_with_profile(command_executor, args, tmp_path, capsys):
+    args.profile = "cpu"
+    args.profile_output = str(tmp_path / "run.pstats")
+    executor, _ = command_executor
+    executor.execute()
+    executor.values_validator.validate.assert_called_once()
+    assert "Profile (cpu)" in capsys.readouterr().err
+    assert (tmp_path / "run.pstats").exists()
+
+
+def test_execute_read_modify_write_with_expected_version(sample_file, capsys):
+    from fintech_file_cli.cli.config import build_parser
+    from fintech_file_cli.executors import CommandExecutor
+
+    def run(*argv):
+        args = build_parser().parse_args(["--file-path", sample_file, *argv])
+        CommandExecutor(args=args).execute()
+        return capsys.readouterr().out.splitlines()[-1].split(" ", 1)[1]
+
+    version = run("--show-version")
+    append = ["--add-transaction", "--amount", "000000001000", "--currency", "USD"]
+    new_version = run(*append, "--expected-version", version, "--show-version")
+    assert new_version != version
+    with pytest.raises(ValueError, match="modified after it was read"):
+        run(*append, "--expected-version", version)
+
+
+def test_execute_segmented_file(tmp_path, capsys, valid_content):
+    from fintech_file_cli.cli.config import build_parser
+    from fintech_file_cli.executors import CommandExecutor
+
+    path = tmp_path / "segmented.csv"
+    path.write_text(valid_content * 2)
+
+    def run(*argv):
+        args = build_parser().parse_args(["--file-path", str(path), "--segmented", *argv])
+        CommandExecutor(args=args).execute()
+
+    run("--validate", "--workers", "2")
+    run("--add-transaction", "--amount", "000000001000", "--currency", "USD")
+    run("--record-type", "footer", "--field", "total counter", "--segment", "2")
+    assert capsys.readouterr().out == "'000003'\n"
+
+
+def test_execute_batch_runs_nothing_else(tmp_path, capsys, valid_content):
+    from fintech_file_cli.cli.config import build_parser
+    from fintech_file_cli.executors import CommandExecutor
+
+    (tmp_path / "a.csv").write_text(valid_content)
+    args = build_parser().parse_args(["--batch", str(tmp_path), "--validate", "--workers", "1"])
+    args.file_path = str(tmp_path / "a.csv")
+    with patch("fintech_file_cli.executors.command_executor.CommandExecutor._handle_file_path_actions") as file_actions:
+        CommandExecutor(args=args).execute()
+    file_actions.assert_not_called()
+    output = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert output[-1]["summary"]["ok"] == 1
@@ -0,0 +1,96 @@
+import argparse
+import io
+import json
+
+import pytest
+
+from fintech_file_cli.executors import ScriptExecutor
+
+
+@pytest.fixture
+def data_file(tmp_path, valid_content):
+    path = tmp_path / "data.csv"
+    path.write_text(valid_content)
+    return path
+
+
+def run_script(data_file, tmp_path, commands):
+    commands_file = tmp_path / "commands.txt"
+    commands_file.write_text(commands)
+    args = argparse.Namespace(
+        file_path=str(data_file), commands=str(commands_file)
+    )
+    ScriptExecutor(args).execute()
+
+
+def read_output(capsys):
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+def test_script_applies_operations_in_order(data_file, tmp_path, capsys):
+    run_script(
+        data_file,
+        tmp_path,
+        "# comment\n"
+        "--validate\n"
+        "\n"
+        "--record-type transaction --field amount --transaction-counter 000002 "
+        "--new-value 000000001000\n"
+        "--add-transaction --amount 000000000500 --currency USD\n"
+        "--record-type footer --field 'total counter'\n"
+        "--record-type footer --field 'control sum'\n",
+    )
+    output = read_output(capsys)
+    assert [result["op"] for result in output[:-1]] == [
+        "validate",
+        "edit",
+        "append",
+        "retrieve",
+        "retrieve",
+    ]
+    assert output[0]["command"] == 2
+    assert output[3]["result"] == "000003"
+    assert output[4]["result"] == "000000010500"
+    assert output[-1]["summary"] == {
+        "commands": 5,
+        "ok": 5,
+        "error": 0,
+        "written": True,
+    }
+    lines = data_file.read_text().splitlines()
+    assert len(lines) == 5
+    assert lines[2].startswith("02,000002,000000001000,eur,")
+    assert lines[3].startswith("02,000003,000000000500,USD,")
+
+
+def test_read_only_script_does_not_write(data_file, tmp_path, capsys):
+    modified_before = data_file.stat().st_mtime_ns
+    run_script(data_file, tmp_path, "--record-type header --field name\n")
+    output = read_output(capsys)
+    assert output[0]["result"].strip() == "nnnnnn"
+    assert output[-1]["summary"]["written"] is False
+    assert data_file.stat().st_mtime_ns == modified_before
+
+
+def test_failed_command_is_reported_and_raises(data_file, tmp_path, capsys):
+    with pytest.raises(ValueError, match="2 of 3 command"):
+        run_script(
+            data_file,
+            tmp_path,
+            "--record-type header --field unknown\n"
+            "--file-path other.csv --validate\n"
+            "--add-transaction --amount 000000000500 --currency USD\n",
+        )
+    output = read_output(capsys)
+    assert output[0]["status"] == "error"
+    assert "--file-path" in output[1]["error"]
+    assert output[2]["status"] == "ok"
+    assert output[-1]["summary"]["error"] == 2
+    assert len(data_file.read_text().splitlines()) == 5
+
+
+def test_commands_from_stdin(data_file, monkeypatch, capsys):
+    monkeypatch.setattr("sys.stdin", io.StringIO("--validate\n"))
+    args = argparse.Namespace(file_path=str(data_file), commands="-")
+    ScriptExecutor(args).execute()
+    assert read_output(capsys)[0]["result"] == {"valid": True}
@@ -0,0 +1,48 @@
+import io
+import pstats
+
+import pytest
+
+from fintech_file_cli.profiling import OperationProfiler
+from fixed_width_struct_io.helpers import phase_timer
+
+
+def busy_operation():
+    with phase_timer.phase("read"):
+        return sum(range(10000))
+
+
+def test_cpu_profile_writes_pstats_and_summary(tmp_path):
+    output_path = tmp_path / "run.pstats"
+    stream = io.StringIO()
+    with OperationProfiler("cpu", str(output_path), top=5, stream=stream):
+        busy_operation()
+    report = stream.getvalue()
+    assert report.startswith("Profile (cpu): total")
+    assert "  read " in report
+    assert "Top 5 functions by cumulative time" in report
+    assert "Peak traced memory" not in report
+    assert pstats.Stats(str(output_path)).total_calls > 0
+    assert phase_timer.enabled is False
+
+
+def test_memory_profile_reports_allocations(tmp_path):
+    output_path = tmp_path / "run.pstats"
+    stream = io.StringIO()
+    with OperationProfiler("memory", str(output_path), stream=stream):
+        busy_operation()
+    assert "Peak traced memory" in stream.getvalue()
+    assert not output_path.exists()
+
+
+def test_report_is_written_when_operation_fails(tmp_path):
+    stream = io.StringIO()
+    with pytest.raises(ValueError):
+        with OperationProfiler("all", str(tmp_path / "run.pstats"), stream=stream):
+            raise ValueError("boom")
+    assert "Profile (all)" in stream.getvalue()
+
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        OperationProfiler("disk")
@@ -0,0 +1,148 @@
+import argparse
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from fintech_file_cli.server import FileDaemon, build_request, send_request
+
+CONTENT = """01,nnnnnn                      ,ooooooo                       ,dnit                          ,street4567                    
+02,000001,000000009000,gbp,                                                                                                 
+02,000002,000000034000,eur,                                                                                                 
+03,000002,000000043000,                                                                                                    
+"""
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text(CONTENT)
+    return str(path)
+
+
+@pytest.fixture
+def running_daemon(tmp_path):
+    daemon = FileDaemon(str(tmp_path / "daemon.sock"))
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_until_complete, args=(daemon.serve_forever(),))
+    thread.start()
+    for _ in range(100):
+        if os.path.exists(daemon.socket_path):
+            break
+        time.sleep(0.01)
+    yield daemon
+    loop.call_soon_threadsafe(daemon.stop)
+    thread.join(timeout=5)
+    loop.close()
+
+
+def test_ping(running_daemon):
+    assert send_request(running_daemon.socket_path, {"op": "ping"}) == {"ok": True, "result": "pong"}
+
+
+def test_unknown_operation(running_daemon):
+    response = send_request(running_daemon.socket_path, {"op": "explode"})
+    assert response["ok"] is False
+    assert "Unknown operation" in response["error"]
+
+
+def test_retrieve_uses_cache_until_file_changes(running_daemon, data_file):
+    request = {"op": "retrieve", "file_path": data_file, "record_type": "footer", "field": "control sum"}
+    assert send_request(running_daemon.socket_path, request)["result"] == "000000043000"
+    cached = running_daemon._cache.get(data_file)
+    assert send_request(running_daemon.socket_path, request)["result"] == "000000043000"
+    assert running_daemon._cache.get(data_file) is cached
+
+    with open(data_file, "w") as file:
+        file.write(CONTENT.replace("000000043000", "000000043001"))
+    assert send_request(running_daemon.socket_path, request)["result"] == "000000043001"
+
+
+def test_cache_is_bounded(tmp_path, data_file):
+    other_file = tmp_path / "other.csv"
+    other_file.write_text(CONTENT)
+    daemon = FileDaemon("unused.sock", cache_max_bytes=len(CONTENT))
+    request = {"op": "retrieve", "record_type": "footer", "field": "control sum"}
+    for path in (data_file, str(other_file)):
+        assert asyncio.run(daemon.handle_request({**request, "file_path": path})) == "000000043000"
+    assert str(other_file) in daemon._cache
+    assert data_file not in daemon._cache
+    assert daemon._cache.total_bytes == len(CONTENT)
+
+
+def test_validate_with_error_collection(running_daemon, data_file):
+    request = {"op": "validate", "file_path": data_file, "max_errors": 10}
+    result = send_request(running_daemon.socket_path, request)["result"]
+    assert result["summary"]["valid"] is True
+
+
+def test_concurrent_appends_are_serialized(data_file):
+    daemon = FileDaemon("unused.sock")
+    request = {"op": "append", "file_path": data_file, "amount": "000000001000", "currency": "USD"}
+
+    async def append_many():
+        return await asyncio.gather(*(daemon.handle_request(dict(request)) for _ in range(5)))
+
+    assert asyncio.run(append_many()) == [True] * 5
+    result = asyncio.run(
+        daemon.handle_request({"op": "retrieve", "file_path": data_file, "record_type": "footer", "field": "total counter"})
+    )
+    assert result == "000007"
+
+
+def test_write_locks_are_shared_by_path_and_pruned(data_file):
+    daemon = FileDaemon(socket_path="unused.sock")
+    relative_path = os.path.relpath(data_file)
+
+    async def hold_both():
+        async with daemon._locked_for_write(data_file):
+            assert len(daemon._write_locks) == 1
+            waiting = asyncio.create_task(_enter(daemon._locked_for_write(relative_path)))
+            await asyncio.sleep(0)
+            assert len(daemon._write_locks) == 1 and not waiting.done()
+        await waiting
+
+    asyncio.run(hold_both())
+    assert daemon._write_locks == {} and daemon._write_lock_users == {}
+
+
+async def _enter(context):
+    async with context:
+        pass
+
+
+def test_build_request():
+    args = argparse.Namespace(
+        file_path="data.csv",
+        validate=False,
+        max_errors=None,
+        record_type="transaction",
+        field="amount",
+        transaction_counter="000001",
+        new_value=None,
+        add_transaction=False,
+        amount=None,
+        currency=None,
+        block_field_from_changes=None,
+        unblock_field_from_changes=None,
+    )
+    assert build_request(args) == {
+        "op": "retrieve",
+        "file_path": os.path.abspath("data.csv"),
+        "record_type": "transaction",
+        "field": "amount",
+        "transaction_counter": "000001",
+    }
+    args.new_value = "000000001000"
+    assert build_request(args)["op"] == "edit"
+
+
+def test_metrics_operation(running_daemon, data_file):
+    request = {"op": "retrieve", "file_path": data_file, "record_type": "footer", "field": "control sum"}
+    send_request(running_daemon.socket_path, request)
+    send_request(running_daemon.socket_path, request)
+    response = send_request(running_daemon.socket_path, {"op": "metrics"})
+    samples = response["result"]["fixed_width_cache_hits_total"]["samples"]
+    assert any(sample["labels"] == {"cache": "daemon"} and sample["value"] >= 1 for sample in samples)
@@ -73,3 +73,299 @@ def test_validate_retrieve_logic_valid(args, validator):
     args.field = 'some_field'
     args.record_type = 'header'
     validator._validate_retrieve_logic()
+
+
+def test_validate_max_errors_requires_validate(args_none, validator):
+    args_none.max_errors = 10
+    with pytest.raises(ValueError) as excinfo:
+        validator.validate()
+    assert "--validate is required when --max-errors is used." in str(excinfo.value)
+
+
+def test_validate_max_errors_must_be_positive(args_none, validator):
+    args_none.validate = True
+    args_none.max_errors = 0
+    with pytest.raises(ValueError) as excinfo:
+        validator.validate()
+    assert "--max-errors must be a positive number." in str(excinfo.value)
+
+
+def test_validate_batch_without_file_path(args_none, validator):
+    args_none.file_path = None
+    args_none.batch = "incoming/"
+    args_none.validate = True
+    validator.validate()
+
+
+def test_validate_batch_rejects_write_operations(args_none, validator):
+    args_none.file_path = None
+    args_none.batch = "incoming/"
+    args_none.add_transaction = True
+    args_none.amount = "000000001000"
+    args_none.currency = "USD"
+    with pytest.raises(ValueError) as excinfo:
+        validator.validate()
+    assert "--batch only supports --validate and field retrieval." in str(excinfo.value)
+
+
+def test_validate_workers_requires_batch(args_none, validator):
+    args_none.workers = 4
+    with pytest.raises(ValueError) as excinfo:
+        validator.validate()
+    assert "--workers can only be used with --batch, --segmented or --split." in str(excinfo.value)
+
+
+def test_validate_commands_with_file_path(args_none, validator):
+    args_none.commands = "commands.txt"
+    validator.validate()
+
+
+def test_validate_commands_requires_file_path(args_none, validator):
+    args_none.file_path = None
+    args_none.commands = "commands.txt"
+    with pytest.raises(ValueError) as excinfo:
+        validator.validate()
+    assert "The --file-path argument is mandatory." in str(excinfo.value)
+
+
+def test_validate_commands_rejects_operation_flags(args_none, validator):
+    args_none.commands = "commands.txt"
+    args_none.validate = True
+    with pytest.raises(ValueError) as excinfo:
+        validator.validate()
+    assert "--commands cannot be combined with other flags: --validate." in str(excinfo.value)
+
+
+def test_validate_profile_output_requires_profile(args_none, validator):
+    args_none.validate = True
+    args_none.profile_output = "run.pstats"
+    with pytest.raises(ValueError) as excinfo:
+        validator.validate()
+    assert "--profile is required when --profile-output is used." in str(excinfo.value)
+
+
+def test_validate_profile_with_field_blocking(args_none, validator):
+    args_none.file_path = None
+    args_none.block_field_from_changes = "name"
+    args_none.profile = "cpu"
+    validator.validate()
+
+
+def test_validate_metrics_format_requires_metrics_file(args_none, validator):
+    args_none.validate = True
+    args_none.metrics_format = "json"
+    with pytest.raises(ValueError) as excinfo:
+        validator.validate()
+    assert "--metrics-file is required when --metrics-format is used." in str(excinfo.value)
+
+
+def test_validate_negative_lock_timeout(args_none, validator):
+    args_none.validate = True
+    args_none.lock_timeout = -1.0
+    with pytest.raises(ValueError) as excinfo:
+        validator.validate()
+    assert "--lock-timeout must not be negative." in str(excinfo.value)
+
+
+def test_validate_expected_version_requires_a_single_write(args_none, validator):
+    args_none.validate = True
+    args_none.expected_version = "10:1:" + "0" * 64
+    with pytest.raises(ValueError) as excinfo:
+        validator.validate()
+    assert "--expected-version requires exactly one edit" in str(excinfo.value)
+
+
+def test_validate_expected_version_format(args_none, validator):
+    args_none.add_transaction = True
+    args_none.amount = "000000001000"
+    args_none.currency = "USD"
+    args_none.expected_version = "not-a-version"
+    with pytest.raises(ValueError) as excinfo:
+        validator.validate()
+    assert "Invalid file version" in str(excinfo.value)
+
+
+def test_validate_segment_requires_segmented(args_none, validator):
+    args_none.record_type = "header"
+    args_none.field = "name"
+    args_none.segment = 2
+    with pytest.raises(ValueError) as excinfo:
+        validator.validate()
+    assert "--segment can only be used with --segmented." in str(excinfo.value)
+
+
+def test_validate_segmented_retrieval_requires_segment(args_none, validator):
+    args_none.segmented = True
+    args_none.record_type = "header"
+    args_none.field = "name"
+    with pytest.raises(ValueError) as excinfo:
+        validator.validate()
+    assert "--segment is required" in str(excinfo.value)
+
+
+def test_validate_segmented_rejects_edits(args_none, validator):
+    args_none.segmented = True
+    args_none.segment = 1
+    args_none.record_type = "header"
+    args_none.field = "name"
+    args_none.new_value = "x"
+    with pytest.raises(ValueError) as excinfo:
+        validator.validate()
+    assert "--segmented cannot be combined with: --new-value." in str(excinfo.value)
+
+
+def test_validate_merge_rejects_other_operations(args_none, validator):
+    args_none.merge = ["a.csv", "b.csv"]
+    args_none.validate = True
+    with pytest.raises(ValueError) as excinfo:
+        validator.validate()
+    assert "--merge cannot be combined with other flags: --validate." in str(excinfo.value)
+
+
+def test_validate_merge_output_is_not_an_input(args_none, validator):
+    args_none.merge = ["a.csv", args_none.file_path]
+    with pytest.raises(ValueError) as excinfo:
+        validator.validate()
+    assert "--file-path must not be one of the --merge inputs." in str(excinfo.value)
+
+
+def test_validate_split_rejects_other_operations(args_none, validator):
+    args_none.split = "shard.csv"
+    args_none.validate = True
+    with pytest.raises(ValueError) as excinfo:
+        validator.validate()
+    assert "--split cannot be combined with other flags: --validate." in str(excinfo.value)
+
+
+def test_validate_shard_size_requires_split(args_none, validator):
+    args_none.shard_size = 10
+    with pytest.raises(ValueError) as excinfo:
+        validator.validate()
+    assert "--split is required when --shard-size is used." in str(excinfo.value)
+
+
+def test_validate_split_with_shard_size_and_workers(args_none, validator):
+    args_none.split = "shard.csv"
+    args_none.shard_size = 10
+    args_none.workers = 2
+    validator.validate()
+
+
+def test_validate_diff_rejects_other_operations(args_none, validator):
+    args_none.diff = "new.csv"
+    args_none.add_transaction = True
+    with pytest.raises(ValueError) as excinfo:
+        validator.validate()
+    assert "--diff cannot be combined with other flags: --add-transaction." in str(excinfo.value)
+
+
+def test_validate_dry_run_requires_repair(args_none, validator):
+    args_none.dry_run = True
+    with pytest.raises(ValueError) as excinfo:
+        validator.validate()
+    assert "--repair is required when --dry-run is used." in str(excinfo.value)
+
+
+def test_validate_repair_rejects_other_operations(args_none, validator):
+    args_none.repair = True
+    args_none.validate = True
+    with pytest.raises(ValueError) as excinfo:
+        validator.validate()
+    assert "--repair cannot be combined with other flags: --validate." in str(excinfo.value)
+
+
+def test_validate_sync_sqlite_rejects_other_operations(args_none, validator):
+    args_none.sync_sqlite = "mirror.db"
+    args_none.validate = True
+    with pytest.raises(ValueError) as excinfo:
+        validator.validate()
+    assert "--sync-sqlite cannot be combined with other flags: --validate." in str(excinfo.value)
+
+
+def test_validate_mirror_requires_retrieval(args_none, validator):
+    args_none.mirror = "mirror.db"
+    with pytest.raises(ValueError) as excinfo:
+        validator.validate()
+    assert "--record-type and --field are required when --mirror is used." in str(excinfo.value)
+
+
+def test_validate_mirror_with_retrieval(args_none, validator):
+    args_none.mirror = "mirror.db"
+    args_none.record_type = "footer"
+    args_none.field = "control sum"
+    validator.validate()
+
+
+def test_validate_export_snapshot_rejects_other_operations(args_none, validator):
+    args_none.export_snapshot = "file.snap"
+    args_none.import_snapshot = "other.snap"
+    with pytest.raises(ValueError) as excinfo:
+        validator.validate()
+    assert "--export-snapshot cannot be combined with other flags: --import-snapshot." in str(excinfo.value)
+
+
+def test_validate_export_options_require_export(args_none, validator):
+    args_none.amount_format = "cents"
+    with pytest.raises(ValueError) as excinfo:
+        validator.validate()
+    assert "--export is required when --amount-format is used." in str(excinfo.value)
+
+
+def test_validate_export_rejects_other_operations(args_none, validator):
+    args_none.export = "-"
+    args_none.export_format = "jsonl"
+    args_none.validate = True
+    with pytest.raises(ValueError) as excinfo:
+        validator.validate()
+    assert "--export cannot be combined with other flags: --validate." in str(excinfo.value)
+
+
+def test_validate_header_field_requires_build(args_none, validator):
+    args_none.header_field = ["name=John"]
+    with pytest.raises(ValueError) as excinfo:
+        validator.validate()
+    assert "--build is required when --header-field is used." in str(excinfo.value)
+
+
+def test_validate_amount_format_with_build(args_none, validator):
+    args_none.build = "rows.csv"
+    args_none.amount_format = "decimal"
+    validator.validate()
+
+
+def test_validate_header_field_form(args_none, validator):
+    args_none.build = "rows.csv"
+    args_none.header_field = ["John"]
+    with pytest.raises(ValueError) as excinfo:
+        validator.validate()
+    assert "--header-field 'John' must have the form FIELD=VALUE." in str(excinfo.value)
+
+
+def test_validate_filter_currency_rejects_other_operations(args_none, validator):
+    args_none.filter_currency = "EUR"
+    args_none.validate = True
+    with pytest.raises(ValueError) as excinfo:
+        validator.validate()
+    assert "--filter-currency cannot be combined with other flags: --validate." in str(excinfo.value)
+
+
+def test_validate_top_amounts_rejects_other_operations(args_none, validator):
+    args_none.top_amounts = 100
+    args_none.validate = True
+    with pytest.raises(ValueError) as excinfo:
+        validator.validate()
+    assert "--top-amounts cannot be combined with other flags: --validate." in str(excinfo.value)
+
+
+def test_validate_amounts_between_range(args_none, validator):
+    args_none.amounts_between = [500, 100]
+    with pytest.raises(ValueError) as excinfo:
+        validator.validate()
+    assert "--amounts-between needs 0 <= MIN <= MAX." in str(excinfo.value)
+
+
+def test_validate_amount_quantile_range(args_none, validator):
+    args_none.amount_quantile = 1.5
+    with pytest.raises(ValueError) as excinfo:
+        validator.validate()
+    assert "--amount-quantile must be between 0 and 1." in str(excinfo.value)
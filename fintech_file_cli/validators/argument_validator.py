@@ -1,5 +1,6 @@
 import argparse
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
@@ -21,11 +22,30 @@ class ArgumentValidator:
     def validate(self) -> None:
         """Performs validation on the provided command-line arguments."""
         self._validate_mandatory_file_path()
+        self._validate_batch()
+        self._validate_daemon()
+        self._validate_commands()
+        self._validate_merge()
+        self._validate_split()
+        self._validate_diff()
+        self._validate_repair()
+        self._validate_sqlite_mirror()
+        self._validate_snapshot()
+        self._validate_export()
+        self._validate_build()
+        self._validate_currency_index()
+        self._validate_amount_index()
         self._validate_exclusive_field_blocking()
         self._validate_transaction_logic()
         self._validate_transaction_addition()
         self._validate_field_editing()
         self._validate_retrieve_logic()
+        self._validate_max_errors()
+        self._validate_profile()
+        self._validate_metrics()
+        self._validate_lock_timeout()
+        self._validate_version()
+        self._validate_segmented()
 
     def _validate_mandatory_file_path(self) -> None:
         """
@@ -41,6 +61,10 @@ class ArgumentValidator:
                     "--file-path is not required for "
                     "field blocking/unblocking."
                 )
+            elif self.args.batch:
+                logger.info("--file-path is not required for --batch.")
+            elif self.args.mode == "serve":
+                logger.info("--file-path is not required for serve.")
             else:
                 logger.error("The --file-path argument is mandatory.")
                 raise ValueError("The --file-path argument is mandatory.")
@@ -58,6 +82,11 @@ class ArgumentValidator:
                     "block_field_from_changes",
                     "unblock_field_from_changes",
                     "log",
+                    "socket",
+                    "profile",
+                    "profile_output",
+                    "metrics_file",
+                    "metrics_format",
                 ]:
                     logger.error(
                         "--block-field-from-changes and --unblock-field-from"
@@ -233,3 +262,670 @@ class ArgumentValidator:
         except ValueError as e:
             logger.error(f"Retrieve logic validation error: {e}")
             raise
+
+    def _validate_max_errors(self) -> None:
+        """
+        Validates that --max-errors is a positive number
+         used together with --validate.
+        """
+        try:
+            if self.args.max_errors is not None:
+                if self.args.max_errors < 1:
+                    raise ValueError("--max-errors must be a positive number.")
+                if not self.args.validate:
+                    raise ValueError(
+                        "--validate is required when --max-errors is used."
+                    )
+            logger.debug("Max errors logic validated successfully.")
+        except ValueError as e:
+            logger.error(f"Max errors validation error: {e}")
+            raise
+
+    def _validate_batch(self) -> None:
+        """
+        Validates the logic for batch mode, ensuring that it replaces
+        --file-path and is only combined with read-only operations.
+        """
+        try:
+            if self.args.workers is not None:
+                if not (
+                    self.args.batch or self.args.segmented or self.args.split
+                ):
+                    raise ValueError(
+                        "--workers can only be used with --batch, "
+                        "--segmented or --split."
+                    )
+                if self.args.workers < 1:
+                    raise ValueError("--workers must be a positive number.")
+            if self.args.batch:
+                if self.args.file_path:
+                    raise ValueError(
+                        "--batch cannot be combined with --file-path."
+                    )
+                if (
+                    self.args.new_value is not None
+                    or self.args.add_transaction
+                    or self.args.block_field_from_changes
+                    or self.args.unblock_field_from_changes
+                ):
+                    raise ValueError(
+                        "--batch only supports --validate and "
+                        "field retrieval."
+                    )
+                if not (self.args.validate or self.args.field):
+                    raise ValueError(
+                        "--batch requires --validate or "
+                        "--record-type with --field."
+                    )
+            logger.debug("Batch logic validated successfully.")
+        except ValueError as e:
+            logger.error(f"Batch validation error: {e}")
+            raise
+
+    def _validate_daemon(self) -> None:
+        """
+        Validates the logic for the daemon: 'serve' needs only --socket,
+        and client mode cannot be combined with --batch.
+        """
+        try:
+            if self.args.mode == "serve":
+                if not self.args.socket:
+                    raise ValueError("--socket is required for serve.")
+                operations = [
+                    arg
+                    for arg in vars(self.args)
+                    if getattr(self.args, arg) not in [None, False]
+                    and arg
+                    not in [
+                        "mode",
+                        "socket",
+                        "log",
+                        "metrics_file",
+                        "metrics_format",
+                    ]
+                ]
+                if operations:
+                    raise ValueError(
+                        f"serve cannot be combined with other flags: "
+                        f"{self._format_arg_names(operations)}."
+                    )
+            elif self.args.socket and self.args.batch:
+                raise ValueError("--socket cannot be combined with --batch.")
+            logger.debug("Daemon logic validated successfully.")
+        except ValueError as e:
+            logger.error(f"Daemon validation error: {e}")
+            raise
+
+    def _validate_commands(self) -> None:
+        """
+        Validates the logic for script mode: --commands replaces every
+        other operation flag of the run.
+        """
+        try:
+            if self.args.commands:
+                operations = [
+                    arg
+                    for arg in vars(self.args)
+                    if getattr(self.args, arg) not in [None, False]
+                    and arg
+                    not in [
+                        "commands",
+                        "file_path",
+                        "log",
+                        "profile",
+                        "profile_output",
+                        "metrics_file",
+                        "metrics_format",
+                        "lock_timeout",
+                    ]
+                ]
+                if operations:
+                    raise ValueError(
+                        f"--commands cannot be combined with other flags: "
+                        f"{self._format_arg_names(operations)}."
+                    )
+            logger.debug("Commands logic validated successfully.")
+        except ValueError as e:
+            logger.error(f"Commands validation error: {e}")
+            raise
+
+    def _validate_merge(self) -> None:
+        """
+        Validates the logic for merging: --merge writes to --file-path
+        and cannot be combined with other operations.
+        """
+        try:
+            if self.args.merge:
+                operations = [
+                    arg
+                    for arg in vars(self.args)
+                    if getattr(self.args, arg) not in [None, False]
+                    and arg
+                    not in [
+                        "merge",
+                        "file_path",
+                        "log",
+                        "profile",
+                        "profile_output",
+                        "metrics_file",
+                        "metrics_format",
+                        "lock_timeout",
+                    ]
+                ]
+                if operations:
+                    raise ValueError(
+                        f"--merge cannot be combined with other flags: "
+                        f"{self._format_arg_names(operations)}."
+                    )
+                if os.path.abspath(self.args.file_path) in {
+                    os.path.abspath(path) for path in self.args.merge
+                }:
+                    raise ValueError(
+                        "--file-path must not be one of the --merge inputs."
+                    )
+            logger.debug("Merge logic validated successfully.")
+        except ValueError as e:
+            logger.error(f"Merge validation error: {e}")
+            raise
+
+    def _validate_split(self) -> None:
+        """
+        Validates the logic for splitting: --split reads --file-path and
+        cannot be combined with other operations.
+        """
+        try:
+            if self.args.shard_size is not None:
+                if not self.args.split:
+                    raise ValueError(
+                        "--split is required when --shard-size is used."
+                    )
+                if self.args.shard_size < 1:
+                    raise ValueError("--shard-size must be a positive number.")
+            if self.args.split:
+                operations = [
+                    arg
+                    for arg in vars(self.args)
+                    if getattr(self.args, arg) not in [None, False]
+                    and arg
+                    not in [
+                        "split",
+                        "shard_size",
+                        "workers",
+                        "file_path",
+                        "log",
+                        "profile",
+                        "profile_output",
+                        "metrics_file",
+                        "metrics_format",
+                        "lock_timeout",
+                    ]
+                ]
+                if operations:
+                    raise ValueError(
+                        f"--split cannot be combined with other flags: "
+                        f"{self._format_arg_names(operations)}."
+                    )
+            logger.debug("Split logic validated successfully.")
+        except ValueError as e:
+            logger.error(f"Split validation error: {e}")
+            raise
+
+    def _validate_diff(self) -> None:
+        """
+        Validates the logic for diffs: --diff compares --file-path with
+        another file and cannot be combined with other operations.
+        """
+        try:
+            if self.args.diff:
+                operations = [
+                    arg
+                    for arg in vars(self.args)
+                    if getattr(self.args, arg) not in [None, False]
+                    and arg
+                    not in [
+                        "diff",
+                        "file_path",
+                        "log",
+                        "profile",
+                        "profile_output",
+                        "metrics_file",
+                        "metrics_format",
+                        "lock_timeout",
+                    ]
+                ]
+                if operations:
+                    raise ValueError(
+                        f"--diff cannot be combined with other flags: "
+                        f"{self._format_arg_names(operations)}."
+                    )
+            logger.debug("Diff logic validated successfully.")
+        except ValueError as e:
+            logger.error(f"Diff validation error: {e}")
+            raise
+
+    def _validate_repair(self) -> None:
+        """
+        Validates the logic for repairs: --repair rewrites --file-path and
+        cannot be combined with other operations, --dry-run needs --repair.
+        """
+        try:
+            if self.args.dry_run and not self.args.repair:
+                raise ValueError(
+                    "--repair is required when --dry-run is used."
+                )
+            if self.args.repair:
+                operations = [
+                    arg
+                    for arg in vars(self.args)
+                    if getattr(self.args, arg) not in [None, False]
+                    and arg
+                    not in [
+                        "repair",
+                        "dry_run",
+                        "file_path",
+                        "log",
+                        "profile",
+                        "profile_output",
+                        "metrics_file",
+                        "metrics_format",
+                        "lock_timeout",
+                    ]
+                ]
+                if operations:
+                    raise ValueError(
+                        f"--repair cannot be combined with other flags: "
+                        f"{self._format_arg_names(operations)}."
+                    )
+            logger.debug("Repair logic validated successfully.")
+        except ValueError as e:
+            logger.error(f"Repair validation error: {e}")
+            raise
+
+    def _validate_sqlite_mirror(self) -> None:
+        """
+        Validates the logic for the SQLite mirror: --sync-sqlite cannot be
+        combined with other operations and --mirror only with retrieval.
+        """
+        try:
+            common = [
+                "file_path",
+                "log",
+                "profile",
+                "profile_output",
+                "metrics_file",
+                "metrics_format",
+                "lock_timeout",
+            ]
+            for flag, allowed in (
+                ("sync_sqlite", ["sync_sqlite"]),
+                (
+                    "mirror",
+                    ["mirror", "record_type", "field", "transaction_counter"],
+                ),
+            ):
+                if not getattr(self.args, flag):
+                    continue
+                operations = [
+                    arg
+                    for arg in vars(self.args)
+                    if getattr(self.args, arg) not in [None, False]
+                    and arg not in allowed + common
+                ]
+                if operations:
+                    raise ValueError(
+                        f"{self._format_arg_names([flag])} cannot be "
+                        f"combined with other flags: "
+                        f"{self._format_arg_names(operations)}."
+                    )
+            if self.args.mirror and not self.args.field:
+                raise ValueError(
+                    "--record-type and --field are required when --mirror "
+                    "is used."
+                )
+            logger.debug("SQLite mirror logic validated successfully.")
+        except ValueError as e:
+            logger.error(f"SQLite mirror validation error: {e}")
+            raise
+
+    def _validate_snapshot(self) -> None:
+        """
+        Validates the logic for snapshots: --export-snapshot and
+        --import-snapshot cannot be combined with other operations.
+        """
+        try:
+            for flag in ("export_snapshot", "import_snapshot"):
+                if not getattr(self.args, flag):
+                    continue
+                operations = [
+                    arg
+                    for arg in vars(self.args)
+                    if getattr(self.args, arg) not in [None, False]
+                    and arg
+                    not in [
+                        flag,
+                        "file_path",
+                        "log",
+                        "profile",
+                        "profile_output",
+                        "metrics_file",
+                        "metrics_format",
+                        "lock_timeout",
+                    ]
+                ]
+                if operations:
+                    raise ValueError(
+                        f"{self._format_arg_names([flag])} cannot be "
+                        f"combined with other flags: "
+                        f"{self._format_arg_names(operations)}."
+                    )
+            logger.debug("Snapshot logic validated successfully.")
+        except ValueError as e:
+            logger.error(f"Snapshot validation error: {e}")
+            raise
+
+    def _validate_export(self) -> None:
+        """
+        Validates the logic for exports: the export options need --export,
+        which cannot be combined with other operations. --amount-format
+        may also be used with --build.
+        """
+        try:
+            options = ["export_format", "export_fields", "amount_format"]
+            if not self.args.export:
+                used = [
+                    arg
+                    for arg in options
+                    if getattr(self.args, arg)
+                    and not (arg == "amount_format" and self.args.build)
+                ]
+                if used:
+                    raise ValueError(
+                        f"--export is required when "
+                        f"{self._format_arg_names(used)} is used."
+                    )
+            else:
+                operations = [
+                    arg
+                    for arg in vars(self.args)
+                    if getattr(self.args, arg) not in [None, False]
+                    and arg
+                    not in options
+                    + [
+                        "export",
+                        "file_path",
+                        "log",
+                        "profile",
+                        "profile_output",
+                        "metrics_file",
+                        "metrics_format",
+                        "lock_timeout",
+                    ]
+                ]
+                if operations:
+                    raise ValueError(
+                        f"--export cannot be combined with other flags: "
+                        f"{self._format_arg_names(operations)}."
+                    )
+            logger.debug("Export logic validated successfully.")
+        except ValueError as e:
+            logger.error(f"Export validation error: {e}")
+            raise
+
+    def _validate_build(self) -> None:
+        """
+        Validates the logic for building files: the build options need
+        --build, which cannot be combined with other operations.
+        """
+        try:
+            options = ["build_format", "header_field"]
+            if not self.args.build:
+                used = [arg for arg in options if getattr(self.args, arg)]
+                if used:
+                    raise ValueError(
+                        f"--build is required when "
+                        f"{self._format_arg_names(used)} is used."
+                    )
+            else:
+                operations = [
+                    arg
+                    for arg in vars(self.args)
+                    if getattr(self.args, arg) not in [None, False]
+                    and arg
+                    not in options
+                    + [
+                        "build",
+                        "amount_format",
+                        "file_path",
+                        "log",
+                        "profile",
+                        "profile_output",
+                        "metrics_file",
+                        "metrics_format",
+                        "lock_timeout",
+                    ]
+                ]
+                if operations:
+                    raise ValueError(
+                        f"--build cannot be combined with other flags: "
+                        f"{self._format_arg_names(operations)}."
+                    )
+                for header_field in self.args.header_field or []:
+                    if "=" not in header_field:
+                        raise ValueError(
+                            f"--header-field '{header_field}' must have the "
+                            f"form FIELD=VALUE."
+                        )
+            logger.debug("Build logic validated successfully.")
+        except ValueError as e:
+            logger.error(f"Build validation error: {e}")
+            raise
+
+    def _validate_currency_index(self) -> None:
+        """
+        Validates the logic for the currency index: --currency-index and
+        --filter-currency cannot be combined with other operations.
+        """
+        try:
+            for flag in ("currency_index", "filter_currency"):
+                if not getattr(self.args, flag):
+                    continue
+                operations = [
+                    arg
+                    for arg in vars(self.args)
+                    if getattr(self.args, arg) not in [None, False]
+                    and arg
+                    not in [
+                        flag,
+                        "file_path",
+                        "log",
+                        "profile",
+                        "profile_output",
+                        "metrics_file",
+                        "metrics_format",
+                        "lock_timeout",
+                    ]
+                ]
+                if operations:
+                    raise ValueError(
+                        f"{self._format_arg_names([flag])} cannot be "
+                        f"combined with other flags: "
+                        f"{self._format_arg_names(operations)}."
+                    )
+            logger.debug("Currency index logic validated successfully.")
+        except ValueError as e:
+            logger.error(f"Currency index validation error: {e}")
+            raise
+
+    def _validate_amount_index(self) -> None:
+        """
+        Validates the logic for the amount index: --amount-index and the
+        amount queries cannot be combined with other operations, and the
+        query values must be in range.
+        """
+        try:
+            for flag in (
+                "amount_index",
+                "amounts_between",
+                "top_amounts",
+                "amount_quantile",
+            ):
+                if getattr(self.args, flag) in [None, False]:
+                    continue
+                operations = [
+                    arg
+                    for arg in vars(self.args)
+                    if getattr(self.args, arg) not in [None, False]
+                    and arg
+                    not in [
+                        flag,
+                        "file_path",
+                        "log",
+                        "profile",
+                        "profile_output",
+                        "metrics_file",
+                        "metrics_format",
+                        "lock_timeout",
+                    ]
+                ]
+                if operations:
+                    raise ValueError(
+                        f"{self._format_arg_names([flag])} cannot be "
+                        f"combined with other flags: "
+                        f"{self._format_arg_names(operations)}."
+                    )
+            if self.args.amounts_between is not None:
+                min_amount, max_amount = self.args.amounts_between
+                if min_amount < 0 or max_amount < min_amount:
+                    raise ValueError(
+                        "--amounts-between needs 0 <= MIN <= MAX."
+                    )
+            if self.args.top_amounts is not None and self.args.top_amounts < 1:
+                raise ValueError("--top-amounts must be a positive number.")
+            if self.args.amount_quantile is not None and not (
+                0 <= self.args.amount_quantile <= 1
+            ):
+                raise ValueError("--amount-quantile must be between 0 and 1.")
+            logger.debug("Amount index logic validated successfully.")
+        except ValueError as e:
+            logger.error(f"Amount index validation error: {e}")
+            raise
+
+    def _validate_profile(self) -> None:
+        """
+        Validates that --profile-output is only used together
+         with --profile.
+        """
+        try:
+            if self.args.profile_output and not self.args.profile:
+                raise ValueError(
+                    "--profile is required when --profile-output is used."
+                )
+            logger.debug("Profile logic validated successfully.")
+        except ValueError as e:
+            logger.error(f"Profile validation error: {e}")
+            raise
+
+    def _validate_metrics(self) -> None:
+        """
+        Validates that --metrics-format is only used together
+         with --metrics-file.
+        """
+        try:
+            if self.args.metrics_format and not self.args.metrics_file:
+                raise ValueError(
+                    "--metrics-file is required when "
+                    "--metrics-format is used."
+                )
+            logger.debug("Metrics logic validated successfully.")
+        except ValueError as e:
+            logger.error(f"Metrics validation error: {e}")
+            raise
+
+    def _validate_lock_timeout(self) -> None:
+        """Validates that --lock-timeout is not negative."""
+        try:
+            lock_timeout = self.args.lock_timeout
+            if lock_timeout is not None and lock_timeout < 0:
+                raise ValueError("--lock-timeout must not be negative.")
+            logger.debug("Lock timeout validated successfully.")
+        except ValueError as e:
+            logger.error(f"Lock timeout validation error: {e}")
+            raise
+
+    def _validate_version(self) -> None:
+        """
+        Validates --show-version and --expected-version: both work on a
+        single local file, and the expected version guards exactly one
+        edit or append.
+        """
+        try:
+            if self.args.show_version or self.args.expected_version:
+                if self.args.batch or self.args.socket:
+                    raise ValueError(
+                        "--show-version and --expected-version cannot be "
+                        "combined with --batch or --socket."
+                    )
+            if self.args.expected_version:
+                writes = [
+                    self.args.new_value is not None,
+                    bool(self.args.add_transaction),
+                ]
+                if sum(writes) != 1:
+                    raise ValueError(
+                        "--expected-version requires exactly one edit "
+                        "(--new-value) or --add-transaction."
+                    )
+                from fixed_width_struct_io.core import FileVersion
+
+                FileVersion.parse(self.args.expected_version)
+            logger.debug("Version logic validated successfully.")
+        except ValueError as e:
+            logger.error(f"Version validation error: {e}")
+            raise
+
+    def _validate_segmented(self) -> None:
+        """
+        Validates the logic for segmented files: --segment addresses a
+        segment of a --segmented file, which supports validation,
+        retrieval and appending only.
+        """
+        try:
+            if self.args.segment is not None:
+                if not self.args.segmented:
+                    raise ValueError(
+                        "--segment can only be used with --segmented."
+                    )
+                if self.args.segment < 1:
+                    raise ValueError("--segment must be a positive number.")
+            if self.args.segmented:
+                unsupported = [
+                    arg
+                    for arg in [
+                        "batch",
+                        "commands",
+                        "socket",
+                        "new_value",
+                        "max_errors",
+                        "show_version",
+                        "expected_version",
+                    ]
+                    if getattr(self.args, arg) not in [None, False]
+                ]
+                if unsupported:
+                    raise ValueError(
+                        f"--segmented cannot be combined with: "
+                        f"{self._format_arg_names(unsupported)}."
+                    )
+                if (
+                    self.args.field
+                    and not self.args.add_transaction
+                    and self.args.segment is None
+                ):
+                    raise ValueError(
+                        "--segment is required to retrieve a field "
+                        "from a segmented file."
+                    )
+            logger.debug("Segmented logic validated successfully.")
+        except ValueError as e:
+            logger.error(f"Segmented validation error: {e}")
+            raise
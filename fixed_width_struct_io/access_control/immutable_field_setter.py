@@ -1,5 +1,6 @@
 import logging
 import os
+from typing import Optional
 
 from fixed_width_struct_io.constants import (
     FIELD_LENGTHS,
@@ -12,7 +13,13 @@ logger = logging.getLogger(__name__)
 
 
 class ImmutableFieldSetter:
-    """Handles setting fields as immutable to prevent changes."""
+    """
+    Handles setting fields as immutable to prevent changes.
+
+    The configuration file is read on first use rather than on
+    construction, so importing the module stays cheap for operations
+    that never check field immutability.
+    """
 
     def __init__(self) -> None:
         """Initializes the immutable field setter with a config file."""
@@ -20,7 +27,14 @@ class ImmutableFieldSetter:
         self.config_path = os.path.join(
             current_dir, FIELD_IMMUTABLE_CONFIG_FILE_NAME
         )
-        self._immutable_fields = self._load_immutable_fields()
+        self._loaded_fields: Optional[set] = None
+
+    @property
+    def _immutable_fields(self) -> set:
+        """The set of immutable fields, loaded on first access."""
+        if self._loaded_fields is None:
+            self._loaded_fields = self._load_immutable_fields()
+        return self._loaded_fields
 
     def _load_immutable_fields(self) -> set:
         """
@@ -0,0 +1,3 @@
+from fixed_width_struct_io.aio.operations import (  # noqa: F401, E501
+    AsyncFileOperations,
+)
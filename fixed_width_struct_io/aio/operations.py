@@ -0,0 +1,211 @@
+import asyncio
+import functools
+import logging
+from concurrent.futures import Executor
+from typing import Any, Callable, List, Optional, Tuple, Type, Union
+
+from fixed_width_struct_io.constants import DEFAULT_LOCK_TIMEOUT
+from fixed_width_struct_io.core import FileIOBase, FileVersion
+from fixed_width_struct_io.readers import FieldRetriever
+from fixed_width_struct_io.validators import (
+    ErrorCollector,
+    FileStructureValidator,
+    StringLengthValidator,
+    ValuesValidator,
+)
+from fixed_width_struct_io.writers import FieldEditor, TransactionAppender
+
+logger = logging.getLogger(__name__)
+
+VALIDATOR_CLASSES: Tuple[
+    Type[
+        Union[FileStructureValidator, StringLengthValidator, ValuesValidator]
+    ],
+    ...,
+] = (FileStructureValidator, StringLengthValidator, ValuesValidator)
+
+
+class AsyncFileOperations:
+    """
+    asyncio counterparts of the library operations: validate, retrieve,
+    edit and append.
+
+    Every blocking step (reading the file, parsing it, running a
+    validator, writing) runs in `executor`, or in the loop's default
+    executor when none is given, so the event loop is never blocked. The
+    steps of an operation are awaited one by one, and a cancelled
+    operation stops at the next step boundary. A step that already runs
+    in the executor completes, so a cancelled edit or append either
+    writes the whole file or nothing.
+
+    Attributes:
+        executor (Optional[Executor]): Executor running the blocking steps.
+        lock_timeout (Optional[float]): Seconds to wait for the file lock.
+    """
+
+    def __init__(
+        self,
+        executor: Optional[Executor] = None,
+        lock_timeout: Optional[float] = DEFAULT_LOCK_TIMEOUT,
+    ) -> None:
+        """Initializes the operations with the executor to use."""
+        self.executor = executor
+        self.lock_timeout = lock_timeout
+
+    async def _run(self, function: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Runs a blocking step in the executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, functools.partial(function, *args, **kwargs)
+        )
+
+    async def read_lines(self, file_path: str) -> List[str]:
+        """
+        Reads the lines of a file.
+        Args:
+            file_path (str): Path to the file.
+        Returns:
+            List[str]: The lines of the file.
+        """
+        reader = await self._run(
+            FileIOBase, file_path=file_path, lock_timeout=self.lock_timeout
+        )
+        return reader.lines
+
+    async def validate(self, file_path: str) -> bool:
+        """
+        Validates the structure, lengths and values of a file.
+        Args:
+            file_path (str): Path to the file.
+        Returns:
+            bool: True if the file is valid.
+        Raises:
+            ValueError: If the file is invalid.
+        """
+        lines = await self.read_lines(file_path)
+        for validator_class in VALIDATOR_CLASSES:
+            await self._run(validator_class(lines=lines).validate)
+        logger.info(f"{file_path} is valid.")
+        return True
+
+    async def collect_errors(
+        self, file_path: str, max_errors: int
+    ) -> ErrorCollector:
+        """
+        Validates a file in collect-all-errors mode.
+        Args:
+            file_path (str): Path to the file.
+            max_errors (int): Maximum number of errors to collect.
+        Returns:
+            ErrorCollector: The collected validation errors.
+        """
+        lines = await self.read_lines(file_path)
+        collector = ErrorCollector(max_errors=max_errors)
+        for validator_class in VALIDATOR_CLASSES:
+            await self._run(
+                validator_class(lines=lines).collect_errors, collector
+            )
+            if collector.truncated:
+                break
+        return collector
+
+    async def retrieve(
+        self,
+        file_path: str,
+        record_type: str,
+        field_name: str,
+        transaction_index: Optional[str] = None,
+    ) -> Any:
+        """
+        Retrieves the value of a field.
+        Args:
+            file_path (str): Path to the file.
+            record_type (str): The type of record (header, transaction,
+                               footer).
+            field_name (str): The name of the field to retrieve.
+            transaction_index (Optional[str]): The counter of the
+                                               transaction, if applicable.
+        Returns:
+            The value of the field.
+        Raises:
+            ValueError: If the record type or field is invalid or the
+                        record is not found.
+        """
+        lines = await self.read_lines(file_path)
+        return await self._run(
+            FieldRetriever(lines=lines).get_value,
+            record_type=record_type,
+            field_name=field_name,
+            transaction_index=transaction_index,
+        )
+
+    async def edit(
+        self,
+        file_path: str,
+        record_type: str,
+        field_name: str,
+        transaction_index: Optional[str],
+        new_value: Any,
+        expected_version: Optional[FileVersion] = None,
+    ) -> bool:
+        """
+        Edits the value of a field and writes the file.
+        Args:
+            file_path (str): Path to the file.
+            record_type (str): The type of record to edit.
+            field_name (str): The name of the field to edit.
+            transaction_index (Optional[str]): The counter of the
+                                               transaction, if applicable.
+            new_value (Any): The new value of the field.
+            expected_version (Optional[FileVersion]): Version the file
+                                                      must still have.
+        Returns:
+            bool: True if the field was edited.
+        Raises:
+            ValueError: If the field is immutable or the value is invalid.
+            VersionConflictError: If the file changed since
+                                  `expected_version`.
+        """
+        editor = await self._run(
+            FieldEditor,
+            file_path=file_path,
+            lock_timeout=self.lock_timeout,
+            expected_version=expected_version,
+        )
+        return await self._run(
+            editor.edit_field_value,
+            record_type=record_type,
+            field_name=field_name,
+            transaction_index=transaction_index,
+            new_value=new_value,
+        )
+
+    async def append(
+        self,
+        file_path: str,
+        amount: str,
+        currency: str,
+        expected_version: Optional[FileVersion] = None,
+    ) -> bool:
+        """
+        Appends a transaction and writes the file.
+        Args:
+            file_path (str): Path to the file.
+            amount (str): Amount of the transaction.
+            currency (str): Currency of the transaction.
+            expected_version (Optional[FileVersion]): Version the file
+                                                      must still have.
+        Returns:
+            bool: True if the transaction was appended.
+        Raises:
+            ValueError: If the amount or currency is invalid.
+            VersionConflictError: If the file changed since
+                                  `expected_version`.
+        """
+        appender = await self._run(
+            TransactionAppender,
+            file_path=file_path,
+            lock_timeout=self.lock_timeout,
+            expected_version=expected_version,
+        )
+        return await self._run(appender.append_transaction, amount, currency)
@@ -0,0 +1,5 @@
+from fixed_width_struct_io.cache.file_cache import (  # noqa: F401, E501
+    CachedFile,
+    FileCache,
+    file_cache,
+)
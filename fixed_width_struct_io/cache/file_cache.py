@@ -0,0 +1,158 @@
+import logging
+import os
+import threading
+from collections import OrderedDict, namedtuple
+from typing import Optional, Tuple
+
+from fixed_width_struct_io.constants import DEFAULT_CACHE_MAX_BYTES
+from fixed_width_struct_io.core import FileIOBase
+from fixed_width_struct_io.metrics.library_metrics import (
+    CACHE_EVICTIONS,
+    CACHE_HITS,
+    CACHE_MISSES,
+)
+from fixed_width_struct_io.readers import FieldRetriever
+
+logger = logging.getLogger(__name__)
+
+CachedFile = namedtuple(
+    "CachedFile", ["stat_key", "size", "lines", "retriever"]
+)
+
+
+class FileCache:
+    """
+    Thread-safe, process-wide cache of parsed fixed-width files.
+
+    Every entry keeps the lines of a file as a tuple and a FieldRetriever
+    whose records are parsed once; callers in any thread share them
+    without copying and must treat them as read-only. An entry is reloaded
+    when the mtime, size or inode of its file changes, and writers of this
+    library invalidate it explicitly, since an edit that keeps the size
+    can land within the filesystem's mtime granularity.
+
+    Hits take no lock: they cost a stat call and a dictionary lookup.
+    The lock is only held to load a missing or stale file, so concurrent
+    misses on the same file load it once. Least recently used entries are
+    evicted once the cached files exceed `max_bytes` in total; a file
+    larger than the whole cache is returned without being cached.
+
+    Attributes:
+        max_bytes (int): Maximum total size of the cached files, in bytes.
+        name (str): Label of the cache in the hit, miss and eviction
+                    metrics.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        name: str = "file_cache",
+    ) -> None:
+        """Initializes an empty cache."""
+        self.max_bytes = max_bytes
+        self.name = name
+        self._entries: "OrderedDict[str, CachedFile]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def total_bytes(self) -> int:
+        """Total size of the cached files, in bytes."""
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        """Returns the number of cached files."""
+        return len(self._entries)
+
+    def __contains__(self, file_path: str) -> bool:
+        """Returns True if the file is cached."""
+        return os.path.abspath(file_path) in self._entries
+
+    def get(self, file_path: str) -> CachedFile:
+        """
+        Returns the cached entry of a file, loading it if needed.
+        Args:
+            file_path (str): Path to the file.
+        Returns:
+            CachedFile: The stat key, size, lines and retriever of the file.
+        Raises:
+            FileNotFoundError: If the file does not exist.
+        """
+        path = os.path.abspath(file_path)
+        stat_key = self._stat_key(path)
+        cached = self._entries.get(path)
+        if cached is not None and cached.stat_key == stat_key:
+            CACHE_HITS.inc(cache=self.name)
+            try:
+                self._entries.move_to_end(path)
+            except KeyError:
+                # Evicted by another thread since the lookup.
+                pass
+            return cached
+        with self._lock:
+            stat_key = self._stat_key(path)
+            cached = self._entries.get(path)
+            if cached is not None and cached.stat_key == stat_key:
+                CACHE_HITS.inc(cache=self.name)
+                return cached
+            CACHE_MISSES.inc(cache=self.name)
+            return self._load(path, stat_key)
+
+    def lines(self, file_path: str) -> Tuple[str, ...]:
+        """Returns the shared, read-only lines of a file."""
+        return self.get(file_path).lines
+
+    def retriever(self, file_path: str) -> FieldRetriever:
+        """Returns the shared FieldRetriever of a file."""
+        return self.get(file_path).retriever
+
+    def invalidate(self, file_path: Optional[str] = None) -> None:
+        """
+        Drops a file from the cache, or every file if no path is given.
+        Args:
+            file_path (Optional[str]): Path to the file to drop.
+        """
+        with self._lock:
+            if file_path is None:
+                self._entries.clear()
+                self._total_bytes = 0
+                return
+            cached = self._entries.pop(os.path.abspath(file_path), None)
+            if cached is not None:
+                self._total_bytes -= cached.size
+
+    def clear(self) -> None:
+        """Drops every file from the cache."""
+        self.invalidate()
+
+    @staticmethod
+    def _stat_key(path: str) -> tuple:
+        """Returns the values that change when the file is replaced."""
+        file_stat = os.stat(path)
+        return file_stat.st_mtime_ns, file_stat.st_size, file_stat.st_ino
+
+    def _load(self, path: str, stat_key: tuple) -> CachedFile:
+        """Reads and parses a file and caches it. Called under the lock."""
+        stale = self._entries.pop(path, None)
+        if stale is not None:
+            self._total_bytes -= stale.size
+        lines = tuple(FileIOBase(file_path=path).lines)
+        retriever = FieldRetriever(lines=lines)
+        retriever._get_records()
+        size = stat_key[1]
+        cached = CachedFile(stat_key, size, lines, retriever)
+        if size > self.max_bytes:
+            logger.debug(f"{path} is larger than the cache and is not cached.")
+            return cached
+        self._entries[path] = cached
+        self._total_bytes += size
+        while self._total_bytes > self.max_bytes:
+            evicted_path, evicted = self._entries.popitem(last=False)
+            self._total_bytes -= evicted.size
+            CACHE_EVICTIONS.inc(cache=self.name)
+            logger.debug(f"Evicted {evicted_path} from the {self.name} cache.")
+        logger.debug(f"Cached {path} ({size} bytes).")
+        return cached
+
+
+file_cache = FileCache()
@@ -14,6 +14,7 @@ FIELD_ID_LENGTH = 2
 LINE_LENGTH = 120
 
 CURRENCIES_LIST = ["usd", "eur", "gbp"]
+CURRENCIES = frozenset(CURRENCIES_LIST)
 
 MAX_TRANSACTIONS_AMOUNT = 20000
 
@@ -141,4 +142,22 @@ RECORD_TYPE_NAMES = {
 
 LAST_TRANSACTION_LIST_INDEX = -2
 
+PROGRESS_LOG_INTERVAL = 5000
+
+DEFAULT_LOCK_TIMEOUT = 30.0
+
+LOCK_FILE_SUFFIX = ".lock"
+
+DEFAULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+SEGMENT_DIRECTORY_SUFFIX = ".segments"
+
+CURRENCY_INDEX_SUFFIX = ".currency-index"
+
+AMOUNT_INDEX_SUFFIX = ".amount-index"
+
+AMOUNT_INDEX_RUN_SIZE = 65536
+
+DIFF_BLOCK_LINES = 1024
+
 FIELD_IMMUTABLE_CONFIG_FILE_NAME = "field_immutable_config.json"
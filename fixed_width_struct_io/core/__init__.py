@@ -1,3 +1,12 @@
 from fixed_width_struct_io.core.file_io_base import (  # noqa: F401, E501
     FileIOBase,
+    exclusive_update,
+)
+from fixed_width_struct_io.core.file_lock import (  # noqa: F401, E501
+    FileLock,
+    LockTimeoutError,
+)
+from fixed_width_struct_io.core.file_version import (  # noqa: F401, E501
+    FileVersion,
+    VersionConflictError,
 )
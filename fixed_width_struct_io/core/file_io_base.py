@@ -1,10 +1,28 @@
+import functools
 import logging
+import os
 from abc import ABC
-from typing import List, Optional
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List, Optional, TypeVar
+
+from fixed_width_struct_io.constants import DEFAULT_LOCK_TIMEOUT
+from fixed_width_struct_io.core.file_lock import FileLock
+from fixed_width_struct_io.core.file_version import (
+    FileVersion,
+    check_file_version,
+)
+from fixed_width_struct_io.helpers.phase_timer import phase_timer
+from fixed_width_struct_io.metrics.library_metrics import (
+    BYTES_READ,
+    BYTES_WRITTEN,
+    RECORDS_READ,
+)
 
 
 logger = logging.getLogger(__name__)
 
+F = TypeVar("F", bound=Callable[..., Any])
+
 
 class FileIOBase(ABC):
     """
@@ -18,17 +36,33 @@ class FileIOBase(ABC):
         lines (List[str]): List of lines from the file
                             or directly passed as an argument.
         file_path (str): Path to the file from which to read lines.
+        lock_timeout (Optional[float]): Seconds to wait for the file lock,
+                                        None waits forever.
+        expected_version (Optional[FileVersion]): Version the file must
+                                        still have when it is written.
+        version (Optional[FileVersion]): Version of the file when it was
+                                        last read or written, captured only
+                                        if versions are tracked.
     """
 
     def __init__(
         self,
         lines: Optional[List[str]] = None,
         file_path: Optional[str] = None,
+        lock_timeout: Optional[float] = DEFAULT_LOCK_TIMEOUT,
+        expected_version: Optional[FileVersion] = None,
+        track_version: bool = False,
     ) -> None:
         """
         Initialize with either a list of lines or a file path.
         Throws ValueError if both or neither arguments are provided.
+        Versions are tracked when `track_version` is set or an
+        `expected_version` is given, since computing them hashes the file.
         """
+        self.lock_timeout = lock_timeout
+        self.expected_version = expected_version
+        self.track_version = track_version or expected_version is not None
+        self.version: Optional[FileVersion] = None
         self.lines = self._initialize_lines(lines, file_path)
         self.file_path = file_path if file_path is not None else ""
 
@@ -46,13 +80,18 @@ class FileIOBase(ABC):
             )
         if file_path:
             try:
-                return self._read_file(file_path)
+                with FileLock(file_path, timeout=self.lock_timeout):
+                    lines = self._read_file(file_path)
+                    if self.track_version:
+                        self.version = FileVersion.of_file(file_path)
+                    return lines
             except Exception as e:
                 logger.exception(f"Failed to read file at {file_path}.")
                 raise e
         else:
             return lines if lines else []
 
+    @phase_timer.timed("read")
     def _read_file(self, file_path: str) -> List[str]:
         """Read lines from the specified file. Handles file-related errors."""
         try:
@@ -60,8 +99,10 @@ class FileIOBase(ABC):
                 lines = [
                     line.rstrip("\n").rstrip("\r") for line in file.readlines()
                 ]
+                BYTES_READ.inc(os.fstat(file.fileno()).st_size)
             if not lines:
                 raise ValueError("File is empty.")
+            RECORDS_READ.inc(len(lines))
             return lines
 
         except FileNotFoundError:
@@ -73,3 +114,75 @@ class FileIOBase(ABC):
         except Exception as e:
             logger.exception(f"An error occurred while reading the file: {e}")
             raise
+
+    @phase_timer.timed("write")
+    def _write_lines(self) -> None:
+        """
+        Writes the current lines back to the file, one record per line.
+        Instances created from a list of lines have no file to write to,
+        so their changes are only kept in memory.
+        """
+        if not self.file_path:
+            logger.debug("No file path set, changes are kept in memory.")
+            return
+        with open(self.file_path, "w") as file:
+            file.writelines(line + "\n" for line in self.lines)
+            BYTES_WRITTEN.inc(file.tell())
+
+    def write_lines(self, file_path: Optional[str] = None) -> None:
+        """
+        Writes the current lines to a file, e.g. lines changed in memory
+        by several operations. The file is rewritten in place without
+        taking its lock, so the caller must hold the exclusive lock.
+        Args:
+            file_path: The file to write, defaults to the file path of the
+                       instance and becomes its file path.
+        Raises:
+            ValueError: If neither a file path is given nor one is set.
+        """
+        if file_path is not None:
+            self.file_path = file_path
+        if not self.file_path:
+            raise ValueError("No file path to write the lines to.")
+        self._write_lines()
+
+    @contextmanager
+    def _locked_for_update(self) -> Iterator[None]:
+        """
+        Holds an exclusive lock on the file for a read-modify-write cycle
+        and re-reads the lines under it, so changes written by another
+        process since this instance was created are not overwritten.
+        If an expected version is set, the update is refused instead when
+        the file no longer has that version. After a successful update the
+        new version becomes the expected one, so the same instance can
+        keep updating the file. Instances without a file path are not
+        locked.
+        Raises:
+            VersionConflictError: If the file changed since the expected
+                                  version.
+        """
+        if not self.file_path:
+            yield
+            return
+        with FileLock(
+            self.file_path, exclusive=True, timeout=self.lock_timeout
+        ):
+            if self.expected_version is not None:
+                check_file_version(self.file_path, self.expected_version)
+            self.lines = self._read_file(self.file_path)
+            yield
+            if self.track_version:
+                self.version = FileVersion.of_file(self.file_path)
+                if self.expected_version is not None:
+                    self.expected_version = self.version
+
+
+def exclusive_update(method: F) -> F:
+    """Decorator running a FileIOBase method under `_locked_for_update`."""
+
+    @functools.wraps(method)
+    def wrapper(self: FileIOBase, *args: Any, **kwargs: Any) -> Any:
+        with self._locked_for_update():
+            return method(self, *args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
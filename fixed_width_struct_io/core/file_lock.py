@@ -0,0 +1,214 @@
+import logging
+import os
+import threading
+import time
+from types import TracebackType
+from typing import Dict, List, Optional, Type
+
+from fixed_width_struct_io.constants import LOCK_FILE_SUFFIX
+from fixed_width_struct_io.metrics.library_metrics import (
+    LOCK_TIMEOUTS,
+    LOCK_WAIT_SECONDS,
+)
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - platforms without fcntl
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+LOCK_SHARED = "shared"
+LOCK_EXCLUSIVE = "exclusive"
+INITIAL_RETRY_DELAY = 0.001
+MAX_RETRY_DELAY = 0.05
+
+
+class LockTimeoutError(TimeoutError):
+    """Raised when a file lock is not acquired within its timeout."""
+
+
+class _HeldLock:
+    """A lock held by the current thread, with its nesting depth."""
+
+    def __init__(self, file_descriptor: Optional[int], exclusive: bool):
+        self.file_descriptor = file_descriptor
+        self.exclusive = exclusive
+        self.depth = 1
+
+
+_local = threading.local()
+
+
+def _held_locks() -> Dict[str, _HeldLock]:
+    """Returns the locks held by the current thread, keyed by path."""
+    if not hasattr(_local, "locks"):
+        _local.locks = {}
+    return _local.locks
+
+
+class FileLock:
+    """
+    Advisory `fcntl.flock` lock on a fixed-width file.
+
+    Readers take a shared lock, so any number of them can read at once;
+    writers take an exclusive lock for their whole read-modify-write
+    cycle, so concurrent writers in other processes (or threads) wait for
+    each other instead of overwriting each other's changes. The lock is
+    taken on a hidden '.<file>.lock' file next to the data file, which is
+    never replaced or removed, so writers may replace the data file
+    atomically with `os.replace` while others wait for the lock.
+
+    Locks are re-entrant within a thread: acquiring a lock the thread
+    already holds only increases its depth, and a shared request inside an
+    exclusive lock is satisfied by the exclusive one. Upgrading a shared
+    lock to an exclusive one is not supported.
+
+    On platforms without `fcntl`, for a shared lock on a file that does
+    not exist, or when the lock file cannot be created or opened, the lock
+    is a no-op and any error is left to the code reading the file.
+
+    Attributes:
+        path (str): Absolute path of the locked file.
+        lock_path (str): Absolute path of the lock file.
+        exclusive (bool): Whether the lock is exclusive.
+        timeout (Optional[float]): Seconds to wait for the lock; None
+                                   waits forever, 0 tries only once.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        exclusive: bool = False,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """Initializes the lock without acquiring it."""
+        self.path = os.path.abspath(path)
+        directory, name = os.path.split(self.path)
+        self.lock_path = os.path.join(directory, f".{name}{LOCK_FILE_SUFFIX}")
+        self.exclusive = exclusive
+        self.timeout = timeout
+
+    @property
+    def mode(self) -> str:
+        """The lock mode, 'shared' or 'exclusive'."""
+        return LOCK_EXCLUSIVE if self.exclusive else LOCK_SHARED
+
+    def acquire(self) -> None:
+        """
+        Acquires the lock, waiting up to `timeout` seconds.
+        Raises:
+            LockTimeoutError: If the lock was not acquired in time.
+            ValueError: If the thread holds a shared lock on the file and
+                        asks for an exclusive one.
+        """
+        held = _held_locks().get(self.path)
+        if held is not None:
+            if self.exclusive and not held.exclusive:
+                raise ValueError(
+                    f"Cannot upgrade the shared lock on {self.path} "
+                    f"to an exclusive lock."
+                )
+            held.depth += 1
+            return
+
+        file_descriptor = None
+        if fcntl is not None:
+            if self.exclusive or os.path.exists(self.path):
+                file_descriptor = self._open_lock_file()
+            else:
+                logger.debug(f"{self.path} does not exist, nothing to lock.")
+        if file_descriptor is not None:
+            try:
+                self._lock(file_descriptor)
+            except BaseException:
+                os.close(file_descriptor)
+                raise
+        _held_locks()[self.path] = _HeldLock(file_descriptor, self.exclusive)
+
+    def _open_lock_file(self) -> Optional[int]:
+        """
+        Opens the lock file, creating it if needed, or returns None if it
+        cannot be opened.
+        """
+        try:
+            return os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o666)
+        except FileNotFoundError:
+            logger.debug(f"{self.path} has no directory, nothing to lock.")
+            return None
+        except PermissionError:
+            pass
+        try:
+            return os.open(self.lock_path, os.O_RDONLY)
+        except OSError:
+            logger.warning(
+                f"Cannot open {self.lock_path} for locking, "
+                f"continuing without a lock."
+            )
+            return None
+
+    def _lock(self, file_descriptor: int) -> None:
+        """Applies flock, retrying with a growing delay until timeout."""
+        operation = fcntl.LOCK_EX if self.exclusive else fcntl.LOCK_SH
+        started_at = time.perf_counter()
+        if self.timeout is None:
+            fcntl.flock(file_descriptor, operation)
+        else:
+            delay = INITIAL_RETRY_DELAY
+            deadline = started_at + self.timeout
+            while True:
+                try:
+                    fcntl.flock(file_descriptor, operation | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        LOCK_TIMEOUTS.inc(lock=self.mode)
+                        logger.error(
+                            f"Timed out after {self.timeout}s waiting for "
+                            f"the {self.mode} lock on {self.path}."
+                        )
+                        raise LockTimeoutError(
+                            f"Could not lock {self.path} within "
+                            f"{self.timeout} seconds."
+                        )
+                    time.sleep(min(delay, remaining))
+                    delay = min(delay * 2, MAX_RETRY_DELAY)
+        waited = time.perf_counter() - started_at
+        LOCK_WAIT_SECONDS.observe(waited, lock=self.mode)
+        logger.debug(
+            "Acquired %s lock on %s after %.4fs.", self.mode, self.path, waited
+        )
+
+    def release(self) -> None:
+        """Releases the lock, or one nesting level of it."""
+        locks = _held_locks()
+        held = locks.get(self.path)
+        if held is None:
+            return
+        held.depth -= 1
+        if held.depth:
+            return
+        del locks[self.path]
+        if held.file_descriptor is not None:
+            fcntl.flock(held.file_descriptor, fcntl.LOCK_UN)
+            os.close(held.file_descriptor)
+
+    def __enter__(self) -> "FileLock":
+        """Acquires the lock."""
+        self.acquire()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Releases the lock."""
+        self.release()
+
+
+def held_lock_paths() -> List[str]:
+    """Returns the paths locked by the current thread."""
+    return list(_held_locks())
@@ -0,0 +1,107 @@
+import hashlib
+import logging
+import os
+import re
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+VERSION_SEPARATOR = ":"
+VERSION_PATTERN = re.compile(r"^(\d+):(\d+):([0-9a-f]{64})$")
+
+_FileVersionBase = namedtuple(
+    "_FileVersionBase", ["size", "mtime_ns", "sha256"]
+)
+
+
+class VersionConflictError(ValueError):
+    """Raised when a file changed after the version a writer expected."""
+
+
+class FileVersion(_FileVersionBase):
+    """
+    Version stamp of a fixed-width file, captured when it is read and
+    checked before it is written (optimistic concurrency).
+
+    Two versions match when the file has the same size and content hash;
+    the modification time is informational, since rewriting a file with
+    the same content is not a conflict. The string form
+    '<size>:<mtime_ns>:<sha256>' is what the CLI prints and accepts.
+
+    Attributes:
+        size (int): Size of the file in bytes.
+        mtime_ns (int): Modification time in nanoseconds.
+        sha256 (str): Hex SHA-256 digest of the file content.
+    """
+
+    @classmethod
+    def of_file(cls, file_path: str) -> "FileVersion":
+        """
+        Returns the current version of a file.
+        Args:
+            file_path (str): Path to the file.
+        Returns:
+            FileVersion: The size, modification time and content hash.
+        """
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as file:
+            stat = os.fstat(file.fileno())
+            for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return cls(stat.st_size, stat.st_mtime_ns, digest.hexdigest())
+
+    @classmethod
+    def parse(cls, text: str) -> "FileVersion":
+        """
+        Parses a version printed by `str(version)`.
+        Args:
+            text (str): Version in the '<size>:<mtime_ns>:<sha256>' form.
+        Returns:
+            FileVersion: The parsed version.
+        Raises:
+            ValueError: If the text is not a valid version.
+        """
+        match = VERSION_PATTERN.match(text.strip().lower())
+        if match is None:
+            raise ValueError(
+                f"Invalid file version '{text}', expected "
+                f"'<size>:<mtime_ns>:<sha256>'."
+            )
+        size, mtime_ns, sha256 = match.groups()
+        return cls(int(size), int(mtime_ns), sha256)
+
+    def matches(self, other: "FileVersion") -> bool:
+        """Returns True if both versions have the same content."""
+        return self.size == other.size and self.sha256 == other.sha256
+
+    def __str__(self) -> str:
+        """Returns the '<size>:<mtime_ns>:<sha256>' form of the version."""
+        return VERSION_SEPARATOR.join(
+            [str(self.size), str(self.mtime_ns), self.sha256]
+        )
+
+
+def check_file_version(file_path: str, expected: FileVersion) -> FileVersion:
+    """
+    Checks that a file still has the expected version. The size is
+    compared first, so most conflicts are found without hashing the file.
+    Args:
+        file_path (str): Path to the file.
+        expected (FileVersion): Version the caller read.
+    Returns:
+        FileVersion: The current version of the file.
+    Raises:
+        VersionConflictError: If the file changed since `expected`.
+    """
+    size = os.stat(file_path).st_size
+    current = None
+    if size == expected.size:
+        current = FileVersion.of_file(file_path)
+    if current is None or not current.matches(expected):
+        logger.error(f"{file_path} changed since version {expected} was read.")
+        raise VersionConflictError(
+            f"File {file_path} was modified after it was read "
+            f"(expected version {expected})."
+        )
+    return current
@@ -1,3 +1,10 @@
 from fixed_width_struct_io.helpers.field_format_type import (  # noqa: F401, E501
     FieldFormat,
 )
+from fixed_width_struct_io.helpers.progress_logger import (  # noqa: F401, E501
+    ProgressLogger,
+)
+from fixed_width_struct_io.helpers.phase_timer import (  # noqa: F401, E501
+    PhaseTimer,
+    phase_timer,
+)
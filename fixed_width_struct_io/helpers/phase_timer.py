@@ -0,0 +1,86 @@
+import functools
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Tuple, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class PhaseTimer:
+    """
+    Accumulates wall-clock time spent in named phases of an operation,
+    such as reading the file, parsing it or running a validator.
+
+    Recording is off by default; while disabled, a timed call costs a
+    single attribute check. Phases may nest (a write happens inside an
+    edit), so their totals are not meant to add up.
+
+    Attributes:
+        enabled (bool): Whether phase times are being recorded.
+    """
+
+    def __init__(self) -> None:
+        """Initializes a disabled timer with no recorded phases."""
+        self.enabled = False
+        self._totals: Dict[str, float] = {}
+        self._calls: Dict[str, int] = {}
+
+    def start(self) -> None:
+        """Clears previous results and starts recording."""
+        self._totals.clear()
+        self._calls.clear()
+        self.enabled = True
+
+    def stop(self) -> None:
+        """Stops recording, keeping the results."""
+        self.enabled = False
+
+    def record(self, name: str, elapsed: float) -> None:
+        """Adds `elapsed` seconds to the phase `name`."""
+        self._totals[name] = self._totals.get(name, 0.0) + elapsed
+        self._calls[name] = self._calls.get(name, 0) + 1
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Times the enclosed block as the phase `name`."""
+        if not self.enabled:
+            yield
+            return
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started_at)
+
+    def timed(self, name: str) -> Callable[[F], F]:
+        """Decorator timing every call of a function as the phase `name`."""
+
+        def decorator(function: F) -> F:
+            @functools.wraps(function)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                started_at = time.perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.record(name, time.perf_counter() - started_at)
+
+            return wrapper  # type: ignore[return-value]
+
+        return decorator
+
+    def summary(self) -> List[Tuple[str, float, int]]:
+        """
+        Returns the recorded phases.
+        Returns:
+            (name, total seconds, number of calls) tuples in the order
+            the phases were first entered.
+        """
+        return [
+            (name, total, self._calls[name])
+            for name, total in self._totals.items()
+        ]
+
+
+phase_timer = PhaseTimer()
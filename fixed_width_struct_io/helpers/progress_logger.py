@@ -0,0 +1,58 @@
+import logging
+import time
+
+
+class ProgressLogger:
+    """
+    Emits summary-level progress messages for long record loops.
+
+    A message with the number of processed records and the throughput
+    is logged every `interval` records, so per-record work in the loop
+    is reduced to a single integer comparison.
+
+    Attributes:
+        logger (logging.Logger): Logger used for the progress messages.
+        label (str): Name of the operation shown in the messages.
+        interval (int): Number of records between two messages.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        label: str,
+        interval: int,
+        level: int = logging.INFO,
+    ) -> None:
+        """Initializes the progress logger and starts its clock."""
+        self.logger = logger
+        self.label = label
+        self.interval = interval
+        self.level = level
+        self._enabled = interval > 0 and logger.isEnabledFor(level)
+        self._next_report = interval if self._enabled else -1
+        self._started_at = time.perf_counter()
+
+    def update(self, processed: int) -> None:
+        """Logs progress if `processed` reached the next report point."""
+        if processed == self._next_report:
+            self._next_report += self.interval
+            self._report(processed, "processed")
+
+    def finish(self, processed: int) -> None:
+        """Logs the final record count and the overall throughput."""
+        if self._enabled:
+            self._report(processed, "finished")
+
+    def _report(self, processed: int, state: str) -> None:
+        """Formats and emits a single progress message."""
+        elapsed = time.perf_counter() - self._started_at
+        rate = processed / elapsed if elapsed > 0 else 0.0
+        self.logger.log(
+            self.level,
+            "%s %s: %d records in %.3fs (%.0f records/sec).",
+            self.label,
+            state,
+            processed,
+            elapsed,
+            rate,
+        )
@@ -0,0 +1,11 @@
+from fixed_width_struct_io.indexes.amount_index import (  # noqa: F401, E501
+    AmountEntry,
+    AmountIndex,
+)
+from fixed_width_struct_io.indexes.currency_index import (  # noqa: F401, E501
+    CurrencyIndex,
+)
+from fixed_width_struct_io.indexes.maintained_indexes import (  # noqa: F401, E501
+    MaintainedIndexes,
+    maintained_indexes,
+)
@@ -0,0 +1,280 @@
+import bisect
+import heapq
+import logging
+import math
+import struct
+import sys
+import tempfile
+from array import array
+from collections import namedtuple
+from typing import IO, Iterator, List, Optional, Tuple
+
+from fixed_width_struct_io.constants import (
+    AMOUNT_INDEX_RUN_SIZE,
+    AMOUNT_INDEX_SUFFIX,
+    DEFAULT_LOCK_TIMEOUT,
+    FIELD_ORDER,
+    TRANSACTION_ID,
+)
+from fixed_width_struct_io.indexes.base import BaseIndex
+
+logger = logging.getLogger(__name__)
+
+AMOUNT_INDEX = FIELD_ORDER[TRANSACTION_ID].index("amount")
+COUNTER_INDEX = FIELD_ORDER[TRANSACTION_ID].index("counter")
+# Amount, position and counter of a transaction in a spilled sorted run.
+RUN_ENTRY = struct.Struct("<qII")
+RUN_READ_ENTRIES = 4096
+
+AmountEntry = namedtuple("AmountEntry", ["amount", "counter", "position"])
+
+
+def _little_endian(column: array) -> bytes:
+    """Returns the items of a column as little-endian bytes."""
+    if sys.byteorder == "little":
+        return column.tobytes()
+    swapped = array(column.typecode, column)
+    swapped.byteswap()
+    return swapped.tobytes()
+
+
+class AmountIndex(BaseIndex):
+    """
+    Secondary index of the transactions of a fixed-width file sorted by
+    amount.
+
+    The index keeps the amounts in cents, counters and positions of all
+    transactions in three packed columns sorted by amount and then by
+    position, so range, top-k and quantile queries take O(log n + k)
+    without reading the file. It is stored in a '<file>.amount-index'
+    sidecar; TransactionAppender and FieldEditor keep an existing, fresh
+    sidecar up to date on appends and on amount and counter edits.
+
+    The index is built with an external merge sort: the scanned entries
+    are sorted in runs of at most `run_size` entries, every full run is
+    spilled to a temporary file and the runs are merged, so the number of
+    entries held as Python objects does not depend on the file size.
+
+    Attributes:
+        amounts (array): The amounts in cents, in ascending order.
+        counters (array): The counters of the transactions.
+        positions (array): The 0-based positions of the transactions.
+        run_size (int): Maximum number of entries sorted in memory.
+    """
+
+    SUFFIX = AMOUNT_INDEX_SUFFIX
+    MAGIC = b"FWAIDX\x00\x00"
+    run_size = AMOUNT_INDEX_RUN_SIZE
+
+    def __init__(
+        self,
+        file_path: str,
+        lock_timeout: Optional[float] = DEFAULT_LOCK_TIMEOUT,
+    ) -> None:
+        """Initializes an empty index of a file."""
+        super().__init__(file_path, lock_timeout)
+        self.amounts = array("q")
+        self.counters = array("I")
+        self.positions = array("I")
+        self._run: List[Tuple[int, int, int]] = []
+        self._runs: List[IO[bytes]] = []
+
+    @property
+    def transaction_count(self) -> int:
+        """Number of indexed transactions."""
+        return len(self.amounts)
+
+    def between(
+        self,
+        min_amount: Optional[int] = None,
+        max_amount: Optional[int] = None,
+    ) -> List[AmountEntry]:
+        """
+        Returns the transactions with amounts in a range, in ascending
+        order of amount.
+        Args:
+            min_amount (Optional[int]): The smallest amount in cents, or
+                                        None for no lower bound.
+            max_amount (Optional[int]): The largest amount in cents, or
+                                        None for no upper bound.
+        Returns:
+            List[AmountEntry]: The matching transactions.
+        """
+        start = (
+            0
+            if min_amount is None
+            else bisect.bisect_left(self.amounts, min_amount)
+        )
+        end = (
+            len(self.amounts)
+            if max_amount is None
+            else bisect.bisect_right(self.amounts, max_amount)
+        )
+        return [self._entry(i) for i in range(start, end)]
+
+    def top(self, count: int) -> List[AmountEntry]:
+        """
+        Returns the transactions with the largest amounts, largest first.
+        Raises:
+            ValueError: If the count is negative.
+        """
+        if count < 0:
+            raise ValueError("The count must not be negative.")
+        end = max(len(self.amounts) - count, 0)
+        return [
+            self._entry(i) for i in range(len(self.amounts) - 1, end - 1, -1)
+        ]
+
+    def quantile(self, fraction: float) -> AmountEntry:
+        """
+        Returns the transaction at a quantile of the amounts, using the
+        nearest-rank method, e.g. 0.5 for the median.
+        Raises:
+            ValueError: If the fraction is not between 0 and 1 or the file
+                        has no transactions.
+        """
+        if not 0 <= fraction <= 1:
+            raise ValueError("The quantile must be between 0 and 1.")
+        if not self.amounts:
+            raise ValueError(f"{self.file_path} has no transactions.")
+        rank = max(math.ceil(fraction * len(self.amounts)), 1)
+        return self._entry(rank - 1)
+
+    def append(self, amount: int, counter: int) -> None:
+        """Adds a transaction after the last one."""
+        position = len(self.amounts)
+        self._insert(
+            bisect.bisect_right(self.amounts, amount),
+            amount,
+            counter,
+            position,
+        )
+
+    def set_amount(self, position: int, amount: int) -> None:
+        """Changes the amount of the transaction at a position."""
+        i = self.positions.index(position)
+        counter = self.counters[i]
+        del self.amounts[i], self.counters[i], self.positions[i]
+        start = bisect.bisect_left(self.amounts, amount)
+        end = bisect.bisect_right(self.amounts, amount)
+        while start < end and self.positions[start] < position:
+            start += 1
+        self._insert(start, amount, counter, position)
+
+    def set_counter(self, position: int, counter: int) -> None:
+        """Changes the counter of the transaction at a position."""
+        self.counters[self.positions.index(position)] = counter
+
+    def _entry(self, i: int) -> AmountEntry:
+        """Returns the i-th entry in ascending order of amount."""
+        return AmountEntry(
+            self.amounts[i], self.counters[i], self.positions[i]
+        )
+
+    def _insert(
+        self, i: int, amount: int, counter: int, position: int
+    ) -> None:
+        """Inserts an entry before the i-th one."""
+        self.amounts.insert(i, amount)
+        self.counters.insert(i, counter)
+        self.positions.insert(i, position)
+
+    def _reset(self) -> None:
+        """Removes all entries and spilled runs."""
+        self.amounts = array("q")
+        self.counters = array("I")
+        self.positions = array("I")
+        self._run = []
+        for run in self._runs:
+            run.close()
+        self._runs = []
+
+    def _add(
+        self, position: int, fields: List[bytes], line_number: int
+    ) -> None:
+        """
+        Adds the transaction at a position to the current run, spilling
+        the run once it is full.
+        Raises:
+            ValueError: If the amount or counter is not a number.
+        """
+        values = []
+        for field, index in (
+            ("amount", AMOUNT_INDEX),
+            ("counter", COUNTER_INDEX),
+        ):
+            value = fields[index] if len(fields) > index else b""
+            if not value.isdigit():
+                raise ValueError(
+                    f"Cannot index {self.file_path}: the {field} on line "
+                    f"{line_number} is not a number."
+                )
+            values.append(int(value))
+        amount, counter = values
+        self._run.append((amount, position, counter))
+        if len(self._run) >= self.run_size:
+            self._spill()
+
+    def _spill(self) -> None:
+        """Sorts the current run and writes it to a temporary file."""
+        self._run.sort()
+        run = tempfile.TemporaryFile(prefix=".amount-run-")
+        run.write(b"".join(RUN_ENTRY.pack(*entry) for entry in self._run))
+        run.seek(0)
+        self._runs.append(run)
+        self._run = []
+
+    @staticmethod
+    def _read_run(run: IO[bytes]) -> Iterator[Tuple[int, int, int]]:
+        """Yields the entries of a spilled run in chunks."""
+        while True:
+            chunk = run.read(RUN_ENTRY.size * RUN_READ_ENTRIES)
+            if not chunk:
+                return
+            yield from RUN_ENTRY.iter_unpack(chunk)
+
+    def _finish(self) -> None:
+        """Merges the spilled runs and the current run into the columns."""
+        self._run.sort()
+        merged = heapq.merge(
+            *(self._read_run(run) for run in self._runs), self._run
+        )
+        for amount, position, counter in merged:
+            self.amounts.append(amount)
+            self.counters.append(counter)
+            self.positions.append(position)
+        if self._runs:
+            logger.debug(
+                f"Merged {len(self._runs)} spilled run(s) of "
+                f"{self.file_path}."
+            )
+        for run in self._runs:
+            run.close()
+        self._run, self._runs = [], []
+
+    def _pack(self) -> Tuple[int, bytes]:
+        """Returns the number of entries and the packed columns."""
+        return len(self.amounts), b"".join(
+            _little_endian(column)
+            for column in (self.amounts, self.counters, self.positions)
+        )
+
+    def _unpack(self, entry_count: int, body: memoryview) -> None:
+        """
+        Reads the packed columns.
+        Raises:
+            ValueError: If the columns are truncated.
+        """
+        columns = (array("q"), array("I"), array("I"))
+        if len(body) != entry_count * sum(
+            column.itemsize for column in columns
+        ):
+            raise ValueError("truncated columns")
+        offset = 0
+        for column in columns:
+            end = offset + entry_count * column.itemsize
+            column.frombytes(body[offset:end])
+            if sys.byteorder != "little":
+                column.byteswap()
+            offset = end
+        self.amounts, self.counters, self.positions = columns
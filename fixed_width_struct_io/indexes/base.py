@@ -0,0 +1,413 @@
+import logging
+import os
+import struct
+import tempfile
+import zlib
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import (
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from fixed_width_struct_io.constants import (
+    DEFAULT_LOCK_TIMEOUT,
+    FOOTER_ID,
+    HEADER_ID,
+    PROGRESS_LOG_INTERVAL,
+    TRANSACTION_ID,
+)
+from fixed_width_struct_io.core import FileLock
+from fixed_width_struct_io.helpers import ProgressLogger, phase_timer
+from fixed_width_struct_io.metrics.library_metrics import (
+    BYTES_READ,
+    RECORDS_READ,
+)
+
+logger = logging.getLogger(__name__)
+
+# Magic, version, number of entries, file size, file mtime in nanoseconds,
+# offset of the first transaction, transaction record length, length of
+# the records after the last transaction and crc32 of the entries.
+INDEX_HEADER = struct.Struct("<8sHIQqQQQI")
+
+IndexType = TypeVar("IndexType", bound="BaseIndex")
+
+
+class BaseIndex(ABC):
+    """
+    Abstract base class for secondary indexes of the transactions of a
+    fixed-width file, persisted in a binary sidecar next to the file.
+
+    Transaction records all have the same length, so the 0-based position
+    of a transaction maps to a byte offset and indexed reads seek straight
+    to the matching records. An index is built in one pass and stored with
+    the size and mtime of the file it describes and a CRC-32 of its
+    entries; a stale or invalid sidecar is rebuilt when it is loaded.
+    Writers keep an existing, fresh sidecar up to date through
+    `maintained`. Files whose transaction records do not all have the same
+    length cannot be indexed.
+
+    Subclasses define the sidecar suffix and magic, collect their entries
+    while the file is scanned and pack them for the sidecar.
+
+    Attributes:
+        file_path (str): Path to the indexed file.
+        lock_timeout (Optional[float]): Seconds to wait for the file lock.
+        first_offset (int): Byte offset of the first transaction.
+        record_length (int): Length in bytes of a transaction record,
+                             including its line break.
+        trailer_length (int): Length in bytes of the records after the last
+                              transaction, i.e. the footer.
+    """
+
+    SUFFIX = ""
+    MAGIC = b""
+    FORMAT_VERSION = 1
+
+    def __init__(
+        self,
+        file_path: str,
+        lock_timeout: Optional[float] = DEFAULT_LOCK_TIMEOUT,
+    ) -> None:
+        """Initializes an empty index of a file."""
+        self.file_path = file_path
+        self.lock_timeout = lock_timeout
+        self.first_offset = self.record_length = self.trailer_length = 0
+        self._size = self._mtime_ns = -1
+
+    @property
+    def sidecar_path(self) -> str:
+        """Path of the sidecar file storing the index."""
+        return f"{self.file_path}{self.SUFFIX}"
+
+    @property
+    @abstractmethod
+    def transaction_count(self) -> int:
+        """Number of indexed transactions."""
+        raise NotImplementedError
+
+    def offset(self, position: int) -> int:
+        """Returns the byte offset of the transaction at a position."""
+        return self.first_offset + position * self.record_length
+
+    @classmethod
+    def build(
+        cls: Type[IndexType],
+        file_path: str,
+        lock_timeout: Optional[float] = DEFAULT_LOCK_TIMEOUT,
+    ) -> IndexType:
+        """
+        Builds the index by scanning the file and saves its sidecar.
+        Args:
+            file_path (str): Path to the file to index.
+            lock_timeout (Optional[float]): Seconds to wait for the lock.
+        Returns:
+            The index of the file.
+        Raises:
+            ValueError: If the file cannot be indexed.
+        """
+        index = cls(file_path, lock_timeout)
+        with FileLock(file_path, timeout=lock_timeout):
+            index._scan()
+            index.save()
+        return index
+
+    @classmethod
+    def load(
+        cls: Type[IndexType],
+        file_path: str,
+        lock_timeout: Optional[float] = DEFAULT_LOCK_TIMEOUT,
+    ) -> IndexType:
+        """
+        Loads the index from its sidecar file, or scans the file and saves
+        a new sidecar if it is missing or describes another version of the
+        file.
+        Args:
+            file_path (str): Path to the indexed file.
+            lock_timeout (Optional[float]): Seconds to wait for the lock.
+        Returns:
+            The index of the file.
+        Raises:
+            ValueError: If the file cannot be indexed.
+        """
+        index = cls(file_path, lock_timeout)
+        with FileLock(file_path, timeout=lock_timeout):
+            index._refresh()
+        return index
+
+    @classmethod
+    @contextmanager
+    def maintained(
+        cls: Type[IndexType], file_path: Optional[str]
+    ) -> Iterator[Optional[IndexType]]:
+        """
+        Context manager for writers updating an indexed file under its
+        exclusive lock. It yields the index if the file has a fresh sidecar
+        and None otherwise; the writer applies its changes to the yielded
+        index, which is saved for the new version of the file on exit. If
+        the file no longer has the layout the index expects, the sidecar is
+        removed instead and rebuilt by the next load.
+        Args:
+            file_path (Optional[str]): Path to the file, if any.
+        Yields:
+            Optional[BaseIndex]: The index to update, or None.
+        """
+        index = None
+        if file_path and os.path.exists(f"{file_path}{cls.SUFFIX}"):
+            candidate = cls(file_path)
+            if candidate._read_sidecar() and candidate._is_fresh():
+                index = candidate
+        yield index
+        if index is not None:
+            index._restamp()
+
+    def save(self) -> None:
+        """
+        Writes the index to its sidecar file. An index that cannot be
+        written is only logged, since it can always be rebuilt.
+        """
+        entry_count, body = self._pack()
+        header = INDEX_HEADER.pack(
+            self.MAGIC,
+            self.FORMAT_VERSION,
+            entry_count,
+            self._size,
+            self._mtime_ns,
+            self.first_offset,
+            self.record_length,
+            self.trailer_length,
+            zlib.crc32(body),
+        )
+        try:
+            file_descriptor, temporary_path = tempfile.mkstemp(
+                dir=os.path.dirname(os.path.abspath(self.sidecar_path)),
+                prefix=".index-",
+            )
+            try:
+                with os.fdopen(file_descriptor, "wb") as sidecar:
+                    sidecar.write(header)
+                    sidecar.write(body)
+                os.replace(temporary_path, self.sidecar_path)
+            except OSError:
+                os.remove(temporary_path)
+                raise
+        except OSError as e:
+            logger.warning(f"Failed to save {self.sidecar_path}: {e}")
+
+    @abstractmethod
+    def _reset(self) -> None:
+        """Removes all entries before the file is scanned."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def _add(
+        self, position: int, fields: List[bytes], line_number: int
+    ) -> None:
+        """
+        Adds the transaction at a position while the file is scanned.
+        Args:
+            position (int): The 0-based position of the transaction.
+            fields (List[bytes]): The fields of the transaction record.
+            line_number (int): The line number of the record.
+        Raises:
+            ValueError: If the transaction cannot be indexed.
+        """
+        raise NotImplementedError
+
+    def _finish(self) -> None:
+        """Completes the entries after the file was scanned."""
+
+    @abstractmethod
+    def _pack(self) -> Tuple[int, bytes]:
+        """Returns the number of entries and the packed entries."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def _unpack(self, entry_count: int, body: memoryview) -> None:
+        """
+        Reads the packed entries of a sidecar.
+        Raises:
+            ValueError: If the entries are invalid.
+        """
+        raise NotImplementedError
+
+    def _read_lines(
+        self, positions: Callable[[], Iterable[int]]
+    ) -> Iterator[str]:
+        """
+        Yields the transaction lines at the positions, reading only their
+        records under a shared lock. The index is refreshed first if the
+        file changed since it was loaded, and only then are the positions
+        taken from it.
+        Args:
+            positions: Returns the positions to read from the refreshed
+                       index.
+        Raises:
+            ValueError: If a record at an indexed offset is not a
+                        transaction.
+        """
+        transactions = 0
+        with FileLock(self.file_path, timeout=self.lock_timeout):
+            if not self._is_fresh():
+                self._refresh()
+            with open(self.file_path, "rb") as file:
+                for transactions, position in enumerate(positions(), start=1):
+                    offset = self.offset(position)
+                    if file.tell() != offset:
+                        file.seek(offset)
+                    record = file.read(self.record_length)
+                    if not record.startswith(TRANSACTION_ID.encode()):
+                        raise ValueError(
+                            f"The index {self.sidecar_path} does not match "
+                            f"the file at offset {offset}."
+                        )
+                    yield record.decode().rstrip("\n").rstrip("\r")
+        BYTES_READ.inc(transactions * self.record_length)
+        RECORDS_READ.inc(transactions)
+
+    def _is_fresh(self) -> bool:
+        """Whether the index describes the current version of the file."""
+        file_stat = os.stat(self.file_path)
+        return (
+            self._size == file_stat.st_size
+            and self._mtime_ns == file_stat.st_mtime_ns
+        )
+
+    def _refresh(self) -> None:
+        """Reads a fresh sidecar, or scans the file and saves one."""
+        if self._read_sidecar() and self._is_fresh():
+            return
+        self._scan()
+        self.save()
+
+    def _read_sidecar(self) -> bool:
+        """
+        Reads the index from its sidecar file.
+        Returns:
+            bool: True if the sidecar was read, False if it is missing or
+                  invalid.
+        """
+        try:
+            with open(self.sidecar_path, "rb") as sidecar:
+                data = sidecar.read()
+        except FileNotFoundError:
+            logger.debug(f"No index {self.sidecar_path}.")
+            return False
+        try:
+            (
+                magic,
+                version,
+                entry_count,
+                size,
+                mtime_ns,
+                first_offset,
+                record_length,
+                trailer_length,
+                checksum,
+            ) = INDEX_HEADER.unpack_from(data)
+            header_size = INDEX_HEADER.size
+            body = memoryview(data)[header_size:]
+            if magic != self.MAGIC or version != self.FORMAT_VERSION:
+                raise ValueError("unknown format")
+            if zlib.crc32(body) != checksum:
+                raise ValueError("checksum mismatch")
+            self._unpack(entry_count, body)
+        except (struct.error, ValueError) as e:
+            logger.warning(f"Ignoring invalid index {self.sidecar_path}: {e}")
+            self._reset()
+            return False
+        self.first_offset = first_offset
+        self.record_length = record_length
+        self.trailer_length = trailer_length
+        self._size, self._mtime_ns = size, mtime_ns
+        return True
+
+    @phase_timer.timed("index")
+    def _scan(self) -> None:
+        """
+        Builds the index in one pass over the file.
+        Raises:
+            ValueError: If the file is empty, has records out of order,
+                        transaction records of different lengths or a
+                        transaction that cannot be indexed.
+        """
+        header_id, footer_id = HEADER_ID.encode(), FOOTER_ID.encode()
+        transaction_id = TRANSACTION_ID.encode()
+        self._reset()
+        self.first_offset = self.record_length = 0
+        file_stat = os.stat(self.file_path)
+        transactions = line_number = 0
+        footer_found = False
+        progress = ProgressLogger(logger, "Index", PROGRESS_LOG_INTERVAL)
+        with open(self.file_path, "rb") as file:
+            for line_number, line in enumerate(file, start=1):
+                if line_number == 1 and line.startswith(header_id):
+                    self.first_offset = len(line)
+                elif not footer_found and line.startswith(transaction_id):
+                    if not self.record_length:
+                        self.record_length = len(line)
+                    elif len(line) != self.record_length:
+                        raise ValueError(
+                            f"Cannot index {self.file_path}: the transaction "
+                            f"on line {line_number} has another length."
+                        )
+                    self._add(transactions, line.split(b","), line_number)
+                    transactions += 1
+                elif (
+                    line_number != 1
+                    and not footer_found
+                    and line.startswith(footer_id)
+                ):
+                    footer_found = True
+                else:
+                    raise ValueError(
+                        f"Cannot index {self.file_path}: unexpected record "
+                        f"on line {line_number}."
+                    )
+                progress.update(line_number)
+        RECORDS_READ.inc(line_number)
+        BYTES_READ.inc(file_stat.st_size)
+        progress.finish(line_number)
+        if line_number == 0:
+            raise ValueError(f"Cannot index {self.file_path}: it is empty.")
+        self._finish()
+        self.trailer_length = (
+            file_stat.st_size
+            - self.first_offset
+            - transactions * self.record_length
+        )
+        self._size, self._mtime_ns = file_stat.st_size, file_stat.st_mtime_ns
+        logger.info(
+            f"Indexed {transactions} transaction(s) of {self.file_path} in "
+            f"{self.sidecar_path}."
+        )
+
+    def _restamp(self) -> None:
+        """
+        Saves the index for the current version of the file after a
+        writer updated it, or removes the sidecar if the file no longer has
+        the expected layout.
+        """
+        file_stat = os.stat(self.file_path)
+        records_length = (
+            file_stat.st_size - self.first_offset - self.trailer_length
+        )
+        if self.transaction_count * self.record_length != records_length:
+            logger.info(
+                f"Removing the index {self.sidecar_path}, the file layout "
+                f"changed."
+            )
+            try:
+                os.remove(self.sidecar_path)
+            except FileNotFoundError:
+                pass
+            return
+        self._size, self._mtime_ns = file_stat.st_size, file_stat.st_mtime_ns
+        self.save()
@@ -0,0 +1,170 @@
+import bisect
+import logging
+import struct
+import sys
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from fixed_width_struct_io.constants import (
+    CURRENCY_INDEX_SUFFIX,
+    DEFAULT_LOCK_TIMEOUT,
+    FIELD_ORDER,
+    TRANSACTION_ID,
+)
+from fixed_width_struct_io.indexes.base import BaseIndex
+
+logger = logging.getLogger(__name__)
+
+# Currency code and number of positions, followed by the positions.
+CURRENCY_ENTRY = struct.Struct("<3sxI")
+CURRENCY_LENGTH = 3
+COUNTER_INDEX = FIELD_ORDER[TRANSACTION_ID].index("counter")
+AMOUNT_INDEX = FIELD_ORDER[TRANSACTION_ID].index("amount")
+CURRENCY_INDEX = FIELD_ORDER[TRANSACTION_ID].index("currency")
+
+
+class CurrencyIndex(BaseIndex):
+    """
+    Secondary index of the transactions of a fixed-width file by currency.
+
+    For every currency code the index keeps a packed, sorted array of the
+    0-based positions of its transactions. Codes are case-insensitive, like
+    in the validators, and kept in upper case. Filtered reads seek straight
+    to the matching records instead of decoding every line. It is stored in
+    a '<file>.currency-index' sidecar; TransactionAppender and FieldEditor
+    keep an existing, fresh sidecar up to date when they write the file.
+
+    Attributes:
+        positions (Dict[str, array]): Sorted transaction positions by
+                                      upper-case currency code.
+    """
+
+    SUFFIX = CURRENCY_INDEX_SUFFIX
+    MAGIC = b"FWCIDX\x00\x00"
+    FORMAT_VERSION = 2
+
+    def __init__(
+        self,
+        file_path: str,
+        lock_timeout: Optional[float] = DEFAULT_LOCK_TIMEOUT,
+    ) -> None:
+        """Initializes an empty index of a file."""
+        super().__init__(file_path, lock_timeout)
+        self.positions: Dict[str, array] = {}
+
+    @property
+    def transaction_count(self) -> int:
+        """Number of indexed transactions."""
+        return sum(len(positions) for positions in self.positions.values())
+
+    def counts(self) -> Dict[str, int]:
+        """Returns the number of transactions of every currency."""
+        return {
+            currency: len(positions)
+            for currency, positions in sorted(self.positions.items())
+        }
+
+    def append(self, currency: str) -> None:
+        """Adds a transaction after the last one."""
+        self._positions_of(currency).append(self.transaction_count)
+
+    def set_currency(self, position: int, currency: str) -> None:
+        """Moves the transaction at a position to another currency."""
+        for code, positions in list(self.positions.items()):
+            found = bisect.bisect_left(positions, position)
+            if found < len(positions) and positions[found] == position:
+                del positions[found]
+                if not positions:
+                    del self.positions[code]
+                break
+        bisect.insort(self._positions_of(currency), position)
+
+    def lines(self, currency: str) -> Iterator[str]:
+        """
+        Yields the transaction lines of a currency in file order, reading
+        only their records under a shared lock. The index is refreshed
+        first if the file changed since it was loaded.
+        Args:
+            currency (str): The currency code in any case, e.g. 'EUR'.
+        Raises:
+            ValueError: If a record at an indexed offset is not a
+                        transaction.
+        """
+        return self._read_lines(
+            lambda: self.positions.get(currency.upper(), array("I"))
+        )
+
+    def total(self, currency: str) -> int:
+        """
+        Returns the sum of the amounts of a currency, in any case, in
+        cents.
+        Raises:
+            ValueError: If an amount is not a number.
+        """
+        total = 0
+        for line in self.lines(currency):
+            fields = line.split(",")
+            amount = fields[AMOUNT_INDEX] if len(fields) > AMOUNT_INDEX else ""
+            if not amount.isdigit():
+                raise ValueError(
+                    f"The amount of transaction {fields[COUNTER_INDEX]} is "
+                    f"not a number."
+                )
+            total += int(amount)
+        return total
+
+    def _positions_of(self, currency: str) -> array:
+        """
+        Returns the positions of a currency in any case, adding it if it
+        is new.
+        Raises:
+            ValueError: If the currency code cannot be indexed.
+        """
+        currency = currency.upper()
+        if currency not in self.positions:
+            if len(currency.encode()) != CURRENCY_LENGTH:
+                raise ValueError(f"Cannot index currency '{currency}'.")
+            self.positions[currency] = array("I")
+        return self.positions[currency]
+
+    def _reset(self) -> None:
+        """Removes all positions."""
+        self.positions = {}
+
+    def _add(
+        self, position: int, fields: List[bytes], line_number: int
+    ) -> None:
+        """Adds the transaction at a position to its currency."""
+        currency = (
+            fields[CURRENCY_INDEX].decode()
+            if len(fields) > CURRENCY_INDEX
+            else ""
+        )
+        self._positions_of(currency).append(position)
+
+    def _pack(self) -> Tuple[int, bytes]:
+        """Returns the number of currencies and their packed positions."""
+        entries: List[bytes] = []
+        for currency, positions in sorted(self.positions.items()):
+            packed = array("I", positions)
+            if sys.byteorder != "little":
+                packed.byteswap()
+            entries.append(CURRENCY_ENTRY.pack(currency.encode(), len(packed)))
+            entries.append(packed.tobytes())
+        return len(self.positions), b"".join(entries)
+
+    def _unpack(self, entry_count: int, body: memoryview) -> None:
+        """Reads the packed positions of every currency."""
+        positions: Dict[str, array] = {}
+        offset = 0
+        for _ in range(entry_count):
+            currency, count = CURRENCY_ENTRY.unpack_from(body, offset)
+            offset += CURRENCY_ENTRY.size
+            packed = array("I")
+            end = offset + count * packed.itemsize
+            packed.frombytes(body[offset:end])
+            if sys.byteorder != "little":
+                packed.byteswap()
+            offset = end
+            positions[currency.decode()] = packed
+        self.positions = positions
@@ -0,0 +1,27 @@
+from collections import namedtuple
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from fixed_width_struct_io.indexes.amount_index import AmountIndex
+from fixed_width_struct_io.indexes.currency_index import CurrencyIndex
+
+MaintainedIndexes = namedtuple("MaintainedIndexes", ["currency", "amount"])
+
+
+@contextmanager
+def maintained_indexes(
+    file_path: Optional[str],
+) -> Iterator[MaintainedIndexes]:
+    """
+    Context manager for writers updating a file under its exclusive lock,
+    yielding every index of the file that has a fresh sidecar, or None in
+    its place. The indexes are saved for the new version of the file on
+    exit.
+    Args:
+        file_path (Optional[str]): Path to the file, if any.
+    Yields:
+        MaintainedIndexes: The currency and amount indexes to update.
+    """
+    with CurrencyIndex.maintained(file_path) as currency_index:
+        with AmountIndex.maintained(file_path) as amount_index:
+            yield MaintainedIndexes(currency_index, amount_index)
@@ -0,0 +1,23 @@
+from fixed_width_struct_io.metrics.registry import (  # noqa: F401, E501
+    Counter,
+    Histogram,
+    MetricsRegistry,
+    metrics,
+)
+from fixed_width_struct_io.metrics.exporters import (  # noqa: F401, E501
+    write_metrics,
+)
+from fixed_width_struct_io.metrics.library_metrics import (  # noqa: F401, E501
+    APPENDS,
+    BYTES_READ,
+    BYTES_WRITTEN,
+    CACHE_EVICTIONS,
+    CACHE_HITS,
+    CACHE_MISSES,
+    EDITS,
+    LOCK_TIMEOUTS,
+    LOCK_WAIT_SECONDS,
+    RECORDS_PARSED,
+    RECORDS_READ,
+    VALIDATION_SECONDS,
+)
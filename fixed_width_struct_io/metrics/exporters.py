@@ -0,0 +1,49 @@
+import json
+import logging
+import os
+import tempfile
+
+from fixed_width_struct_io.metrics.registry import MetricsRegistry, metrics
+
+logger = logging.getLogger(__name__)
+
+FORMAT_PROMETHEUS = "prometheus"
+FORMAT_JSON = "json"
+EXPORT_FORMATS = [FORMAT_PROMETHEUS, FORMAT_JSON]
+
+
+def write_metrics(
+    path: str,
+    export_format: str = FORMAT_PROMETHEUS,
+    registry: MetricsRegistry = metrics,
+) -> None:
+    """
+    Writes the registry to a file, replacing it atomically so that a
+    Prometheus textfile collector never reads a partial file.
+    Args:
+        path: Output file path.
+        export_format: 'prometheus' (text exposition format) or 'json'.
+        registry: The registry to export.
+    Raises:
+        ValueError: If the export format is unknown.
+    """
+    if export_format == FORMAT_PROMETHEUS:
+        content = registry.render_prometheus()
+    elif export_format == FORMAT_JSON:
+        content = json.dumps(registry.as_dict(), indent=2) + "\n"
+    else:
+        raise ValueError(f"Unknown metrics format: {export_format}")
+
+    directory = os.path.dirname(os.path.abspath(path))
+    file_descriptor, temporary_path = tempfile.mkstemp(
+        dir=directory, prefix=".metrics-"
+    )
+    try:
+        with os.fdopen(file_descriptor, "w") as file:
+            file.write(content)
+        os.chmod(temporary_path, 0o644)
+        os.replace(temporary_path, path)
+    except OSError:
+        os.remove(temporary_path)
+        raise
+    logger.info(f"Metrics written to {path}.")
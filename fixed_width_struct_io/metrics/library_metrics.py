@@ -0,0 +1,56 @@
+from fixed_width_struct_io.metrics.registry import metrics
+
+RECORDS_READ = metrics.counter(
+    "fixed_width_records_read_total",
+    "Records read from fixed-width files.",
+)
+RECORDS_PARSED = metrics.counter(
+    "fixed_width_records_parsed_total",
+    "Records split into fields by the field retriever.",
+)
+BYTES_READ = metrics.counter(
+    "fixed_width_bytes_read_total",
+    "Bytes read from fixed-width files.",
+)
+BYTES_WRITTEN = metrics.counter(
+    "fixed_width_bytes_written_total",
+    "Bytes written to fixed-width files.",
+)
+VALIDATION_SECONDS = metrics.histogram(
+    "fixed_width_validation_seconds",
+    "Time spent in a validator run, in seconds.",
+    label_names=["validator"],
+)
+EDITS = metrics.counter(
+    "fixed_width_edits_total",
+    "Field values edited.",
+)
+APPENDS = metrics.counter(
+    "fixed_width_appends_total",
+    "Transactions appended.",
+)
+CACHE_HITS = metrics.counter(
+    "fixed_width_cache_hits_total",
+    "Lookups answered from an in-memory cache.",
+    label_names=["cache"],
+)
+CACHE_MISSES = metrics.counter(
+    "fixed_width_cache_misses_total",
+    "Lookups that had to load or parse the file.",
+    label_names=["cache"],
+)
+LOCK_WAIT_SECONDS = metrics.histogram(
+    "fixed_width_lock_wait_seconds",
+    "Time spent waiting to acquire a lock, in seconds.",
+    label_names=["lock"],
+)
+LOCK_TIMEOUTS = metrics.counter(
+    "fixed_width_lock_timeouts_total",
+    "Lock acquisitions that gave up after their timeout.",
+    label_names=["lock"],
+)
+CACHE_EVICTIONS = metrics.counter(
+    "fixed_width_cache_evictions_total",
+    "Cache entries evicted to stay within the size limit.",
+    label_names=["cache"],
+)
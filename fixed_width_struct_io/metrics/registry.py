@@ -0,0 +1,340 @@
+import functools
+import math
+import threading
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+LabelKey = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+    5.0,
+    10.0,
+    60.0,
+)
+
+
+class Metric:
+    """
+    Base class of the registry metrics.
+
+    Values are kept per combination of label values. Updates take a
+    per-metric lock, so metrics can be shared by threads; they are made
+    once per operation, never per record.
+
+    Attributes:
+        name (str): Metric name, used as is in the exports.
+        description (str): One-line help text.
+        label_names (Tuple[str, ...]): Names of the labels of the metric.
+    """
+
+    kind = ""
+
+    def __init__(
+        self, name: str, description: str, label_names: Sequence[str] = ()
+    ) -> None:
+        """Initializes the metric without any samples."""
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def _label_key(self, labels: Dict[str, str]) -> LabelKey:
+        """
+        Returns the label values in the order of `label_names`.
+        Raises:
+            ValueError: If the labels do not match the label names.
+        """
+        if set(labels) != set(self.label_names):
+            raise ValueError(
+                f"Metric '{self.name}' expects labels "
+                f"{list(self.label_names)}, got {sorted(labels)}."
+            )
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def labels_of(self, key: LabelKey) -> Dict[str, str]:
+        """Returns the labels dictionary of a label key."""
+        return dict(zip(self.label_names, key))
+
+    def reset(self) -> None:
+        """Removes all samples."""
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """A monotonically increasing value, such as a number of records."""
+
+    kind = "counter"
+
+    def __init__(
+        self, name: str, description: str, label_names: Sequence[str] = ()
+    ) -> None:
+        """Initializes the counter without any samples."""
+        super().__init__(name, description, label_names)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """Increases the counter of the given labels by `amount`."""
+        key = self._label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        """Returns the current value of the given labels."""
+        return self._values.get(self._label_key(labels), 0)
+
+    def samples(self) -> List[Tuple[LabelKey, float]]:
+        """Returns (label key, value) pairs of all label combinations."""
+        with self._lock:
+            return list(self._values.items())
+
+    def reset(self) -> None:
+        """Removes all samples."""
+        with self._lock:
+            self._values.clear()
+
+
+class HistogramSample:
+    """Bucket counts, sum and count of one label combination."""
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        """Initializes an empty sample."""
+        self.bucket_counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+
+class Histogram(Metric):
+    """A distribution of observed values, such as durations in seconds."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        """Initializes the histogram without any samples."""
+        super().__init__(name, description, label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._samples: Dict[LabelKey, HistogramSample] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Records one observation for the given labels."""
+        key = self._label_key(labels)
+        with self._lock:
+            sample = self._samples.get(key)
+            if sample is None:
+                sample = self._samples[key] = HistogramSample(self.buckets)
+            sample.sum += value
+            sample.count += 1
+            for index, upper_bound in enumerate(self.buckets):
+                if value <= upper_bound:
+                    sample.bucket_counts[index] += 1
+                    break
+
+    def timed(self, **labels: str) -> Callable[[F], F]:
+        """Decorator observing the duration of every call in seconds."""
+
+        def decorator(function: F) -> F:
+            @functools.wraps(function)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                started_at = time.perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.observe(time.perf_counter() - started_at, **labels)
+
+            return wrapper  # type: ignore[return-value]
+
+        return decorator
+
+    def count(self, **labels: str) -> int:
+        """Returns the number of observations of the given labels."""
+        sample = self._samples.get(self._label_key(labels))
+        return sample.count if sample else 0
+
+    def samples(self) -> List[Tuple[LabelKey, HistogramSample]]:
+        """Returns (label key, sample) pairs of all label combinations."""
+        with self._lock:
+            return list(self._samples.items())
+
+    def reset(self) -> None:
+        """Removes all samples."""
+        with self._lock:
+            self._samples.clear()
+
+
+class MetricsRegistry:
+    """
+    Holds the metrics of a process and renders them for export.
+
+    Metrics are created once with `counter` or `histogram`; asking for an
+    existing name returns the registered metric.
+    """
+
+    def __init__(self) -> None:
+        """Initializes an empty registry."""
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def counter(
+        self, name: str, description: str, label_names: Sequence[str] = ()
+    ) -> Counter:
+        """Returns the counter `name`, registering it if needed."""
+        return self._register(Counter(name, description, label_names))
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Returns the histogram `name`, registering it if needed."""
+        return self._register(
+            Histogram(name, description, label_names, buckets)
+        )
+
+    def _register(self, metric: Any) -> Any:
+        """
+        Registers a metric unless one with the same name exists.
+        Raises:
+            ValueError: If the name is registered with another type.
+        """
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is None:
+                self._metrics[metric.name] = metric
+                return metric
+        if type(existing) is not type(metric):
+            raise ValueError(
+                f"Metric '{metric.name}' is already registered "
+                f"as a {existing.kind}."
+            )
+        return existing
+
+    def get(self, name: str) -> Optional[Metric]:
+        """Returns the metric `name`, or None if it is not registered."""
+        return self._metrics.get(name)
+
+    def collect(self) -> List[Metric]:
+        """Returns the registered metrics sorted by name."""
+        return sorted(self._metrics.values(), key=lambda metric: metric.name)
+
+    def reset(self) -> None:
+        """Removes the samples of every metric, keeping the metrics."""
+        for metric in self.collect():
+            metric.reset()
+
+    def as_dict(self) -> dict:
+        """Returns every metric and its samples as a JSON-ready dict."""
+        exported: dict = {}
+        for metric in self.collect():
+            entry: dict = {
+                "type": metric.kind,
+                "description": metric.description,
+                "samples": [],
+            }
+            if isinstance(metric, Counter):
+                for key, value in metric.samples():
+                    entry["samples"].append(
+                        {"labels": metric.labels_of(key), "value": value}
+                    )
+            elif isinstance(metric, Histogram):
+                entry["buckets"] = list(metric.buckets)
+                for key, sample in metric.samples():
+                    entry["samples"].append(
+                        {
+                            "labels": metric.labels_of(key),
+                            "bucket_counts": list(sample.bucket_counts),
+                            "sum": sample.sum,
+                            "count": sample.count,
+                        }
+                    )
+            exported[metric.name] = entry
+        return exported
+
+    def render_prometheus(self) -> str:
+        """Renders every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for metric in self.collect():
+            lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            if isinstance(metric, Counter):
+                for key, value in metric.samples():
+                    lines.append(
+                        f"{metric.name}"
+                        f"{_format_labels(metric.labels_of(key))} "
+                        f"{_format_value(value)}"
+                    )
+            elif isinstance(metric, Histogram):
+                for key, sample in metric.samples():
+                    labels = metric.labels_of(key)
+                    cumulative = 0
+                    for upper_bound, bucket_count in zip(
+                        metric.buckets, sample.bucket_counts
+                    ):
+                        cumulative += bucket_count
+                        lines.append(
+                            f"{metric.name}_bucket"
+                            f"{_format_labels(labels, le=upper_bound)} "
+                            f"{cumulative}"
+                        )
+                    lines.append(
+                        f"{metric.name}_bucket"
+                        f"{_format_labels(labels, le=math.inf)} "
+                        f"{sample.count}"
+                    )
+                    lines.append(
+                        f"{metric.name}_sum{_format_labels(labels)} "
+                        f"{_format_value(sample.sum)}"
+                    )
+                    lines.append(
+                        f"{metric.name}_count{_format_labels(labels)} "
+                        f"{sample.count}"
+                    )
+        return "\n".join(lines) + "\n"
+
+
+def _format_value(value: float) -> str:
+    """Formats a sample value, writing whole numbers without decimals."""
+    if value == math.inf:
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+def _format_labels(labels: Dict[str, str], le: Optional[float] = None) -> str:
+    """Formats the label set of a sample, with an optional bucket bound."""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in labels.items()]
+    if le is not None:
+        pairs.append(f'le="{_format_value(le)}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    """Escapes a label value for the Prometheus text format."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+metrics = MetricsRegistry()
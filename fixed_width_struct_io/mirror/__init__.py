@@ -0,0 +1,4 @@
+from fixed_width_struct_io.mirror.sqlite_mirror import (  # noqa: F401, E501
+    SqliteMirror,
+    SyncResult,
+)
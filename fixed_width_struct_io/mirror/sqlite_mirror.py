@@ -0,0 +1,457 @@
+import hashlib
+import logging
+import os
+import sqlite3
+from collections import namedtuple
+from typing import Any, BinaryIO, Dict, List, Optional
+
+from fixed_width_struct_io.constants import (
+    DEFAULT_LOCK_TIMEOUT,
+    FIELD_ORDER,
+    FOOTER,
+    FOOTER_ID,
+    HEADER,
+    HEADER_ID,
+    RECORD_TYPES,
+    TRANSACTION,
+    TRANSACTION_ID,
+)
+from fixed_width_struct_io.core import FileLock
+from fixed_width_struct_io.helpers import phase_timer
+from fixed_width_struct_io.metrics.library_metrics import (
+    BYTES_READ,
+    RECORDS_PARSED,
+    RECORDS_READ,
+)
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+SYNC_BATCH_SIZE = 5000
+HASH_CHUNK_SIZE = 1024 * 1024
+AMOUNT_INDEX = FIELD_ORDER[TRANSACTION_ID].index("amount")
+COUNTER_WIDTH = 6
+RECORD_TABLES = {HEADER: "headers", FOOTER: "footers"}
+
+SyncResult = namedtuple("SyncResult", ["file_path", "mode", "transactions"])
+
+
+def _column(field_name: str) -> str:
+    """Returns the column name of a field, e.g. 'control_sum'."""
+    return field_name.replace(" ", "_")
+
+
+HEADER_COLUMNS = [_column(field) for field in FIELD_ORDER[HEADER_ID]]
+TRANSACTION_COLUMNS = [_column(field) for field in FIELD_ORDER[TRANSACTION_ID]]
+FOOTER_COLUMNS = [_column(field) for field in FIELD_ORDER[FOOTER_ID]]
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS files (
+    file_id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    synced_offset INTEGER NOT NULL,
+    prefix_sha256 TEXT NOT NULL,
+    transaction_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS headers (
+    file_id INTEGER PRIMARY KEY,
+    {", ".join(f"{column} TEXT" for column in HEADER_COLUMNS)}
+);
+CREATE TABLE IF NOT EXISTS transactions (
+    file_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    {", ".join(f"{column} TEXT" for column in TRANSACTION_COLUMNS)},
+    amount_cents INTEGER,
+    PRIMARY KEY (file_id, position)
+);
+CREATE INDEX IF NOT EXISTS transactions_counter
+    ON transactions (counter);
+CREATE INDEX IF NOT EXISTS transactions_currency
+    ON transactions (currency, amount_cents);
+CREATE INDEX IF NOT EXISTS transactions_amount
+    ON transactions (amount_cents);
+CREATE TABLE IF NOT EXISTS footers (
+    file_id INTEGER PRIMARY KEY,
+    {", ".join(f"{column} TEXT" for column in FOOTER_COLUMNS)}
+);
+"""
+
+
+def _pad(fields: List[str], count: int) -> List[Optional[str]]:
+    """Returns exactly `count` fields, padded with None."""
+    return (fields + [None] * count)[:count]
+
+
+class SqliteMirror:
+    """
+    Mirrors fixed-width files into a local SQLite database for indexed
+    queries across many files.
+
+    Every mirrored file has a row in `headers` and `footers` and one row
+    per transaction in `transactions`, with its 1-based position, the raw
+    field values and the amount in cents; transactions are indexed by
+    counter, currency and amount. Column names are the field names with
+    underscores, e.g. `control_sum`.
+
+    A sync is incremental: a file whose size and mtime did not change is
+    skipped, and when the part of the file up to its last mirrored
+    transaction still has the same SHA-256, only the tail after it is
+    parsed, so appended transactions cost in proportion to their number.
+    Any other change re-mirrors the whole file. Queries answer from the
+    database as of the last sync.
+
+    Attributes:
+        database_path (str): Path to the SQLite database.
+        lock_timeout (Optional[float]): Seconds to wait for file locks.
+    """
+
+    def __init__(
+        self,
+        database_path: str,
+        lock_timeout: Optional[float] = DEFAULT_LOCK_TIMEOUT,
+    ) -> None:
+        """Opens the database, creating its tables if needed."""
+        self.database_path = database_path
+        self.lock_timeout = lock_timeout
+        self._connection = sqlite3.connect(database_path)
+        self._connection.row_factory = sqlite3.Row
+        try:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            version = self._connection.execute(
+                "PRAGMA user_version"
+            ).fetchone()[0]
+            if version not in (0, SCHEMA_VERSION):
+                raise ValueError(
+                    f"{database_path} has an unsupported mirror schema "
+                    f"version {version}."
+                )
+            with self._connection:
+                self._connection.executescript(SCHEMA)
+                self._connection.execute(
+                    f"PRAGMA user_version = {SCHEMA_VERSION}"
+                )
+        except BaseException:
+            self._connection.close()
+            raise
+
+    def close(self) -> None:
+        """Closes the database."""
+        self._connection.close()
+
+    def __enter__(self) -> "SqliteMirror":
+        """Returns the mirror for use in a with statement."""
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Closes the database."""
+        self.close()
+
+    @phase_timer.timed("sync")
+    def sync(self, file_path: str) -> SyncResult:
+        """
+        Brings the mirror of a file up to date.
+        Args:
+            file_path (str): Path to the fixed-width file.
+        Returns:
+            SyncResult: The path, the sync mode ('unchanged', 'incremental'
+                        or 'full') and the number of mirrored transactions.
+        """
+        path = os.path.abspath(file_path)
+        with FileLock(file_path, timeout=self.lock_timeout):
+            with open(file_path, "rb") as file:
+                stat = os.fstat(file.fileno())
+                row = self._connection.execute(
+                    "SELECT * FROM files WHERE path = ?", (path,)
+                ).fetchone()
+                if (
+                    row is not None
+                    and row["size"] == stat.st_size
+                    and row["mtime_ns"] == stat.st_mtime_ns
+                ):
+                    logger.debug(f"Mirror of {path} is up to date.")
+                    return SyncResult(
+                        path, "unchanged", row["transaction_count"]
+                    )
+                with self._connection:
+                    result = self._sync_file(path, file, stat, row)
+        logger.info(
+            f"Mirrored {path} ({result.mode}), "
+            f"{result.transactions} transaction(s)."
+        )
+        return result
+
+    def _sync_file(
+        self,
+        path: str,
+        file: BinaryIO,
+        stat: os.stat_result,
+        row: Optional[sqlite3.Row],
+    ) -> SyncResult:
+        """
+        Mirrors the file from its start, or from the end of its last
+        mirrored transaction if everything before it is unchanged.
+        """
+        digest = hashlib.sha256()
+        offset = position = 0
+        mode = "full"
+        if row is not None and stat.st_size >= row["synced_offset"]:
+            self._hash_prefix(file, row["synced_offset"], digest)
+            if digest.hexdigest() == row["prefix_sha256"]:
+                mode = "incremental"
+                offset = row["synced_offset"]
+                position = row["transaction_count"]
+            else:
+                file.seek(0)
+                digest = hashlib.sha256()
+
+        if row is None:
+            cursor = self._connection.execute(
+                "INSERT INTO files (path, size, mtime_ns, synced_offset, "
+                "prefix_sha256, transaction_count) VALUES (?, 0, 0, 0, '', 0)",
+                (path,),
+            )
+            assert cursor.lastrowid is not None
+            file_id = cursor.lastrowid
+        else:
+            file_id = row["file_id"]
+            self._delete_records(file_id, transactions=mode == "full")
+
+        synced_offset, pending = offset, b""
+        batch: List[tuple] = []
+        lines = 0
+        for raw_line in file:
+            lines += 1
+            offset += len(raw_line)
+            fields = raw_line.decode().rstrip("\n").rstrip("\r").split(",")
+            if fields[0] == TRANSACTION_ID:
+                position += 1
+                batch.append(self._transaction_row(file_id, position, fields))
+                if len(batch) == SYNC_BATCH_SIZE:
+                    self._insert_transactions(batch)
+                    batch = []
+                digest.update(pending + raw_line)
+                synced_offset, pending = offset, b""
+                continue
+            pending += raw_line
+            if fields[0] == HEADER_ID:
+                self._upsert(HEADER, HEADER_COLUMNS, file_id, fields)
+            elif fields[0] == FOOTER_ID:
+                self._upsert(FOOTER, FOOTER_COLUMNS, file_id, fields)
+        self._insert_transactions(batch)
+        BYTES_READ.inc(offset)
+        RECORDS_READ.inc(lines)
+        RECORDS_PARSED.inc(lines)
+
+        self._connection.execute(
+            "UPDATE files SET size = ?, mtime_ns = ?, synced_offset = ?, "
+            "prefix_sha256 = ?, transaction_count = ? WHERE file_id = ?",
+            (
+                stat.st_size,
+                stat.st_mtime_ns,
+                synced_offset,
+                digest.hexdigest(),
+                position,
+                file_id,
+            ),
+        )
+        return SyncResult(path, mode, position)
+
+    @staticmethod
+    def _hash_prefix(file: BinaryIO, size: int, digest: Any) -> None:
+        """Feeds the first `size` bytes of a file to a digest."""
+        remaining = size
+        while remaining:
+            chunk = file.read(min(HASH_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            digest.update(chunk)
+            remaining -= len(chunk)
+        BYTES_READ.inc(size - remaining)
+
+    def _delete_records(self, file_id: int, transactions: bool) -> None:
+        """
+        Deletes the footer of a file, and its header and transactions for
+        a full sync. An incremental sync keeps the header and transactions
+        before the tail; the footer always follows the last transaction.
+        """
+        tables = ["footers"]
+        if transactions:
+            tables += ["headers", "transactions"]
+        for table in tables:
+            # Table names come from the fixed list above, never from input.
+            self._connection.execute(
+                f"DELETE FROM {table} WHERE file_id = ?",  # nosec B608
+                (file_id,),
+            )
+
+    @staticmethod
+    def _transaction_row(
+        file_id: int, position: int, fields: List[str]
+    ) -> tuple:
+        """Returns the row of a transaction."""
+        values = _pad(fields, len(TRANSACTION_COLUMNS))
+        amount = values[AMOUNT_INDEX]
+        amount_cents = int(amount) if amount and amount.isdigit() else None
+        return (file_id, position, *values, amount_cents)
+
+    def _insert_transactions(self, batch: List[tuple]) -> None:
+        """Inserts a batch of transaction rows."""
+        if not batch:
+            return
+        placeholders = ", ".join("?" * (len(TRANSACTION_COLUMNS) + 3))
+        self._connection.executemany(
+            f"INSERT OR REPLACE INTO transactions (file_id, position, "
+            f"{', '.join(TRANSACTION_COLUMNS)}, amount_cents) "
+            f"VALUES ({placeholders})",
+            batch,
+        )
+
+    def _upsert(
+        self,
+        record_type: str,
+        columns: List[str],
+        file_id: int,
+        fields: List[str],
+    ) -> None:
+        """Inserts or replaces the header or footer row of a file."""
+        table = RECORD_TABLES[record_type]
+        placeholders = ", ".join("?" * (len(columns) + 1))
+        self._connection.execute(
+            f"INSERT OR REPLACE INTO {table} (file_id, {', '.join(columns)}) "
+            f"VALUES ({placeholders})",
+            (file_id, *_pad(fields, len(columns))),
+        )
+
+    def get_value(
+        self,
+        file_path: str,
+        record_type: str,
+        field_name: str,
+        transaction_index: Optional[str] = None,
+    ) -> Any:
+        """
+        Retrieves the value of a field from the mirror, like
+        FieldRetriever.get_value does from the file. Transactions are
+        looked up by their counter through the counter index.
+        Args:
+            file_path (str): Path to the mirrored file.
+            record_type (str): The type of record (header, transaction,
+                               footer).
+            field_name (str): The name of the field to retrieve.
+            transaction_index (Optional[str]): The counter of the
+                                               transaction, e.g. '2' or
+                                               '000002'.
+        Returns:
+            The value of the field.
+        Raises:
+            ValueError: If the file is not mirrored, or the record type,
+                        field or record is not found.
+        """
+        try:
+            record_type, field_name = record_type.lower(), field_name.lower()
+            if record_type not in RECORD_TYPES:
+                raise ValueError(f"Invalid record type: {record_type}")
+            if field_name not in FIELD_ORDER[RECORD_TYPES[record_type]]:
+                raise ValueError(
+                    f"{record_type.capitalize()} record "
+                    f"doesn't have field '{field_name}'"
+                )
+            file_id = self._file_id(file_path)
+            column = _column(field_name)
+            if record_type == TRANSACTION:
+                if transaction_index is None:
+                    raise ValueError(
+                        "Transaction counter must be provided "
+                        "for transaction records."
+                    )
+                counter = str(int(transaction_index)).zfill(COUNTER_WIDTH)
+                # The column is a checked field name, values are bound.
+                row = self._connection.execute(
+                    f"SELECT {column} FROM transactions "  # nosec B608
+                    f"WHERE file_id = ? AND counter = ?",
+                    (file_id, counter),
+                ).fetchone()
+                if row is None:
+                    raise ValueError(
+                        f"Transaction not found for the "
+                        f"specified counter '{transaction_index}'."
+                    )
+            else:
+                # Table and column names come from fixed mappings.
+                table = RECORD_TABLES[record_type]
+                row = self._connection.execute(
+                    f"SELECT {column} FROM {table} "  # nosec B608
+                    f"WHERE file_id = ?",
+                    (file_id,),
+                ).fetchone()
+                if row is None:
+                    name = HEADER if record_type == HEADER else FOOTER
+                    raise ValueError(f"{name.capitalize()} not found.")
+            value = row[0]
+            logger.info(f"{field_name} for {record_type} is '{value}'.")
+            return value
+        except ValueError as e:
+            logger.error(e)
+            raise
+
+    def transactions(
+        self,
+        file_path: Optional[str] = None,
+        currency: Optional[str] = None,
+        min_amount: Optional[int] = None,
+        max_amount: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Queries the mirrored transactions of one or all files.
+        Args:
+            file_path (Optional[str]): Only transactions of this file.
+            currency (Optional[str]): Only transactions in this currency.
+            min_amount (Optional[int]): Minimum amount in cents.
+            max_amount (Optional[int]): Maximum amount in cents.
+        Returns:
+            List[Dict[str, Any]]: The path, position, counter, amount,
+                                  currency and amount in cents of every
+                                  matching transaction.
+        Raises:
+            ValueError: If the file is not mirrored.
+        """
+        conditions: List[str] = []
+        parameters: List[Any] = []
+        if file_path is not None:
+            conditions.append("transactions.file_id = ?")
+            parameters.append(self._file_id(file_path))
+        if currency is not None:
+            conditions.append("currency = ?")
+            parameters.append(currency.upper())
+        if min_amount is not None:
+            conditions.append("amount_cents >= ?")
+            parameters.append(min_amount)
+        if max_amount is not None:
+            conditions.append("amount_cents <= ?")
+            parameters.append(max_amount)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        # The conditions are fixed strings, every value is bound.
+        rows = self._connection.execute(
+            "SELECT path, position, counter, amount, currency, "  # nosec B608
+            "amount_cents "
+            "FROM transactions JOIN files USING (file_id) "
+            f"{where} ORDER BY path, position",
+            parameters,
+        )
+        return [dict(row) for row in rows]
+
+    def _file_id(self, file_path: str) -> int:
+        """
+        Returns the id of a mirrored file.
+        Raises:
+            ValueError: If the file is not mirrored.
+        """
+        row = self._connection.execute(
+            "SELECT file_id FROM files WHERE path = ?",
+            (os.path.abspath(file_path),),
+        ).fetchone()
+        if row is None:
+            raise ValueError(f"{file_path} is not mirrored, sync it first.")
+        return row[0]
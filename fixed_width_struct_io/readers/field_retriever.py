@@ -1,16 +1,24 @@
 import logging
-from typing import Any, Optional
+from typing import Any, Optional, Sequence
 
 from fixed_width_struct_io.constants import (
+    DEFAULT_LOCK_TIMEOUT,
     FIELD_LENGTHS,
     FOOTER,
     FOOTER_ID,
     HEADER,
     HEADER_ID,
+    PROGRESS_LOG_INTERVAL,
     RECORD_TYPES,
     TRANSACTION,
     TRANSACTION_ID,
 )
+from fixed_width_struct_io.helpers import ProgressLogger, phase_timer
+from fixed_width_struct_io.metrics.library_metrics import (
+    CACHE_HITS,
+    CACHE_MISSES,
+    RECORDS_PARSED,
+)
 from fixed_width_struct_io.readers.base import BaseRetriever
 
 
@@ -23,6 +31,24 @@ class FieldRetriever(BaseRetriever):
     file based on record type and field name.
     """
 
+    def __init__(
+        self,
+        lines: Optional[Sequence[str]] = None,
+        file_path: Optional[str] = None,
+        lock_timeout: Optional[float] = DEFAULT_LOCK_TIMEOUT,
+    ) -> None:
+        """
+        Initialize with either a sequence of lines or a file path. The
+        retriever only reads its lines, so an immutable sequence such as
+        the tuple of a cached file is shared without a copy.
+        """
+        super().__init__(
+            lines=lines,  # type: ignore[arg-type]
+            file_path=file_path,
+            lock_timeout=lock_timeout,
+        )
+        self._records: Optional[tuple] = None
+
     def retrieve(
         self,
         record_type: str,
@@ -30,7 +56,37 @@ class FieldRetriever(BaseRetriever):
         transaction_index: Optional[str] = None,
     ) -> Any:
         """
-        Retrieves the value of a specified field from a fixed-width file.
+        Retrieves the value of a specified field from a fixed-width file
+        and prints it to stdout.
+        Args:
+            record_type: The type of records
+                        (e.g., HEADER, TRANSACTION, FOOTER).
+            field_name: The name of the field to retrieve.
+            transaction_index: The index of the transaction
+                                to retrieve (if applicable).
+        Returns:
+            The value of the specified field.
+        Raises:
+            ValueError: If record_type or field_name is
+             invalid or if the specified field is not found.
+        """
+        return_value = self.get_value(
+            record_type=record_type,
+            field_name=field_name,
+            transaction_index=transaction_index,
+        )
+        print(f"'{return_value}'")
+        return return_value
+
+    def get_value(
+        self,
+        record_type: str,
+        field_name: str,
+        transaction_index: Optional[str] = None,
+    ) -> Any:
+        """
+        Retrieves the value of a specified field from a fixed-width file
+        without printing it.
         Args:
             record_type: The type of records
                         (e.g., HEADER, TRANSACTION, FOOTER).
@@ -60,14 +116,13 @@ class FieldRetriever(BaseRetriever):
 
             # Process file lines once, collecting required information.
             header_values, transaction_values, footer_values = (
-                self._process_file_lines()
+                self._get_records()
             )
             if record_type == HEADER:
                 if header_values is None:
                     raise ValueError("Header not found.")
                 return_value = header_values.get(field_name)
                 logger.info(f"{field_name} for header is '{return_value}'.")
-                print(f"'{return_value}'")
                 return return_value
 
             elif record_type == TRANSACTION:
@@ -88,7 +143,6 @@ class FieldRetriever(BaseRetriever):
                         f"transaction_index={transaction_index}"
                         f" is '{return_value}'."
                     )
-                    print(f"'{return_value}'")
                     return return_value
                 raise ValueError(
                     "Transaction counter must be provided "
@@ -100,13 +154,27 @@ class FieldRetriever(BaseRetriever):
                     raise ValueError("Footer not found.")
                 return_value = footer_values.get(field_name)
                 logger.info(f"{field_name} for footer is '{return_value}'.")
-                print(f"'{return_value}'")
                 return return_value
 
         except ValueError as e:
             logger.error(e)
             raise
 
+    def _get_records(self) -> tuple:
+        """
+        Returns the records of the file, processing the lines on first
+        use only. Retrievers never modify their lines, so repeated
+        lookups on the same instance share the processed records.
+        """
+        if self._records is None:
+            CACHE_MISSES.inc(cache="retriever")
+            self._records = self._process_file_lines()
+            RECORDS_PARSED.inc(len(self.lines))
+        else:
+            CACHE_HITS.inc(cache="retriever")
+        return self._records
+
+    @phase_timer.timed("parse")
     def _process_file_lines(self) -> tuple:
         """
         Processes lines from the fixed-width file and categorizes
@@ -118,7 +186,10 @@ class FieldRetriever(BaseRetriever):
         try:
             header_values, footer_values, transaction_values = None, None, []
             current_transaction = 0
-            for line in self.lines:
+            progress = ProgressLogger(
+                logger, "Record parsing", PROGRESS_LOG_INTERVAL
+            )
+            for line_number, line in enumerate(self.lines, start=1):
                 if line.startswith(HEADER_ID):
                     header_values = self._extract_fields(
                         line, FIELD_LENGTHS[HEADER_ID]
@@ -134,6 +205,8 @@ class FieldRetriever(BaseRetriever):
                     footer_values = self._extract_fields(
                         line, FIELD_LENGTHS[FOOTER_ID]
                     )
+                progress.update(line_number)
+            progress.finish(len(self.lines))
 
             return header_values, transaction_values, footer_values
 
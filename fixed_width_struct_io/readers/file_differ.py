@@ -0,0 +1,300 @@
+import hashlib
+import logging
+from collections import namedtuple
+from contextlib import ExitStack
+from itertools import islice, zip_longest
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional
+
+from fixed_width_struct_io.constants import (
+    DEFAULT_LOCK_TIMEOUT,
+    DIFF_BLOCK_LINES,
+    FIELD_ORDER,
+    FOOTER,
+    FOOTER_ID,
+    HEADER,
+    HEADER_ID,
+    TRANSACTION,
+    TRANSACTION_ID,
+)
+from fixed_width_struct_io.core import FileLock
+from fixed_width_struct_io.helpers import phase_timer
+from fixed_width_struct_io.metrics.library_metrics import (
+    BYTES_READ,
+    RECORDS_PARSED,
+    RECORDS_READ,
+)
+
+logger = logging.getLogger(__name__)
+
+COUNTER_INDEX = FIELD_ORDER[TRANSACTION_ID].index("counter")
+COMPARED_TRANSACTION_FIELDS = ("amount", "currency")
+COMPARED_FOOTER_FIELDS = ("total counter", "control sum")
+
+Difference = namedtuple(
+    "Difference", ["record_type", "change", "counter", "field", "old", "new"]
+)
+
+
+def _field(fields: Optional[List[str]], index: int) -> Optional[str]:
+    """Returns a field of a split record, or None if it is missing."""
+    if fields is None or index >= len(fields):
+        return None
+    return fields[index]
+
+
+class FileDiff:
+    """
+    The differences between two versions of a file, one Difference per
+    changed field. Added and removed transactions are reported with one
+    Difference per compared field, with `old` or `new` set to None.
+
+    Attributes:
+        differences (List[Difference]): The differences: header, changed,
+                                        removed and added transactions,
+                                        then footer.
+        footer_delta (Dict[str, int]): New minus old total counter and
+                                       control sum.
+        blocks_compared (int): Number of blocks that were decoded.
+        blocks_skipped (int): Number of identical blocks skipped.
+    """
+
+    def __init__(self) -> None:
+        """Initializes an empty diff."""
+        self.differences: List[Difference] = []
+        self.footer_delta: Dict[str, int] = {}
+        self.blocks_compared = 0
+        self.blocks_skipped = 0
+
+    @property
+    def identical(self) -> bool:
+        """True if the files have no record differences."""
+        return not self.differences
+
+    def summary(self) -> dict:
+        """Returns a summary of the diff."""
+        return {
+            "identical": self.identical,
+            "differences": len(self.differences),
+            "footer_delta": self.footer_delta,
+            "blocks_compared": self.blocks_compared,
+            "blocks_skipped": self.blocks_skipped,
+        }
+
+    def __len__(self) -> int:
+        """Returns the number of differences."""
+        return len(self.differences)
+
+    def __iter__(self) -> Iterator[Difference]:
+        """Iterates over the differences."""
+        return iter(self.differences)
+
+
+class _Records:
+    """Records decoded from the blocks of one file that differed."""
+
+    def __init__(self) -> None:
+        """Initializes empty records."""
+        self.header: Optional[List[str]] = None
+        self.footer: Optional[List[str]] = None
+        self.transactions: Dict[str, List[str]] = {}
+
+    def add(self, block: List[bytes]) -> None:
+        """Decodes the lines of a block."""
+        for raw_line in block:
+            fields = raw_line.decode().rstrip("\n").rstrip("\r").split(",")
+            if fields[0] == TRANSACTION_ID and len(fields) > COUNTER_INDEX:
+                self.transactions[fields[COUNTER_INDEX]] = fields
+            elif fields[0] == HEADER_ID:
+                self.header = fields
+            elif fields[0] == FOOTER_ID:
+                self.footer = fields
+        RECORDS_PARSED.inc(len(block))
+
+
+class FileDiffer:
+    """
+    Compares two versions of a fixed-width file record by record.
+
+    Reports changed header fields, added and removed transactions and
+    changed amounts or currencies by counter, and changed footer fields.
+    Both files are read in parallel in blocks of `block_lines` raw lines.
+    Blocks at the same position are compared by hash first; identical
+    blocks are skipped without being decoded, so comparing large, mostly
+    identical files costs little more than reading them. Transactions of
+    differing blocks are matched by counter, also across blocks.
+
+    Attributes:
+        old_path (str): Path to the old version of the file.
+        new_path (str): Path to the new version of the file.
+        block_lines (int): Number of lines per hashed block.
+        lock_timeout (Optional[float]): Seconds to wait for the file locks.
+    """
+
+    def __init__(
+        self,
+        old_path: str,
+        new_path: str,
+        block_lines: int = DIFF_BLOCK_LINES,
+        lock_timeout: Optional[float] = DEFAULT_LOCK_TIMEOUT,
+    ) -> None:
+        """Initializes the differ with the two versions of the file."""
+        if block_lines < 1:
+            raise ValueError("block_lines must be a positive number.")
+        self.old_path = old_path
+        self.new_path = new_path
+        self.block_lines = block_lines
+        self.lock_timeout = lock_timeout
+
+    @phase_timer.timed("diff")
+    def diff(self) -> FileDiff:
+        """
+        Compares the two files.
+        Returns:
+            FileDiff: The differences between the files.
+        """
+        result = FileDiff()
+        old, new = _Records(), _Records()
+        with ExitStack() as stack:
+            files = []
+            for path in (self.old_path, self.new_path):
+                stack.enter_context(FileLock(path, timeout=self.lock_timeout))
+                files.append(stack.enter_context(open(path, "rb")))
+            old_block: List[bytes]
+            new_block: List[bytes]
+            for old_block, new_block in zip_longest(
+                self._blocks(files[0]), self._blocks(files[1]), fillvalue=[]
+            ):
+                if self._digest(old_block) == self._digest(new_block):
+                    result.blocks_skipped += 1
+                    continue
+                result.blocks_compared += 1
+                old.add(old_block)
+                new.add(new_block)
+                self._match_transactions(old, new, result)
+
+        header_changes = self._field_changes(
+            HEADER, FIELD_ORDER[HEADER_ID][1:], old.header, new.header
+        )
+        footer_changes = self._field_changes(
+            FOOTER, COMPARED_FOOTER_FIELDS, old.footer, new.footer
+        )
+        result.differences[:0] = header_changes
+        for counter in sorted(old.transactions):
+            result.differences.extend(
+                self._transaction_changes(
+                    counter, "removed", old.transactions[counter], None
+                )
+            )
+        for counter in sorted(new.transactions):
+            result.differences.extend(
+                self._transaction_changes(
+                    counter, "added", None, new.transactions[counter]
+                )
+            )
+        result.differences.extend(footer_changes)
+        result.footer_delta = self._footer_delta(footer_changes)
+        logger.info(
+            f"Found {len(result)} difference(s) between {self.old_path} and "
+            f"{self.new_path}; {result.blocks_skipped} identical block(s) "
+            f"skipped."
+        )
+        return result
+
+    def _blocks(self, file: BinaryIO) -> Iterator[List[bytes]]:
+        """Yields the raw lines of a file in blocks."""
+        while True:
+            block = list(islice(file, self.block_lines))
+            if not block:
+                return
+            BYTES_READ.inc(sum(map(len, block)))
+            RECORDS_READ.inc(len(block))
+            yield block
+
+    @staticmethod
+    def _digest(block: List[bytes]) -> bytes:
+        """Returns the hash of a block."""
+        return hashlib.blake2b(b"".join(block), digest_size=16).digest()
+
+    def _match_transactions(
+        self, old: _Records, new: _Records, result: FileDiff
+    ) -> None:
+        """
+        Compares the transactions present in both files and forgets them,
+        keeping only the unmatched ones for the following blocks.
+        """
+        for counter in sorted(old.transactions.keys() & new.transactions):
+            result.differences.extend(
+                self._transaction_changes(
+                    counter,
+                    "changed",
+                    old.transactions.pop(counter),
+                    new.transactions.pop(counter),
+                )
+            )
+
+    @staticmethod
+    def _transaction_changes(
+        counter: str,
+        change: str,
+        old: Optional[List[str]],
+        new: Optional[List[str]],
+    ) -> List[Difference]:
+        """Returns the differing fields of a transaction."""
+        differences = []
+        for field in COMPARED_TRANSACTION_FIELDS:
+            index = FIELD_ORDER[TRANSACTION_ID].index(field)
+            old_value = _field(old, index)
+            new_value = _field(new, index)
+            if old_value != new_value:
+                differences.append(
+                    Difference(
+                        TRANSACTION,
+                        change,
+                        counter,
+                        field,
+                        old_value,
+                        new_value,
+                    )
+                )
+        return differences
+
+    @staticmethod
+    def _field_changes(
+        record_type: str,
+        fields: Iterable[str],
+        old: Optional[List[str]],
+        new: Optional[List[str]],
+    ) -> List[Difference]:
+        """Returns the differing fields of a header or footer."""
+        if old is None and new is None:
+            return []
+        change = "changed"
+        if old is None:
+            change = "added"
+        elif new is None:
+            change = "removed"
+        record_id = HEADER_ID if record_type == HEADER else FOOTER_ID
+        differences = []
+        for field in fields:
+            index = FIELD_ORDER[record_id].index(field)
+            old_value, new_value = _field(old, index), _field(new, index)
+            if old_value != new_value:
+                differences.append(
+                    Difference(
+                        record_type, change, None, field, old_value, new_value
+                    )
+                )
+        return differences
+
+    @staticmethod
+    def _footer_delta(footer_changes: List[Difference]) -> Dict[str, int]:
+        """Returns the numeric change of the changed footer fields."""
+        delta = {}
+        for difference in footer_changes:
+            try:
+                delta[difference.field] = int(difference.new or 0) - int(
+                    difference.old or 0
+                )
+            except ValueError:
+                logger.debug(f"Footer {difference.field} is not numeric.")
+        return delta
@@ -0,0 +1,7 @@
+from fixed_width_struct_io.segments.segment_directory import (  # noqa: F401, E501
+    Segment,
+    SegmentDirectory,
+)
+from fixed_width_struct_io.segments.segmented_file import (  # noqa: F401, E501
+    SegmentedFile,
+)
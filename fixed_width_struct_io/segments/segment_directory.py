@@ -0,0 +1,177 @@
+import json
+import logging
+import os
+import tempfile
+from collections import namedtuple
+from typing import Iterator, List
+
+from fixed_width_struct_io.constants import (
+    HEADER_ID,
+    SEGMENT_DIRECTORY_SUFFIX,
+    TRANSACTION_ID,
+)
+
+logger = logging.getLogger(__name__)
+
+DIRECTORY_FORMAT_VERSION = 1
+
+Segment = namedtuple(
+    "Segment",
+    ["offset", "length", "first_line", "line_count", "transaction_count"],
+)
+
+
+class SegmentDirectory:
+    """
+    Directory of the segments of a segmented fixed-width file.
+
+    A segmented file chains header/transactions/footer groups in one
+    physical file; every group is a segment with its own counters, so it
+    can hold up to MAX_TRANSACTIONS_AMOUNT transactions. The directory
+    records the byte offset and length of each segment so a segment can be
+    read with a single seek. It is stored next to the file in a sidecar
+    '<file>.segments' JSON file together with the size and mtime of the
+    file it describes, and rebuilt by scanning the file when stale.
+
+    Attributes:
+        file_path (str): Path to the segmented file.
+        segments (List[Segment]): The segments, in file order.
+    """
+
+    def __init__(self, file_path: str, segments: List[Segment]) -> None:
+        """Initializes the directory of a file."""
+        self.file_path = file_path
+        self.segments = segments
+
+    @property
+    def sidecar_path(self) -> str:
+        """Path of the sidecar file storing the directory."""
+        return f"{self.file_path}{SEGMENT_DIRECTORY_SUFFIX}"
+
+    @property
+    def transaction_count(self) -> int:
+        """Total number of transactions in all segments."""
+        return sum(segment.transaction_count for segment in self.segments)
+
+    def __len__(self) -> int:
+        """Returns the number of segments."""
+        return len(self.segments)
+
+    def __iter__(self) -> Iterator[Segment]:
+        """Iterates over the segments in file order."""
+        return iter(self.segments)
+
+    def __getitem__(self, number: int) -> Segment:
+        """
+        Returns a segment by its 1-based number.
+        Raises:
+            ValueError: If there is no segment with that number.
+        """
+        if not 1 <= number <= len(self.segments):
+            raise ValueError(
+                f"Segment {number} not found, the file has "
+                f"{len(self.segments)} segment(s)."
+            )
+        return self.segments[number - 1]
+
+    @classmethod
+    def scan(cls, file_path: str) -> "SegmentDirectory":
+        """
+        Builds the directory by scanning the file: every header line
+        starts a new segment.
+        Args:
+            file_path (str): Path to the segmented file.
+        Returns:
+            SegmentDirectory: The directory of the file.
+        """
+        header_id, transaction_id = HEADER_ID.encode(), TRANSACTION_ID.encode()
+        segments: List[Segment] = []
+        offset = start = first_line = line_count = transactions = 0
+        with open(file_path, "rb") as file:
+            for line_number, line in enumerate(file, start=1):
+                if line.startswith(header_id) and line_count:
+                    segments.append(
+                        Segment(
+                            start,
+                            offset - start,
+                            first_line,
+                            line_count,
+                            transactions,
+                        )
+                    )
+                    line_count = transactions = 0
+                if not line_count:
+                    start, first_line = offset, line_number
+                line_count += 1
+                if line.startswith(transaction_id):
+                    transactions += 1
+                offset += len(line)
+        if line_count:
+            segments.append(
+                Segment(
+                    start, offset - start, first_line, line_count, transactions
+                )
+            )
+        logger.debug(f"Scanned {len(segments)} segment(s) in {file_path}.")
+        return cls(file_path, segments)
+
+    @classmethod
+    def load(cls, file_path: str) -> "SegmentDirectory":
+        """
+        Loads the directory from its sidecar file, or scans the file and
+        saves a new sidecar if it is missing or describes another version
+        of the file.
+        Args:
+            file_path (str): Path to the segmented file.
+        Returns:
+            SegmentDirectory: The directory of the file.
+        """
+        file_stat = os.stat(file_path)
+        directory = cls(file_path, [])
+        try:
+            with open(directory.sidecar_path, "r") as sidecar:
+                data = json.load(sidecar)
+            if (
+                data.get("version") == DIRECTORY_FORMAT_VERSION
+                and data.get("size") == file_stat.st_size
+                and data.get("mtime_ns") == file_stat.st_mtime_ns
+            ):
+                directory.segments = [
+                    Segment(*segment) for segment in data["segments"]
+                ]
+                return directory
+            logger.info(f"Segment directory of {file_path} is stale.")
+        except FileNotFoundError:
+            logger.debug(f"No segment directory for {file_path}.")
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring invalid segment directory: {e}")
+        directory = cls.scan(file_path)
+        directory.save()
+        return directory
+
+    def save(self) -> None:
+        """
+        Writes the directory to its sidecar file. A directory that cannot
+        be written is only logged, since it can always be rebuilt.
+        """
+        file_stat = os.stat(self.file_path)
+        data = {
+            "version": DIRECTORY_FORMAT_VERSION,
+            "size": file_stat.st_size,
+            "mtime_ns": file_stat.st_mtime_ns,
+            "segments": [list(segment) for segment in self.segments],
+        }
+        try:
+            file_descriptor, temporary_path = tempfile.mkstemp(
+                dir=os.path.dirname(os.path.abspath(self.sidecar_path)),
+                prefix=".segments-",
+            )
+            try:
+                with os.fdopen(file_descriptor, "w") as sidecar:
+                    json.dump(data, sidecar)
+                os.replace(temporary_path, self.sidecar_path)
+            except OSError:
+                os.remove(temporary_path)
+                raise
+        except OSError as e:
+            logger.warning(f"Failed to save the segment directory: {e}")
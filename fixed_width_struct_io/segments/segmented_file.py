@@ -0,0 +1,288 @@
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, List, Optional
+
+from fixed_width_struct_io.cache import file_cache
+from fixed_width_struct_io.constants import (
+    DEFAULT_LOCK_TIMEOUT,
+    HEADER_ID,
+    MAX_TRANSACTIONS_AMOUNT,
+    TRANSACTION,
+    TRANSACTION_ID,
+)
+from fixed_width_struct_io.core import FileLock
+from fixed_width_struct_io.metrics.library_metrics import (
+    APPENDS,
+    BYTES_READ,
+    BYTES_WRITTEN,
+    RECORDS_READ,
+)
+from fixed_width_struct_io.readers import FieldRetriever
+from fixed_width_struct_io.segments.segment_directory import (
+    Segment,
+    SegmentDirectory,
+)
+from fixed_width_struct_io.utils import validate_field
+from fixed_width_struct_io.validators import (
+    FileStructureValidator,
+    StringLengthValidator,
+    ValuesValidator,
+)
+from fixed_width_struct_io.writers import TransactionAppender
+from fixed_width_struct_io.writers.record_format import (
+    format_control_sum,
+    format_counter,
+    format_footer,
+    format_transaction,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def read_segment_lines(file_path: str, segment: Segment) -> List[str]:
+    """
+    Reads the lines of one segment with a single seek.
+    Args:
+        file_path (str): Path to the segmented file.
+        segment (Segment): The segment to read.
+    Returns:
+        List[str]: The lines of the segment.
+    """
+    with open(file_path, "rb") as file:
+        file.seek(segment.offset)
+        data = file.read(segment.length)
+    BYTES_READ.inc(len(data))
+    lines = [line.rstrip("\r") for line in data.decode().split("\n")]
+    if lines and not lines[-1]:
+        lines.pop()
+    RECORDS_READ.inc(len(lines))
+    return lines
+
+
+def validate_segment(file_path: str, segment: Segment) -> Optional[str]:
+    """
+    Validates one segment with all validators.
+    Args:
+        file_path (str): Path to the segmented file.
+        segment (Segment): The segment to validate.
+    Returns:
+        Optional[str]: The validation error, or None if the segment is
+                       valid.
+    """
+    lines = read_segment_lines(file_path, segment)
+    try:
+        FileStructureValidator(lines=lines).validate()
+        StringLengthValidator(lines=lines).validate()
+        ValuesValidator(lines=lines).validate()
+    except ValueError as e:
+        return str(e)
+    return None
+
+
+class SegmentedFile:
+    """
+    A fixed-width file holding several header/transactions/footer groups
+    (segments), which lifts the MAX_TRANSACTIONS_AMOUNT limit of a single
+    file. A regular file is a segmented file with one segment.
+
+    Every segment is a complete, independently valid group with its own
+    counters and control sum. Segments are located through a
+    SegmentDirectory, read with a single seek, and can be processed in
+    parallel in worker processes. Reads take a shared lock on the file
+    and appends an exclusive one.
+
+    Attributes:
+        file_path (str): Path to the segmented file.
+        lock_timeout (Optional[float]): Seconds to wait for the file lock.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        lock_timeout: Optional[float] = DEFAULT_LOCK_TIMEOUT,
+    ) -> None:
+        """Initializes the segmented file."""
+        self.file_path = file_path
+        self.lock_timeout = lock_timeout
+
+    @property
+    def directory(self) -> SegmentDirectory:
+        """The current segment directory of the file."""
+        with FileLock(self.file_path, timeout=self.lock_timeout):
+            return SegmentDirectory.load(self.file_path)
+
+    def read_segment(self, number: int) -> List[str]:
+        """
+        Reads the lines of a segment.
+        Args:
+            number (int): 1-based number of the segment.
+        Returns:
+            List[str]: The lines of the segment.
+        Raises:
+            ValueError: If there is no segment with that number.
+        """
+        with FileLock(self.file_path, timeout=self.lock_timeout):
+            segment = SegmentDirectory.load(self.file_path)[number]
+            return read_segment_lines(self.file_path, segment)
+
+    def map_segments(
+        self,
+        function: Callable[[str, Segment], Any],
+        workers: Optional[int] = None,
+    ) -> List[Any]:
+        """
+        Applies `function(file_path, segment)` to every segment, in worker
+        processes when `workers` is greater than one. The function reads
+        its segment itself, so only the directory entry is sent to the
+        workers.
+        Args:
+            function: A picklable function of the file path and a segment.
+            workers (Optional[int]): Number of worker processes.
+        Returns:
+            List[Any]: The results, in segment order.
+        """
+        with FileLock(self.file_path, timeout=self.lock_timeout):
+            segments = list(SegmentDirectory.load(self.file_path))
+            file_paths = [self.file_path] * len(segments)
+            if workers is None or workers <= 1 or len(segments) <= 1:
+                return list(map(function, file_paths, segments))
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(segments))
+            ) as executor:
+                return list(executor.map(function, file_paths, segments))
+
+    def validate(self, workers: Optional[int] = None) -> bool:
+        """
+        Validates every segment, in parallel when `workers` is greater
+        than one.
+        Args:
+            workers (Optional[int]): Number of worker processes.
+        Returns:
+            bool: True if every segment is valid.
+        Raises:
+            ValueError: If a segment is invalid.
+        """
+        errors = self.map_segments(validate_segment, workers)
+        for number, error in enumerate(errors, start=1):
+            if error is not None:
+                logger.error(f"Segment {number} is invalid: {error}")
+                raise ValueError(f"Segment {number}: {error}")
+        logger.info(f"All {len(errors)} segment(s) are valid.")
+        return True
+
+    def get_value(
+        self,
+        segment: int,
+        record_type: str,
+        field_name: str,
+        transaction_index: Optional[str] = None,
+    ) -> Any:
+        """
+        Retrieves the value of a field of one segment.
+        Args:
+            segment (int): 1-based number of the segment.
+            record_type (str): The type of record (header, transaction,
+                               footer).
+            field_name (str): The name of the field to retrieve.
+            transaction_index (Optional[str]): The counter of the
+                                               transaction in the segment.
+        Returns:
+            The value of the field.
+        Raises:
+            ValueError: If the segment, record or field is not found.
+        """
+        return FieldRetriever(lines=self.read_segment(segment)).get_value(
+            record_type=record_type,
+            field_name=field_name,
+            transaction_index=transaction_index,
+        )
+
+    def append_transaction(self, amount: str, currency: str) -> int:
+        """
+        Appends a transaction to the last segment, or starts a new segment
+        with the header of the last one when the last segment is full.
+        Only the last segment is rewritten.
+        Args:
+            amount (str): The transaction amount.
+            currency (str): The transaction currency.
+        Returns:
+            int: The number of the segment the transaction was added to.
+        Raises:
+            ValueError: If the amount or currency is invalid.
+        """
+        with FileLock(
+            self.file_path, exclusive=True, timeout=self.lock_timeout
+        ):
+            directory = SegmentDirectory.load(self.file_path)
+            last = directory.segments[-1]
+            lines = read_segment_lines(self.file_path, last)
+            separator = b""
+            if last.transaction_count < MAX_TRANSACTIONS_AMOUNT:
+                appender = TransactionAppender(lines=lines)
+                appender.append_transaction(amount, currency)
+                offset, new_lines = last.offset, appender.lines
+                directory.segments.pop()
+            else:
+                for field_name, value in (
+                    ("amount", amount),
+                    ("currency", currency),
+                ):
+                    if not validate_field(TRANSACTION, field_name, value):
+                        raise ValueError("Amount or currency is invalid")
+                offset = last.offset + last.length
+                if not self._ends_with_newline(offset):
+                    # The footer of a file without a trailing newline is
+                    # terminated first, so the header starts a new line.
+                    separator = b"\n"
+                    directory.segments[-1] = last._replace(
+                        length=last.length + 1
+                    )
+                new_lines = self._new_segment(lines[0], amount, currency)
+                APPENDS.inc()
+            data = "".join(line + "\n" for line in new_lines).encode()
+            with open(self.file_path, "r+b") as file:
+                file.seek(offset)
+                file.write(separator + data)
+                file.truncate()
+            BYTES_WRITTEN.inc(len(separator) + len(data))
+            first_line = (
+                directory.segments[-1].first_line
+                + directory.segments[-1].line_count
+                if directory.segments
+                else 1
+            )
+            directory.segments.append(
+                Segment(
+                    offset + len(separator),
+                    len(data),
+                    first_line,
+                    len(new_lines),
+                    sum(line.startswith(TRANSACTION_ID) for line in new_lines),
+                )
+            )
+            directory.save()
+        file_cache.invalidate(self.file_path)
+        logger.info(
+            f"Transaction appended to segment {len(directory)} "
+            f"of {self.file_path}."
+        )
+        return len(directory)
+
+    def _ends_with_newline(self, offset: int) -> bool:
+        """Whether the byte before an offset of the file is a newline."""
+        if not offset:
+            return True
+        with open(self.file_path, "rb") as file:
+            file.seek(offset - 1)
+            return file.read(1) == b"\n"
+
+    @staticmethod
+    def _new_segment(header: str, amount: str, currency: str) -> List[str]:
+        """Builds a segment with one transaction under a copied header."""
+        if not header.startswith(HEADER_ID):
+            raise ValueError("The last segment does not start with a header.")
+        transaction = format_transaction(format_counter(1), amount, currency)
+        footer = format_footer(
+            format_counter(1), format_control_sum(int(amount))
+        )
+        return [header, transaction, footer]
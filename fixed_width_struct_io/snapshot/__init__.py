@@ -0,0 +1,3 @@
+from fixed_width_struct_io.snapshot.columnar_snapshot import (  # noqa: F401, E501
+    ColumnarSnapshot,
+)
@@ -0,0 +1,400 @@
+import logging
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import zlib
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from fixed_width_struct_io.cache import file_cache
+from fixed_width_struct_io.constants import (
+    DEFAULT_LOCK_TIMEOUT,
+    FIELD_ORDER,
+    FOOTER_ID,
+    HEADER_ID,
+    TRANSACTION_ID,
+)
+from fixed_width_struct_io.core import FileLock
+from fixed_width_struct_io.helpers import phase_timer
+from fixed_width_struct_io.metrics.library_metrics import (
+    BYTES_READ,
+    BYTES_WRITTEN,
+    RECORDS_READ,
+)
+from fixed_width_struct_io.writers.record_format import (
+    format_amount,
+    format_counter,
+    format_transaction,
+)
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b"FWSNAP\x00\x00"
+SNAPSHOT_FORMAT_VERSION = 1
+FLAG_FINAL_NEWLINE = 1
+MAX_CURRENCIES = 256
+COLUMN_ALIGNMENT = 8
+RESTORE_BUFFER_SIZE = 1024 * 1024
+
+# magic, format version, flags, header, footer and currency table lengths,
+# transaction count, footer total counter and control sum, offsets of the
+# counter, amount and currency columns, CRC-32 of everything after it.
+SNAPSHOT_HEADER = struct.Struct("<8sHHIIIQqqQQQI")
+
+COUNTER_INDEX = FIELD_ORDER[TRANSACTION_ID].index("counter")
+AMOUNT_INDEX = FIELD_ORDER[TRANSACTION_ID].index("amount")
+CURRENCY_INDEX = FIELD_ORDER[TRANSACTION_ID].index("currency")
+TOTAL_COUNTER_INDEX = FIELD_ORDER[FOOTER_ID].index("total counter")
+CONTROL_SUM_INDEX = FIELD_ORDER[FOOTER_ID].index("control sum")
+
+
+def _padding(offset: int) -> bytes:
+    """Returns the zero bytes aligning `offset` to COLUMN_ALIGNMENT."""
+    return b"\x00" * (-offset % COLUMN_ALIGNMENT)
+
+
+def _footer_total(fields: List[str], index: int) -> int:
+    """Returns a numeric footer field, or -1 if it is not a number."""
+    value = fields[index] if index < len(fields) else ""
+    return int(value) if value.isdigit() else -1
+
+
+class ColumnarSnapshot:
+    """
+    Compact binary columnar snapshot of a fixed-width file.
+
+    A snapshot stores the header and footer lines as blobs and the
+    transactions as three little-endian columns: `counter` (int32),
+    `amount` in cents (int64) and `currency` (uint8 index into a currency
+    table stored in the snapshot). A fixed header describes the layout
+    and holds the footer totals and a CRC-32 of the rest of the snapshot.
+    Columns are aligned to 8 bytes, so an opened snapshot is memory-mapped
+    and its columns are exposed as memoryviews without copying or parsing.
+
+    Only files with one header, canonical transaction records (as written
+    by this library) and one footer can be exported, which guarantees
+    that restoring a snapshot reproduces the file byte for byte.
+
+    Attributes:
+        snapshot_path (str): Path to the snapshot file.
+        transaction_count (int): Number of transactions.
+        total_counter (int): Total counter of the footer, or -1.
+        control_sum (int): Control sum of the footer, or -1.
+        header (str): The header line.
+        footer (str): The footer line.
+        currency_codes (List[str]): The currency table.
+    """
+
+    def __init__(self, snapshot_path: str, verify: bool = True) -> None:
+        """
+        Opens and memory-maps a snapshot.
+        Args:
+            snapshot_path (str): Path to the snapshot file.
+            verify (bool): Check the CRC-32 of the snapshot.
+        Raises:
+            ValueError: If the file is not a valid snapshot.
+        """
+        self.snapshot_path = snapshot_path
+        with open(snapshot_path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size < SNAPSHOT_HEADER.size:
+                raise ValueError(f"{snapshot_path} is not a snapshot.")
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._load(verify)
+        except BaseException:
+            self.close()
+            raise
+
+    def _load(self, verify: bool) -> None:
+        """Reads the snapshot header and maps the columns."""
+        (
+            magic,
+            version,
+            self._flags,
+            header_length,
+            footer_length,
+            currencies_length,
+            self.transaction_count,
+            self.total_counter,
+            self.control_sum,
+            counter_offset,
+            amount_offset,
+            currency_offset,
+            checksum,
+        ) = SNAPSHOT_HEADER.unpack_from(self._map)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"{self.snapshot_path} is not a snapshot.")
+        if version != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(
+                f"{self.snapshot_path} has unsupported snapshot format "
+                f"version {version}."
+            )
+        count = self.transaction_count
+        if currency_offset + count > len(self._map):
+            raise ValueError(f"{self.snapshot_path} is truncated.")
+        view = memoryview(self._map)
+        offset = SNAPSHOT_HEADER.size
+        if verify and zlib.crc32(view[offset:]) != checksum:
+            view.release()
+            raise ValueError(f"{self.snapshot_path} failed its checksum.")
+
+        blobs = []
+        for length in (header_length, footer_length, currencies_length):
+            end = offset + length
+            blobs.append(bytes(view[offset:end]).decode())
+            offset = end
+        self.header, self.footer, currencies = blobs
+        self.currency_codes = currencies.split(",") if currencies else []
+
+        self._views = [view]
+        self.counters = self._column(view, counter_offset, count, "i")
+        self.amounts = self._column(view, amount_offset, count, "q")
+        self.currencies = self._column(view, currency_offset, count, "B")
+        BYTES_READ.inc(len(self._map))
+
+    def _column(
+        self, view: memoryview, offset: int, count: int, type_code: str
+    ) -> Union[memoryview, array]:
+        """
+        Returns a column as a memoryview of the mapped snapshot, or as a
+        byte-swapped copy on big-endian machines.
+        """
+        item_size = struct.calcsize(type_code)
+        end = offset + count * item_size
+        data = view[offset:end]
+        if sys.byteorder == "little" or item_size == 1:
+            column = data.cast(type_code)
+            self._views += [data, column]
+            return column
+        swapped = array(type_code, data.tobytes())
+        swapped.byteswap()
+        data.release()
+        return swapped
+
+    def close(self) -> None:
+        """Releases the columns and unmaps the snapshot."""
+        for view in reversed(getattr(self, "_views", [])):
+            view.release()
+        self._views = []
+        self._map.close()
+
+    def __enter__(self) -> "ColumnarSnapshot":
+        """Returns the snapshot for use in a with statement."""
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Closes the snapshot."""
+        self.close()
+
+    def __len__(self) -> int:
+        """Returns the number of transactions."""
+        return self.transaction_count
+
+    def currency(self, index: int) -> str:
+        """Returns the currency of the transaction at a 0-based index."""
+        return self.currency_codes[self.currencies[index]]
+
+    def totals_by_currency(self) -> Dict[str, int]:
+        """Returns the sum of the amounts in cents per currency."""
+        totals = [0] * len(self.currency_codes)
+        for amount, code in zip(self.amounts, self.currencies):
+            totals[code] += amount
+        return dict(zip(self.currency_codes, totals))
+
+    def lines(self) -> Iterator[str]:
+        """Yields the lines of the original file, without line endings."""
+        yield self.header
+        for counter, amount, code in zip(
+            self.counters, self.amounts, self.currencies
+        ):
+            yield format_transaction(
+                format_counter(counter),
+                format_amount(amount),
+                self.currency_codes[code],
+            )
+        yield self.footer
+
+    @phase_timer.timed("restore")
+    def restore(
+        self,
+        output_path: str,
+        lock_timeout: Optional[float] = DEFAULT_LOCK_TIMEOUT,
+    ) -> None:
+        """
+        Writes the original fixed-width file, replacing `output_path`
+        atomically under an exclusive lock.
+        Args:
+            output_path (str): Path of the restored file.
+            lock_timeout (Optional[float]): Seconds to wait for the lock.
+        """
+        with FileLock(output_path, exclusive=True, timeout=lock_timeout):
+            self._restore(output_path)
+        file_cache.invalidate(output_path)
+        logger.info(
+            f"Restored {self.transaction_count} transaction(s) from "
+            f"{self.snapshot_path} to {output_path}."
+        )
+
+    def _restore(self, output_path: str) -> None:
+        """Writes the file to a temporary file and moves it into place."""
+        file_descriptor, temporary_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(output_path)),
+            prefix=".restore-",
+        )
+        try:
+            os.chmod(temporary_path, 0o644)
+            with os.fdopen(
+                file_descriptor, "w", buffering=RESTORE_BUFFER_SIZE
+            ) as output:
+                output.write("\n".join(self.lines()))
+                if self._flags & FLAG_FINAL_NEWLINE:
+                    output.write("\n")
+                BYTES_WRITTEN.inc(output.tell())
+            os.replace(temporary_path, output_path)
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+
+    @classmethod
+    @phase_timer.timed("snapshot")
+    def export(
+        cls,
+        file_path: str,
+        snapshot_path: str,
+        lock_timeout: Optional[float] = DEFAULT_LOCK_TIMEOUT,
+    ) -> "ColumnarSnapshot":
+        """
+        Writes the snapshot of a fixed-width file.
+        Args:
+            file_path (str): Path to the fixed-width file.
+            snapshot_path (str): Path of the snapshot, replaced atomically.
+            lock_timeout (Optional[float]): Seconds to wait for the lock.
+        Returns:
+            ColumnarSnapshot: The written snapshot, opened.
+        Raises:
+            ValueError: If the file cannot be reproduced exactly from a
+                        snapshot.
+        """
+        with FileLock(file_path, timeout=lock_timeout):
+            with open(file_path, "r", newline="") as file:
+                data = cls._encode(file_path, file.read())
+        file_descriptor, temporary_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(snapshot_path)),
+            prefix=".snapshot-",
+        )
+        try:
+            os.chmod(temporary_path, 0o644)
+            with os.fdopen(file_descriptor, "wb") as output:
+                for chunk in data:
+                    output.write(chunk)
+                BYTES_WRITTEN.inc(output.tell())
+            os.replace(temporary_path, snapshot_path)
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+        logger.info(f"Wrote the snapshot of {file_path} to {snapshot_path}.")
+        return cls(snapshot_path, verify=False)
+
+    @staticmethod
+    def _encode(file_path: str, text: str) -> List[bytes]:
+        """
+        Encodes the content of a file as the chunks of a snapshot.
+        Raises:
+            ValueError: If the file cannot be reproduced exactly.
+        """
+        lines = text.split("\n")
+        flags = 0
+        if len(lines) > 1 and lines[-1] == "":
+            lines.pop()
+            flags |= FLAG_FINAL_NEWLINE
+        RECORDS_READ.inc(len(lines))
+        BYTES_READ.inc(len(text))
+        if (
+            len(lines) < 2
+            or not lines[0].startswith(HEADER_ID)
+            or not lines[-1].startswith(FOOTER_ID)
+        ):
+            raise ValueError(
+                f"{file_path} must have a header and a footer to be "
+                f"snapshotted."
+            )
+
+        counters, amounts, currencies = array("i"), array("q"), array("B")
+        currency_codes: Dict[str, int] = {}
+        for line_number, line in enumerate(lines[1:-1], start=2):
+            fields = line.split(",")
+            if (
+                len(fields) > CURRENCY_INDEX
+                and fields[COUNTER_INDEX].isdigit()
+                and fields[AMOUNT_INDEX].isdigit()
+            ):
+                counter = int(fields[COUNTER_INDEX])
+                amount = int(fields[AMOUNT_INDEX])
+                currency = fields[CURRENCY_INDEX]
+                canonical = format_transaction(
+                    format_counter(counter), format_amount(amount), currency
+                )
+            else:
+                canonical = None
+            if line != canonical:
+                raise ValueError(
+                    f"{file_path}: line {line_number} is not a canonical "
+                    f"transaction record and cannot be snapshotted exactly."
+                )
+            code = currency_codes.setdefault(currency, len(currency_codes))
+            if code >= MAX_CURRENCIES:
+                raise ValueError(
+                    f"{file_path} has more than {MAX_CURRENCIES} currencies."
+                )
+            counters.append(counter)
+            amounts.append(amount)
+            currencies.append(code)
+        if sys.byteorder != "little":
+            counters.byteswap()
+            amounts.byteswap()
+
+        header, footer = lines[0].encode(), lines[-1].encode()
+        currency_table = ",".join(currency_codes).encode()
+        footer_fields = lines[-1].split(",")
+        offset = (
+            SNAPSHOT_HEADER.size
+            + len(header)
+            + len(footer)
+            + len(currency_table)
+        )
+        body = [header, footer, currency_table, _padding(offset)]
+        offset += len(body[-1])
+        counter_offset = offset
+        offset += len(counters) * counters.itemsize
+        body += [counters.tobytes(), _padding(offset)]
+        offset += len(body[-1])
+        amount_offset = offset
+        offset += len(amounts) * amounts.itemsize
+        body.append(amounts.tobytes())
+        currency_offset = offset
+        body.append(currencies.tobytes())
+
+        checksum = 0
+        for chunk in body:
+            checksum = zlib.crc32(chunk, checksum)
+        snapshot_header = SNAPSHOT_HEADER.pack(
+            SNAPSHOT_MAGIC,
+            SNAPSHOT_FORMAT_VERSION,
+            flags,
+            len(header),
+            len(footer),
+            len(currency_table),
+            len(counters),
+            _footer_total(footer_fields, TOTAL_COUNTER_INDEX),
+            _footer_total(footer_fields, CONTROL_SUM_INDEX),
+            counter_offset,
+            amount_offset,
+            currency_offset,
+            checksum,
+        )
+        return [snapshot_header] + body
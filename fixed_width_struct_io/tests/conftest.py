@@ -57,6 +57,33 @@ def string_length_validator():
     return validator
 
 
+@pytest.fixture
+def header_line():
+    return VALID_LINE
+
+
+@pytest.fixture
+def write_file():
+    def write(path, amounts):
+        lines = [VALID_LINE]
+        for counter, amount in enumerate(amounts, start=1):
+            lines.append(f"02,{counter:06d},{amount:012d},USD,{' ' * 97}")
+        lines.append(f"03,{len(amounts):06d},{sum(amounts):012d},{' ' * 100}")
+        path.write_text("\n".join(lines) + "\n")
+        return str(path)
+
+    return write
+
+
+@pytest.fixture
+def read_lines():
+    def read(path):
+        with open(path) as file:
+            return file.read().splitlines()
+
+    return read
+
+
 @pytest.fixture
 def field_retriever(sample_file):
     retriever = FieldRetriever(file_path=sample_file)
@@ -54,3 +54,11 @@ def test_save_immutable_fields_io_error(immutable_field_setter_mock):
         mocked_file.side_effect = IOError("Test error")
         with pytest.raises(IOError):
             immutable_field_setter_mock._save_immutable_fields()
+
+
+def test_config_is_loaded_on_first_use(immutable_field_setter_mock):
+    with patch.object(immutable_field_setter_mock, "_load_immutable_fields", return_value={"name"}) as mock_load:
+        mock_load.assert_not_called()
+        assert immutable_field_setter_mock.is_field_immutable("name") is True
+        assert immutable_field_setter_mock.is_field_immutable("counter") is False
+        mock_load.assert_called_once()
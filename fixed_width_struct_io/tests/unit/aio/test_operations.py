@@ -0,0 +1,67 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from fixed_width_struct_io.aio import AsyncFileOperations
+from fixed_width_struct_io.constants import TRANSACTION_ID
+
+
+@pytest.fixture
+def operations():
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        yield AsyncFileOperations(executor=executor)
+
+
+def test_retrieve_runs_in_the_executor(operations, sample_file):
+    value = asyncio.run(operations.retrieve(sample_file, "transaction", "amount", "2"))
+    assert value == "000000034000"
+
+
+def test_validate_raises_for_an_invalid_file(operations, sample_file):
+    with pytest.raises(ValueError):
+        asyncio.run(operations.validate(sample_file))
+
+
+def test_collect_errors_returns_the_collector(operations, sample_file):
+    collector = asyncio.run(operations.collect_errors(sample_file, max_errors=10))
+    assert len(collector) > 0
+
+
+def test_concurrent_appends_are_all_written(operations, sample_file):
+    async def append_many():
+        return await asyncio.gather(
+            *(operations.append(sample_file, "000000001000", "USD") for _ in range(4))
+        )
+
+    assert asyncio.run(append_many()) == [True] * 4
+    with open(sample_file) as file:
+        assert sum(line.startswith(TRANSACTION_ID) for line in file) == 7
+
+
+def test_cancelled_append_does_not_write(sample_file):
+    started, release = threading.Event(), threading.Event()
+
+    class BlockingOperations(AsyncFileOperations):
+        async def _run(self, function, *args, **kwargs):
+            if function.__name__ == "append_transaction":
+                raise AssertionError("append must not run after cancellation")
+            started.set()
+            await asyncio.get_running_loop().run_in_executor(None, release.wait)
+            return await super()._run(function, *args, **kwargs)
+
+    content = open(sample_file).read()
+
+    async def cancel_append():
+        task = asyncio.create_task(
+            BlockingOperations().append(sample_file, "000000001000", "USD")
+        )
+        await asyncio.get_running_loop().run_in_executor(None, started.wait)
+        task.cancel()
+        release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_append())
+    assert open(sample_file).read() == content
@@ -0,0 +1,78 @@
+import os
+import threading
+
+import pytest
+
+from fixed_width_struct_io.cache import FileCache, file_cache
+from fixed_width_struct_io.metrics import CACHE_MISSES
+from fixed_width_struct_io.writers import TransactionAppender
+
+
+@pytest.fixture
+def cache():
+    return FileCache()
+
+
+def test_hits_share_the_same_parsed_views(cache, sample_file):
+    first = cache.get(sample_file)
+    second = cache.get(sample_file)
+    assert first is second
+    assert isinstance(first.lines, tuple)
+    assert first.retriever.lines is first.lines
+    assert cache.retriever(sample_file).get_value("header", "name").strip() == "nnnnnn"
+
+
+def test_entry_is_reloaded_when_the_file_changes(cache, sample_file):
+    first = cache.get(sample_file)
+    with open(sample_file, "a") as file:
+        file.write("\n")
+    assert cache.get(sample_file) is not first
+
+
+def test_least_recently_used_files_are_evicted_by_size(sample_file, tmp_path):
+    size = os.path.getsize(sample_file)
+    paths = []
+    for name in ("a.txt", "b.txt", "c.txt"):
+        path = tmp_path / name
+        path.write_text(open(sample_file).read())
+        paths.append(str(path))
+    cache = FileCache(max_bytes=2 * size)
+    cache.get(paths[0])
+    cache.get(paths[1])
+    cache.get(paths[0])
+    cache.get(paths[2])
+    assert paths[0] in cache and paths[2] in cache
+    assert paths[1] not in cache
+    assert cache.total_bytes == 2 * size
+
+
+def test_file_larger_than_the_cache_is_not_cached(sample_file):
+    cache = FileCache(max_bytes=1)
+    assert cache.get(sample_file).lines
+    assert len(cache) == 0
+
+
+def test_writers_invalidate_the_shared_cache(sample_file):
+    file_cache.get(sample_file)
+    TransactionAppender(file_path=sample_file).append_transaction("000000001000", "USD")
+    assert sample_file not in file_cache
+    assert len(file_cache.lines(sample_file)) == 6
+    file_cache.clear()
+
+
+def test_concurrent_misses_load_the_file_once(cache, sample_file):
+    misses_before = CACHE_MISSES.value(cache="file_cache")
+    entries = []
+    barrier = threading.Barrier(8)
+
+    def get():
+        barrier.wait()
+        entries.append(cache.get(sample_file))
+
+    workers = [threading.Thread(target=get) for _ in range(8)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert CACHE_MISSES.value(cache="file_cache") == misses_before + 1
+    assert all(entry is entries[0] for entry in entries)
@@ -48,3 +48,13 @@ class TestFileIOBase:
         monkeypatch.setattr(FileIOBase, "_read_file", mock_read_file)
         with pytest.raises(RuntimeError):
             FileIOBase(file_path="sample_file.txt")
+
+    def test_write_lines_to_a_file(self, tmp_path):
+        target = tmp_path / "out.txt"
+        target.write_text("old\n")
+        file_io = FileIOBase(lines=["first", "second"])
+        file_io.write_lines(str(target))
+        assert target.read_text() == "first\nsecond\n"
+        assert file_io.file_path == str(target)
+        with pytest.raises(ValueError, match="No file path"):
+            FileIOBase(lines=["first"]).write_lines()
@@ -0,0 +1,133 @@
+import os
+import threading
+import time
+
+import pytest
+
+from fixed_width_struct_io.constants import TRANSACTION_ID
+from fixed_width_struct_io.core import FileLock, LockTimeoutError
+from fixed_width_struct_io.core.file_lock import held_lock_paths
+from fixed_width_struct_io.metrics import LOCK_TIMEOUTS
+from fixed_width_struct_io.writers import TransactionAppender
+
+
+def _hold_lock(path, exclusive, acquired, release):
+    with FileLock(path, exclusive=exclusive):
+        acquired.set()
+        release.wait(5)
+
+
+@pytest.fixture
+def held_exclusive_lock(sample_file):
+    acquired, release = threading.Event(), threading.Event()
+    holder = threading.Thread(
+        target=_hold_lock, args=(sample_file, True, acquired, release)
+    )
+    holder.start()
+    acquired.wait(5)
+    yield sample_file
+    release.set()
+    holder.join()
+
+
+def test_lock_times_out_while_another_writer_holds_it(held_exclusive_lock):
+    timeouts_before = LOCK_TIMEOUTS.value(lock="shared")
+    with pytest.raises(LockTimeoutError):
+        FileLock(held_exclusive_lock, timeout=0.05).acquire()
+    assert LOCK_TIMEOUTS.value(lock="shared") == timeouts_before + 1
+    assert held_lock_paths() == []
+
+
+def test_shared_locks_do_not_block_each_other(sample_file):
+    acquired, release = threading.Event(), threading.Event()
+    holder = threading.Thread(
+        target=_hold_lock, args=(sample_file, False, acquired, release)
+    )
+    holder.start()
+    acquired.wait(5)
+    try:
+        with FileLock(sample_file, timeout=0.05):
+            pass
+    finally:
+        release.set()
+        holder.join()
+
+
+def test_lock_is_reentrant_within_a_thread(sample_file):
+    with FileLock(sample_file, exclusive=True, timeout=0):
+        with FileLock(sample_file, timeout=0):
+            with FileLock(sample_file, exclusive=True, timeout=0):
+                pass
+        assert len(held_lock_paths()) == 1
+    assert held_lock_paths() == []
+
+
+def test_upgrading_a_shared_lock_is_rejected(sample_file):
+    with FileLock(sample_file):
+        with pytest.raises(ValueError):
+            FileLock(sample_file, exclusive=True).acquire()
+
+
+def test_missing_file_is_left_to_the_reader(tmp_path):
+    with FileLock(str(tmp_path / "missing.txt"), timeout=0):
+        assert len(held_lock_paths()) == 1
+    assert held_lock_paths() == []
+
+
+def test_writer_rereads_the_file_under_the_lock(sample_file):
+    first = TransactionAppender(file_path=sample_file)
+    second = TransactionAppender(file_path=sample_file)
+    first.append_transaction("000000001000", "USD")
+    second.append_transaction("000000002000", "EUR")
+    with open(sample_file) as file:
+        transactions = [
+            line for line in file if line.startswith(TRANSACTION_ID)
+        ]
+    assert len(transactions) == 5
+
+
+def test_concurrent_appends_are_not_lost(sample_file):
+    def append_many():
+        for _ in range(5):
+            TransactionAppender(file_path=sample_file).append_transaction(
+                "000000001000", "USD"
+            )
+
+    workers = [threading.Thread(target=append_many) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    with open(sample_file) as file:
+        transactions = [
+            line for line in file if line.startswith(TRANSACTION_ID)
+        ]
+    assert len(transactions) == 3 + 20
+    assert transactions[-1].split(",")[1] == "000023"
+
+
+def test_replacing_a_locked_file_keeps_new_writers_waiting(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("old\n")
+    acquired, release = threading.Event(), threading.Event()
+    with FileLock(str(path), exclusive=True):
+        waiter = threading.Thread(target=_hold_lock, args=(str(path), True, acquired, release))
+        waiter.start()
+        time.sleep(0.2)  # let the waiter block on the lock
+        temporary = tmp_path / "new.csv"
+        temporary.write_text("new\n")
+        os.replace(temporary, path)
+    assert acquired.wait(5)
+    try:
+        with pytest.raises(LockTimeoutError):
+            FileLock(str(path), exclusive=True, timeout=0).acquire()
+    finally:
+        release.set()
+        waiter.join()
+    assert sorted(p.name for p in tmp_path.iterdir()) == [".data.csv.lock", "data.csv"]
+
+
+def test_shared_lock_on_a_missing_file_creates_no_lock_file(tmp_path):
+    with FileLock(str(tmp_path / "missing.csv")):
+        pass
+    assert list(tmp_path.iterdir()) == []
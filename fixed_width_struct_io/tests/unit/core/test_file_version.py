@@ -0,0 +1,46 @@
+import pytest
+
+from fixed_width_struct_io.core import FileVersion, VersionConflictError
+from fixed_width_struct_io.writers import TransactionAppender
+
+
+def test_version_round_trips_through_its_string_form(sample_file):
+    version = FileVersion.of_file(sample_file)
+    assert FileVersion.parse(str(version)) == version
+    assert version.size == len(open(sample_file, "rb").read())
+
+
+def test_parse_rejects_invalid_versions():
+    with pytest.raises(ValueError):
+        FileVersion.parse("123:abc")
+
+
+def test_versions_match_on_content_not_mtime(sample_file):
+    version = FileVersion.of_file(sample_file)
+    assert version.matches(version._replace(mtime_ns=0))
+    assert not version.matches(version._replace(sha256="0" * 64))
+
+
+def test_write_with_expected_version_succeeds(sample_file):
+    version = FileVersion.of_file(sample_file)
+    appender = TransactionAppender(
+        file_path=sample_file, expected_version=version
+    )
+    appender.append_transaction("000000001000", "USD")
+    assert appender.version == FileVersion.of_file(sample_file)
+    appender.append_transaction("000000002000", "EUR")
+    assert appender.expected_version == FileVersion.of_file(sample_file)
+
+
+def test_write_with_stale_version_is_refused(sample_file):
+    version = FileVersion.of_file(sample_file)
+    TransactionAppender(file_path=sample_file).append_transaction(
+        "000000001000", "USD"
+    )
+    content = open(sample_file).read()
+    appender = TransactionAppender(
+        file_path=sample_file, expected_version=version
+    )
+    with pytest.raises(VersionConflictError):
+        appender.append_transaction("000000002000", "EUR")
+    assert open(sample_file).read() == content
@@ -0,0 +1,42 @@
+from fixed_width_struct_io.helpers import PhaseTimer, phase_timer
+from fixed_width_struct_io.validators import FileStructureValidator
+
+
+def test_disabled_timer_records_nothing():
+    timer = PhaseTimer()
+
+    @timer.timed("work")
+    def work():
+        return 42
+
+    with timer.phase("block"):
+        pass
+    assert work() == 42
+    assert timer.summary() == []
+
+
+def test_enabled_timer_records_phases_and_calls():
+    timer = PhaseTimer()
+
+    @timer.timed("work")
+    def work():
+        return 42
+
+    timer.start()
+    work()
+    work()
+    with timer.phase("block"):
+        pass
+    timer.stop()
+    work()
+    assert [(name, calls) for name, _, calls in timer.summary()] == [("work", 2), ("block", 1)]
+    assert all(total >= 0 for _, total, _ in timer.summary())
+
+
+def test_library_phases_are_recorded(sample_file):
+    phase_timer.start()
+    try:
+        FileStructureValidator(file_path=sample_file).validate()
+    finally:
+        phase_timer.stop()
+    assert [name for name, _, _ in phase_timer.summary()] == ["read", "validate structure"]
@@ -0,0 +1,28 @@
+import logging
+
+from fixed_width_struct_io.helpers import ProgressLogger
+
+
+def test_progress_logged_every_interval(caplog):
+    logger = logging.getLogger("progress_logger_test")
+    with caplog.at_level(logging.INFO, logger="progress_logger_test"):
+        progress = ProgressLogger(logger, "Parsing", interval=2)
+        for processed in range(1, 6):
+            progress.update(processed)
+        progress.finish(5)
+    messages = [record.getMessage() for record in caplog.records]
+    assert len(messages) == 3
+    assert messages[0].startswith("Parsing processed: 2 records")
+    assert messages[1].startswith("Parsing processed: 4 records")
+    assert messages[2].startswith("Parsing finished: 5 records")
+    assert "records/sec" in messages[2]
+
+
+def test_progress_disabled_below_level(caplog):
+    logger = logging.getLogger("progress_logger_test")
+    with caplog.at_level(logging.WARNING, logger="progress_logger_test"):
+        progress = ProgressLogger(logger, "Parsing", interval=1)
+        for processed in range(1, 4):
+            progress.update(processed)
+        progress.finish(3)
+    assert caplog.records == []
@@ -0,0 +1,70 @@
+import os
+
+import pytest
+
+from fixed_width_struct_io.indexes import AmountEntry, AmountIndex, CurrencyIndex
+from fixed_width_struct_io.writers import FieldEditor, TransactionAppender
+
+
+def test_build_sorts_amounts_with_their_counters(tmp_path, write_file):
+    source = write_file(tmp_path / "a.csv", [300, 100, 200, 100])
+    index = AmountIndex.build(source)
+    assert os.path.exists(f"{source}.amount-index")
+    assert list(index.amounts) == [100, 100, 200, 300]
+    assert list(index.counters) == [2, 4, 3, 1]
+    assert index.transaction_count == 4
+
+
+def test_range_top_and_quantile_queries(tmp_path, write_file):
+    source = write_file(tmp_path / "a.csv", [500, 100, 400, 200, 300])
+    index = AmountIndex.load(source)
+    assert [entry.amount for entry in index.between(200, 400)] == [200, 300, 400]
+    assert index.between(150, 160) == []
+    assert [entry.amount for entry in index.between(min_amount=450)] == [500]
+    assert index.top(2) == [AmountEntry(500, 1, 0), AmountEntry(400, 3, 2)]
+    assert len(index.top(10)) == 5
+    assert index.quantile(0.5) == AmountEntry(300, 5, 4)
+    assert index.quantile(0).amount == 100
+    assert index.quantile(1).amount == 500
+    with pytest.raises(ValueError, match="between 0 and 1"):
+        index.quantile(1.5)
+
+
+def test_external_sort_merges_spilled_runs(tmp_path, monkeypatch, write_file):
+    amounts = [(i * 7919) % 1000 for i in range(1, 50)]
+    source = write_file(tmp_path / "a.csv", amounts)
+    monkeypatch.setattr(AmountIndex, "run_size", 4)
+    index = AmountIndex.build(source)
+    assert list(index.amounts) == sorted(amounts)
+    assert [amounts[position] for position in index.positions] == sorted(amounts)
+    assert AmountIndex.load(source).between() == index.between()
+
+
+def test_load_rebuilds_a_stale_sidecar(tmp_path, write_file):
+    source = tmp_path / "a.csv"
+    write_file(source, [100, 200])
+    AmountIndex.build(str(source))
+    write_file(source, [100, 200, 900])
+    assert AmountIndex.load(str(source)).top(1)[0].amount == 900
+
+
+def test_writers_maintain_an_existing_index(tmp_path, write_file):
+    source = write_file(tmp_path / "a.csv", [300, 100, 200])
+    AmountIndex.build(source)
+    CurrencyIndex.build(source)
+    TransactionAppender(file_path=source).append_transaction("000000000150", "EUR")
+    FieldEditor(file_path=source).edit_field_value("transaction", "amount", "000001", "000000000050")
+    FieldEditor(file_path=source).edit_field_value("transaction", "counter", "000003", "000009")
+    index = AmountIndex(source)
+    assert index._read_sidecar() and index._is_fresh()
+    assert [tuple(entry) for entry in index.between()] == [(50, 1, 0), (100, 2, 1), (150, 4, 3), (200, 9, 2)]
+    assert index.between() == AmountIndex.build(source).between()
+    assert CurrencyIndex.load(source).counts() == {"EUR": 1, "USD": 3}
+
+
+def test_transaction_with_a_non_numeric_amount_is_rejected(tmp_path, write_file):
+    source = tmp_path / "a.csv"
+    write_file(source, [100, 200])
+    source.write_text(source.read_text().replace("000000000200", "00000000020x"))
+    with pytest.raises(ValueError, match="the amount on line 3 is not a number"):
+        AmountIndex.build(str(source))
@@ -0,0 +1,124 @@
+import os
+
+import pytest
+
+from fixed_width_struct_io.indexes import CurrencyIndex
+from fixed_width_struct_io.writers import FieldEditor, TransactionAppender
+
+
+@pytest.fixture
+def write_currencies(write_file):
+    def write(path, amounts, currencies):
+        write_file(path, amounts)
+        lines = path.read_text().splitlines()
+        for position, currency in enumerate(currencies, start=1):
+            lines[position] = lines[position].replace(",USD,", f",{currency},")
+        path.write_text("\n".join(lines) + "\n")
+        return str(path)
+
+    return write
+
+
+def test_build_indexes_positions_by_currency(tmp_path, write_currencies):
+    source = write_currencies(tmp_path / "a.csv", [100, 200, 300, 400], ["USD", "EUR", "USD", "GBP"])
+    index = CurrencyIndex.build(source)
+    assert os.path.exists(f"{source}.currency-index")
+    assert index.counts() == {"EUR": 1, "GBP": 1, "USD": 2}
+    assert list(index.positions["USD"]) == [0, 2]
+    assert index.transaction_count == 4
+
+
+def test_filtered_reads_seek_to_the_matching_records(tmp_path, write_currencies):
+    source = write_currencies(tmp_path / "a.csv", [100, 200, 300], ["EUR", "USD", "EUR"])
+    index = CurrencyIndex.load(source)
+    assert [line.split(",")[1] for line in index.lines("EUR")] == ["000001", "000003"]
+    assert index.total("EUR") == 400
+    assert index.total("JPY") == 0
+    with open(source, "rb") as file:
+        file.seek(index.offset(1))
+        assert file.readline().startswith(b"02,000002,")
+
+
+def test_load_reads_the_sidecar_and_rebuilds_it_when_stale(tmp_path, write_currencies):
+    source = tmp_path / "a.csv"
+    write_currencies(source, [100, 200], ["USD", "EUR"])
+    CurrencyIndex.build(str(source))
+    assert CurrencyIndex.load(str(source)).counts() == {"EUR": 1, "USD": 1}
+    write_currencies(source, [100, 200, 300], ["GBP", "GBP", "EUR"])
+    assert CurrencyIndex.load(str(source)).counts() == {"EUR": 1, "GBP": 2}
+
+
+def test_corrupted_sidecar_is_rebuilt(tmp_path, write_currencies):
+    source = write_currencies(tmp_path / "a.csv", [100, 200], ["USD", "EUR"])
+    CurrencyIndex.build(source)
+    sidecar = tmp_path / "a.csv.currency-index"
+    data = bytearray(sidecar.read_bytes())
+    data[-1] ^= 1
+    sidecar.write_bytes(bytes(data))
+    assert list(CurrencyIndex.load(source).positions["EUR"]) == [1]
+
+
+def test_appender_maintains_an_existing_index(tmp_path, write_currencies):
+    source = write_currencies(tmp_path / "a.csv", [100], ["USD"])
+    CurrencyIndex.build(source)
+    TransactionAppender(file_path=source).append_transaction("000000000500", "EUR")
+    index = CurrencyIndex(source)
+    assert index._read_sidecar() and index._is_fresh()
+    assert index.counts() == {"EUR": 1, "USD": 1}
+    assert [line.split(",")[1] for line in index.lines("EUR")] == ["000002"]
+
+
+def test_index_is_removed_when_the_layout_changes(tmp_path, write_file):
+    source = tmp_path / "a.csv"
+    write_file(source, [100])
+    source.write_text(source.read_text().replace("\n", "\r\n"))
+    CurrencyIndex.build(str(source))
+    TransactionAppender(file_path=str(source)).append_transaction("000000000500", "EUR")
+    assert not os.path.exists(f"{source}.currency-index")
+    assert CurrencyIndex.load(str(source)).counts() == {"EUR": 1, "USD": 1}
+
+
+def test_editor_moves_a_transaction_to_its_new_currency(tmp_path, write_currencies):
+    source = write_currencies(tmp_path / "a.csv", [100, 200, 300], ["USD", "USD", "EUR"])
+    CurrencyIndex.build(source)
+    FieldEditor(file_path=source).edit_field_value("transaction", "currency", "000002", "EUR")
+    index = CurrencyIndex(source)
+    assert index._read_sidecar() and index._is_fresh()
+    assert list(index.positions["EUR"]) == [1, 2]
+    assert index.total("EUR") == 500
+    FieldEditor(file_path=source).edit_field_value("transaction", "amount", "000003", "000000000001")
+    assert CurrencyIndex(source)._read_sidecar()
+    assert CurrencyIndex.load(source).total("EUR") == 201
+
+
+def test_writers_do_not_create_an_index(tmp_path, write_file):
+    source = write_file(tmp_path / "a.csv", [100])
+    TransactionAppender(file_path=source).append_transaction("000000000500", "EUR")
+    assert not os.path.exists(f"{source}.currency-index")
+
+
+def test_file_with_transactions_of_different_lengths_is_rejected(tmp_path, write_file):
+    source = tmp_path / "a.csv"
+    write_file(source, [100, 200])
+    source.write_text(source.read_text().replace("USD, ", "USD,", 1))
+    with pytest.raises(ValueError, match="line 3 has another length"):
+        CurrencyIndex.build(str(source))
+
+
+def test_currency_codes_are_case_insensitive(tmp_path, write_currencies):
+    source = write_currencies(tmp_path / "a.csv", [100, 200, 300, 400], ["USD", "eur", "usd", "Eur"])
+    index = CurrencyIndex.build(source)
+    assert index.counts() == {"EUR": 2, "USD": 2}
+    assert index.total("USD") == 400
+    assert [line.split(",")[1] for line in index.lines("eur")] == ["000002", "000004"]
+    FieldEditor(file_path=source).edit_field_value("transaction", "currency", "000001", "eur")
+    assert CurrencyIndex.load(source).counts() == {"EUR": 3, "USD": 1}
+
+
+def test_lines_use_the_positions_of_the_refreshed_index(tmp_path, write_currencies):
+    source = tmp_path / "a.csv"
+    write_currencies(source, [100, 200, 300], ["EUR", "USD", "USD"])
+    index = CurrencyIndex.load(str(source))
+    write_currencies(source, [100, 200, 300], ["USD", "EUR", "EUR"])
+    assert [line.split(",")[3] for line in index.lines("EUR")] == ["EUR", "EUR"]
+    assert index.total("EUR") == 500
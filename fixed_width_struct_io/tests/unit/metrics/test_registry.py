@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+from fixed_width_struct_io.metrics import (
+    APPENDS,
+    BYTES_READ,
+    CACHE_HITS,
+    RECORDS_PARSED,
+    RECORDS_READ,
+    VALIDATION_SECONDS,
+    MetricsRegistry,
+    metrics,
+    write_metrics,
+)
+from fixed_width_struct_io.readers import FieldRetriever
+from fixed_width_struct_io.validators import FileStructureValidator
+from fixed_width_struct_io.writers import TransactionAppender
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+@pytest.fixture
+def library_metrics():
+    metrics.reset()
+    yield metrics
+    metrics.reset()
+
+
+def test_counter_with_labels(registry):
+    hits = registry.counter("hits_total", "Hits.", label_names=["cache"])
+    hits.inc(cache="a")
+    hits.inc(2, cache="a")
+    hits.inc(cache="b")
+    assert hits.value(cache="a") == 3
+    assert hits.value(cache="b") == 1
+    with pytest.raises(ValueError):
+        hits.inc(other="a")
+
+
+def test_registry_returns_existing_metric(registry):
+    counter = registry.counter("edits_total", "Edits.")
+    assert registry.counter("edits_total", "Edits.") is counter
+    with pytest.raises(ValueError):
+        registry.histogram("edits_total", "Edits.")
+
+
+def test_histogram_buckets_and_prometheus_output(registry):
+    seconds = registry.histogram("run_seconds", "Run time.", buckets=[0.1, 1.0])
+    seconds.observe(0.05)
+    seconds.observe(0.5)
+    seconds.observe(5)
+    registry.counter("bytes_total", "Bytes.").inc(10)
+    assert registry.render_prometheus().splitlines() == [
+        "# HELP bytes_total Bytes.",
+        "# TYPE bytes_total counter",
+        "bytes_total 10",
+        "# HELP run_seconds Run time.",
+        "# TYPE run_seconds histogram",
+        'run_seconds_bucket{le="0.1"} 1',
+        'run_seconds_bucket{le="1"} 2',
+        'run_seconds_bucket{le="+Inf"} 3',
+        "run_seconds_sum 5.55",
+        "run_seconds_count 3",
+    ]
+
+
+def test_write_metrics_json(registry, tmp_path):
+    registry.counter("hits_total", "Hits.", label_names=["cache"]).inc(cache="a")
+    path = tmp_path / "metrics.json"
+    write_metrics(str(path), "json", registry)
+    exported = json.loads(path.read_text())
+    assert exported["hits_total"]["samples"] == [{"labels": {"cache": "a"}, "value": 1}]
+    assert [file.name for file in tmp_path.iterdir()] == ["metrics.json"]
+
+
+def test_write_metrics_unknown_format(registry, tmp_path):
+    with pytest.raises(ValueError):
+        write_metrics(str(tmp_path / "metrics.txt"), "xml", registry)
+
+
+def test_library_operations_update_metrics(library_metrics, sample_file):
+    FileStructureValidator(file_path=sample_file).validate()
+    retriever = FieldRetriever(file_path=sample_file)
+    retriever.get_value("header", "name", None)
+    retriever.get_value("footer", "control sum", None)
+    TransactionAppender(file_path=sample_file).append_transaction("000000001000", "USD")
+
+    # The appender re-reads the file under its exclusive lock.
+    assert RECORDS_READ.value() == 20
+    assert BYTES_READ.value() > 0
+    assert RECORDS_PARSED.value() == 5
+    assert CACHE_HITS.value(cache="retriever") == 1
+    assert VALIDATION_SECONDS.count(validator="structure") == 1
+    assert APPENDS.value() == 1
@@ -0,0 +1,76 @@
+import pytest
+
+from fixed_width_struct_io.mirror import SqliteMirror, SyncResult
+from fixed_width_struct_io.writers import FieldEditor, TransactionAppender
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    with SqliteMirror(str(tmp_path / "mirror.db")) as mirror:
+        yield mirror
+
+
+def test_sync_mirrors_header_transactions_and_footer(tmp_path, mirror, write_file):
+    path = write_file(tmp_path / "a.csv", [100, 200])
+    assert mirror.sync(path) == SyncResult(path, "full", 2)
+    assert mirror.get_value(path, "header", "name") == "nnnnnn                      "
+    assert mirror.get_value(path, "transaction", "amount", "2") == "000000000200"
+    assert mirror.get_value(path, "footer", "control sum") == "000000000300"
+
+
+def test_transactions_are_looked_up_by_counter(tmp_path, mirror, write_file):
+    path = write_file(tmp_path / "a.csv", [100, 200, 300])
+    with open(path) as file:
+        lines = file.read().splitlines()
+    del lines[1]
+    (tmp_path / "a.csv").write_text("\n".join(lines) + "\n")
+    mirror.sync(path)
+    assert mirror.get_value(path, "transaction", "amount", "2") == "000000000200"
+    assert mirror.get_value(path, "transaction", "amount", "000003") == "000000000300"
+    with pytest.raises(ValueError, match="specified counter '1'"):
+        mirror.get_value(path, "transaction", "amount", "1")
+
+
+def test_unchanged_file_is_skipped(tmp_path, mirror, write_file):
+    path = write_file(tmp_path / "a.csv", [100])
+    mirror.sync(path)
+    assert mirror.sync(path).mode == "unchanged"
+
+
+def test_appended_transactions_sync_incrementally(tmp_path, mirror, write_file):
+    path = write_file(tmp_path / "a.csv", [100, 200])
+    mirror.sync(path)
+    TransactionAppender(file_path=path).append_transaction("000000000300", "EUR")
+    assert mirror.sync(path) == SyncResult(path, "incremental", 3)
+    assert mirror.get_value(path, "transaction", "currency", "3") == "EUR"
+    assert mirror.get_value(path, "footer", "total counter") == "000003"
+
+
+def test_edited_file_is_mirrored_again(tmp_path, mirror, write_file):
+    path = write_file(tmp_path / "a.csv", [100, 200])
+    mirror.sync(path)
+    FieldEditor(file_path=path).edit_field_value("transaction", "amount", "000001", "000000000500")
+    assert mirror.sync(path).mode == "full"
+    assert mirror.get_value(path, "transaction", "amount", "1") == "000000000500"
+    assert mirror.get_value(path, "transaction", "amount", "2") == "000000000200"
+
+
+def test_transactions_query_across_files(tmp_path, mirror, write_file):
+    first = write_file(tmp_path / "a.csv", [100, 5000])
+    second = write_file(tmp_path / "b.csv", [7000])
+    mirror.sync(first)
+    mirror.sync(second)
+    rows = mirror.transactions(currency="usd", min_amount=1000)
+    assert [(row["path"], row["position"], row["amount_cents"]) for row in rows] == [(first, 2, 5000), (second, 1, 7000)]
+    assert len(mirror.transactions(file_path=first)) == 2
+
+
+def test_get_value_errors(tmp_path, mirror, write_file):
+    path = write_file(tmp_path / "a.csv", [100])
+    with pytest.raises(ValueError, match="is not mirrored"):
+        mirror.get_value(path, "header", "name")
+    mirror.sync(path)
+    with pytest.raises(ValueError, match="Transaction not found"):
+        mirror.get_value(path, "transaction", "amount", "2")
+    with pytest.raises(ValueError, match="doesn't have field"):
+        mirror.get_value(path, "footer", "name")
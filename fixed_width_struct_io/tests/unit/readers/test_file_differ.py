@@ -0,0 +1,59 @@
+import pytest
+
+from fixed_width_struct_io.readers.file_differ import Difference, FileDiffer
+
+
+def test_identical_files_skip_every_block(tmp_path, write_file):
+    old = write_file(tmp_path / "old.csv", list(range(1, 11)))
+    new = write_file(tmp_path / "new.csv", list(range(1, 11)))
+    diff = FileDiffer(old, new, block_lines=4).diff()
+    assert diff.identical
+    assert diff.blocks_compared == 0
+    assert diff.blocks_skipped == 3
+
+
+def test_changed_amount_only_decodes_its_block(tmp_path, write_file):
+    old = write_file(tmp_path / "old.csv", list(range(1, 11)))
+    new = write_file(tmp_path / "new.csv", [1, 2, 3, 4, 5, 6, 70, 8, 9, 10])
+    diff = FileDiffer(old, new, block_lines=4).diff()
+    assert list(diff)[0] == Difference("transaction", "changed", "000007", "amount", "000000000007", "000000000070")
+    assert diff.blocks_compared == 2
+    assert diff.blocks_skipped == 1
+    assert diff.footer_delta == {"control sum": 63}
+
+
+def test_added_transaction_and_footer_delta(tmp_path, write_file):
+    old = write_file(tmp_path / "old.csv", [100, 200])
+    new = write_file(tmp_path / "new.csv", [100, 200, 300])
+    diff = FileDiffer(old, new).diff()
+    assert [(d.record_type, d.change, d.counter, d.field) for d in diff] == [
+        ("transaction", "added", "000003", "amount"),
+        ("transaction", "added", "000003", "currency"),
+        ("footer", "changed", None, "total counter"),
+        ("footer", "changed", None, "control sum"),
+    ]
+    assert diff.footer_delta == {"total counter": 1, "control sum": 300}
+
+
+def test_removed_transaction_across_blocks(tmp_path, write_file):
+    old = write_file(tmp_path / "old.csv", [1, 2, 3, 4, 5])
+    new = write_file(tmp_path / "new.csv", [1, 2, 3, 4])
+    diff = FileDiffer(old, new, block_lines=2).diff()
+    removed = [d for d in diff if d.change == "removed"]
+    assert [(d.counter, d.field, d.old, d.new) for d in removed] == [
+        ("000005", "amount", "000000000005", None),
+        ("000005", "currency", "USD", None),
+    ]
+
+
+def test_changed_header_field(tmp_path, write_file, header_line):
+    old = write_file(tmp_path / "old.csv", [1])
+    new_path = tmp_path / "new.csv"
+    new_path.write_text(open(old).read().replace(header_line, header_line.replace("nnnnnn", "mmmmmm")))
+    diff = FileDiffer(old, str(new_path)).diff()
+    assert [(d.record_type, d.field) for d in diff] == [("header", "name")]
+
+
+def test_invalid_block_size():
+    with pytest.raises(ValueError):
+        FileDiffer("a.csv", "b.csv", block_lines=0)
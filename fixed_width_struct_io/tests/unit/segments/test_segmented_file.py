@@ -0,0 +1,88 @@
+import json
+from unittest.mock import patch
+
+import pytest
+
+from fixed_width_struct_io.segments import SegmentDirectory, SegmentedFile
+
+SEGMENT = """01,nnnnnn                      ,ooooooo                       ,dnit                          ,street4567                    
+02,000001,000000009000,GBP,                                                                                                 
+02,000002,000000034000,EUR,                                                                                                 
+03,000002,000000043000,                                                                                                    
+"""
+
+
+@pytest.fixture
+def segmented_path(tmp_path):
+    path = tmp_path / "segmented.csv"
+    path.write_text(SEGMENT + SEGMENT.replace("000000009000", "000000001000").replace("000000043000", "000000035000"))
+    return str(path)
+
+
+def test_scan_finds_every_segment(segmented_path):
+    directory = SegmentDirectory.scan(segmented_path)
+    assert len(directory) == 2
+    assert directory[2].first_line == 5
+    assert directory[2].offset == len(SEGMENT)
+    assert directory.transaction_count == 4
+
+
+def test_directory_is_saved_and_reused(segmented_path):
+    SegmentDirectory.load(segmented_path)
+    with open(f"{segmented_path}.segments") as sidecar:
+        assert len(json.load(sidecar)["segments"]) == 2
+    with patch.object(SegmentDirectory, "scan") as scan:
+        assert len(SegmentDirectory.load(segmented_path)) == 2
+    scan.assert_not_called()
+
+
+def test_values_are_addressed_by_segment_and_counter(segmented_path):
+    segmented = SegmentedFile(segmented_path)
+    assert segmented.get_value(1, "transaction", "amount", "1") == "000000009000"
+    assert segmented.get_value(2, "transaction", "amount", "1") == "000000001000"
+    assert segmented.get_value(2, "footer", "control sum") == "000000035000"
+    with pytest.raises(ValueError):
+        segmented.get_value(3, "footer", "control sum")
+
+
+def test_validate_checks_every_segment(segmented_path):
+    segmented = SegmentedFile(segmented_path)
+    assert segmented.validate() is True
+    assert segmented.validate(workers=2) is True
+    with open(segmented_path, "a") as file:
+        file.write(SEGMENT.replace("03,000002", "03,000003"))
+    with pytest.raises(ValueError, match="Segment 3"):
+        segmented.validate()
+
+
+def test_append_goes_to_the_last_segment(segmented_path):
+    segmented = SegmentedFile(segmented_path)
+    assert segmented.append_transaction("000000002000", "USD") == 2
+    assert segmented.get_value(2, "transaction", "counter", "3") == "000003"
+    assert segmented.get_value(2, "footer", "control sum") == "000000037000"
+    assert segmented.directory.segments == SegmentDirectory.scan(segmented_path).segments
+    assert segmented.validate() is True
+
+
+def test_append_starts_a_new_segment_when_the_last_one_is_full(segmented_path):
+    segmented = SegmentedFile(segmented_path)
+    with patch("fixed_width_struct_io.segments.segmented_file.MAX_TRANSACTIONS_AMOUNT", 2):
+        assert segmented.append_transaction("000000002000", "USD") == 3
+    assert segmented.get_value(3, "header", "name").strip() == "nnnnnn"
+    assert segmented.get_value(3, "footer", "total counter") == "000001"
+    assert segmented.directory.segments == SegmentDirectory.scan(segmented_path).segments
+    assert segmented.validate() is True
+
+
+def test_new_segment_after_a_footer_without_trailing_newline(segmented_path):
+    with open(segmented_path, "r+") as file:
+        file.truncate(len(file.read().rstrip("\n")))
+    segmented = SegmentedFile(segmented_path)
+    with patch("fixed_width_struct_io.segments.segmented_file.MAX_TRANSACTIONS_AMOUNT", 2):
+        with pytest.raises(ValueError, match="currency"):
+            segmented.append_transaction("000000002000", "ZZZ")
+        assert segmented.append_transaction("000000002000", "USD") == 3
+    assert segmented.get_value(2, "footer", "control sum") == "000000035000"
+    assert segmented.get_value(3, "transaction", "amount", "1") == "000000002000"
+    assert segmented.directory.segments == SegmentDirectory.scan(segmented_path).segments
+    assert segmented.validate() is True
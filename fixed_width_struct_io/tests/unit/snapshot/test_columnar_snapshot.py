@@ -0,0 +1,68 @@
+import pytest
+
+from fixed_width_struct_io.snapshot import ColumnarSnapshot
+
+
+def test_restore_reproduces_the_file_exactly(tmp_path, write_file):
+    source = write_file(tmp_path / "a.csv", [100, 250, 999999])
+    snapshot_path = str(tmp_path / "a.snap")
+    ColumnarSnapshot.export(source, snapshot_path).close()
+    with ColumnarSnapshot(snapshot_path) as snapshot:
+        snapshot.restore(str(tmp_path / "restored.csv"))
+    assert (tmp_path / "restored.csv").read_bytes() == (tmp_path / "a.csv").read_bytes()
+
+
+def test_columns_are_readable_without_parsing(tmp_path, write_file):
+    source = tmp_path / "a.csv"
+    write_file(source, [100, 250, 300])
+    source.write_text(source.read_text().replace("000003,000000000300,USD", "000003,000000000300,EUR"))
+    with ColumnarSnapshot.export(str(source), str(tmp_path / "a.snap")) as snapshot:
+        assert len(snapshot) == 3
+        assert list(snapshot.counters) == [1, 2, 3]
+        assert list(snapshot.amounts) == [100, 250, 300]
+        assert snapshot.currency(2) == "EUR"
+        assert snapshot.totals_by_currency() == {"USD": 350, "EUR": 300}
+        assert (snapshot.total_counter, snapshot.control_sum) == (3, 650)
+
+
+def test_byte_swapped_columns_keep_one_item_per_value(tmp_path, monkeypatch, write_file):
+    source = write_file(tmp_path / "a.csv", [100, 120])
+    ColumnarSnapshot.export(source, str(tmp_path / "a.snap")).close()
+    monkeypatch.setattr("fixed_width_struct_io.snapshot.columnar_snapshot.sys.byteorder", "big")
+    with ColumnarSnapshot(str(tmp_path / "a.snap")) as snapshot:
+        assert len(snapshot.amounts) == 2
+        assert list(snapshot.amounts) == [100 << 56, 120 << 56]
+
+
+def test_file_without_final_newline_is_reproduced(tmp_path, write_file):
+    source = tmp_path / "a.csv"
+    write_file(source, [100])
+    source.write_text(source.read_text().rstrip("\n"))
+    with ColumnarSnapshot.export(str(source), str(tmp_path / "a.snap")) as snapshot:
+        snapshot.restore(str(tmp_path / "restored.csv"))
+    assert (tmp_path / "restored.csv").read_text() == source.read_text()
+
+
+def test_non_canonical_transaction_is_rejected(tmp_path, write_file):
+    source = tmp_path / "a.csv"
+    write_file(source, [100])
+    source.write_text(source.read_text().replace("USD,", "USD,x", 1))
+    with pytest.raises(ValueError, match="line 2 is not a canonical transaction"):
+        ColumnarSnapshot.export(str(source), str(tmp_path / "a.snap"))
+
+
+def test_corrupted_snapshot_fails_its_checksum(tmp_path, write_file):
+    source = write_file(tmp_path / "a.csv", [100, 200])
+    snapshot_path = tmp_path / "a.snap"
+    ColumnarSnapshot.export(source, str(snapshot_path)).close()
+    data = bytearray(snapshot_path.read_bytes())
+    data[-1] ^= 1
+    snapshot_path.write_bytes(bytes(data))
+    with pytest.raises(ValueError, match="failed its checksum"):
+        ColumnarSnapshot(str(snapshot_path))
+
+
+def test_other_files_are_not_snapshots(tmp_path, write_file):
+    source = write_file(tmp_path / "a.csv", [100])
+    with pytest.raises(ValueError, match="is not a snapshot"):
+        ColumnarSnapshot(source)
@@ -1,58 +1,51 @@
 import pytest
 from unittest.mock import patch
 from fixed_width_struct_io.utils import validate_field
+from fixed_width_struct_io.validators.validation_plan import get_field_check
 
 
-RECORD_TYPES = {
-    "header": "01",
-    "transaction": "02",
-    "footer": "03",
-}
+@pytest.mark.parametrize(
+    "record_type,field_name,field_value",
+    [
+        ("header", "name", "20210101".ljust(28)),
+        ("transaction", "amount", "000000032000"),
+        ("transaction", "Currency", "usd"),
+        ("footer", "control sum", "000000114000"),
+    ],
+)
+def test_validate_field_success_cases(record_type, field_name, field_value):
+    assert validate_field(record_type, field_name, field_value) is True
 
 
 @pytest.mark.parametrize(
-    "record_type,field_name,field_value,length_valid,value_valid,expected",
+    "record_type,field_name,field_value,expected_message",
     [
-        ("header", "name", "20210101", True, True, True),
-        ("transaction", "amount", "000000032000", False, True, False),
-        ("footer", "control sum", "000000114000", True, False, False),
+        ("transaction", "amount", "00000032000", "expected length 12, found 11"),
+        ("transaction", "currency", "ZZZ", "currency 'ZZZ' is not in the currencies list"),
+        ("footer", "control sum", "00000011400x", "does not match the field format"),
+        ("footer", "field id", "02", "expected fixed value '03'"),
     ],
 )
-@patch("fixed_width_struct_io.validators.StringLengthValidator.validate_individual_field_length")
-@patch("fixed_width_struct_io.validators.ValuesValidator.validate_field")
-def test_validate_field_success_cases(
-    mock_validate_field,
-    mock_validate_length,
-    record_type,
-    field_name,
-    field_value,
-    length_valid,
-    value_valid,
-    expected
-):
-    mock_validate_length.return_value = length_valid
-    mock_validate_field.return_value = value_valid
-    assert validate_field(record_type, field_name, field_value) == expected
+def test_validate_field_failure_cases(record_type, field_name, field_value, expected_message):
+    with pytest.raises(ValueError) as excinfo:
+        validate_field(record_type, field_name, field_value)
+    assert f"Error validating field '{field_name}' in record type '{record_type}'" in str(excinfo.value)
+    assert expected_message in str(excinfo.value)
 
 
 @pytest.mark.parametrize(
-    "record_type,field_name,field_value,length_valid,value_valid",
+    "record_type,field_name",
     [
-        ("unknown", "field", "value", True, True),
+        ("unknown", "field"),
+        ("transaction", "iban"),
     ],
 )
-@patch("fixed_width_struct_io.validators.StringLengthValidator.validate_individual_field_length")
-@patch("fixed_width_struct_io.validators.ValuesValidator.validate_field")
-def test_validate_field_exception_cases(
-    mock_validate_field,
-    mock_validate_length,
-    record_type,
-    field_name,
-    field_value,
-    length_valid,
-    value_valid,
-):
-    mock_validate_length.return_value = length_valid
-    mock_validate_field.return_value = value_valid
+def test_validate_field_exception_cases(record_type, field_name):
     with pytest.raises(ValueError):
-        validate_field(record_type, field_name, field_value)
+        validate_field(record_type, field_name, "value")
+
+
+@patch("fixed_width_struct_io.utils.validation.get_field_check", wraps=get_field_check)
+def test_validate_field_uses_the_validation_plan(mock_get_field_check):
+    validate_field("transaction", "amount", "000000032000")
+    mock_get_field_check.assert_called_once_with("02", "amount")
@@ -0,0 +1,126 @@
+import pytest
+
+from fixed_width_struct_io.validators import (
+    ErrorCollector,
+    FileStructureValidator,
+    StringLengthValidator,
+    ValuesValidator,
+    validate_lines,
+)
+
+HEADER = "01,nnnnnn                      ,ooooooo                       ,dnit                          ,street4567                    "
+FIRST_TRANSACTION = "02,000001,000000009000,gbp,                                                                                                 "
+SECOND_TRANSACTION = "02,000002,000000034000,eur,                                                                                                 "
+FOOTER = "03,000002,000000043000,                                                                                                    "
+VALID_LINES = [HEADER, FIRST_TRANSACTION, SECOND_TRANSACTION, FOOTER]
+
+
+def test_collector_is_bounded():
+    streamed = []
+    collector = ErrorCollector(max_errors=2, on_error=streamed.append)
+    assert collector.add(1, "02", "amount", "first") is True
+    assert collector.add(2, "02", "amount", "second") is True
+    assert collector.add(3, "02", "amount", "third") is False
+    assert len(collector) == 2
+    assert collector.is_full and collector.truncated
+    assert [issue.reason for issue in streamed] == ["first", "second"]
+    assert streamed[0].record_type == "transaction"
+    assert collector.summary() == {"valid": False, "errors": 2, "max_errors": 2, "truncated": True}
+
+
+def test_collector_rejects_non_positive_bound():
+    with pytest.raises(ValueError):
+        ErrorCollector(max_errors=0)
+
+
+@pytest.mark.parametrize("validator_class", [FileStructureValidator, StringLengthValidator, ValuesValidator])
+def test_valid_file_has_no_errors(validator_class):
+    collector = ErrorCollector(max_errors=10)
+    validator_class(lines=VALID_LINES).collect_errors(collector)
+    assert len(collector) == 0
+    assert collector.summary()["valid"] is True
+
+
+def test_structure_errors_collected_in_one_pass():
+    lines = [FIRST_TRANSACTION, "04" + HEADER[2:], HEADER, FOOTER, SECOND_TRANSACTION]
+    collector = ErrorCollector(max_errors=10)
+    FileStructureValidator(lines=lines).collect_errors(collector)
+    reasons = [(issue.line, issue.reason) for issue in collector]
+    assert (1, "first line must be a header") in reasons
+    assert (5, "last line must be a footer") in reasons
+    assert (2, "unknown record type '04'") in reasons
+    assert (3, "extra header") in reasons
+    assert (4, "extra footer") in reasons
+
+
+def test_length_errors_collected_in_one_pass():
+    lines = [HEADER, FIRST_TRANSACTION.replace("000001", "0001"), SECOND_TRANSACTION + " ", FOOTER]
+    collector = ErrorCollector(max_errors=10)
+    StringLengthValidator(lines=lines).collect_errors(collector)
+    fields = [(issue.line, issue.field) for issue in collector]
+    assert (2, "counter") in fields
+    assert (3, "reserved") in fields
+
+
+def test_values_errors_collected_in_one_pass():
+    lines = [
+        HEADER,
+        FIRST_TRANSACTION.replace("gbp", "zzz"),
+        SECOND_TRANSACTION.replace("000002", "000005"),
+        FOOTER,
+    ]
+    collector = ErrorCollector(max_errors=10)
+    ValuesValidator(lines=lines).collect_errors(collector)
+    fields = [(issue.line, issue.field) for issue in collector]
+    assert fields == [(2, "currency"), (3, "counter"), (4, "total counter")]
+
+
+def test_values_collection_stops_when_full():
+    lines = [HEADER] + [FIRST_TRANSACTION.replace("gbp", "zzz")] * 5 + [FOOTER]
+    collector = ErrorCollector(max_errors=2)
+    ValuesValidator(lines=lines).collect_errors(collector)
+    assert len(collector) == 2
+    assert collector.truncated is True
+
+
+def test_wrong_length_is_reported_once_per_field():
+    lines = [HEADER, FIRST_TRANSACTION.replace("000001,", "0001,  "), SECOND_TRANSACTION, FOOTER]
+    collector = ErrorCollector(max_errors=10)
+    StringLengthValidator(lines=lines).collect_errors(collector)
+    ValuesValidator(lines=lines).collect_errors(collector)
+    fields = [(issue.line, issue.field) for issue in collector]
+    assert fields.count((2, "counter")) == 1
+
+
+def test_missing_counter_is_reported_once():
+    transactions = [
+        FIRST_TRANSACTION.replace("000001", str(counter).zfill(6))
+        for counter in (1, 2, 4, 5, 6)
+    ]
+    footer = FOOTER.replace("000002,000000043000", "000006,000000045000")
+    lines = [HEADER, *transactions, footer]
+    collector = ErrorCollector(max_errors=10)
+    ValuesValidator(lines=lines).collect_errors(collector)
+    assert [(issue.line, issue.reason) for issue in collector] == [
+        (4, "counter is not auto-incremented, expected 000003"),
+    ]
+
+
+def test_swapped_counter_reports_both_neighbours():
+    lines = [HEADER, FIRST_TRANSACTION, SECOND_TRANSACTION.replace("000002", "000009"), FIRST_TRANSACTION.replace("000001", "000003"), FOOTER.replace("000002,000000043000", "000003,000000052000")]
+    collector = ErrorCollector(max_errors=10)
+    ValuesValidator(lines=lines).collect_errors(collector)
+    assert [(issue.line, issue.reason) for issue in collector] == [
+        (3, "counter is not auto-incremented, expected 000002"),
+        (4, "counter is not auto-incremented, expected 000010"),
+    ]
+
+
+def test_validate_lines_fail_fast_and_collecting():
+    assert validate_lines(VALID_LINES) == {"valid": True}
+    lines = [HEADER, FIRST_TRANSACTION.replace("gbp", "zzz"), SECOND_TRANSACTION, FOOTER]
+    with pytest.raises(ValueError):
+        validate_lines(lines)
+    result = validate_lines(lines, max_errors=5)
+    assert [error["field"] for error in result["errors"]] == ["currency"]
+    assert result["summary"]["valid"] is False
@@ -0,0 +1,68 @@
+import re
+
+import pytest
+
+from fixed_width_struct_io.constants import CURRENCIES, FIELD_ORDER
+from fixed_width_struct_io.validators.validation_plan import (
+    FAILURE_CURRENCY,
+    FAILURE_FIXED_VALUE,
+    FAILURE_FORMAT,
+    FAILURE_LENGTH,
+    FAILURE_TYPE,
+    find_failure,
+    first_failure,
+    get_field_check,
+    get_validation_plan,
+)
+
+HEADER_ID = "01"
+TRANSACTION_ID = "02"
+FOOTER_ID = "03"
+TRANSACTION_VALID_LINE = "02,000001,000000009000,gbp,                                                                                                 "
+
+
+@pytest.mark.parametrize("record_type", [HEADER_ID, TRANSACTION_ID, FOOTER_ID])
+def test_plan_follows_field_order(record_type):
+    plan = get_validation_plan(record_type)
+    assert [check.name for check in plan] == FIELD_ORDER[record_type]
+
+
+def test_plan_is_compiled_once():
+    assert get_validation_plan(TRANSACTION_ID) is get_validation_plan(TRANSACTION_ID)
+
+
+def test_plan_contains_precompiled_checks():
+    counter = get_field_check(TRANSACTION_ID, "counter")
+    currency = get_field_check(TRANSACTION_ID, "currency")
+    field_id = get_field_check(TRANSACTION_ID, "field id")
+    assert isinstance(counter.pattern, re.Pattern)
+    assert counter.length == 6
+    assert currency.currencies == CURRENCIES
+    assert field_id.fixed_value == TRANSACTION_ID
+    assert counter.currencies is None
+
+
+def test_unknown_field_raises_key_error():
+    with pytest.raises(KeyError):
+        get_field_check(HEADER_ID, "unknown")
+    with pytest.raises(KeyError):
+        get_validation_plan("04")
+
+
+@pytest.mark.parametrize("field_name, field_value, expected", [
+    ("counter", "000001", None),
+    ("counter", 1, FAILURE_TYPE),
+    ("counter", "0001", FAILURE_LENGTH),
+    ("field id", "01", FAILURE_FIXED_VALUE),
+    ("currency", "ZZZ", FAILURE_CURRENCY),
+    ("amount", "00000000900a", FAILURE_FORMAT),
+])
+def test_find_failure(field_name, field_value, expected):
+    assert find_failure(get_field_check(TRANSACTION_ID, field_name), field_value) == expected
+
+
+def test_first_failure():
+    plan = get_validation_plan(TRANSACTION_ID)
+    assert first_failure(plan, TRANSACTION_VALID_LINE.split(",")) == -1
+    invalid_values = TRANSACTION_VALID_LINE.replace("gbp", "zzz").split(",")
+    assert first_failure(plan, invalid_values) == 3
@@ -86,3 +86,13 @@ def test_validate_field_for_transactions_and_footer(record_type, field_name, fie
     else:
         assert ValuesValidator.validate_field(record_type, field_name, field_value) is True
 
+
+
+def test_validate_control_sum_has_no_float_drift():
+    transactions = [
+        TRANSACTION_VALID_LINE.replace("000001,000000009000", f"{counter:06d},000000000010")
+        for counter in range(1, 11)
+    ]
+    footer = FOOTER_VALID_LINE.replace("000001,000000009000", "000010,000000000100")
+    validator = ValuesValidator(lines=[HEADER_VALID_LINE, *transactions, footer])
+    assert validator.validate() is True
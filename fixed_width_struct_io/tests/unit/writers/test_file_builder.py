@@ -0,0 +1,83 @@
+import pytest
+
+from fixed_width_struct_io.validators import FileStructureValidator, StringLengthValidator, ValuesValidator
+from fixed_width_struct_io.writers.file_builder import FileBuilder
+from fixed_width_struct_io.writers.record_exporter import RecordExporter
+
+HEADER_VALUES = {"name": "nnnnnn", "surname": "ooooooo", "patronymic": "dnit", "address": "street4567"}
+
+
+def assert_valid(path):
+    with open(path) as file:
+        lines = file.read().splitlines()
+    assert FileStructureValidator(lines=lines).validate()
+    assert StringLengthValidator(lines=lines).validate()
+    assert ValuesValidator(lines=lines).validate()
+    return lines
+
+
+def test_build_from_rows(tmp_path, header_line):
+    output = str(tmp_path / "built.csv")
+    rows = [{"amount": "100", "currency": "usd"}, {"amount": 250, "currency": "EUR"}, {"amount": "000000000350", "currency": "GBP"}]
+    assert FileBuilder(HEADER_VALUES).build(rows, output) == 3
+    lines = assert_valid(output)
+    assert lines[0] == header_line
+    assert [line.split(",")[1:4] for line in lines[1:-1]] == [
+        ["000001", "000000000100", "USD"],
+        ["000002", "000000000250", "EUR"],
+        ["000003", "000000000350", "GBP"],
+    ]
+    assert lines[-1].startswith("03,000003,000000000700,")
+
+
+def test_build_from_csv_and_jsonl(tmp_path):
+    (tmp_path / "rows.csv").write_text("amount,currency\n1,USD\n20.50,EUR\n")
+    (tmp_path / "rows.jsonl").write_text('{"amount": "1.00", "currency": "USD"}\n\n{"amount": "20.5", "currency": "EUR"}\n')
+    builder = FileBuilder(HEADER_VALUES, amount_format="decimal")
+    builder.build_from(str(tmp_path / "rows.csv"), str(tmp_path / "a.csv"))
+    builder.build_from(str(tmp_path / "rows.jsonl"), str(tmp_path / "b.csv"))
+    lines = assert_valid(tmp_path / "a.csv")
+    assert lines == assert_valid(tmp_path / "b.csv")
+    assert lines[-1].startswith("03,000002,000000002150,")
+
+
+@pytest.mark.parametrize("amount_format, valid, invalid", [
+    ("cents", ["12", 12], ["12.0", "12.00", 12.0]),
+    ("decimal", ["0.12", "0.1"], [12, "1.234", "1,00"]),
+    ("text", ["000000000012"], ["12", 12, "0.12"]),
+])
+def test_every_amount_has_the_unit_of_the_amount_format(tmp_path, amount_format, valid, invalid, read_lines):
+    builder = FileBuilder(HEADER_VALUES, amount_format=amount_format)
+    output = str(tmp_path / "built.csv")
+    for amount in valid:
+        builder.build([{"amount": amount, "currency": "USD"}], output)
+        assert read_lines(output)[1].split(",")[2] == ("000000000010" if amount == "0.1" else "000000000012")
+    for amount in invalid:
+        with pytest.raises(ValueError, match=f"Row 1: invalid amount .* '{amount_format}' amount format"):
+            builder.build([{"amount": amount, "currency": "USD"}], output)
+    with pytest.raises(ValueError, match="Invalid amount format"):
+        FileBuilder(HEADER_VALUES, amount_format="units")
+
+
+def test_build_back_an_exported_file(tmp_path, write_file, read_lines):
+    source = write_file(tmp_path / "source.csv", [100, 200, 300])
+    RecordExporter(source).export(str(tmp_path / "export.csv"))
+    FileBuilder(HEADER_VALUES).build_from(str(tmp_path / "export.csv"), str(tmp_path / "rebuilt.csv"))
+    assert read_lines(tmp_path / "rebuilt.csv") == read_lines(source)
+
+
+def test_invalid_row_leaves_no_output(tmp_path):
+    output = tmp_path / "built.csv"
+    rows = [{"amount": "100", "currency": "USD"}, {"amount": "1.234", "currency": "USD"}]
+    with pytest.raises(ValueError, match="Row 2: invalid amount"):
+        FileBuilder(HEADER_VALUES).build(rows, str(output))
+    with pytest.raises(ValueError, match="Row 1: invalid currency"):
+        FileBuilder(HEADER_VALUES).build([{"amount": "100", "currency": "JPY"}], str(output))
+    assert [p.name for p in tmp_path.iterdir()] == [".built.csv.lock"]
+
+
+def test_invalid_header_values():
+    with pytest.raises(ValueError, match="Unknown header field"):
+        FileBuilder({"iban": "x"})
+    with pytest.raises(ValueError, match="Invalid header name"):
+        FileBuilder({"name": "n" * 29})
@@ -0,0 +1,39 @@
+import pytest
+
+from fixed_width_struct_io.validators import FileStructureValidator, ValuesValidator
+from fixed_width_struct_io.writers.file_merger import FileMerger
+
+def test_merge_renumbers_counters_and_recomputes_the_footer(tmp_path, write_file, read_lines):
+    inputs = [write_file(tmp_path / "a.csv", [100, 200]), write_file(tmp_path / "b.csv", [300])]
+    output = str(tmp_path / "merged.csv")
+    assert FileMerger(inputs).merge(output) == [output]
+    lines = read_lines(output)
+    assert [line.split(",")[1] for line in lines[1:-1]] == ["000001", "000002", "000003"]
+    assert lines[-1].startswith("03,000003,000000000600,")
+    assert FileStructureValidator(lines=lines).validate()
+    assert ValuesValidator(lines=lines).validate()
+
+
+def test_merge_splits_outputs_at_the_transaction_limit(tmp_path, write_file, read_lines):
+    inputs = [write_file(tmp_path / "a.csv", [1, 2, 3]), write_file(tmp_path / "b.csv", [4, 5])]
+    outputs = FileMerger(inputs, max_transactions=2).merge(str(tmp_path / "merged.csv"))
+    assert [path.rsplit("/", 1)[1] for path in outputs] == ["merged.001.csv", "merged.002.csv", "merged.003.csv"]
+    footers = [read_lines(path)[-1].split(",")[:3] for path in outputs]
+    assert footers == [["03", "000002", "000000000003"], ["03", "000002", "000000000007"], ["03", "000001", "000000000005"]]
+
+
+def test_merge_rejects_an_input_with_a_wrong_footer(tmp_path, write_file):
+    bad = tmp_path / "bad.csv"
+    write_file(bad, [100])
+    bad.write_text(bad.read_text().replace("03,000001,000000000100", "03,000001,000000000999"))
+    output = tmp_path / "merged.csv"
+    with pytest.raises(ValueError, match="footer does not match"):
+        FileMerger([write_file(tmp_path / "a.csv", [1]), str(bad)]).merge(str(output))
+    assert not output.exists()
+    assert [path.name for path in tmp_path.iterdir() if path.name.startswith(".merge-")] == []
+
+
+def test_merge_refuses_to_overwrite_an_input(tmp_path, write_file):
+    path = write_file(tmp_path / "a.csv", [1])
+    with pytest.raises(ValueError):
+        FileMerger([path]).merge(path)
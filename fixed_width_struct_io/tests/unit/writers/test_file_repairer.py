@@ -0,0 +1,66 @@
+import pytest
+
+from fixed_width_struct_io.readers.file_differ import Difference
+from fixed_width_struct_io.validators import ValuesValidator
+from fixed_width_struct_io.writers.file_repairer import FileRepairer
+
+
+def drift(path, counters, footer=None):
+    lines = path.read_text().splitlines()
+    for line_index, counter in enumerate(counters, start=1):
+        lines[line_index] = lines[line_index][:3] + counter + lines[line_index][9:]
+    if footer is not None:
+        lines[-1] = footer
+    path.write_text("\n".join(lines) + "\n")
+
+
+def test_repair_renumbers_counters_and_recomputes_the_footer(tmp_path, write_file, read_lines):
+    path = tmp_path / "drifted.csv"
+    write_file(path, [100, 200, 300])
+    drift(path, ["000001", "000005", "000002"], footer=f"03,000002,000000000999,{' ' * 100}")
+    changes = FileRepairer(str(path)).repair()
+    assert changes == [
+        Difference("transaction", "changed", "000002", "counter", "000005", "000002"),
+        Difference("transaction", "changed", "000003", "counter", "000002", "000003"),
+        Difference("footer", "changed", None, "total counter", "000002", "000003"),
+        Difference("footer", "changed", None, "control sum", "000000000999", "000000000600"),
+    ]
+    assert ValuesValidator(lines=read_lines(path)).validate()
+
+
+def test_dry_run_does_not_write(tmp_path, write_file):
+    path = tmp_path / "drifted.csv"
+    write_file(path, [100, 200])
+    drift(path, ["000003", "000004"])
+    before = path.read_text()
+    assert len(FileRepairer(str(path)).repair(dry_run=True)) == 2
+    assert path.read_text() == before
+
+
+def test_repair_adds_a_missing_footer(tmp_path, write_file, read_lines):
+    path = tmp_path / "no_footer.csv"
+    write_file(path, [100, 200])
+    path.write_text("\n".join(read_lines(path)[:-1]) + "\n")
+    changes = FileRepairer(str(path)).repair()
+    assert [(change.change, change.new) for change in changes] == [("added", "000002"), ("added", "000000000300")]
+    assert read_lines(path)[-1].startswith("03,000002,000000000300,")
+
+
+def test_valid_file_is_left_untouched(tmp_path, write_file):
+    path = tmp_path / "valid.csv"
+    write_file(path, [100, 200])
+    mtime = path.stat().st_mtime_ns
+    assert FileRepairer(str(path)).repair() == []
+    assert path.stat().st_mtime_ns == mtime
+    assert sorted(p.name for p in tmp_path.iterdir()) == [".valid.csv.lock", "valid.csv"]
+
+
+def test_repair_rejects_records_after_the_footer(tmp_path, write_file):
+    path = tmp_path / "two_footers.csv"
+    write_file(path, [100])
+    path.write_text(path.read_text() * 2)
+    before = path.read_text()
+    with pytest.raises(ValueError, match="unexpected record on line 4"):
+        FileRepairer(str(path)).repair()
+    assert path.read_text() == before
+    assert sorted(p.name for p in tmp_path.iterdir()) == [".two_footers.csv.lock", "two_footers.csv"]
@@ -0,0 +1,49 @@
+import io
+
+import pytest
+
+from fixed_width_struct_io.validators import FileStructureValidator, ValuesValidator
+from fixed_width_struct_io.writers.file_splitter import FileSplitter
+
+
+def test_split_writes_valid_shards(tmp_path, write_file, read_lines, header_line):
+    source = write_file(tmp_path / "big.csv", [1, 2, 3, 4, 5])
+    shards = FileSplitter(source, max_transactions=2).split(str(tmp_path / "shard.csv"))
+    assert [path.rsplit("/", 1)[1] for path in shards] == ["shard.001.csv", "shard.002.csv", "shard.003.csv"]
+    for path, amounts in zip(shards, [[1, 2], [3, 4], [5]]):
+        lines = read_lines(path)
+        assert lines[0] == header_line
+        assert [int(line.split(",")[2]) for line in lines[1:-1]] == amounts
+        assert FileStructureValidator(lines=lines).validate()
+        assert ValuesValidator(lines=lines).validate()
+
+
+def test_split_in_parallel_matches_the_sequential_split(tmp_path, write_file, read_lines):
+    source = write_file(tmp_path / "big.csv", list(range(1, 8)))
+    sequential = FileSplitter(source, max_transactions=3).split(str(tmp_path / "a.csv"))
+    parallel = FileSplitter(source, max_transactions=3).split(str(tmp_path / "b.csv"), workers=2)
+    assert [read_lines(path) for path in sequential] == [read_lines(path) for path in parallel]
+
+
+def test_split_skips_the_headers_and_footers_of_chained_groups(tmp_path, write_file, read_lines):
+    first = write_file(tmp_path / "a.csv", [1, 2])
+    second = write_file(tmp_path / "b.csv", [3])
+    chained = tmp_path / "chained.csv"
+    chained.write_text(open(first).read() + open(second).read())
+    shards = FileSplitter(str(chained)).split(str(tmp_path / "out.csv"))
+    lines = read_lines(shards[0])
+    assert [line.split(",")[1] for line in lines[1:-1]] == ["000001", "000002", "000003"]
+    assert lines[-1].startswith("03,000003,000000000006,")
+
+
+def test_split_stream_writes_the_same_shards(tmp_path, write_file, read_lines):
+    source = write_file(tmp_path / "big.csv", [1, 2, 3, 4, 5])
+    expected = FileSplitter(source, max_transactions=2).split(str(tmp_path / "a.csv"))
+    with open(source) as stream:
+        streamed = FileSplitter(source, max_transactions=2).split_stream(io.StringIO(stream.read()), str(tmp_path / "b.csv"))
+    assert [read_lines(path) for path in expected] == [read_lines(path) for path in streamed]
+
+
+def test_split_rejects_oversized_shards(tmp_path):
+    with pytest.raises(ValueError):
+        FileSplitter("any.csv", max_transactions=20001)
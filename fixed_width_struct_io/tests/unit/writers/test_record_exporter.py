@@ -0,0 +1,53 @@
+import csv
+import io
+import json
+
+import pytest
+
+from fixed_width_struct_io.writers.record_exporter import RecordExporter
+
+
+def test_export_csv_with_every_field(tmp_path, write_file):
+    source = write_file(tmp_path / "a.csv", [100, 2050])
+    output = tmp_path / "out.csv"
+    assert RecordExporter(source).export(str(output)) == 4
+    with open(output, newline="") as file:
+        rows = list(csv.DictReader(file))
+    assert rows[0]["record type"] == "header"
+    assert rows[0]["name"] == "nnnnnn"
+    assert rows[2]["amount"] == "000000002050"
+    assert rows[2]["currency"] == "USD"
+    assert rows[3]["control sum"] == "000000002150"
+    assert rows[3]["name"] == ""
+
+
+def test_export_jsonl_with_projection_and_decimal_amounts(tmp_path, write_file):
+    source = write_file(tmp_path / "a.csv", [100, 2050])
+    stream = io.StringIO()
+    RecordExporter(source, fields=["counter", "amount", "control sum"], amount_format="decimal").export_to(stream, "jsonl")
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert records == [
+        {"record type": "header"},
+        {"record type": "transaction", "counter": "000001", "amount": "1.00"},
+        {"record type": "transaction", "counter": "000002", "amount": "20.50"},
+        {"record type": "footer", "control sum": "21.50"},
+    ]
+
+
+def test_export_amounts_as_integer_cents(tmp_path, write_file):
+    source = write_file(tmp_path / "a.csv", [100])
+    stream = io.StringIO()
+    RecordExporter(source, fields=["amount"], amount_format="cents").export_to(stream, "jsonl")
+    assert json.loads(stream.getvalue().splitlines()[1]) == {"record type": "transaction", "amount": 100}
+
+
+def test_invalid_options_are_rejected(tmp_path, write_file):
+    with pytest.raises(ValueError, match="Unknown field"):
+        RecordExporter("a.csv", fields=["iban"])
+    with pytest.raises(ValueError, match="Invalid amount format"):
+        RecordExporter("a.csv", amount_format="float")
+    source = write_file(tmp_path / "a.csv", [100])
+    with pytest.raises(ValueError, match="Invalid export format"):
+        RecordExporter(source).export_to(io.StringIO(), "xml")
+    with pytest.raises(ValueError, match="must not overwrite"):
+        RecordExporter(source).export(source)
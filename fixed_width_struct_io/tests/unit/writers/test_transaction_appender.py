@@ -3,6 +3,7 @@ from unittest.mock import patch
 import pytest
 
 from fixed_width_struct_io.constants import FieldLength
+from fixed_width_struct_io.writers import TransactionAppender
 
 
 def test_extract_fields_success(transaction_appender):
@@ -51,3 +52,13 @@ def test_get_next_counter_no_transactions(transaction_appender):
 def test_new_transaction(transaction_appender):
     result = transaction_appender._new_transaction("000004", "00000002000", "USD")
     assert "02,000004,00000002000,USD,                                                                                                 " in result
+
+
+def test_append_transaction_keeps_every_cent_of_the_control_sum():
+    appender = TransactionAppender(lines=[
+        "01,nnnnnn                      ,ooooooo                       ,dnit                          ,street4567                    ",
+        "02,000001,000000009000,gbp,                                                                                                 ",
+        "03,000001,000000009000,                                                                                                    ",
+    ])
+    assert appender.append_transaction("000000000029", "USD") is True
+    assert appender.lines[-1].split(",")[1:3] == ["000002", "000000009029"]
@@ -2,8 +2,11 @@ import logging
 from typing import Any
 
 from fixed_width_struct_io.constants import RECORD_TYPES
-from fixed_width_struct_io.validators import StringLengthValidator
-from fixed_width_struct_io.validators.values_validator import ValuesValidator
+from fixed_width_struct_io.validators.validation_plan import (
+    describe_failure,
+    find_failure,
+    get_field_check,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -14,8 +17,9 @@ def validate_field(
 ) -> bool:
     """
     Validates a field value against defined constraints
-    for its record type and field name. This function checks if the
-    field value adheres to the specified length and value constraints.
+    for its record type and field name. This function runs the
+    precompiled check of the field from the validation plan: data type,
+    length, fixed value, currency list and format.
     Args:
         record_type: The type of record
                     (e.g., 'header', 'transaction', 'footer').
@@ -23,12 +27,10 @@ def validate_field(
         field_value: The value of the field to be validated.
 
     Returns:
-        bool: True if the field value passes
-        all validations, False otherwise.
+        bool: True if the field value passes all validations.
     Raises:
-        KeyError: If the record type or field name does not exist.
-        ValueError: If the field value does not
-        meet length or value constraints.
+        ValueError: If the record type or field name does not exist, or
+        the field value does not meet its constraints.
     """
     try:
         record_type_id = RECORD_TYPES[record_type]
@@ -37,30 +39,24 @@ def validate_field(
         raise ValueError(f"Invalid record type '{record_type}'.") from e
 
     try:
-        length_valid = StringLengthValidator.validate_individual_field_length(
-            record_type=record_type_id,
-            field_name=field_name,
-            field_value=field_value,
-        )
-        value_valid = ValuesValidator.validate_field(
-            record_type=record_type_id,
-            field_name=field_name,
-            field_value=field_value,
+        check = get_field_check(record_type_id, field_name.lower())
+    except KeyError as e:
+        logger.error(
+            f"Unknown field '{field_name}' in record type '{record_type}'."
         )
-        if length_valid and value_valid:
-            return True
-        else:
-            logger.info(
-                f"Field '{field_name}' in record type"
-                f" '{record_type}' failed validation."
-            )
-            return False
-    except Exception as e:
-        logger.exception(
-            f"Error validating field '{field_name}' "
-            f"in record type '{record_type}': {e}"
+        raise ValueError(
+            f"Unknown field '{field_name}' in record type '{record_type}'."
+        ) from e
+
+    failure = find_failure(check, field_value)
+    if failure is not None:
+        reason = describe_failure(check, field_value, failure)
+        logger.error(
+            f"Field '{field_name}' in record type '{record_type}' failed "
+            f"validation: {reason}."
         )
         raise ValueError(
             f"Error validating field '{field_name}' "
-            f"in record type '{record_type}'."
-        ) from e
+            f"in record type '{record_type}': {reason}."
+        )
+    return True
@@ -8,3 +8,10 @@ from fixed_width_struct_io.validators.string_length_validator import (  # noqa:
 from fixed_width_struct_io.validators.values_validator import (  # noqa: F401, E501
     ValuesValidator,
 )
+from fixed_width_struct_io.validators.error_collector import (  # noqa: F401, E501
+    ErrorCollector,
+    ValidationIssue,
+)
+from fixed_width_struct_io.validators.lines_validation import (  # noqa: F401, E501
+    validate_lines,
+)
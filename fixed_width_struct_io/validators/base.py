@@ -2,6 +2,7 @@ from abc import abstractmethod
 from typing import Any
 
 from fixed_width_struct_io.core import FileIOBase
+from fixed_width_struct_io.validators.error_collector import ErrorCollector
 
 
 class BaseValidator(FileIOBase):
@@ -23,3 +24,13 @@ class BaseValidator(FileIOBase):
             NotImplementedError: If not overridden in a subclass.
         """
         raise NotImplementedError
+
+    def collect_errors(self, collector: ErrorCollector) -> None:
+        """
+        Runs the validation in collect-all-errors mode, reporting every
+        problem to `collector` instead of raising on the first one.
+        Scanning stops as soon as the collector drops an issue.
+        Raises:
+            NotImplementedError: If not overridden in a subclass.
+        """
+        raise NotImplementedError
@@ -0,0 +1,108 @@
+import logging
+from collections import namedtuple
+from typing import Callable, Iterator, List, Optional
+
+from fixed_width_struct_io.constants import RECORD_TYPE_NAMES
+
+logger = logging.getLogger(__name__)
+
+ValidationIssue = namedtuple(
+    "ValidationIssue", ["line", "record_type", "field", "reason"]
+)
+
+
+class ErrorCollector:
+    """
+    Bounded buffer of structured validation errors.
+
+    Validators running in collect-all-errors mode report every problem
+    they find here instead of raising on the first one. Once
+    `max_errors` issues are stored the collector is full, further issues
+    are dropped and validators stop scanning.
+
+    Attributes:
+        max_errors (int): Maximum number of issues kept in the buffer.
+        on_error (Optional[Callable]): Called with each stored issue,
+                                        e.g. to stream it to the output.
+    """
+
+    __slots__ = ("max_errors", "on_error", "_issues", "_truncated")
+
+    def __init__(
+        self,
+        max_errors: int,
+        on_error: Optional[Callable[[ValidationIssue], None]] = None,
+    ) -> None:
+        """
+        Initializes an empty collector.
+        Raises:
+            ValueError: If max_errors is not a positive number.
+        """
+        if max_errors < 1:
+            raise ValueError("max_errors must be a positive number.")
+        self.max_errors = max_errors
+        self.on_error = on_error
+        self._issues: List[ValidationIssue] = []
+        self._truncated = False
+
+    @property
+    def is_full(self) -> bool:
+        """Whether the buffer reached `max_errors` issues."""
+        return len(self._issues) >= self.max_errors
+
+    @property
+    def truncated(self) -> bool:
+        """Whether at least one issue was dropped because of the bound."""
+        return self._truncated
+
+    def add(
+        self,
+        line: Optional[int],
+        record_type: Optional[str],
+        field: Optional[str],
+        reason: str,
+    ) -> bool:
+        """
+        Stores a validation issue unless the buffer is full.
+        Args:
+            line: The line number of the issue, if it relates to a line.
+            record_type: The record type identifier or name.
+            field: The field name, if the issue relates to a field.
+            reason: A short description of the problem.
+        Returns:
+            True if the issue was stored, False if it was dropped.
+        """
+        if self.is_full:
+            self._truncated = True
+            return False
+        issue = ValidationIssue(
+            line,
+            (
+                RECORD_TYPE_NAMES.get(record_type, record_type)
+                if record_type is not None
+                else None
+            ),
+            field,
+            reason,
+        )
+        self._issues.append(issue)
+        if self.on_error is not None:
+            self.on_error(issue)
+        return True
+
+    def summary(self) -> dict:
+        """Returns a summary of the collected issues."""
+        return {
+            "valid": not self._issues,
+            "errors": len(self._issues),
+            "max_errors": self.max_errors,
+            "truncated": self._truncated,
+        }
+
+    def __len__(self) -> int:
+        """Returns the number of stored issues."""
+        return len(self._issues)
+
+    def __iter__(self) -> Iterator[ValidationIssue]:
+        """Iterates over the stored issues in the order they were found."""
+        return iter(self._issues)
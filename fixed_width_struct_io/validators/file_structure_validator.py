@@ -5,7 +5,10 @@ from fixed_width_struct_io.constants import (
     MAX_TRANSACTIONS_AMOUNT,
     RECORD_TYPES,
 )
+from fixed_width_struct_io.helpers import phase_timer
+from fixed_width_struct_io.metrics.library_metrics import VALIDATION_SECONDS
 from fixed_width_struct_io.validators.base import BaseValidator
+from fixed_width_struct_io.validators.error_collector import ErrorCollector
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +19,8 @@ class FileStructureValidator(BaseValidator):
     and transactions according to predefined rules.
     """
 
+    @phase_timer.timed("validate structure")
+    @VALIDATION_SECONDS.timed(validator="structure")
     def validate(self) -> bool:
         """
         Validates the fixed-width file's structure.
@@ -42,6 +47,55 @@ class FileStructureValidator(BaseValidator):
             logger.error(f"Validation error: {e}")
             raise
 
+    @phase_timer.timed("validate structure")
+    @VALIDATION_SECONDS.timed(validator="structure")
+    def collect_errors(self, collector: ErrorCollector) -> None:
+        """
+        Reports every structural problem of the file to the collector:
+        unknown record types, missing or extra headers and footers,
+        and an exceeded transaction limit.
+        Args:
+            collector: The error collector receiving the issues.
+        """
+        header_id = RECORD_TYPES["header"]
+        footer_id = RECORD_TYPES["footer"]
+        known_record_types = set(RECORD_TYPES.values())
+        last_line_number = len(self.lines)
+        transactions_count = 0
+
+        if not self.lines or not self.lines[0].startswith(header_id):
+            if not collector.add(1, None, None, "first line must be a header"):
+                return
+        if not self.lines or not self.lines[-1].startswith(footer_id):
+            if not collector.add(
+                last_line_number, None, None, "last line must be a footer"
+            ):
+                return
+
+        for line_number, line in enumerate(self.lines, start=1):
+            record_type = line[:FIELD_ID_LENGTH]
+            if record_type not in known_record_types:
+                reason = f"unknown record type '{record_type}'"
+            elif record_type == header_id and line_number != 1:
+                reason = "extra header"
+            elif record_type == footer_id and line_number != last_line_number:
+                reason = "extra footer"
+            else:
+                if record_type == RECORD_TYPES["transaction"]:
+                    transactions_count += 1
+                continue
+            if not collector.add(line_number, record_type, None, reason):
+                return
+
+        if transactions_count > MAX_TRANSACTIONS_AMOUNT:
+            collector.add(
+                None,
+                None,
+                None,
+                f"the number of transactions exceeds the limit of "
+                f"{MAX_TRANSACTIONS_AMOUNT}, found {transactions_count}",
+            )
+
     def _validate_transaction_limit(self, transaction_lines: list) -> None:
         """
         Validates that the number of transaction records
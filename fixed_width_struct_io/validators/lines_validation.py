@@ -0,0 +1,51 @@
+import logging
+from typing import List, Optional
+
+from fixed_width_struct_io.validators.error_collector import ErrorCollector
+from fixed_width_struct_io.validators.file_structure_validator import (
+    FileStructureValidator,
+)
+from fixed_width_struct_io.validators.string_length_validator import (
+    StringLengthValidator,
+)
+from fixed_width_struct_io.validators.values_validator import (
+    ValuesValidator,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def validate_lines(lines: List[str], max_errors: Optional[int] = None) -> dict:
+    """
+    Validates already loaded lines with the structure, length and values
+    validators, fail-fast or in collect-all-errors mode.
+    Args:
+        lines: The lines of a fixed-width file.
+        max_errors: The maximum number of errors to collect, or None to
+                    stop at the first error.
+    Returns:
+        {"valid": True} in fail-fast mode, otherwise the collected errors
+        as dictionaries and the collector summary.
+    Raises:
+        ValueError: In fail-fast mode, if the lines are not valid.
+    """
+    validators = (
+        FileStructureValidator(lines=lines),
+        StringLengthValidator(lines=lines),
+        ValuesValidator(lines=lines),
+    )
+    if max_errors is None:
+        for validator in validators:
+            validator.validate()
+        return {"valid": True}
+
+    collector = ErrorCollector(max_errors=max_errors)
+    for validator in validators:
+        validator.collect_errors(collector)
+        if collector.truncated:
+            break
+    logger.debug(f"Collected {len(collector)} validation error(s).")
+    return {
+        "errors": [issue._asdict() for issue in collector],
+        "summary": collector.summary(),
+    }
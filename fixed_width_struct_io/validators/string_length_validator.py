@@ -6,8 +6,16 @@ from fixed_width_struct_io.constants import (
     FIELD_LENGTHS,
     FIELD_ORDER,
     LINE_LENGTH,
+    PROGRESS_LOG_INTERVAL,
 )
+from fixed_width_struct_io.helpers import ProgressLogger, phase_timer
+from fixed_width_struct_io.metrics.library_metrics import VALIDATION_SECONDS
 from fixed_width_struct_io.validators.base import BaseValidator
+from fixed_width_struct_io.validators.error_collector import ErrorCollector
+from fixed_width_struct_io.validators.validation_plan import (
+    get_field_check,
+    get_validation_plan,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -109,9 +117,11 @@ class StringLengthValidator(BaseValidator):
             the expected length.
         """
         logger.debug(
-            f"Validating field length for field {field_name} "
-            f"with value={field_value } and record type "
-            f"{record_type} is started."
+            "Validating field length for field %s with value=%s "
+            "and record type %s is started.",
+            field_name,
+            field_value,
+            record_type,
         )
         try:
             if field_name.lower() not in FIELD_LENGTHS[record_type]:
@@ -125,10 +135,7 @@ class StringLengthValidator(BaseValidator):
                 logger.error(error_message)
                 raise ValueError(error_message)
 
-            field_spec = FIELD_LENGTHS[record_type][field_name]
-            expected_length = (
-                field_spec.end_position - field_spec.start_position + 1
-            )
+            expected_length = get_field_check(record_type, field_name).length
             actual_length = len(field_value)
 
             if actual_length != expected_length:
@@ -143,9 +150,11 @@ class StringLengthValidator(BaseValidator):
                 logger.error(error_message)
                 raise ValueError(error_message)
             logger.debug(
-                f"Validating field length for field {field_name} "
-                f"with value={field_value} and record type "
-                f"{record_type} is successfully finished."
+                "Validating field length for field %s with value=%s "
+                "and record type %s is successfully finished.",
+                field_name,
+                field_value,
+                record_type,
             )
             return True
         except KeyError as e:
@@ -165,7 +174,7 @@ class StringLengthValidator(BaseValidator):
         Validates the total length of all field values in
         a line matches the expected LINE_LENGTH.
         """
-        logger.debug(f"Validate total line length for line '{line}'.")
+        logger.debug("Validate total line length for line '%s'.", line)
         total_value_length = sum(len(value) for value in line.split(","))
         if total_value_length != LINE_LENGTH:
             error_msg = (
@@ -179,7 +188,7 @@ class StringLengthValidator(BaseValidator):
             logger.error(error_msg)
             raise ValueError(error_msg)
         logger.debug(
-            f"Total line length validation for line '{line}' is finished."
+            "Total line length validation for line '%s' is finished.", line
         )
 
     def validate_line(
@@ -209,24 +218,73 @@ class StringLengthValidator(BaseValidator):
                 fields, ordered_field_names, record_type, line_number
             )
 
-            for field_name, field_value in zip(ordered_field_names, fields):
-                StringLengthValidator.validate_individual_field_length(
-                    record_type, field_name, field_value, line_number
-                )
+            for check, field_value in zip(
+                get_validation_plan(record_type), fields
+            ):
+                if len(field_value) != check.length:
+                    StringLengthValidator.validate_individual_field_length(
+                        record_type, check.name, field_value, line_number
+                    )
 
             self.validate_total_line_length(line, line_number)
 
-            info_message = (
-                "The length of line and its " "fields is as expected."
-            )
-            if line_number:
-                info_message += f" Line number {line_number}."
-            logger.debug(info_message)
+            if logger.isEnabledFor(logging.DEBUG):
+                info_message = (
+                    "The length of line and its " "fields is as expected."
+                )
+                if line_number:
+                    info_message += f" Line number {line_number}."
+                logger.debug(info_message)
             return True
         except ValueError as e:
             logger.error(f"Line {line_number} validation error: {e}")
             raise
 
+    @phase_timer.timed("validate length")
+    @VALIDATION_SECONDS.timed(validator="length")
+    def collect_errors(self, collector: ErrorCollector) -> None:
+        """
+        Reports every field count, field length and total line length
+        problem of the file to the collector. Lines of unknown record
+        types are left to the structure validator.
+        Args:
+            collector: The error collector receiving the issues.
+        """
+        for line_number, line in enumerate(self.lines, start=1):
+            record_type = line[:FIELD_ID_LENGTH]
+            if record_type not in FIELD_ORDER:
+                continue
+            fields = line.split(",")
+            plan = get_validation_plan(record_type)
+            if len(fields) != len(plan):
+                if not collector.add(
+                    line_number,
+                    record_type,
+                    None,
+                    f"expected {len(plan)} fields, found {len(fields)}",
+                ):
+                    return
+            for check, field_value in zip(plan, fields):
+                if len(field_value) != check.length and not collector.add(
+                    line_number,
+                    record_type,
+                    check.name,
+                    f"expected length {check.length}, "
+                    f"found {len(field_value)}",
+                ):
+                    return
+            total_value_length = sum(len(value) for value in fields)
+            if total_value_length != LINE_LENGTH and not collector.add(
+                line_number,
+                record_type,
+                None,
+                f"expected total length of field values {LINE_LENGTH}, "
+                f"found {total_value_length}",
+            ):
+                return
+
+    @phase_timer.timed("validate length")
+    @VALIDATION_SECONDS.timed(validator="length")
     def validate(self) -> bool:
         """
         Validates the entire fixed-width file against
@@ -237,8 +295,13 @@ class StringLengthValidator(BaseValidator):
             ValueError: If any line in the file fails validation.
         """
         try:
+            progress = ProgressLogger(
+                logger, "Length validation", PROGRESS_LOG_INTERVAL
+            )
             for line_number, line in enumerate(self.lines, start=1):
                 self.validate_line(line, line_number)
+                progress.update(line_number)
+            progress.finish(len(self.lines))
             logger.info(
                 "===== All lines and their fields in the file passed "
                 "length validation. ====="
@@ -0,0 +1,134 @@
+import re
+from collections import namedtuple
+from functools import lru_cache
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from fixed_width_struct_io.constants import (
+    CURRENCIES,
+    FIELD_FORMATS,
+    FIELD_ORDER,
+)
+
+FieldCheck = namedtuple(
+    "FieldCheck",
+    ["name", "data_type", "length", "fixed_value", "pattern", "currencies"],
+)
+
+FAILURE_TYPE = "type"
+FAILURE_LENGTH = "length"
+FAILURE_FIXED_VALUE = "fixed value"
+FAILURE_CURRENCY = "currency"
+FAILURE_FORMAT = "format"
+
+
+def _compile_field_check(record_type: str, field_name: str) -> FieldCheck:
+    """Builds a precompiled check from the field format definition."""
+    field_spec = FIELD_FORMATS[record_type][field_name]
+    return FieldCheck(
+        name=field_name,
+        data_type=field_spec.data_type,
+        length=field_spec.end_position - field_spec.start_position + 1,
+        fixed_value=(
+            str(field_spec.fixed_value)
+            if field_spec.fixed_value is not None
+            else None
+        ),
+        pattern=(
+            re.compile(str(field_spec.regex_value))
+            if field_spec.regex_value is not None
+            else None
+        ),
+        currencies=CURRENCIES if field_name == "currency" else None,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_validation_plan(record_type: str) -> Tuple[FieldCheck, ...]:
+    """
+    Returns the validation plan of a record type: one precompiled
+    check per field, in the order the fields appear in the line.
+    The plan is compiled on first use and shared afterwards.
+    Args:
+        record_type: The record type identifier (e.g. '01').
+    Returns:
+        A tuple of FieldCheck objects.
+    Raises:
+        KeyError: If the record type is unknown.
+    """
+    return tuple(
+        _compile_field_check(record_type, field_name)
+        for field_name in FIELD_ORDER[record_type]
+    )
+
+
+@lru_cache(maxsize=None)
+def _get_field_checks(record_type: str) -> Dict[str, FieldCheck]:
+    """Maps field names of a record type to their checks."""
+    return {check.name: check for check in get_validation_plan(record_type)}
+
+
+def get_field_check(record_type: str, field_name: str) -> FieldCheck:
+    """
+    Returns the precompiled check of a single field.
+    Raises:
+        KeyError: If the record type or the field name is unknown.
+    """
+    return _get_field_checks(record_type)[field_name]
+
+
+def find_failure(check: FieldCheck, field_value: Any) -> Optional[str]:
+    """
+    Runs a field check and reports which criterion failed.
+    The criteria are evaluated in the order: data type, length,
+    fixed value, currency list and regex format.
+    Returns:
+        None if the value passes, otherwise one of the FAILURE_* kinds.
+    """
+    if not isinstance(field_value, check.data_type):
+        return FAILURE_TYPE
+    if len(field_value) != check.length:
+        return FAILURE_LENGTH
+    if check.fixed_value is not None and field_value != check.fixed_value:
+        return FAILURE_FIXED_VALUE
+    if (
+        check.currencies is not None
+        and field_value.lower() not in check.currencies
+    ):
+        return FAILURE_CURRENCY
+    if check.pattern is not None and check.pattern.match(field_value) is None:
+        return FAILURE_FORMAT
+    return None
+
+
+def describe_failure(check: FieldCheck, field_value: Any, failure: str) -> str:
+    """
+    Returns a short human-readable reason for a failed field check.
+    Args:
+        check: The check that failed.
+        field_value: The value that was checked.
+        failure: The failure kind returned by `find_failure`.
+    """
+    if failure == FAILURE_TYPE:
+        return f"expected data type {check.data_type.__name__}"
+    if failure == FAILURE_LENGTH:
+        return f"expected length {check.length}, found {len(field_value)}"
+    if failure == FAILURE_FIXED_VALUE:
+        return f"expected fixed value '{check.fixed_value}'"
+    if failure == FAILURE_CURRENCY:
+        return f"currency '{field_value}' is not in the currencies list"
+    return f"value '{field_value}' does not match the field format"
+
+
+def first_failure(
+    plan: Sequence[FieldCheck], field_values: Sequence[str]
+) -> int:
+    """
+    Runs a validation plan against the values of one line.
+    Only as many fields as both sequences have are checked.
+    Returns:
+        The index of the first field that fails, or -1 if all pass.
+    """
+    for index, (check, value) in enumerate(zip(plan, field_values)):
+        if find_failure(check, value) is not None:
+            return index
+    return -1
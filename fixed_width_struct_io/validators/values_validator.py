@@ -1,21 +1,38 @@
 import logging
-import re
-from typing import Any, Optional
+from typing import Any, List, NoReturn, Optional
 
 from fixed_width_struct_io.constants import (
-    CURRENCIES_LIST,
-    FIELD_FORMATS,
     FIELD_ID_LENGTH,
+    FIELD_ORDER,
     FOOTER_ID,
     HEADER_ID,
+    PROGRESS_LOG_INTERVAL,
     RECORD_TYPE_NAMES,
     TRANSACTION_ID,
 )
+from fixed_width_struct_io.helpers import ProgressLogger, phase_timer
+from fixed_width_struct_io.metrics.library_metrics import VALIDATION_SECONDS
 from fixed_width_struct_io.validators.base import BaseValidator
+from fixed_width_struct_io.validators.error_collector import ErrorCollector
+from fixed_width_struct_io.validators.validation_plan import (
+    FAILURE_CURRENCY,
+    FAILURE_FIXED_VALUE,
+    FAILURE_LENGTH,
+    FAILURE_TYPE,
+    FieldCheck,
+    describe_failure,
+    find_failure,
+    first_failure,
+    get_field_check,
+    get_validation_plan,
+)
 
 
 logger = logging.getLogger(__name__)
 
+COUNTER_INDEX = FIELD_ORDER[TRANSACTION_ID].index("counter")
+AMOUNT_INDEX = FIELD_ORDER[TRANSACTION_ID].index("amount")
+
 
 class ValuesValidator(BaseValidator):
     """
@@ -44,105 +61,107 @@ class ValuesValidator(BaseValidator):
             ValueError: If any validation criterion is not met.
         """
         try:
-            field_spec = FIELD_FORMATS[record_type][field_name.lower()]
-            expected_type = field_spec.data_type
-
-            if not isinstance(field_value, expected_type):
-                record_type_name = RECORD_TYPE_NAMES.get(
-                    record_type, record_type
-                )
-                error_message = (
-                    f"Field '{field_name}' in record type "
-                    f"'{record_type_name}' expects "
-                    f"data type {expected_type}."
-                )
-                if line_number is not None:
-                    error_message += f" Found on line {line_number}."
-                raise ValueError(error_message)
-
-            start_pos = field_spec.start_position
-            end_pos = field_spec.end_position
+            check = get_field_check(record_type, field_name.lower())
+        except KeyError:
+            error_message = f"Unknown field '{field_name}'"
+            if line_number:
+                error_message += f"Line {line_number}."
+            logger.error(error_message)
+            raise
+        failure = find_failure(check, field_value)
+        if failure is not None:
+            ValuesValidator._raise_field_error(
+                record_type, check, field_value, failure, line_number
+            )
+        if logger.isEnabledFor(logging.DEBUG):
+            message = (
+                f"Field '{field_name}' in '{RECORD_TYPE_NAMES[record_type]}'"
+                f" with value '{field_value}' validated successfully."
+            )
+            if line_number:
+                message += f" Line {line_number}."
+            logger.debug(message)
+        return True
 
-            if len(field_value) != (end_pos - start_pos + 1):
-                record_type_name = RECORD_TYPE_NAMES.get(
-                    record_type, record_type
-                )
+    @staticmethod
+    def _raise_field_error(
+        record_type: str,
+        check: FieldCheck,
+        field_value: Any,
+        failure: str,
+        line_number: Optional[int] = None,
+    ) -> NoReturn:
+        """
+        Builds the error message for a failed field check and raises it.
+        Messages are only formatted here, once a check has failed.
+        Raises:
+            ValueError: Always.
+        """
+        record_type_name = RECORD_TYPE_NAMES.get(record_type, record_type)
+        if failure == FAILURE_TYPE:
+            error_message = (
+                f"Field '{check.name}' in record type "
+                f"'{record_type_name}' expects "
+                f"data type {check.data_type}."
+            )
+            if line_number is not None:
+                error_message += f" Found on line {line_number}."
+        else:
+            if failure == FAILURE_LENGTH:
                 error_message = (
-                    f"Field '{field_name}' in record type "
+                    f"Field '{check.name}' in record type "
                     f"'{record_type_name}' should have "
-                    f"length {end_pos - start_pos + 1}."
-                )
-                if line_number is not None:
-                    error_message += f" Line {line_number}."
-                raise ValueError(error_message)
-
-            if field_spec.fixed_value is not None and field_value != str(
-                field_spec.fixed_value
-            ):
-                record_type_name = RECORD_TYPE_NAMES.get(
-                    record_type, record_type
+                    f"length {check.length}."
                 )
+            elif failure == FAILURE_FIXED_VALUE:
                 error_message = (
-                    f"Field '{field_name}' in record type "
+                    f"Field '{check.name}' in record type "
                     f"'{record_type_name}' should have "
-                    f"fixed value '{field_spec.fixed_value}'."
-                )
-                if line_number is not None:
-                    error_message += f" Line {line_number}."
-                raise ValueError(error_message)
-
-            if (
-                field_name == "currency"
-                and field_value.lower() not in CURRENCIES_LIST
-            ):
-                record_type_name = RECORD_TYPE_NAMES.get(
-                    record_type, record_type
+                    f"fixed value '{check.fixed_value}'."
                 )
+            elif failure == FAILURE_CURRENCY:
                 error_message = (
                     f"Invalid currency value '{field_value}'"
                     f" in record type '{record_type_name}'."
                     f"This currency isn't added "
                     f"to the currencies list."
                 )
-                if line_number is not None:
-                    error_message += f" Line {line_number}."
-                raise ValueError(error_message)
-
-            if field_spec.regex_value is not None and not re.match(
-                str(field_spec.regex_value), field_value
-            ):
-                record_type_name = RECORD_TYPE_NAMES.get(
-                    record_type, record_type
-                )
+            else:
                 error_message = (
                     f"Invalid value '{field_value}' for field"
-                    f" '{field_name}' in record type "
+                    f" '{check.name}' in record type "
                     f"'{record_type_name}'."
                 )
-                if line_number is not None:
-                    error_message += f" Line {line_number}."
-                raise ValueError(error_message)
-            message = (
-                f"Field '{field_name}' in '{RECORD_TYPE_NAMES[record_type]}'"
-                f" with value '{field_value}' validated successfully."
-            )
-            if line_number:
-                message += f" Line {line_number}."
-            logger.debug(message)
-
-            return True
-        except ValueError:
-            error_message = f"Validation error for field '{field_name}'"
-            if line_number:
+            if line_number is not None:
                 error_message += f" Line {line_number}."
-            logger.error(error_message)
-            raise
-        except KeyError:
-            error_message = f"Unknown field '{field_name}'"
-            if line_number:
-                error_message += f"Line {line_number}."
-            logger.error(error_message)
-            raise
+        validation_error = f"Validation error for field '{check.name}'"
+        if line_number:
+            validation_error += f" Line {line_number}."
+        logger.error(validation_error)
+        raise ValueError(error_message)
+
+    @staticmethod
+    def _validate_fields(
+        record_type: str,
+        field_values: List[str],
+        line_number: Optional[int] = None,
+    ) -> None:
+        """
+        Runs the validation plan of the record type over the field
+        values of one line, raising on the first invalid field.
+        """
+        plan = get_validation_plan(record_type)
+        failed_index = first_failure(plan, field_values)
+        if failed_index >= 0:
+            check = plan[failed_index]
+            field_value = field_values[failed_index]
+            ValuesValidator._raise_field_error(
+                record_type,
+                check,
+                field_value,
+                str(find_failure(check, field_value)),
+                line_number,
+            )
 
     def _validate_footer_control_digits(
         self,
@@ -223,42 +242,28 @@ class ValuesValidator(BaseValidator):
         """
         try:
             if record_type == HEADER_ID:
-                header_fields = dict(
-                    zip(
-                        FIELD_FORMATS[HEADER_ID].keys(),
-                        self.lines[0].split(","),
-                    )
+                ValuesValidator._validate_fields(
+                    record_type, self.lines[0].split(","), line_number
                 )
-                for field_name, field_value in header_fields.items():
-                    ValuesValidator.validate_field(
-                        record_type, field_name, field_value, line_number
-                    )
 
             elif record_type == TRANSACTION_ID:
-                transaction_fields = dict(
-                    zip(FIELD_FORMATS[TRANSACTION_ID].keys(), line.split(","))
+                ValuesValidator._validate_fields(
+                    record_type, line.split(","), line_number
                 )
-                for field_name, field_value in transaction_fields.items():
-                    ValuesValidator.validate_field(
-                        record_type, field_name, field_value, line_number
-                    )
 
             elif record_type == FOOTER_ID:
-                footer_fields = dict(
-                    zip(
-                        FIELD_FORMATS[FOOTER_ID].keys(),
-                        self.lines[-1].split(","),
-                    )
+                footer_values = self.lines[-1].split(",")
+                ValuesValidator._validate_fields(
+                    record_type, footer_values, line_number
                 )
-                for field_name, field_value in footer_fields.items():
-                    ValuesValidator.validate_field(
-                        record_type, field_name, field_value, line_number
-                    )
 
                 if (
                     calculated_total_counter is not None
                     and control_sum is not None
                 ):
+                    footer_fields = dict(
+                        zip(FIELD_ORDER[FOOTER_ID], footer_values)
+                    )
                     self._validate_footer_control_digits(
                         footer_fields, calculated_total_counter, control_sum
                     )
@@ -267,8 +272,8 @@ class ValuesValidator(BaseValidator):
                     f"Unknown record type found on line {line_number}"
                 )
             logger.debug(
-                f"Values of record type '{record_type}' "
-                f"validated successfully."
+                "Values of record type '%s' validated successfully.",
+                record_type,
             )
 
             return True
@@ -276,6 +281,96 @@ class ValuesValidator(BaseValidator):
             logger.error(f"Validation error on line {line_number}: {e}")
             raise
 
+    @phase_timer.timed("validate values")
+    @VALIDATION_SECONDS.timed(validator="values")
+    def collect_errors(self, collector: ErrorCollector) -> None:
+        """
+        Reports every invalid field value, counter gap and footer
+        control digit mismatch of the file to the collector.
+        Lines of unknown record types are left to the structure validator
+        and field lengths to the string length validator. Every counter is
+        compared with the previous one, so a gap is reported once.
+        Args:
+            collector: The error collector receiving the issues.
+        """
+        previous_counter = None
+        calculated_total_counter = 0
+        control_sum = 0
+
+        for line_number, line in enumerate(self.lines, start=1):
+            record_type = line[:FIELD_ID_LENGTH]
+            if record_type not in FIELD_ORDER:
+                continue
+            field_values = line.split(",")
+            plan = get_validation_plan(record_type)
+            if first_failure(plan, field_values) >= 0:
+                for check, field_value in zip(plan, field_values):
+                    failure = find_failure(check, field_value)
+                    if failure is None or failure == FAILURE_LENGTH:
+                        continue
+                    if not collector.add(
+                        line_number,
+                        record_type,
+                        check.name,
+                        describe_failure(check, field_value, failure),
+                    ):
+                        return
+
+            fields = dict(zip(FIELD_ORDER[record_type], field_values))
+            if record_type == TRANSACTION_ID:
+                counter = fields.get("counter", "")
+                if counter.isdigit():
+                    current_counter = int(counter)
+                    if (
+                        previous_counter is not None
+                        and current_counter != previous_counter + 1
+                        and not collector.add(
+                            line_number,
+                            record_type,
+                            "counter",
+                            f"counter is not auto-incremented, expected "
+                            f"{str(previous_counter + 1).zfill(6)}",
+                        )
+                    ):
+                        return
+                    previous_counter = current_counter
+                    calculated_total_counter = current_counter
+                amount = fields.get("amount", "")
+                if amount.isdigit():
+                    control_sum += int(amount)
+
+            elif record_type == FOOTER_ID:
+                total_counter = fields.get("total counter", "")
+                if (
+                    total_counter.isdigit()
+                    and int(total_counter) != calculated_total_counter
+                    and not collector.add(
+                        line_number,
+                        record_type,
+                        "total counter",
+                        f"total counter does not match the last "
+                        f"transaction counter, expected "
+                        f"{str(calculated_total_counter).zfill(6)}",
+                    )
+                ):
+                    return
+                footer_control_sum = fields.get("control sum", "")
+                if (
+                    footer_control_sum.isdigit()
+                    and int(footer_control_sum) != control_sum
+                    and not collector.add(
+                        line_number,
+                        record_type,
+                        "control sum",
+                        f"control sum does not match the sum of "
+                        f"transaction amounts, expected "
+                        f"{str(control_sum).zfill(12)}",
+                    )
+                ):
+                    return
+
+    @phase_timer.timed("validate values")
+    @VALIDATION_SECONDS.timed(validator="values")
     def validate(self) -> bool:
         """
         Validates all records in the fixed-width file
@@ -288,7 +383,12 @@ class ValuesValidator(BaseValidator):
         try:
             previous_counter = None
             calculated_total_counter = 0
-            control_sum = 0.0
+            # Summed in integer cents, a running float sum drifts by a
+            # cent on large files.
+            control_sum_cents = 0
+            progress = ProgressLogger(
+                logger, "Values validation", PROGRESS_LOG_INTERVAL
+            )
 
             for line_number, line in enumerate(self.lines, start=1):
                 record_type = line[:FIELD_ID_LENGTH]
@@ -298,17 +398,12 @@ class ValuesValidator(BaseValidator):
                     line=line,
                     line_number=line_number,
                     calculated_total_counter=calculated_total_counter,
-                    control_sum=control_sum,
+                    control_sum=control_sum_cents / 100,
                 )
 
                 if record_type == TRANSACTION_ID:
-                    transaction_fields = dict(
-                        zip(
-                            FIELD_FORMATS[TRANSACTION_ID].keys(),
-                            line.split(","),
-                        )
-                    )
-                    current_counter = int(transaction_fields["counter"])
+                    transaction_values = line.split(",")
+                    current_counter = int(transaction_values[COUNTER_INDEX])
                     if (
                         previous_counter is not None
                         and current_counter != previous_counter + 1
@@ -328,9 +423,11 @@ class ValuesValidator(BaseValidator):
                     previous_counter = current_counter
 
                     calculated_total_counter = current_counter
-                    control_sum += (
-                        float(transaction_fields["amount"]) / 100
+                    control_sum_cents += int(
+                        transaction_values[AMOUNT_INDEX]
                     )  # Assuming "Amount" is in cents
+                progress.update(line_number)
+            progress.finish(len(self.lines))
             logger.info(
                 "===== All records values validated successfully. ====="
             )
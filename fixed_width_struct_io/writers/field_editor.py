@@ -9,17 +9,27 @@ from fixed_width_struct_io.constants import (
     FOOTER_ID,
     TRANSACTION_ID,
     FIELD_ID_LENGTH,
-    FIELD_FORMATS,
+    FIELD_ORDER,
     HEADER,
     FOOTER,
     TRANSACTION,
 )
-from fixed_width_struct_io.core import FileIOBase
+from fixed_width_struct_io.cache import file_cache
+from fixed_width_struct_io.core import FileIOBase, exclusive_update
+from fixed_width_struct_io.helpers import phase_timer
+from fixed_width_struct_io.indexes import (
+    MaintainedIndexes,
+    maintained_indexes,
+)
+from fixed_width_struct_io.metrics.library_metrics import EDITS
 from fixed_width_struct_io.utils import validate_field
 
 
 logger = logging.getLogger(__name__)
 
+AMOUNT_INDEX = FIELD_ORDER[TRANSACTION_ID].index("amount")
+COUNTER_INDEX = FIELD_ORDER[TRANSACTION_ID].index("counter")
+
 
 class FieldEditor(FileIOBase):
     """
@@ -106,13 +116,7 @@ class FieldEditor(FileIOBase):
         try:
             for line in updated_lines:
                 if line[:FIELD_ID_LENGTH] == TRANSACTION_ID:
-                    transaction_fields = dict(
-                        zip(
-                            FIELD_FORMATS[TRANSACTION_ID].keys(),
-                            line.split(","),
-                        )
-                    )
-                    new_control_sum_int += int(transaction_fields["amount"])
+                    new_control_sum_int += int(line.split(",")[AMOUNT_INDEX])
             new_control_sum = str(new_control_sum_int).zfill(12)
             logger.debug(
                 "Calculation of the new control sum "
@@ -123,6 +127,53 @@ class FieldEditor(FileIOBase):
             logger.error(f"Failed to calculate new control sum: {e}")
             raise
 
+    def _transaction_positions(self, counter: str | int) -> list[int]:
+        """
+        Returns the 0-based positions of the transactions with a counter.
+        Args:
+            counter (str | int): The transaction counter.
+        Returns:
+            list[int]: The positions, in file order.
+        """
+        positions = []
+        transactions = (
+            line for line in self.lines if line.startswith(TRANSACTION_ID)
+        )
+        for position, line in enumerate(transactions):
+            fields = line.split(",")
+            if fields[COUNTER_INDEX] == counter:
+                positions.append(position)
+        return positions
+
+    def _update_indexes(
+        self,
+        indexes: MaintainedIndexes,
+        field_name: str,
+        transaction_index: str | int,
+        new_value: Any,
+    ) -> None:
+        """
+        Applies a transaction edit to the maintained indexes of the file,
+        before the edited lines replace the current ones.
+        Args:
+            indexes (MaintainedIndexes): The indexes to update.
+            field_name (str): The name of the edited field.
+            transaction_index (str | int): The counter of the edited
+                                           transactions.
+            new_value (Any): The new value of the field.
+        """
+        if field_name == "currency" and indexes.currency is not None:
+            for position in self._transaction_positions(transaction_index):
+                indexes.currency.set_currency(position, new_value)
+        elif field_name == "amount" and indexes.amount is not None:
+            for position in self._transaction_positions(transaction_index):
+                indexes.amount.set_amount(position, int(new_value))
+        elif field_name == "counter" and indexes.amount is not None:
+            for position in self._transaction_positions(transaction_index):
+                indexes.amount.set_counter(position, int(new_value))
+
+    @phase_timer.timed("edit")
+    @exclusive_update
     def edit_field_value(
         self,
         record_type: str,
@@ -180,7 +231,7 @@ class FieldEditor(FileIOBase):
                                 ].keys()
                             ]
                         )
-                        updated_lines.append(updated_line + "\n")
+                        updated_lines.append(updated_line)
 
                     elif line.startswith(HEADER_ID) or line.startswith(
                         FOOTER_ID
@@ -205,10 +256,10 @@ class FieldEditor(FileIOBase):
                                     ].keys()
                                 ]
                             )
-                            updated_lines.append(updated_line + "\n")
+                            updated_lines.append(updated_line)
 
                         else:
-                            updated_lines.append(line + "\n")
+                            updated_lines.append(line)
                     elif (
                         line.startswith(TRANSACTION_ID)
                         and record_type.lower() == TRANSACTION
@@ -230,16 +281,23 @@ class FieldEditor(FileIOBase):
                                         ].keys()
                                     ]
                                 )
-                                updated_lines.append(updated_line + "\n")
+                                updated_lines.append(updated_line)
                                 continue
                             else:
-                                updated_lines.append(line + "\n")
+                                updated_lines.append(line)
 
                     elif line.startswith(TRANSACTION_ID):
-                        updated_lines.append(line + "\n")
+                        updated_lines.append(line)
 
-                with open(self.file_path, "w") as file:
-                    file.writelines(updated_lines)
+                with maintained_indexes(self.file_path) as indexes:
+                    if record_type.lower() == TRANSACTION:
+                        self._update_indexes(
+                            indexes, field_name, transaction_index, new_value
+                        )
+                    self.lines = updated_lines
+                    self._write_lines()
+                file_cache.invalidate(self.file_path)
+                EDITS.inc()
                 logger.info(
                     f"Field '{field_name}' in record type "
                     f"'{record_type}' successfully edited."
@@ -0,0 +1,292 @@
+import csv
+import json
+import logging
+import os
+import re
+import tempfile
+from typing import IO, Any, Dict, Iterable, Iterator, Optional
+
+from fixed_width_struct_io.cache import file_cache
+from fixed_width_struct_io.constants import (
+    DEFAULT_LOCK_TIMEOUT,
+    FIELD_ORDER,
+    HEADER_ID,
+    MAX_TRANSACTIONS_AMOUNT,
+    PROGRESS_LOG_INTERVAL,
+    TRANSACTION_ID,
+)
+from fixed_width_struct_io.core import FileLock
+from fixed_width_struct_io.helpers import ProgressLogger, phase_timer
+from fixed_width_struct_io.metrics.library_metrics import (
+    BYTES_WRITTEN,
+    RECORDS_READ,
+)
+from fixed_width_struct_io.validators.validation_plan import (
+    describe_failure,
+    find_failure,
+    get_field_check,
+)
+from fixed_width_struct_io.writers.record_exporter import AMOUNT_FORMATS
+from fixed_width_struct_io.writers.record_format import (
+    format_amount,
+    format_control_sum,
+    format_counter,
+    format_footer,
+    format_transaction,
+)
+
+logger = logging.getLogger(__name__)
+
+INPUT_FORMATS = ("csv", "jsonl")
+JSONL_EXTENSIONS = (".jsonl", ".ndjson")
+BUILD_BUFFER_SIZE = 1024 * 1024
+RECORD_TYPE_COLUMN = "record type"
+DECIMAL_AMOUNT_PATTERN = re.compile(r"^(\d+)(?:\.(\d{1,2}))?$")
+HEADER_FIELDS = [
+    field for field in FIELD_ORDER[HEADER_ID] if field != "field id"
+]
+
+
+class FileBuilder:
+    """
+    Builds a complete, valid fixed-width file from header values and a
+    stream of (amount, currency) rows.
+
+    Header values are padded to their FIELD_FORMATS widths. Every row is
+    validated as it is read, gets the next counter and is added to the
+    footer totals, which are computed with integer arithmetic; the file
+    is written in one buffered pass to a temporary file that replaces the
+    output atomically, so memory use does not depend on the number of
+    rows.
+
+    Rows are mappings with 'amount' and 'currency' keys, e.g. the lines of
+    a CSV file with these columns or of a JSON Lines file; currencies are
+    written in upper case. Rows with a 'record type' other than
+    'transaction' are skipped, so files written by RecordExporter can be
+    built back.
+
+    All amounts of a build have the same unit, set by `amount_format` as
+    in RecordExporter, so '12' cannot mean cents in one row and units in
+    another: 'text' takes 12-digit strings of cents as in the file,
+    'cents' integer cents or digit strings of cents, and 'decimal' decimal
+    strings of units with at most two decimals, such as '20.50' or '20'.
+
+    Attributes:
+        header (Dict[str, str]): The padded header values by field name.
+        amount_format (str): One of AMOUNT_FORMATS.
+        lock_timeout (Optional[float]): Seconds to wait for the file lock.
+    """
+
+    def __init__(
+        self,
+        header: Dict[str, str],
+        amount_format: str = "cents",
+        lock_timeout: Optional[float] = DEFAULT_LOCK_TIMEOUT,
+    ) -> None:
+        """
+        Initializes the builder with the header values.
+        Raises:
+            ValueError: If a header field is unknown, a value is invalid
+                        or the amount format is unknown.
+        """
+        unknown = [field for field in header if field not in HEADER_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown header field(s): {', '.join(unknown)}.")
+        if amount_format not in AMOUNT_FORMATS:
+            raise ValueError(
+                f"Invalid amount format '{amount_format}', expected one of "
+                f"{', '.join(AMOUNT_FORMATS)}."
+            )
+        self.amount_format = amount_format
+        self.header = {
+            field: self._pad(field, header.get(field, ""))
+            for field in HEADER_FIELDS
+        }
+        self.lock_timeout = lock_timeout
+
+    @staticmethod
+    def _pad(field: str, value: str) -> str:
+        """
+        Pads a header value to the width of its field.
+        Raises:
+            ValueError: If the value is too long or invalid.
+        """
+        check = get_field_check(HEADER_ID, field)
+        if "," in value:
+            raise ValueError(f"Header {field} must not contain a comma.")
+        padded = value.ljust(check.length)
+        failure = find_failure(check, padded)
+        if failure is not None:
+            raise ValueError(
+                f"Invalid header {field}: "
+                f"{describe_failure(check, padded, failure)}."
+            )
+        return padded
+
+    @phase_timer.timed("build")
+    def build(self, rows: Iterable[Dict[str, Any]], output_path: str) -> int:
+        """
+        Writes a file with the header and a transaction for every row.
+        Args:
+            rows (Iterable[Dict[str, Any]]): The rows, read one at a time.
+            output_path (str): Path of the file, replaced atomically.
+        Returns:
+            int: The number of transactions.
+        Raises:
+            ValueError: If a row is invalid or there are more than
+                        MAX_TRANSACTIONS_AMOUNT rows.
+        """
+        with FileLock(output_path, exclusive=True, timeout=self.lock_timeout):
+            file_descriptor, temporary_path = tempfile.mkstemp(
+                dir=os.path.dirname(os.path.abspath(output_path)),
+                prefix=".build-",
+            )
+            try:
+                os.chmod(temporary_path, 0o644)
+                with os.fdopen(
+                    file_descriptor, "w", buffering=BUILD_BUFFER_SIZE
+                ) as output:
+                    transactions = self._write(rows, output)
+                    BYTES_WRITTEN.inc(output.tell())
+                os.replace(temporary_path, output_path)
+            except BaseException:
+                if os.path.exists(temporary_path):
+                    os.remove(temporary_path)
+                raise
+        file_cache.invalidate(output_path)
+        logger.info(f"Built {output_path} with {transactions} transaction(s).")
+        return transactions
+
+    def build_from(
+        self,
+        input_path: str,
+        output_path: str,
+        input_format: Optional[str] = None,
+    ) -> int:
+        """
+        Builds a file from the rows of a CSV or JSON Lines file.
+        Args:
+            input_path (str): Path of the rows.
+            output_path (str): Path of the built file.
+            input_format (Optional[str]): One of INPUT_FORMATS; inferred
+                                          from the extension if None.
+        Returns:
+            int: The number of transactions.
+        Raises:
+            ValueError: If the input format is unknown or a row is
+                        invalid.
+        """
+        if input_format is None:
+            extension = os.path.splitext(input_path)[1].lower()
+            input_format = "jsonl" if extension in JSONL_EXTENSIONS else "csv"
+        if input_format not in INPUT_FORMATS:
+            raise ValueError(
+                f"Invalid input format '{input_format}', expected one of "
+                f"{', '.join(INPUT_FORMATS)}."
+            )
+        with open(input_path, "r", newline="") as file:
+            if input_format == "csv":
+                return self.build(csv.DictReader(file), output_path)
+            return self.build(self._json_rows(file), output_path)
+
+    @staticmethod
+    def _json_rows(file: IO[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Yields the objects of a JSON Lines file, skipping blank lines.
+        Raises:
+            ValueError: If a line is not a JSON object.
+        """
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            if not isinstance(row, dict):
+                raise ValueError(f"Line {line_number} is not a JSON object.")
+            yield row
+
+    def _write(self, rows: Iterable[Dict[str, Any]], output: IO[str]) -> int:
+        """Writes the header, the transactions and the footer."""
+        output.write(",".join([HEADER_ID] + list(self.header.values())) + "\n")
+        transactions = control_sum = rows_read = 0
+        progress = ProgressLogger(logger, "Build", PROGRESS_LOG_INTERVAL)
+        for rows_read, row in enumerate(rows, start=1):
+            if row.get(RECORD_TYPE_COLUMN, "transaction") != "transaction":
+                continue
+            amount = self._amount(row.get("amount"), rows_read)
+            currency = self._currency(row.get("currency"), rows_read)
+            transactions += 1
+            if transactions > MAX_TRANSACTIONS_AMOUNT:
+                raise ValueError(
+                    f"A file holds at most {MAX_TRANSACTIONS_AMOUNT} "
+                    f"transactions."
+                )
+            control_sum += amount
+            output.write(
+                format_transaction(
+                    format_counter(transactions),
+                    format_amount(amount),
+                    currency,
+                )
+                + "\n"
+            )
+            progress.update(rows_read)
+        output.write(
+            format_footer(
+                format_counter(transactions), format_control_sum(control_sum)
+            )
+            + "\n"
+        )
+        RECORDS_READ.inc(rows_read)
+        progress.finish(rows_read)
+        return transactions
+
+    def _amount(self, value: Any, row_number: int) -> int:
+        """
+        Returns the amount of a row in cents, read in the amount format.
+        Raises:
+            ValueError: If the amount is missing or invalid.
+        """
+        check = get_field_check(TRANSACTION_ID, "amount")
+        cents = None
+        if isinstance(value, str):
+            value = value.strip()
+            if self.amount_format == "decimal":
+                match = DECIMAL_AMOUNT_PATTERN.match(value)
+                if match is not None:
+                    units, fraction = match.groups()
+                    cents = int(units) * 100 + int(
+                        (fraction or "").ljust(2, "0")
+                    )
+            elif self.amount_format == "cents" and value.isdigit():
+                cents = int(value)
+            elif find_failure(check, value) is None:
+                cents = int(value)
+        elif (
+            self.amount_format == "cents"
+            and isinstance(value, int)
+            and not isinstance(value, bool)
+        ):
+            cents = value
+        if (
+            cents is None
+            or cents < 0
+            or find_failure(check, format_amount(cents))
+        ):
+            raise ValueError(
+                f"Row {row_number}: invalid amount '{value}' for the "
+                f"'{self.amount_format}' amount format."
+            )
+        return cents
+
+    @staticmethod
+    def _currency(value: Any, row_number: int) -> str:
+        """
+        Returns the currency of a row in upper case.
+        Raises:
+            ValueError: If the currency is missing or invalid.
+        """
+        currency = value.strip().upper() if isinstance(value, str) else ""
+        check = get_field_check(TRANSACTION_ID, "currency")
+        if find_failure(check, currency) is not None:
+            raise ValueError(f"Row {row_number}: invalid currency '{value}'.")
+        return currency
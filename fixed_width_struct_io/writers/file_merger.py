@@ -0,0 +1,280 @@
+import logging
+import os
+import tempfile
+from contextlib import ExitStack
+from typing import IO, Iterator, List, Optional, Tuple
+
+from fixed_width_struct_io.constants import (
+    DEFAULT_LOCK_TIMEOUT,
+    FIELD_ORDER,
+    FOOTER_ID,
+    HEADER_ID,
+    MAX_TRANSACTIONS_AMOUNT,
+    PROGRESS_LOG_INTERVAL,
+    TRANSACTION_ID,
+)
+from fixed_width_struct_io.core import FileLock
+from fixed_width_struct_io.helpers import ProgressLogger, phase_timer
+from fixed_width_struct_io.metrics.library_metrics import (
+    BYTES_WRITTEN,
+    RECORDS_READ,
+)
+from fixed_width_struct_io.writers.record_format import (
+    format_control_sum,
+    format_counter,
+    format_footer,
+    format_transaction,
+)
+
+logger = logging.getLogger(__name__)
+
+AMOUNT_INDEX = FIELD_ORDER[TRANSACTION_ID].index("amount")
+CURRENCY_INDEX = FIELD_ORDER[TRANSACTION_ID].index("currency")
+TOTAL_COUNTER_INDEX = FIELD_ORDER[FOOTER_ID].index("total counter")
+CONTROL_SUM_INDEX = FIELD_ORDER[FOOTER_ID].index("control sum")
+FOOTER_READ_SIZE = 4096
+
+
+def read_footer(file_path: str) -> str:
+    """
+    Reads the footer of a file by seeking to its end.
+    Args:
+        file_path (str): Path to the file.
+    Returns:
+        str: The footer line.
+    Raises:
+        ValueError: If the file does not end with a footer.
+    """
+    with open(file_path, "rb") as file:
+        file.seek(0, os.SEEK_END)
+        file.seek(max(0, file.tell() - FOOTER_READ_SIZE))
+        lines = file.read().decode().splitlines()
+    footer = lines[-1] if lines else ""
+    if not footer.startswith(FOOTER_ID):
+        raise ValueError(f"{file_path} does not end with a footer.")
+    return footer
+
+
+def numbered_output_paths(output_path: str, count: int) -> List[str]:
+    """
+    Returns the paths of `count` output files: the path itself for a
+    single output, numbered paths such as 'merged.001.csv' otherwise.
+    """
+    if count == 1:
+        return [output_path]
+    root, extension = os.path.splitext(output_path)
+    return [
+        f"{root}.{number:03d}{extension}" for number in range(1, count + 1)
+    ]
+
+
+class FileMerger:
+    """
+    Merges several fixed-width files into one, or into several when the
+    merged transactions exceed `max_transactions`.
+
+    Inputs are streamed line by line, so memory use does not depend on
+    their size. Transaction counters are renumbered consecutively in every
+    output, and each footer's total counter and control sum are computed
+    while writing. Every output uses the header of the first input. The
+    footer of each input is checked against its streamed transactions.
+
+    Outputs are written to temporary files and moved into place only once
+    the merge succeeded. A single output is written to the given path;
+    several outputs are numbered, e.g. 'merged.001.csv', 'merged.002.csv'.
+
+    Attributes:
+        input_paths (List[str]): Paths of the files to merge, in order.
+        max_transactions (int): Maximum number of transactions per output.
+        lock_timeout (Optional[float]): Seconds to wait for the file locks.
+    """
+
+    def __init__(
+        self,
+        input_paths: List[str],
+        max_transactions: int = MAX_TRANSACTIONS_AMOUNT,
+        lock_timeout: Optional[float] = DEFAULT_LOCK_TIMEOUT,
+    ) -> None:
+        """Initializes the merger with the files to merge."""
+        if not input_paths:
+            raise ValueError("At least one input file is required.")
+        if max_transactions < 1:
+            raise ValueError("max_transactions must be a positive number.")
+        self.input_paths = list(input_paths)
+        self.max_transactions = max_transactions
+        self.lock_timeout = lock_timeout
+
+    def output_paths(self, output_path: str, transactions: int) -> List[str]:
+        """
+        Returns the paths the merged transactions are written to.
+        Args:
+            output_path (str): Path of the merged file.
+            transactions (int): Total number of merged transactions.
+        Returns:
+            List[str]: One path per output file.
+        """
+        count = max(1, -(-transactions // self.max_transactions))
+        return numbered_output_paths(output_path, count)
+
+    @phase_timer.timed("merge")
+    def merge(self, output_path: str) -> List[str]:
+        """
+        Merges the input files.
+        Args:
+            output_path (str): Path of the merged file.
+        Returns:
+            List[str]: Paths of the written files.
+        Raises:
+            ValueError: If an input is not a valid file or the output is
+                        one of the inputs.
+        """
+        input_paths = {os.path.abspath(path) for path in self.input_paths}
+        if os.path.abspath(output_path) in input_paths:
+            raise ValueError("The output file must not be one of the inputs.")
+
+        with ExitStack() as stack:
+            for input_path in self.input_paths:
+                stack.enter_context(
+                    FileLock(input_path, timeout=self.lock_timeout)
+                )
+            transactions = sum(
+                int(read_footer(path).split(",")[TOTAL_COUNTER_INDEX])
+                for path in self.input_paths
+            )
+            paths = self.output_paths(output_path, transactions)
+            for path in paths:
+                stack.enter_context(
+                    FileLock(path, exclusive=True, timeout=self.lock_timeout)
+                )
+            temporary_paths: List[str] = []
+            try:
+                self._stream(paths, temporary_paths)
+                for temporary_path, path in zip(temporary_paths, paths):
+                    os.replace(temporary_path, path)
+            except BaseException:
+                for temporary_path in temporary_paths:
+                    if os.path.exists(temporary_path):
+                        os.remove(temporary_path)
+                raise
+        logger.info(
+            f"Merged {len(self.input_paths)} file(s) with {transactions} "
+            f"transaction(s) into {len(paths)} file(s)."
+        )
+        return paths
+
+    def _stream(self, paths: List[str], temporary_paths: List[str]) -> None:
+        """Streams the transactions of all inputs into the outputs."""
+        header = self._read_header(self.input_paths[0])
+        output: Optional[IO[str]] = None
+        counter = control_sum = merged = 0
+        progress = ProgressLogger(logger, "Merge", PROGRESS_LOG_INTERVAL)
+        try:
+            for input_path in self.input_paths:
+                for amount, currency in self._transactions(input_path):
+                    if output is None or counter == self.max_transactions:
+                        if output is not None:
+                            self._finish(output, counter, control_sum)
+                        output = self._open_output(
+                            paths, temporary_paths, header
+                        )
+                        counter = control_sum = 0
+                    counter += 1
+                    merged += 1
+                    control_sum += int(amount)
+                    output.write(
+                        format_transaction(
+                            format_counter(counter), amount, currency
+                        )
+                        + "\n"
+                    )
+                    progress.update(merged)
+            if output is None:
+                output = self._open_output(paths, temporary_paths, header)
+            self._finish(output, counter, control_sum)
+            output = None
+            progress.finish(merged)
+        finally:
+            if output is not None:
+                output.close()
+
+    def _transactions(self, file_path: str) -> Iterator[Tuple[str, str]]:
+        """
+        Yields the amount and currency of every transaction of an input
+        and checks its footer against them.
+        Raises:
+            ValueError: If the file has an unexpected record or its footer
+                        does not match its transactions.
+        """
+        transactions = control_sum = line_number = 0
+        footer = None
+        with open(file_path, "r") as file:
+            for line_number, line in enumerate(file, start=1):
+                line = line.rstrip("\n").rstrip("\r")
+                if footer is None and line.startswith(TRANSACTION_ID):
+                    fields = line.split(",")
+                    transactions += 1
+                    control_sum += int(fields[AMOUNT_INDEX])
+                    yield fields[AMOUNT_INDEX], fields[CURRENCY_INDEX]
+                elif footer is None and line.startswith(FOOTER_ID):
+                    footer = line
+                elif line_number != 1 or not line.startswith(HEADER_ID):
+                    raise ValueError(
+                        f"{file_path}: unexpected record on line "
+                        f"{line_number}."
+                    )
+        RECORDS_READ.inc(line_number)
+        if footer is None:
+            raise ValueError(f"{file_path} does not end with a footer.")
+        fields = footer.split(",")
+        if (
+            int(fields[TOTAL_COUNTER_INDEX]) != transactions
+            or int(fields[CONTROL_SUM_INDEX]) != control_sum
+        ):
+            raise ValueError(
+                f"{file_path}: footer does not match its transactions."
+            )
+
+    @staticmethod
+    def _read_header(file_path: str) -> str:
+        """Reads the header of a file."""
+        with open(file_path, "r") as file:
+            header = file.readline().rstrip("\n").rstrip("\r")
+        if not header.startswith(HEADER_ID):
+            raise ValueError(f"{file_path} does not start with a header.")
+        return header
+
+    @staticmethod
+    def _open_output(
+        paths: List[str], temporary_paths: List[str], header: str
+    ) -> IO[str]:
+        """
+        Opens a temporary file for the next output and writes the header.
+        Raises:
+            ValueError: If the inputs have more transactions than their
+                        footers report.
+        """
+        if len(temporary_paths) == len(paths):
+            raise ValueError(
+                "The inputs have more transactions than their footers report."
+            )
+        path = paths[len(temporary_paths)]
+        file_descriptor, temporary_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(path)), prefix=".merge-"
+        )
+        temporary_paths.append(temporary_path)
+        os.chmod(temporary_path, 0o644)
+        output = os.fdopen(file_descriptor, "w")
+        output.write(header + "\n")
+        return output
+
+    @staticmethod
+    def _finish(output: IO[str], counter: int, control_sum: int) -> None:
+        """Writes the footer of an output and closes it."""
+        output.write(
+            format_footer(
+                format_counter(counter), format_control_sum(control_sum)
+            )
+            + "\n"
+        )
+        BYTES_WRITTEN.inc(output.tell())
+        output.close()
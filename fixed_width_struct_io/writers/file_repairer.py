@@ -0,0 +1,218 @@
+import logging
+import os
+import stat
+import tempfile
+from typing import IO, List, Optional
+
+from fixed_width_struct_io.cache import file_cache
+from fixed_width_struct_io.constants import (
+    DEFAULT_LOCK_TIMEOUT,
+    FIELD_ORDER,
+    FOOTER,
+    FOOTER_ID,
+    HEADER_ID,
+    PROGRESS_LOG_INTERVAL,
+    TRANSACTION,
+    TRANSACTION_ID,
+)
+from fixed_width_struct_io.core import FileLock
+from fixed_width_struct_io.helpers import ProgressLogger, phase_timer
+from fixed_width_struct_io.metrics.library_metrics import (
+    BYTES_WRITTEN,
+    RECORDS_READ,
+)
+from fixed_width_struct_io.readers.file_differ import Difference
+from fixed_width_struct_io.writers.record_format import (
+    format_control_sum,
+    format_counter,
+    format_footer,
+)
+
+logger = logging.getLogger(__name__)
+
+COUNTER_INDEX = FIELD_ORDER[TRANSACTION_ID].index("counter")
+AMOUNT_INDEX = FIELD_ORDER[TRANSACTION_ID].index("amount")
+TOTAL_COUNTER_INDEX = FIELD_ORDER[FOOTER_ID].index("total counter")
+CONTROL_SUM_INDEX = FIELD_ORDER[FOOTER_ID].index("control sum")
+
+
+class FileRepairer:
+    """
+    Repairs drifted transaction counters and a stale footer in one
+    streaming pass.
+
+    Counters are renumbered consecutively from 1, and the footer's total
+    counter and control sum are recomputed from the transactions with
+    integer arithmetic on the amounts in cents. A missing footer is added.
+    All other fields are kept as they are. The repaired file is written to
+    a temporary file next to the original and moved into place, so readers
+    never see a partially repaired file. A dry run only reports the
+    planned changes.
+
+    Attributes:
+        file_path (str): Path to the file to repair.
+        lock_timeout (Optional[float]): Seconds to wait for the file lock.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        lock_timeout: Optional[float] = DEFAULT_LOCK_TIMEOUT,
+    ) -> None:
+        """Initializes the repairer with the file to repair."""
+        self.file_path = file_path
+        self.lock_timeout = lock_timeout
+
+    @phase_timer.timed("repair")
+    def repair(self, dry_run: bool = False) -> List[Difference]:
+        """
+        Repairs the counters and the footer of the file.
+        Args:
+            dry_run (bool): Only report the changes, without writing.
+        Returns:
+            List[Difference]: The changed fields, with their old and new
+                              values.
+        Raises:
+            ValueError: If the file has a record other than one header,
+                        transactions and one footer, or an amount that is
+                        not a number.
+        """
+        with FileLock(
+            self.file_path, exclusive=True, timeout=self.lock_timeout
+        ):
+            if dry_run:
+                changes = self._repair(None)
+            else:
+                changes = self._repair_in_place()
+        if changes and not dry_run:
+            file_cache.invalidate(self.file_path)
+        logger.info(
+            f"{len(changes)} field(s) of {self.file_path} "
+            f"{'would be' if dry_run else 'were'} repaired."
+        )
+        return changes
+
+    def _repair_in_place(self) -> List[Difference]:
+        """
+        Writes the repaired file to a temporary file and replaces the
+        original with it if anything changed.
+        """
+        file_descriptor, temporary_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(self.file_path)),
+            prefix=".repair-",
+        )
+        try:
+            os.chmod(
+                temporary_path, stat.S_IMODE(os.stat(self.file_path).st_mode)
+            )
+            with os.fdopen(file_descriptor, "w") as output:
+                changes = self._repair(output)
+                BYTES_WRITTEN.inc(output.tell())
+            if changes:
+                os.replace(temporary_path, self.file_path)
+            else:
+                os.remove(temporary_path)
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+        return changes
+
+    def _repair(self, output: Optional[IO[str]]) -> List[Difference]:
+        """
+        Streams the file, writing the repaired lines to `output` unless it
+        is None, and returns the changes.
+        """
+        changes: List[Difference] = []
+        transactions = control_sum = line_number = 0
+        footer: Optional[List[str]] = None
+        progress = ProgressLogger(logger, "Repair", PROGRESS_LOG_INTERVAL)
+        with open(self.file_path, "r") as file:
+            for line_number, line in enumerate(file, start=1):
+                line = line.rstrip("\n").rstrip("\r")
+                if footer is None and line.startswith(TRANSACTION_ID):
+                    fields = line.split(",")
+                    transactions += 1
+                    control_sum += self._amount(fields, line_number)
+                    counter = format_counter(transactions)
+                    if fields[COUNTER_INDEX] != counter:
+                        changes.append(
+                            Difference(
+                                TRANSACTION,
+                                "changed",
+                                counter,
+                                "counter",
+                                fields[COUNTER_INDEX],
+                                counter,
+                            )
+                        )
+                        fields[COUNTER_INDEX] = counter
+                        line = ",".join(fields)
+                elif footer is None and line.startswith(FOOTER_ID):
+                    footer = line.split(",")
+                    continue
+                elif line_number != 1 or not line.startswith(HEADER_ID):
+                    raise ValueError(
+                        f"Cannot repair {self.file_path}: unexpected record "
+                        f"on line {line_number}."
+                    )
+                if output is not None:
+                    output.write(line + "\n")
+                progress.update(line_number)
+        RECORDS_READ.inc(line_number)
+        progress.finish(line_number)
+        if line_number == 0:
+            raise ValueError(f"Cannot repair {self.file_path}: it is empty.")
+
+        changes.extend(self._footer_changes(footer, transactions, control_sum))
+        if output is not None:
+            if footer is None or len(footer) <= CONTROL_SUM_INDEX:
+                footer = format_footer("", "").split(",")
+            footer[TOTAL_COUNTER_INDEX] = format_counter(transactions)
+            footer[CONTROL_SUM_INDEX] = format_control_sum(control_sum)
+            output.write(",".join(footer) + "\n")
+        return changes
+
+    def _amount(self, fields: List[str], line_number: int) -> int:
+        """
+        Returns the amount of a transaction in cents.
+        Raises:
+            ValueError: If the amount is not a number.
+        """
+        amount = fields[AMOUNT_INDEX] if len(fields) > AMOUNT_INDEX else ""
+        if not amount.isdigit():
+            raise ValueError(
+                f"Cannot repair {self.file_path}: the amount on line "
+                f"{line_number} is not a number."
+            )
+        return int(amount)
+
+    @staticmethod
+    def _footer_changes(
+        footer: Optional[List[str]], transactions: int, control_sum: int
+    ) -> List[Difference]:
+        """Returns the changes of the footer fields."""
+        change = "changed" if footer is not None else "added"
+        changes = []
+        for field, index, value in (
+            (
+                "total counter",
+                TOTAL_COUNTER_INDEX,
+                format_counter(transactions),
+            ),
+            (
+                "control sum",
+                CONTROL_SUM_INDEX,
+                format_control_sum(control_sum),
+            ),
+        ):
+            old = (
+                footer[index]
+                if footer is not None and index < len(footer)
+                else None
+            )
+            if old != value:
+                changes.append(
+                    Difference(FOOTER, change, None, field, old, value)
+                )
+        return changes
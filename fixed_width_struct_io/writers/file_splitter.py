@@ -0,0 +1,344 @@
+import logging
+import os
+import stat
+import tempfile
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import ExitStack
+from typing import Iterable, List, Optional, Tuple
+
+from fixed_width_struct_io.constants import (
+    DEFAULT_LOCK_TIMEOUT,
+    FIELD_ORDER,
+    HEADER_ID,
+    MAX_TRANSACTIONS_AMOUNT,
+    TRANSACTION_ID,
+)
+from fixed_width_struct_io.core import FileLock
+from fixed_width_struct_io.helpers import phase_timer
+from fixed_width_struct_io.metrics.library_metrics import BYTES_WRITTEN
+from fixed_width_struct_io.writers.file_merger import numbered_output_paths
+from fixed_width_struct_io.writers.record_format import (
+    format_control_sum,
+    format_counter,
+    format_footer,
+    format_transaction,
+)
+
+logger = logging.getLogger(__name__)
+
+AMOUNT_INDEX = FIELD_ORDER[TRANSACTION_ID].index("amount")
+CURRENCY_INDEX = FIELD_ORDER[TRANSACTION_ID].index("currency")
+SHARD_BUFFER_SIZE = 1024 * 1024
+
+
+class _ShardWriter:
+    """
+    Writes one shard to a temporary file: the header copy, renumbered
+    transactions and a footer computed from them.
+    """
+
+    def __init__(self, directory: str, header: str) -> None:
+        """Opens the temporary file and writes the header."""
+        file_descriptor, self.temporary_path = tempfile.mkstemp(
+            dir=directory, prefix=".shard-"
+        )
+        os.chmod(self.temporary_path, 0o644)
+        self._file = os.fdopen(
+            file_descriptor, "w", buffering=SHARD_BUFFER_SIZE
+        )
+        self._file.write(header + "\n")
+        self.transactions = 0
+        self.control_sum = 0
+
+    def add(self, line: str) -> None:
+        """Adds a transaction line with the next counter."""
+        fields = line.split(",")
+        amount = fields[AMOUNT_INDEX]
+        self.transactions += 1
+        self.control_sum += int(amount)
+        self._file.write(
+            format_transaction(
+                format_counter(self.transactions),
+                amount,
+                fields[CURRENCY_INDEX],
+            )
+            + "\n"
+        )
+
+    def finish(self) -> str:
+        """Writes the footer, closes the file and returns its path."""
+        self._file.write(
+            format_footer(
+                format_counter(self.transactions),
+                format_control_sum(self.control_sum),
+            )
+            + "\n"
+        )
+        BYTES_WRITTEN.inc(self._file.tell())
+        self._file.close()
+        return self.temporary_path
+
+    def discard(self) -> None:
+        """Closes and removes the temporary file."""
+        self._file.close()
+        os.remove(self.temporary_path)
+
+
+def write_shard(
+    input_path: str, start: int, end: int, header: str, directory: str
+) -> str:
+    """
+    Writes the transactions between two byte offsets of a file as a shard.
+    Lines of other record types in the range are skipped.
+    Args:
+        input_path (str): Path to the input file.
+        start (int): Offset of the first byte of the range.
+        end (int): Offset after the last byte of the range.
+        header (str): Header line of the shard.
+        directory (str): Directory of the temporary shard file.
+    Returns:
+        str: Path of the temporary shard file.
+    """
+    transaction_id = TRANSACTION_ID.encode()
+    shard = _ShardWriter(directory, header)
+    try:
+        with open(input_path, "rb", buffering=SHARD_BUFFER_SIZE) as file:
+            file.seek(start)
+            position = start
+            for line in file:
+                if position >= end:
+                    break
+                position += len(line)
+                if line.startswith(transaction_id):
+                    shard.add(line.decode().rstrip("\n").rstrip("\r"))
+        return shard.finish()
+    except BaseException:
+        shard.discard()
+        raise
+
+
+class FileSplitter:
+    """
+    Splits a transaction stream into valid shard files of at most
+    `max_transactions` transactions each.
+
+    The input is a header followed by transactions. It may exceed the
+    transaction limit of a single file, or chain several groups like a
+    segmented file; further headers and all footers are skipped, since
+    the footers of the shards are computed from their own transactions.
+    Every shard gets a copy of the first header and counters starting
+    at 1.
+
+    A regular file is scanned once to find the byte offset where each
+    shard starts, and the shards are then written independently, in
+    worker processes when requested. Other inputs are written shard after
+    shard in a single pass. Memory use is bounded either way. Shards are
+    written to temporary files and moved into place once all of them
+    succeeded; they are named like the outputs of FileMerger.
+
+    Attributes:
+        input_path (str): Path to the file to split.
+        max_transactions (int): Maximum number of transactions per shard.
+        lock_timeout (Optional[float]): Seconds to wait for the file lock.
+    """
+
+    def __init__(
+        self,
+        input_path: str,
+        max_transactions: int = MAX_TRANSACTIONS_AMOUNT,
+        lock_timeout: Optional[float] = DEFAULT_LOCK_TIMEOUT,
+    ) -> None:
+        """Initializes the splitter with the file to split."""
+        if not 1 <= max_transactions <= MAX_TRANSACTIONS_AMOUNT:
+            raise ValueError(
+                f"The shard size must be between 1 and "
+                f"{MAX_TRANSACTIONS_AMOUNT}."
+            )
+        self.input_path = input_path
+        self.max_transactions = max_transactions
+        self.lock_timeout = lock_timeout
+
+    @phase_timer.timed("split")
+    def split(
+        self, output_path: str, workers: Optional[int] = None
+    ) -> List[str]:
+        """
+        Splits the input file into shards.
+        Args:
+            output_path (str): Path of the shard, numbered if there are
+                               several shards.
+            workers (Optional[int]): Number of worker processes writing
+                                     the shards of a regular file.
+        Returns:
+            List[str]: Paths of the written shards.
+        Raises:
+            ValueError: If the input does not start with a header or an
+                        output would overwrite the input.
+        """
+        if not stat.S_ISREG(os.stat(self.input_path).st_mode):
+            # A pipe or device: stream it, there is nothing to lock.
+            with open(self.input_path, "r") as file:
+                return self.split_stream(file, output_path)
+
+        with FileLock(self.input_path, timeout=self.lock_timeout):
+            header, ranges = self._scan()
+            paths = numbered_output_paths(output_path, len(ranges))
+            self._check_outputs(paths)
+            directory = os.path.dirname(os.path.abspath(output_path))
+            jobs = [
+                (self.input_path, start, end, header, directory)
+                for start, end in ranges
+            ]
+            temporary_paths = self._write_shards(jobs, workers)
+        return self._commit(temporary_paths, paths)
+
+    def split_stream(
+        self, lines: Iterable[str], output_path: str
+    ) -> List[str]:
+        """
+        Splits a stream of lines into shards in a single pass.
+        Args:
+            lines (Iterable[str]): The lines of the input, e.g. a file.
+            output_path (str): Path of the shard, numbered if there are
+                               several shards.
+        Returns:
+            List[str]: Paths of the written shards.
+        Raises:
+            ValueError: If the stream does not start with a header.
+        """
+        directory = os.path.dirname(os.path.abspath(output_path))
+        iterator = iter(lines)
+        header = self._check_header(next(iterator, ""))
+        temporary_paths: List[str] = []
+        shard: Optional[_ShardWriter] = None
+        try:
+            for line in iterator:
+                if not line.startswith(TRANSACTION_ID):
+                    continue
+                if shard is None:
+                    shard = _ShardWriter(directory, header)
+                shard.add(line.rstrip("\n").rstrip("\r"))
+                if shard.transactions == self.max_transactions:
+                    temporary_paths.append(shard.finish())
+                    shard = None
+            if shard is not None or not temporary_paths:
+                shard = shard or _ShardWriter(directory, header)
+                temporary_paths.append(shard.finish())
+                shard = None
+        except BaseException:
+            if shard is not None:
+                shard.discard()
+            self._discard(temporary_paths)
+            raise
+        paths = numbered_output_paths(output_path, len(temporary_paths))
+        try:
+            self._check_outputs(paths)
+        except ValueError:
+            self._discard(temporary_paths)
+            raise
+        return self._commit(temporary_paths, paths)
+
+    def _scan(self) -> Tuple[str, List[Tuple[int, int]]]:
+        """
+        Reads the header and finds the byte range of every shard.
+        Returns:
+            The header line and the (start, end) offsets of the shards.
+        """
+        transaction_id = TRANSACTION_ID.encode()
+        starts: List[int] = []
+        transactions = position = 0
+        with open(self.input_path, "rb", buffering=SHARD_BUFFER_SIZE) as file:
+            first_line = file.readline()
+            header = self._check_header(first_line.decode())
+            position = len(first_line)
+            for line in file:
+                if line.startswith(transaction_id):
+                    if transactions % self.max_transactions == 0:
+                        starts.append(position)
+                    transactions += 1
+                position += len(line)
+        if not starts:
+            starts.append(position)
+        ends = starts[1:] + [position]
+        logger.info(
+            f"{self.input_path} has {transactions} transaction(s), "
+            f"split into {len(starts)} shard(s)."
+        )
+        return header, list(zip(starts, ends))
+
+    @staticmethod
+    def _check_header(line: str) -> str:
+        """Returns the header line, checking that it is one."""
+        header = line.rstrip("\n").rstrip("\r")
+        if not header.startswith(HEADER_ID):
+            raise ValueError("The input does not start with a header.")
+        return header
+
+    def _check_outputs(self, paths: List[str]) -> None:
+        """Checks that no shard would overwrite the input."""
+        input_path = os.path.abspath(self.input_path)
+        if any(os.path.abspath(path) == input_path for path in paths):
+            raise ValueError("A shard must not overwrite the input file.")
+
+    @staticmethod
+    def _write_shards(jobs: List[tuple], workers: Optional[int]) -> List[str]:
+        """
+        Writes the shards, in worker processes if `workers` is greater
+        than one, and returns their temporary paths.
+        """
+        if workers is None or workers <= 1 or len(jobs) <= 1:
+            temporary_paths: List[str] = []
+            try:
+                for job in jobs:
+                    temporary_paths.append(write_shard(*job))
+            except BaseException:
+                FileSplitter._discard(temporary_paths)
+                raise
+            return temporary_paths
+
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(jobs))
+        ) as executor:
+            futures: List[Future] = [
+                executor.submit(write_shard, *job) for job in jobs
+            ]
+            temporary_paths, errors = [], []
+            for future in futures:
+                try:
+                    temporary_paths.append(future.result())
+                except Exception as e:
+                    errors.append(e)
+        if errors:
+            FileSplitter._discard(temporary_paths)
+            raise errors[0]
+        return temporary_paths
+
+    def _commit(
+        self, temporary_paths: List[str], paths: List[str]
+    ) -> List[str]:
+        """
+        Moves the temporary shards into place under exclusive locks on
+        the shards, so writers of existing shards are not interrupted.
+        """
+        try:
+            with ExitStack() as stack:
+                for path in paths:
+                    stack.enter_context(
+                        FileLock(
+                            path, exclusive=True, timeout=self.lock_timeout
+                        )
+                    )
+                for temporary_path, path in zip(temporary_paths, paths):
+                    os.replace(temporary_path, path)
+        except BaseException:
+            self._discard(temporary_paths)
+            raise
+        logger.info(f"Wrote {len(paths)} shard(s).")
+        return paths
+
+    @staticmethod
+    def _discard(temporary_paths: List[str]) -> None:
+        """Removes temporary shards."""
+        for temporary_path in temporary_paths:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
@@ -0,0 +1,217 @@
+import csv
+import json
+import logging
+import os
+import tempfile
+from typing import IO, Any, Dict, Iterator, List, Optional, Sequence
+
+from fixed_width_struct_io.constants import (
+    DEFAULT_LOCK_TIMEOUT,
+    FIELD_ORDER,
+    PROGRESS_LOG_INTERVAL,
+    RECORD_TYPE_NAMES,
+)
+from fixed_width_struct_io.core import FileLock
+from fixed_width_struct_io.helpers import ProgressLogger, phase_timer
+from fixed_width_struct_io.metrics.library_metrics import (
+    BYTES_WRITTEN,
+    RECORDS_READ,
+)
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ("csv", "jsonl")
+AMOUNT_FORMATS = ("text", "cents", "decimal")
+AMOUNT_FIELDS = frozenset(["amount", "control sum"])
+EXPORT_BUFFER_SIZE = 1024 * 1024
+RECORD_TYPE_COLUMN = "record type"
+
+
+def _default_fields() -> List[str]:
+    """Returns every field name except the field id and reserved space."""
+    fields: List[str] = []
+    for field_order in FIELD_ORDER.values():
+        for field in field_order:
+            if field not in ("field id", "reserved") and field not in fields:
+                fields.append(field)
+    return fields
+
+
+class RecordExporter:
+    """
+    Exports the records of a fixed-width file to CSV or JSON Lines in one
+    streaming pass, so memory use does not depend on the file size.
+
+    Every record becomes one row or JSON object with its record type
+    ('header', 'transaction' or 'footer') and the projected fields it
+    has; values are stripped of their padding spaces. CSV rows have a
+    column per projected field, left empty for fields of other record
+    types. Amounts ('amount' and 'control sum') are exported as in the
+    file ('text'), as integer cents ('cents') or as decimal strings such
+    as '20.00' ('decimal').
+
+    Attributes:
+        file_path (str): Path to the file to export.
+        fields (List[str]): The exported fields, in column order.
+        amount_format (str): One of AMOUNT_FORMATS.
+        lock_timeout (Optional[float]): Seconds to wait for the file lock.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        fields: Optional[Sequence[str]] = None,
+        amount_format: str = "text",
+        lock_timeout: Optional[float] = DEFAULT_LOCK_TIMEOUT,
+    ) -> None:
+        """
+        Initializes the exporter.
+        Raises:
+            ValueError: If a field or the amount format is unknown.
+        """
+        known_fields = {
+            field for order in FIELD_ORDER.values() for field in order
+        }
+        self.fields = (
+            [field.strip().lower() for field in fields]
+            if fields
+            else _default_fields()
+        )
+        unknown = [field for field in self.fields if field not in known_fields]
+        if unknown:
+            raise ValueError(f"Unknown field(s): {', '.join(unknown)}.")
+        if amount_format not in AMOUNT_FORMATS:
+            raise ValueError(
+                f"Invalid amount format '{amount_format}', expected one of "
+                f"{', '.join(AMOUNT_FORMATS)}."
+            )
+        self.file_path = file_path
+        self.amount_format = amount_format
+        self.lock_timeout = lock_timeout
+        self._projection = {
+            record_id: [
+                (field, field_order.index(field))
+                for field in self.fields
+                if field in field_order
+            ]
+            for record_id, field_order in FIELD_ORDER.items()
+        }
+
+    @phase_timer.timed("export")
+    def export(self, output_path: str, output_format: str = "csv") -> int:
+        """
+        Exports the records to a file, replacing it atomically.
+        Args:
+            output_path (str): Path of the exported file.
+            output_format (str): One of EXPORT_FORMATS.
+        Returns:
+            int: The number of exported records.
+        Raises:
+            ValueError: If the format is unknown, the output is the input
+                        file or a record cannot be exported.
+        """
+        if os.path.abspath(output_path) == os.path.abspath(self.file_path):
+            raise ValueError("The export must not overwrite the input file.")
+        file_descriptor, temporary_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(output_path)),
+            prefix=".export-",
+        )
+        try:
+            os.chmod(temporary_path, 0o644)
+            with os.fdopen(
+                file_descriptor,
+                "w",
+                buffering=EXPORT_BUFFER_SIZE,
+                newline="",
+            ) as output:
+                records = self.export_to(output, output_format)
+                BYTES_WRITTEN.inc(output.tell())
+            os.replace(temporary_path, output_path)
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+        return records
+
+    def export_to(self, output: IO[str], output_format: str = "csv") -> int:
+        """
+        Exports the records to an open text stream, e.g. stdout.
+        Args:
+            output (IO[str]): The stream to write to. CSV streams should be
+                              opened with newline=''.
+            output_format (str): One of EXPORT_FORMATS.
+        Returns:
+            int: The number of exported records.
+        Raises:
+            ValueError: If the format is unknown or a record cannot be
+                        exported.
+        """
+        if output_format not in EXPORT_FORMATS:
+            raise ValueError(
+                f"Invalid export format '{output_format}', expected one of "
+                f"{', '.join(EXPORT_FORMATS)}."
+            )
+        records = 0
+        if output_format == "csv":
+            columns = [RECORD_TYPE_COLUMN] + self.fields
+            writer = csv.DictWriter(output, fieldnames=columns)
+            writer.writeheader()
+            for records, record in enumerate(self.records(), start=1):
+                writer.writerow(record)
+        else:
+            for records, record in enumerate(self.records(), start=1):
+                output.write(json.dumps(record) + "\n")
+        logger.info(
+            f"Exported {records} record(s) of {self.file_path} "
+            f"as {output_format}."
+        )
+        return records
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yields the projected records of the file, reading it line by line
+        under a shared lock.
+        Raises:
+            ValueError: If a line has an unknown record type or an amount
+                        is not a number.
+        """
+        line_number = 0
+        progress = ProgressLogger(logger, "Export", PROGRESS_LOG_INTERVAL)
+        with FileLock(self.file_path, timeout=self.lock_timeout):
+            with open(self.file_path, "r") as file:
+                for line_number, line in enumerate(file, start=1):
+                    yield self._record(line, line_number)
+                    progress.update(line_number)
+        RECORDS_READ.inc(line_number)
+        progress.finish(line_number)
+
+    def _record(self, line: str, line_number: int) -> Dict[str, Any]:
+        """Returns the projected record of a line."""
+        values = line.rstrip("\n").rstrip("\r").split(",")
+        record_type = RECORD_TYPE_NAMES.get(values[0])
+        if record_type is None:
+            raise ValueError(
+                f"Unknown record type '{values[0]}' on line {line_number}."
+            )
+        record: Dict[str, Any] = {RECORD_TYPE_COLUMN: record_type}
+        for field, index in self._projection[values[0]]:
+            value = values[index].rstrip(" ") if index < len(values) else ""
+            if field in AMOUNT_FIELDS and self.amount_format != "text":
+                value = self._typed_amount(value, field, line_number)
+            record[field] = value
+        return record
+
+    def _typed_amount(self, value: str, field: str, line_number: int) -> Any:
+        """
+        Converts an amount in cents to an integer or a decimal string.
+        Raises:
+            ValueError: If the amount is not a number.
+        """
+        if not value.isdigit():
+            raise ValueError(
+                f"The {field} on line {line_number} is not a number."
+            )
+        cents = int(value)
+        if self.amount_format == "cents":
+            return cents
+        return f"{cents // 100}.{cents % 100:02d}"
@@ -0,0 +1,48 @@
+from fixed_width_struct_io.constants import FOOTER_ID, TRANSACTION_ID
+from fixed_width_struct_io.validators.validation_plan import get_field_check
+
+COUNTER_LENGTH = 6
+AMOUNT_LENGTH = 12
+CONTROL_SUM_LENGTH = 12
+
+
+def format_counter(counter: int) -> str:
+    """Returns a transaction counter or total counter field value."""
+    return str(counter).zfill(COUNTER_LENGTH)
+
+
+def format_amount(amount_cents: int) -> str:
+    """Returns a transaction amount field value from an amount in cents."""
+    return str(amount_cents).zfill(AMOUNT_LENGTH)
+
+
+def format_control_sum(control_sum_cents: int) -> str:
+    """Returns a control sum field value from an amount in cents."""
+    return str(control_sum_cents).zfill(CONTROL_SUM_LENGTH)
+
+
+def format_transaction(counter: str, amount: str, currency: str) -> str:
+    """
+    Returns a transaction record without the line ending.
+    Args:
+        counter (str): The transaction counter field value.
+        amount (str): The amount field value.
+        currency (str): The currency field value.
+    Returns:
+        str: The transaction line.
+    """
+    reserved_spaces = " " * get_field_check(TRANSACTION_ID, "reserved").length
+    return f"{TRANSACTION_ID},{counter},{amount},{currency},{reserved_spaces}"
+
+
+def format_footer(total_counter: str, control_sum: str) -> str:
+    """
+    Returns a footer record without the line ending.
+    Args:
+        total_counter (str): The total counter field value.
+        control_sum (str): The control sum field value.
+    Returns:
+        str: The footer line.
+    """
+    reserved_spaces = " " * get_field_check(FOOTER_ID, "reserved").length
+    return f"{FOOTER_ID},{total_counter},{control_sum},{reserved_spaces}"
@@ -8,8 +8,18 @@ from fixed_width_struct_io.constants import (
     TRANSACTION,
     FOOTER_ID,
 )
-from fixed_width_struct_io.core import FileIOBase
+from fixed_width_struct_io.cache import file_cache
+from fixed_width_struct_io.core import FileIOBase, exclusive_update
+from fixed_width_struct_io.helpers import phase_timer
+from fixed_width_struct_io.indexes import maintained_indexes
+from fixed_width_struct_io.metrics.library_metrics import APPENDS
 from fixed_width_struct_io.utils import validate_field
+from fixed_width_struct_io.writers.record_format import (
+    format_control_sum,
+    format_counter,
+    format_footer,
+    format_transaction,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -80,6 +90,8 @@ class TransactionAppender(FileIOBase):
             )
             raise
 
+    @phase_timer.timed("append")
+    @exclusive_update
     def append_transaction(self, amount: str, currency: str) -> bool:
         """
         Appends a new transaction to the file
@@ -98,9 +110,7 @@ class TransactionAppender(FileIOBase):
                 logger.error("Failed to validate new transaction fields.")
                 raise ValueError("Amount or currency is invalid")
 
-                # Load all lines from the file
-            with open(self.file_path, "r") as file:
-                lines = file.readlines()
+            lines = list(self.lines)
 
             footer_index = None
             for i, line in enumerate(self.lines):
@@ -117,23 +127,30 @@ class TransactionAppender(FileIOBase):
                 new_counter, amount, currency
             )
 
-            lines.insert(footer_index, new_transaction_line)
+            lines.insert(footer_index, new_transaction_line.rstrip("\n"))
 
             transaction_count_increment = 1
             amount_increment = (
                 float(amount) / 100
             )  # assuming amount is in cents
-            logging.info("Calculate new footer values")
+            logger.info("Calculate new footer values")
 
             updated_footer_line = self._update_footer(
                 lines[footer_index + 1],
                 transaction_count_increment,
                 amount_increment,
             )
-            lines[footer_index + 1] = updated_footer_line
+            lines[footer_index + 1] = updated_footer_line.rstrip("\n")
 
-            with open(self.file_path, "w") as file:
-                file.writelines(lines)
+            self.lines = lines
+            with maintained_indexes(self.file_path) as indexes:
+                self._write_lines()
+                if indexes.currency is not None:
+                    indexes.currency.append(currency)
+                if indexes.amount is not None:
+                    indexes.amount.append(int(amount), int(new_counter))
+            file_cache.invalidate(self.file_path)
+            APPENDS.inc()
             logger.info("New transaction appended successfully.")
             return True
         except ValueError as e:
@@ -194,21 +211,14 @@ class TransactionAppender(FileIOBase):
             str: The new transaction line.
         """
         logger.debug(
-            f"Creating new transaction: Counter={counter}, "
-            f"Amount={amount}, Currency={currency}."
+            "Creating new transaction: Counter=%s, Amount=%s, Currency=%s.",
+            counter,
+            amount,
+            currency,
         )
 
-        reserved_field_format = FIELD_FORMATS[TRANSACTION_ID]["reserved"]
-        reserved_spaces = " " * (
-            reserved_field_format.end_position
-            - reserved_field_format.start_position
-            + 1
-        )
         logger.info("New transaction line created successfully.")
-        return (
-            f"{TRANSACTION_ID},{counter},{amount},"
-            f"{currency},{reserved_spaces}\n"
-        )
+        return format_transaction(counter, amount, currency) + "\n"
 
     def _update_footer(
         self,
@@ -237,24 +247,18 @@ class TransactionAppender(FileIOBase):
                 int(footer_fields["total counter"])
                 + transaction_count_increment
             )
-            footer_fields["total counter"] = str(total_counter).zfill(6)
-
-            # Increment the control sum
-            control_sum = int(footer_fields["control sum"]) + int(
+            # Increment the control sum; rounding keeps amounts such as
+            # 0.29 from losing a cent to float representation.
+            control_sum = int(footer_fields["control sum"]) + round(
                 amount_increment * 100
             )  # assuming control sum is also in cents
-            footer_fields["control sum"] = str(control_sum).zfill(12)
-
-            # Reconstruct the footer line
-            reserved_spaces = " " * (
-                FIELD_FORMATS[FOOTER_ID]["reserved"].end_position
-                - FIELD_FORMATS[FOOTER_ID]["reserved"].start_position
-                + 1
-            )
             logger.info("Footer updated successfully.")
             return (
-                f"{FOOTER_ID},{footer_fields['total counter']},"
-                f"{footer_fields['control sum']},{reserved_spaces}\n"
+                format_footer(
+                    format_counter(total_counter),
+                    format_control_sum(control_sum),
+                )
+                + "\n"
             )
         except Exception:
             logger.exception("Failed to update the footer.")